@@ -0,0 +1,172 @@
+# Standard Library Imports
+import io
+import json
+import math
+import threading
+from typing import Any, Callable, Dict, Iterator, List, Tuple
+
+# Third-Party Imports
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+# Local App Imports
+from metrics.models import UserCredential
+from metrics.services.content_analyzer import get_category_freqs_in_playlist, get_topic_freqs_in_playlist
+from metrics.services.history_analyzer import process_takeout_data
+from metrics.services.subscription_analyzer import PAGE_TOKEN_INDEX, get_paginated_subscriptions
+from metrics.services.visualizer import create_plotly_chart_dict
+from metrics.utils.api_client import YouTubeClient
+from metrics.utils.api_stub import ApiStubServer, StubConfig, StubDataset
+from metrics.utils.benchmark_helper import (BenchmarkResult, find_regressions, load_baseline, measure,
+                                            save_baseline)
+from metrics.utils.cache_helper import delete_user_artifact
+from metrics.utils.synthetic_helper import generate_watch_history
+
+BENCHMARK_USER_ID = 0 # Never assigned to a real user, so benchmark artifacts cannot clash with real ones
+CHART_CALLS = 100 # Chart specs built per chart scenario run
+SUBSCRIPTIONS_PER_PAGE = 25
+
+# A scenario is a name and a setup function returning (the code to time, whether it calls the API)
+Scenario = Tuple[str, Callable[[], Tuple[Callable[[], Any], bool]]]
+
+def _sizes(value: str) -> List[int]:
+    return [int(size) for size in value.split(',') if size.strip()]
+
+def _count_api_calls(run: Callable[[], Any], server: ApiStubServer) -> Tuple[Callable[[], None], List[int]]:
+    """Wrap a scenario so every run records how many API requests it made."""
+    calls: List[int] = []
+    def counted_run() -> None:
+        before = server.request_count
+        run()
+        calls.append(server.request_count - before)
+    return counted_run, calls
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark the Takeout, subscription, chart and content-affinity pipelines on synthetic data (API "
+        "scenarios run against an in-process offline API stand-in). Reports wall time, peak memory and API "
+        "calls per scenario and fails if any regresses against the stored baseline."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--scenario', action='append', dest='scenarios',
+                            help="Only run scenarios whose name starts with this prefix (repeatable).")
+        parser.add_argument('--takeout-sizes', type=_sizes, default=[10_000, 100_000, 1_000_000],
+                            help="Comma-separated watch history sizes, e.g. 10000,100000,5000000.")
+        parser.add_argument('--subscription-sizes', type=_sizes, default=[100, 1_000, 5_000],
+                            help="Comma-separated subscription list sizes.")
+        parser.add_argument('--liked-sizes', type=_sizes, default=[100, 1_000, 5_000],
+                            help="Comma-separated liked playlist sizes.")
+        parser.add_argument('--repeat', type=int, default=3, help="Timed runs per scenario; the fastest is reported.")
+        parser.add_argument('--seed', type=int, default=0, help="Seed of the synthetic data.")
+        parser.add_argument('--latency-ms', type=float, default=0.0,
+                            help="Latency the API stand-in adds per request (0 measures our own CPU cost).")
+        parser.add_argument('--baseline', default=settings.BENCHMARK_BASELINE_FILE, help="Baseline file to compare with.")
+        parser.add_argument('--save-baseline', action='store_true', help="Store these results as the new baseline.")
+        parser.add_argument('--tolerance', type=float, default=settings.BENCHMARK_TOLERANCE,
+                            help="Allowed fractional slowdown or memory growth before a scenario counts as regressed.")
+
+    def handle(self, *args, **options):
+        empty = StubDataset(channel_count=0, subscription_count=0, playlist_count=0, liked_count=0) # replaced per scenario
+        server = ApiStubServer(('127.0.0.1', 0), empty, StubConfig(latency_ms=options['latency_ms']))
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        try:
+            results = list(self._run(self._scenarios(server, options), server, options))
+        finally:
+            server.shutdown()
+            server.server_close()
+            delete_user_artifact(BENCHMARK_USER_ID, PAGE_TOKEN_INDEX)
+
+        if not results:
+            raise CommandError("No scenario matches the given --scenario prefixes.")
+
+        if options['save_baseline']:
+            save_baseline(options['baseline'], results)
+            self.stdout.write(self.style.SUCCESS(f"\nSaved {len(results)} results to {options['baseline']}."))
+            return
+
+        baseline = load_baseline(options['baseline'])
+        if not baseline:
+            self.stdout.write(f"\nNo baseline at {options['baseline']}; run with --save-baseline to create one.")
+            return
+        regressions = find_regressions(results, baseline, options['tolerance'])
+        if regressions:
+            raise CommandError("Regressions against the baseline:\n  " + "\n  ".join(regressions))
+        self.stdout.write(self.style.SUCCESS(f"\nNo regressions against {options['baseline']}."))
+
+    def _run(self, scenarios: List[Scenario], server: ApiStubServer, options: Dict[str, Any]) -> Iterator[BenchmarkResult]:
+        prefixes = options['scenarios']
+        self.stdout.write(f"{'scenario':<32} {'wall ms':>11} {'peak KiB':>11} {'API calls':>10}")
+        for name, setup in scenarios:
+            if prefixes and not any(name.startswith(prefix) for prefix in prefixes):
+                continue
+            run, uses_api = setup()
+
+            counted_run, calls = _count_api_calls(run, server)
+            measured = measure(counted_run, options['repeat'])
+            result = BenchmarkResult(name, round(measured['wall_ms'], 2), round(measured['peak_kb'], 1),
+                                     calls[-1] if uses_api else None)
+            api_calls = '-' if result.api_calls is None else str(result.api_calls)
+            self.stdout.write(f"{name:<32} {result.wall_ms:>11.1f} {result.peak_kb:>11.0f} {api_calls:>10}")
+            yield result
+
+    def _scenarios(self, server: ApiStubServer, options: Dict[str, Any]) -> List[Scenario]:
+        seed = options['seed']
+        client = self._stub_client(server.base_url)
+        scenarios: List[Scenario] = []
+
+        for size in options['takeout_sizes']:
+            def setup_takeout(size=size):
+                content = json.dumps(list(generate_watch_history(size, seed))).encode('utf-8')
+                def run():
+                    if process_takeout_data(io.BytesIO(content))['status'] != 'success':
+                        raise CommandError(f"process_takeout_data failed on {size} entries.")
+                return run, False
+            scenarios.append((f"takeout_{size}", setup_takeout))
+
+        for chart_name, chart_type, freq_data in (
+            ('daily', 'daily_needle_chart', {f"day-{day:05d}": day % 37 for day in range(3650)}),
+            ('bar', 'bar', {f"Topic {topic}": (topic * 7919) % 1000 for topic in range(500)}),
+        ):
+            def setup_chart(chart_type=chart_type, freq_data=freq_data):
+                def run():
+                    for _ in range(CHART_CALLS):
+                        create_plotly_chart_dict(freq_data, "Videos Watched", chart_type, "Benchmark")
+                return run, False
+            scenarios.append((f"chart_dict_{chart_name}_x{CHART_CALLS}", setup_chart))
+
+        for size in options['subscription_sizes']:
+            def setup_subscriptions(size=size):
+                server.dataset = StubDataset(seed, channel_count=size, videos_per_channel=1, subscription_count=size,
+                                             playlist_count=0, liked_count=0)
+                pages = math.ceil(size / SUBSCRIPTIONS_PER_PAGE)
+                def run():
+                    delete_user_artifact(BENCHMARK_USER_ID, PAGE_TOKEN_INDEX) # every run starts without cached tokens
+                    for page_num in range(1, pages + 1):
+                        get_paginated_subscriptions(client, BENCHMARK_USER_ID, page_num, SUBSCRIPTIONS_PER_PAGE)
+                return run, True
+            scenarios.append((f"subscriptions_{size}", setup_subscriptions))
+
+        for size in options['liked_sizes']:
+            for kind, analyze in (('topics', get_topic_freqs_in_playlist), ('categories', get_category_freqs_in_playlist)):
+                def setup_affinity(size=size, analyze=analyze):
+                    server.dataset = StubDataset(seed, channel_count=max(300, math.ceil(size / 40)), subscription_count=0,
+                                                 playlist_count=0, liked_count=size)
+                    return (lambda: analyze(client, StubDataset.LIKED_PLAYLIST_ID)), True
+                scenarios.append((f"content_{kind}_{size}", setup_affinity))
+
+        return scenarios
+
+    @staticmethod
+    def _stub_client(base_url: str) -> YouTubeClient:
+        """
+        A client that talks to the in-process stand-in, never records and never needs a real key or token.
+
+        The shared public cache is off, so every timed run makes the same API calls.
+        """
+        client = YouTubeClient(credentials=UserCredential(access_token='stub', refresh_token='stub'))
+        client.base_url = base_url
+        client.record_mode = 'off'
+        client.public_cache = False
+        client.api_key = client.api_key or 'stub'
+        return client
@@ -0,0 +1,166 @@
+# Standard Library Imports
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.request
+from contextlib import ExitStack
+from typing import Dict, Optional
+
+# Third-Party Imports
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+# Local App Imports
+from metrics.utils.api_stub import ApiStubServer, StubConfig, StubDataset
+from metrics.utils.loadtest_helper import DEFAULT_MIX, LoadTestStats, VirtualUser
+from metrics.utils.synthetic_helper import write_takeout_zip
+
+SERVER_START_TIMEOUT = 60 # seconds to wait for gunicorn to answer
+
+def _mix(value: str) -> Dict[str, int]:
+    mix = {}
+    for item in value.split(','):
+        if not item.strip():
+            continue
+        name, _, weight = item.partition('=')
+        if name.strip() not in DEFAULT_MIX:
+            raise ValueError(f"unknown journey {name.strip()!r}")
+        mix[name.strip()] = int(weight or 1)
+    return mix
+
+class Command(BaseCommand):
+    help = (
+        "Load test the site with simulated users who sign in through the stubbed OAuth callback and browse "
+        "the dashboard, subscriptions, content affinity, recommendations and Takeout uploads. By default the "
+        "site is started under gunicorn against an in-process offline API stand-in. Reports throughput, "
+        "p50/p95/p99 latency and error rates per view."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--base-url', default='http://127.0.0.1:8000',
+                            help="Site to test when --workers is 0 (it must run with DEBUG and OAUTH_STUB_ENABLED=true).")
+        parser.add_argument('--workers', type=int, default=2,
+                            help="gunicorn workers to start against the API stand-in (0 tests --base-url as is).")
+        parser.add_argument('--threads', type=int, default=1, help="Threads per gunicorn worker.")
+        parser.add_argument('--users', type=int, default=10, help="Simulated users.")
+        parser.add_argument('--concurrency', type=int, default=None,
+                            help="Most requests in flight at once (default: one per user).")
+        parser.add_argument('--duration', type=float, default=60.0, help="Seconds to run after the ramp-up starts.")
+        parser.add_argument('--ramp-up', type=float, default=10.0, help="Seconds over which users start.")
+        parser.add_argument('--think-ms', type=float, default=1000.0, help="Mean pause between a user's journeys.")
+        parser.add_argument('--mix', type=_mix, default=DEFAULT_MIX,
+                            help="Journey weights, e.g. dashboard=3,subscriptions=4,takeout_upload=0.")
+        parser.add_argument('--takeout-entries', type=int, default=20_000,
+                            help="Watch history entries in the uploaded Takeout archive (0 skips uploads).")
+        parser.add_argument('--api-latency-ms', type=float, default=50.0,
+                            help="Latency the API stand-in adds per request.")
+        parser.add_argument('--seed', type=int, default=0, help="Seed of the synthetic data and the users' choices.")
+        parser.add_argument('--json', dest='json_path', help="Also write the report to this file as JSON.")
+
+    def handle(self, *args, **options):
+        takeout_zip = self._takeout_zip(options['takeout_entries'], options['seed'])
+        mix = {name: weight for name, weight in options['mix'].items() if weight > 0}
+        if not takeout_zip:
+            mix.pop('takeout_upload', None)
+        if not mix:
+            raise CommandError("The journey mix is empty.")
+
+        stub_server = None
+        base_url = options['base_url']
+        with ExitStack() as stack:
+            if options['workers'] > 0:
+                stub_server = ApiStubServer(('127.0.0.1', 0), StubDataset(options['seed']),
+                                            StubConfig(latency_ms=options['api_latency_ms']))
+                stack.callback(stub_server.server_close)
+                stack.callback(stub_server.shutdown)
+                threading.Thread(target=stub_server.serve_forever, daemon=True).start()
+                base_url = self._start_gunicorn(stack, stub_server.base_url, options['workers'], options['threads'])
+            stats = self._run(base_url, mix, takeout_zip, options)
+
+        report = stats.report()
+        self._print_report(report)
+        if stub_server is not None:
+            self.stdout.write(f"\nThe API stand-in served {stub_server.request_count} requests.")
+        if options['json_path']:
+            with open(options['json_path'], 'w', encoding='utf-8') as f:
+                json.dump({'options': {key: options[key] for key in (
+                    'workers', 'threads', 'users', 'concurrency', 'duration', 'ramp_up', 'think_ms',
+                    'takeout_entries', 'api_latency_ms', 'seed')} | {'mix': mix}, 'views': report}, f, indent=2)
+            self.stdout.write(f"Wrote the report to {options['json_path']}.")
+
+    def _run(self, base_url: str, mix: Dict[str, int], takeout_zip: Optional[bytes], options) -> LoadTestStats:
+        users = options['users']
+        slots = threading.Semaphore(options['concurrency'] or users)
+        stats = LoadTestStats()
+        stop_at = time.perf_counter() + options['duration']
+        self.stdout.write(f"Running {users} users against {base_url} for {options['duration']:.0f} s...")
+
+        threads = []
+        for user_number in range(users):
+            user = VirtualUser(base_url, user_number, stats, mix, options['think_ms'] / 1000, takeout_zip, slots,
+                               options['seed'])
+            delay = options['ramp_up'] * user_number / users # users start evenly over the ramp-up
+            thread = threading.Thread(target=lambda user=user, delay=delay: (time.sleep(delay), user.run(stop_at)),
+                                      daemon=True)
+            thread.start()
+            threads.append(thread)
+        for thread in threads:
+            thread.join()
+        stats.finished_at = time.perf_counter()
+        return stats
+
+    def _start_gunicorn(self, stack: ExitStack, api_base_url: str, workers: int, threads: int) -> str:
+        """Start the site under gunicorn with the stubbed OAuth callback and the API stand-in, stopped when `stack` closes."""
+        with socket.socket() as sock:
+            sock.bind(('127.0.0.1', 0))
+            port = sock.getsockname()[1]
+        env = dict(os.environ, YOUTUBE_API_BASE_URL=api_base_url, YOUTUBE_API_RECORD_MODE='off',
+                   OAUTH_STUB_ENABLED='true')
+        env.setdefault('API_KEY', 'stub')
+        process = stack.enter_context(subprocess.Popen(
+            [sys.executable, '-m', 'gunicorn', 'mytube_metrics.wsgi:application', '--bind', f'127.0.0.1:{port}',
+             '--workers', str(workers), '--threads', str(threads)],
+            cwd=settings.BASE_DIR, env=env,
+        ))
+        stack.callback(process.terminate) # runs before Popen.__exit__ waits for the exit
+        base_url = f"http://127.0.0.1:{port}"
+        deadline = time.monotonic() + SERVER_START_TIMEOUT
+        while time.monotonic() < deadline:
+            if process.poll() is not None:
+                raise CommandError(f"gunicorn exited with status {process.returncode}.")
+            try:
+                with urllib.request.urlopen(base_url + '/', timeout=2):
+                    pass
+                self.stdout.write(f"gunicorn is serving {workers} workers x {threads} threads at {base_url}")
+                return base_url
+            except OSError:
+                time.sleep(0.25)
+        raise CommandError(f"gunicorn did not answer within {SERVER_START_TIMEOUT} s.")
+
+    @staticmethod
+    def _takeout_zip(entries: int, seed: int) -> Optional[bytes]:
+        """Build the uploaded archive once; every upload sends the same bytes."""
+        if entries <= 0:
+            return None
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'takeout.zip')
+            write_takeout_zip(path, entries, seed)
+            with open(path, 'rb') as f:
+                return f.read()
+
+    def _print_report(self, report) -> None:
+        self.stdout.write(f"\n{'view':<30} {'requests':>9} {'errors':>7} {'err %':>6} {'req/s':>7} "
+                          f"{'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'max ms':>8}")
+        for view, row in report.items():
+            line = (f"{view:<30} {row['requests']:>9} {row['errors']:>7} {row['error_rate'] * 100:>6.1f} "
+                    f"{row['throughput']:>7.1f} {row['p50_ms']:>8.0f} {row['p95_ms']:>8.0f} {row['p99_ms']:>8.0f} "
+                    f"{row['max_ms']:>8.0f}")
+            self.stdout.write(self.style.ERROR(line) if row['errors'] else line)
+            if row['error_kinds']:
+                kinds = ", ".join(f"{kind} x{count}" for kind, count in sorted(row['error_kinds'].items()))
+                self.stdout.write(f"{'':<30} {kinds}")
@@ -0,0 +1,81 @@
+# Standard Library Imports
+import os
+import subprocess
+import sys
+from collections import defaultdict
+from typing import List, NamedTuple
+
+# Third-Party Imports
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+class ImportTiming(NamedTuple):
+    module: str
+    self_us: int
+    cumulative_us: int
+
+def parse_importtime(output: str) -> List[ImportTiming]:
+    """
+    Parse the report written to stderr by `python -X importtime`.
+
+    Args:
+        output (str): The captured stderr of the profiled interpreter.
+
+    Returns:
+        List[ImportTiming]: One entry per imported module, in report order (nested imports before their importer).
+    """
+    timings = []
+    for line in output.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        fields = line[len('import time:'):].split('|')
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue # header line
+        timings.append(ImportTiming(fields[2].strip(), int(fields[0]), int(fields[1])))
+    return timings
+
+class Command(BaseCommand):
+    help = (
+        "Measure the import cost of booting a worker (WSGI application plus URL configuration) in a fresh "
+        "interpreter, report the slowest modules and packages, and fail if the total exceeds the budget."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--top', type=int, default=25, help="Number of modules and packages to list.")
+        parser.add_argument('--budget-ms', type=float, default=settings.STARTUP_IMPORT_BUDGET_MS,
+                            help="Fail if the total import time exceeds this many milliseconds.")
+        parser.add_argument('--module', action='append', dest='modules',
+                            help="Module to import instead of the WSGI application and URL configuration (repeatable).")
+
+    def handle(self, *args, **options):
+        modules = options['modules'] or [settings.WSGI_APPLICATION.rsplit('.', 1)[0], settings.ROOT_URLCONF]
+        code = "import django; django.setup(); " + "; ".join(f"import {module}" for module in modules)
+
+        env = {**os.environ, 'DJANGO_SETTINGS_MODULE': os.environ.get('DJANGO_SETTINGS_MODULE', 'mytube_metrics.settings')}
+        result = subprocess.run([sys.executable, '-X', 'importtime', '-c', code],
+                                capture_output=True, text=True, env=env, cwd=settings.BASE_DIR,
+                                check=False) # a failure is reported with the interpreter's own error output below
+        if result.returncode != 0:
+            errors = [line for line in result.stderr.splitlines() if not line.startswith('import time:')]
+            raise CommandError("Profiled interpreter failed:\n" + "\n".join(errors[-20:]))
+        timings = parse_importtime(result.stderr)
+
+        total_ms = sum(timing.self_us for timing in timings) / 1000
+        top = options['top']
+
+        self.stdout.write(f"Imported {len(timings)} modules in {total_ms:.1f} ms ({', '.join(modules)}).\n")
+        self.stdout.write("Slowest modules (cumulative, including their own imports):")
+        for timing in sorted(timings, key=lambda timing: timing.cumulative_us, reverse=True)[:top]:
+            self.stdout.write(f"  {timing.cumulative_us / 1000:9.1f} ms  {timing.module}")
+
+        package_us = defaultdict(int)
+        for timing in timings:
+            package_us[timing.module.split('.', 1)[0]] += timing.self_us
+        self.stdout.write("\nSlowest top-level packages (self time of all their modules):")
+        for package, self_us in sorted(package_us.items(), key=lambda item: item[1], reverse=True)[:top]:
+            self.stdout.write(f"  {self_us / 1000:9.1f} ms  {package}")
+
+        budget_ms = options['budget_ms']
+        if total_ms > budget_ms:
+            raise CommandError(f"Startup imports took {total_ms:.1f} ms, over the {budget_ms:.0f} ms budget.")
+        self.stdout.write(self.style.SUCCESS(f"\nWithin the {budget_ms:.0f} ms budget."))
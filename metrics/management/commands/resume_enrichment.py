@@ -0,0 +1,26 @@
+# Third-Party Imports
+from django.core.management.base import BaseCommand
+
+# Local App Imports
+from metrics.models import WatchHistoryEnrichment
+from metrics.services.history_enricher import claim_enrichment, enrich_watch_history
+
+class Command(BaseCommand):
+    help = "Resume every unfinished watch-history enrichment (e.g. from cron after the daily API quota resets)."
+
+    def handle(self, *args, **options):
+        unfinished = WatchHistoryEnrichment.objects.exclude(status=WatchHistoryEnrichment.STATUS_COMPLETE)
+        for user_id in unfinished.values_list('user_id', flat=True):
+            # The quota has presumably reset, so paused jobs need not wait out their retry delay
+            generation = claim_enrichment(user_id, ignore_retry_after=True)
+            if generation is None:
+                self.stdout.write(f"User {user_id}: skipped (running elsewhere)")
+                continue
+            job = enrich_watch_history(user_id, generation)
+            if job is None:
+                self.stdout.write(f"User {user_id}: taken over by a newer upload")
+                continue
+            self.stdout.write(f"User {user_id}: {job.status} ({job.cursor}/{job.total} videos)")
+            if job.status == WatchHistoryEnrichment.STATUS_PAUSED:
+                self.stdout.write(self.style.WARNING("Stopping early; lookups are failing (quota exhausted?)."))
+                break
@@ -0,0 +1,56 @@
+# Third-Party Imports
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+# Local App Imports
+from metrics.utils.api_stub import ApiStubServer, StubConfig, StubDataset
+
+class Command(BaseCommand):
+    help = (
+        "Serve an offline stand-in for the YouTube Data API (deterministic synthetic data, optional recorded "
+        "fixtures, latency and error injection). Point YOUTUBE_API_BASE_URL at the printed URL."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--host', default='127.0.0.1')
+        parser.add_argument('--port', type=int, default=8765)
+        parser.add_argument('--seed', type=int, default=0, help="Seed of the synthetic dataset.")
+        parser.add_argument('--channels', type=int, default=300, help="Number of public channels.")
+        parser.add_argument('--videos-per-channel', type=int, default=40)
+        parser.add_argument('--subscriptions', type=int, default=150, help="Channels the stub account subscribes to.")
+        parser.add_argument('--playlists', type=int, default=20, help="Playlists the stub account owns.")
+        parser.add_argument('--liked', type=int, default=400, help="Videos the stub account has liked.")
+        parser.add_argument('--latency-ms', type=float, default=0.0, help="Latency added to every response.")
+        parser.add_argument('--jitter-ms', type=float, default=0.0, help="Uniform random latency on top of --latency-ms.")
+        parser.add_argument('--error-rate', type=float, default=0.0, help="Fraction of requests answered with a 500 error.")
+        parser.add_argument('--quota-requests', type=int, default=None,
+                            help="Requests served before every response is a 403 quotaExceeded error.")
+        parser.add_argument('--fixtures', nargs='?', const=settings.YOUTUBE_API_FIXTURES_DIR, default='',
+                            help="Serve recorded fixtures (default directory: YOUTUBE_API_FIXTURES_DIR) before synthetic data.")
+
+    def handle(self, *args, **options):
+        dataset = StubDataset(
+            seed=options['seed'],
+            channel_count=options['channels'],
+            videos_per_channel=options['videos_per_channel'],
+            subscription_count=options['subscriptions'],
+            playlist_count=options['playlists'],
+            liked_count=options['liked'],
+        )
+        config = StubConfig(
+            latency_ms=options['latency_ms'],
+            jitter_ms=options['jitter_ms'],
+            error_rate=options['error_rate'],
+            quota_requests=options['quota_requests'],
+            fixtures_dir=options['fixtures'],
+        )
+        server = ApiStubServer((options['host'], options['port']), dataset, config)
+        self.stdout.write(f"Serving {len(dataset.channels)} channels and {len(dataset.videos)} videos at {server.base_url}")
+        self.stdout.write(f"Set YOUTUBE_API_BASE_URL={server.base_url} (any API key and OAuth token are accepted).")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+            self.stdout.write(f"Served {server.request_count} requests.")
@@ -0,0 +1,46 @@
+# Standard Library Imports
+import logging
+import time
+
+# Third-Party Imports
+from django.conf import settings
+from django.db import connection
+
+# Local App Imports
+from .utils.instrumentation_helper import end_request, start_request
+
+logger = logging.getLogger(__name__)
+
+class InstrumentationMiddleware:
+    """
+    Records the total time, YouTube API calls, database queries and cache lookups of every request.
+
+    The totals are aggregated per view for the Prometheus endpoint (see `instrumentation_helper`),
+    and requests slower than SLOW_REQUEST_MS are logged with their breakdown.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not settings.INSTRUMENTATION_ENABLED:
+            return self.get_response(request)
+
+        stats, token = start_request()
+        start = time.perf_counter()
+        status = 500 # reported if the handler raises past Django's own exception handling
+        try:
+            # Only queries on this thread's connection are seen; views run their queries on the request thread
+            with connection.execute_wrapper(stats.db_wrapper):
+                response = self.get_response(request)
+            status = response.status_code
+        finally:
+            seconds = time.perf_counter() - start
+            match = request.resolver_match
+            view = (match.url_name or match.view_name) if match else 'unmatched'
+            end_request(stats, token, view, request.method, status, seconds)
+
+        if seconds * 1000 >= settings.SLOW_REQUEST_MS:
+            logger.warning("Slow request %s %s (%s) took %.0f ms: %s",
+                           request.method, request.path, view, seconds * 1000, stats.breakdown())
+        return response
@@ -0,0 +1,37 @@
+# Generated by Django 5.2.3 on 2026-10-19 09:12
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('metrics', '0003_usercredential_profile_picture_url'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='VideoMetadata',
+            fields=[
+                ('video_id', models.CharField(max_length=32, primary_key=True, serialize=False)),
+                ('category_id', models.CharField(blank=True, default='', max_length=8)),
+                ('topics', models.JSONField(blank=True, default=list)),
+                ('is_available', models.BooleanField(default=True)),
+                ('fetched_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='WatchHistoryEnrichment',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('video_ids', models.JSONField(blank=True, default=list)),
+                ('cursor', models.PositiveIntegerField(default=0)),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('running', 'Running'), ('paused', 'Paused'), ('complete', 'Complete')], default='pending', max_length=16)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.3 on 2026-10-19 14:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('metrics', '0004_videometadata_watchhistoryenrichment'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ChannelProfile',
+            fields=[
+                ('channel_id', models.CharField(max_length=32, primary_key=True, serialize=False)),
+                ('title', models.CharField(blank=True, default='', max_length=255)),
+                ('profile_picture_url', models.URLField(blank=True, default='', max_length=255)),
+                ('topics', models.JSONField(blank=True, default=list)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+    ]
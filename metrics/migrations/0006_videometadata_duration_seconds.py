@@ -0,0 +1,18 @@
+# Generated by Django 5.2.3 on 2026-10-19 15:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('metrics', '0005_channelprofile'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='videometadata',
+            name='duration_seconds',
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+    ]
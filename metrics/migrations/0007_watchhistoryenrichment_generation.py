@@ -0,0 +1,36 @@
+# Generated by Django 5.2.3 on 2026-10-19 18:02
+
+from django.db import migrations, models
+
+
+def fill_totals(apps, schema_editor):
+    WatchHistoryEnrichment = apps.get_model('metrics', 'WatchHistoryEnrichment')
+    for job in WatchHistoryEnrichment.objects.all():
+        job.total = len(job.video_ids)
+        job.save(update_fields=['total'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('metrics', '0006_videometadata_duration_seconds'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='watchhistoryenrichment',
+            name='total',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='watchhistoryenrichment',
+            name='generation',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='watchhistoryenrichment',
+            name='retry_after',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.RunPython(fill_totals, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 5.2.3 on 2026-10-19 18:30
+
+from django.core.management import call_command
+from django.db import migrations
+
+
+def create_cache_tables(apps, schema_editor):
+    # The caches are database tables unless CACHE_BACKEND says otherwise; this is a no-op then
+    call_command('createcachetable', database=schema_editor.connection.alias, verbosity=0)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('metrics', '0007_watchhistoryenrichment_generation'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_cache_tables, migrations.RunPython.noop),
+    ]
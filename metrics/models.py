@@ -9,4 +9,52 @@ class UserCredential(models.Model):
     profile_picture_url = models.URLField(max_length=255, blank=True, null=True)
 
     def __str__(self):
-        return self.user.username
\ No newline at end of file
+        return self.user.username
+
+class VideoMetadata(models.Model):
+    """Public category, topic and duration data for a video, shared by every user."""
+    video_id = models.CharField(max_length=32, primary_key=True)
+    category_id = models.CharField(max_length=8, blank=True, default='')
+    topics = models.JSONField(default=list, blank=True)
+    duration_seconds = models.PositiveIntegerField(null=True, blank=True) # None until looked up with contentDetails
+    is_available = models.BooleanField(default=True) # False if the API returned nothing (deleted/private)
+    fetched_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return self.video_id
+
+class ChannelProfile(models.Model):
+    """Public topic data for a channel, shared by every user as a candidate for channel recommendations."""
+    channel_id = models.CharField(max_length=32, primary_key=True)
+    title = models.CharField(max_length=255, blank=True, default='')
+    profile_picture_url = models.URLField(max_length=255, blank=True, default='')
+    topics = models.JSONField(default=list, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return self.title or self.channel_id
+
+class WatchHistoryEnrichment(models.Model):
+    """Checkpoint of a user's watch-history enrichment so it can resume after quota exhaustion."""
+    STATUS_PENDING = 'pending'
+    STATUS_RUNNING = 'running'
+    STATUS_PAUSED = 'paused'
+    STATUS_COMPLETE = 'complete'
+    STATUS_CHOICES = [
+        (STATUS_PENDING, 'Pending'),
+        (STATUS_RUNNING, 'Running'),
+        (STATUS_PAUSED, 'Paused'),
+        (STATUS_COMPLETE, 'Complete'),
+    ]
+
+    user = models.OneToOneField(User, on_delete=models.CASCADE)
+    video_ids = models.JSONField(default=list, blank=True) # deduplicated IDs in lookup order
+    total = models.PositiveIntegerField(default=0) # len(video_ids), so progress polls need not load the IDs
+    cursor = models.PositiveIntegerField(default=0) # every ID before this index has been looked up
+    status = models.CharField(max_length=16, choices=STATUS_CHOICES, default=STATUS_PENDING)
+    generation = models.PositiveIntegerField(default=0) # bumped by every upload and claim; only its holder may write
+    retry_after = models.DateTimeField(null=True, blank=True) # a paused job is not resumed before this time
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.user.username} ({self.cursor}/{self.total})"
@@ -35,7 +35,7 @@ def get_recommended_videos_context(request: Any,
     recommended_video_ids = set(recommended_video_ids_list)
 
     # --- Category to ID Mapping ---
-    all_categories_response = client.videos.list_video_category(part="snippet", region_code="US")
+    all_categories_response = client.videos.list_video_category(region_code="US", fields=['snippet.title'])
     category_name_to_id = {
         item['snippet']['title']: item['id']
         for item in all_categories_response.get('items', [])
@@ -71,9 +71,9 @@ def get_recommended_videos_context(request: Any,
         # Fetch popular videos for the chosen category
         chosen_category_id = category_name_to_id.get(chosen_category_name)
         response = client.videos.list_video(
-            part="snippet",
             chart='mostPopular',
             video_category_id=chosen_category_id,
+            fields=['snippet.title', 'snippet.thumbnails.medium.url'],
         )
 
         if response and response.get('items'):
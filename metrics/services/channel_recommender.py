@@ -0,0 +1,215 @@
+"""
+Responsible for recommending channels similar to the ones a user already follows, such as:
+    - Building a sparse topic profile from subscribed channels and the channels of liked videos.
+    - Scoring every known channel against that profile by cosine similarity.
+
+Channel topics are stored in the shared ChannelProfile table whenever a subscription snapshot is
+built or liked-video channels are looked up, so every user's channels become candidates for
+everyone else and scoring itself never calls the API. Topics are weighted by inverse channel
+frequency, so ubiquitous topics (e.g. 'Lifestyle (sociology)') count for less than niche ones.
+"""
+
+# Standard Library Imports
+import heapq
+import math
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Tuple
+
+# Third-Party Imports
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import cache
+
+# Local App Imports
+from metrics.models import ChannelProfile
+from metrics.utils.api_client import YouTubeClient
+from metrics.utils.cache_helper import get_user_artifact, set_user_artifact, user_cache_key
+from metrics.utils.task_helper import run_in_background
+from .subscription_analyzer import get_subscription_snapshot, store_channel_profiles
+
+BATCH_SIZE = 50 # Max number of channel IDs per API call
+CANDIDATE_INDEX_KEY = 'metrics:channel_candidate_index'
+CANDIDATE_INDEX_TIMEOUT = 60 * 15 # Seconds before newly stored channels become candidates
+LIKED_CHANNELS_TIMEOUT = 60 * 60 # Seconds liked-video channel counts are reused before being recomputed
+LIKED_CHANNELS_COLLECT_TIMEOUT = 60 * 10 # Seconds a collection may run before another worker may start one
+PROFILE_FIELDS = ['snippet.title', 'snippet.thumbnails.default.url', 'topicDetails.topicCategories']
+
+def get_similar_channels_context(user: User, top_k: int = 20) -> Dict[str, Any]:
+    """
+    Build context for the `similar_channels` view.
+
+    The resulting context dictionary contains:
+        - 'status': 'building' while the subscription snapshot or liked-video channels are being collected.
+        - 'recommendations': up to `top_k` channels with 'channel_id', 'title', 'profile_picture_url',
+          'score' (cosine similarity, 0-1) and 'shared_topics'.
+        - 'candidate_count': the number of channels that were scored.
+    """
+    snapshot = get_subscription_snapshot(user)
+    liked_channels = get_user_artifact(user.id, 'liked_channel_counts')
+    collect_key = user_cache_key(user.id, 'liked_channels_collect')
+    # The marker is shared by all workers, so only one collects and all of them report it as running
+    if liked_channels is None and cache.add(collect_key, True, LIKED_CHANNELS_COLLECT_TIMEOUT):
+        run_in_background(f"liked_channels:{user.id}", collect_liked_channels, user.id)
+
+    if snapshot is None or (liked_channels is None and cache.get(collect_key)):
+        return {'status': 'building', 'recommendations': [], 'candidate_count': 0}
+
+    weights = Counter({channel_id: 1.0 for channel_id in snapshot.channel_ids})
+    for channel_id, likes in (liked_channels or {}).items():
+        weights[channel_id] += math.log1p(likes)
+
+    index = get_candidate_index()
+    if not any(channel_id in index['position'] for channel_id in weights):
+        index = get_candidate_index(refresh=True) # the user's own channels were stored after the index was cached
+
+    recommendations = recommend_channels(index, weights, exclude=set(snapshot.channel_ids), top_k=top_k)
+    return {'status': 'ready', 'recommendations': recommendations, 'candidate_count': len(index['channels'])}
+
+def recommend_channels(index: Dict[str, Any], channel_weights: Dict[str, float],
+                       exclude: Iterable[str] = (), top_k: int = 20) -> List[Dict[str, Any]]:
+    """
+    Score every candidate channel against a user profile and return the best matches.
+
+    The profile is the weighted sum of the (unit-length) topic vectors of the given channels. Each
+    candidate's cosine similarity only touches the topics it has, so scoring is linear in the
+    number of stored (channel, topic) pairs, and a bounded heap keeps the top k.
+
+    Args:
+        index (Dict[str, Any]): A candidate index from `get_candidate_index`.
+        channel_weights (Dict[str, float]): Channel IDs that describe the user, mapped to their weight.
+        exclude (Iterable[str]): Channel IDs that must not be recommended (e.g. existing subscriptions).
+        top_k (int): The maximum number of recommendations.
+
+    Returns:
+        List[Dict[str, Any]]: The recommended channels, best first.
+    """
+    position = index['position']
+    vectors = index['vectors']
+    norms = index['norms']
+    idf = index['idf']
+
+    profile: Dict[int, float] = {}
+    for channel_id, weight in channel_weights.items():
+        i = position.get(channel_id)
+        if i is None or not norms[i]:
+            continue
+        for topic_id in vectors[i]:
+            profile[topic_id] = profile.get(topic_id, 0.0) + weight * idf[topic_id] / norms[i]
+
+    profile_norm = math.sqrt(sum(value * value for value in profile.values()))
+    if not profile_norm:
+        return []
+
+    excluded = {position[channel_id] for channel_id in exclude if channel_id in position}
+
+    def scores() -> Iterable[Tuple[float, int]]:
+        for i, topic_ids in enumerate(vectors):
+            if i in excluded or not norms[i]:
+                continue
+            dot = sum(profile.get(topic_id, 0.0) * idf[topic_id] for topic_id in topic_ids)
+            if dot:
+                yield dot / (profile_norm * norms[i]), i
+
+    topics = index['topics']
+    recommendations = []
+    for score, i in heapq.nlargest(top_k, scores()):
+        channel_id, title, picture_url = index['channels'][i]
+        shared = sorted((topic_id for topic_id in vectors[i] if topic_id in profile), key=profile.get, reverse=True)
+        recommendations.append({
+            'channel_id': channel_id,
+            'title': title,
+            'profile_picture_url': picture_url,
+            'score': round(score, 3),
+            'shared_topics': [topics[topic_id] for topic_id in shared[:3]],
+        })
+    return recommendations
+
+def get_candidate_index(refresh: bool = False) -> Dict[str, Any]:
+    """
+    Load every stored channel as a sparse topic vector, cached for all users.
+
+    Args:
+        refresh (bool): Rebuild the index from the database even if a cached copy exists.
+
+    Returns:
+        Dict[str, Any]: A dictionary with 'topics' (topic names by ID), 'channels' (channel ID,
+        title and picture URL per candidate), 'position' (channel ID -> candidate index),
+        'vectors' (topic IDs per candidate), 'idf' (weight per topic ID) and 'norms' (IDF-weighted
+        vector length per candidate).
+    """
+    index = None if refresh else cache.get(CANDIDATE_INDEX_KEY)
+    if index is not None:
+        return index
+
+    topics: List[str] = []
+    topic_ids: Dict[str, int] = {}
+    channels: List[Tuple[str, str, str]] = []
+    vectors: List[Tuple[int, ...]] = []
+    document_freq: Counter = Counter()
+    rows = ChannelProfile.objects.values_list('channel_id', 'title', 'profile_picture_url', 'topics')
+    for channel_id, title, picture_url, channel_topics in rows.iterator(chunk_size=2000):
+        vector = []
+        for topic in set(channel_topics):
+            topic_id = topic_ids.get(topic)
+            if topic_id is None:
+                topic_id = topic_ids[topic] = len(topics)
+                topics.append(topic)
+            vector.append(topic_id)
+        document_freq.update(vector)
+        channels.append((channel_id, title, picture_url))
+        vectors.append(tuple(vector))
+
+    idf = [math.log((1 + len(channels)) / (1 + document_freq[topic_id])) + 1 for topic_id in range(len(topics))]
+    norms = [math.sqrt(sum(idf[topic_id] ** 2 for topic_id in vector)) for vector in vectors]
+    index = {
+        'topics': topics,
+        'channels': channels,
+        'position': {channel[0]: i for i, channel in enumerate(channels)},
+        'vectors': vectors,
+        'idf': idf,
+        'norms': norms,
+    }
+    cache.set(CANDIDATE_INDEX_KEY, index, CANDIDATE_INDEX_TIMEOUT)
+    return index
+
+def collect_liked_channels(user_id: int) -> Dict[str, int]:
+    """
+    Count the channels of the user's liked videos and store profiles for channels not yet known.
+
+    Args:
+        user_id (int): The ID of the user whose liked videos should be read.
+
+    Returns:
+        Dict[str, int]: Channel IDs mapped to the number of liked videos (empty if the liked
+        playlist could not be found).
+    """
+    try:
+        user = User.objects.select_related('usercredential').get(pk=user_id)
+        client = YouTubeClient(credentials=user.usercredential)
+
+        liked_channels: Counter = Counter()
+        liked_playlist_id = client.channels.get_liked_playlist_id()
+        responses = []
+        if liked_playlist_id:
+            responses = client.playlist_items.list_all(liked_playlist_id, fields=['snippet.videoOwnerChannelId']).values()
+        for response in responses:
+            for item in response.get('items', []):
+                channel_id = item.get('snippet', {}).get('videoOwnerChannelId')
+                if channel_id:
+                    liked_channels[channel_id] += 1
+
+        unknown = sorted(set(liked_channels).difference(
+            ChannelProfile.objects.filter(pk__in=list(liked_channels)).values_list('channel_id', flat=True)))
+        chunks = [unknown[i:i + BATCH_SIZE] for i in range(0, len(unknown), BATCH_SIZE)]
+        for i in range(0, len(chunks), settings.YOUTUBE_API_BATCH_SIZE):
+            with client.batch() as batch:
+                calls = [batch.channels.list(part="snippet,topicDetails", channel_ids=",".join(chunk), fields=PROFILE_FIELDS)
+                         for chunk in chunks[i:i + settings.YOUTUBE_API_BATCH_SIZE]]
+            for call in calls:
+                if call.response:
+                    store_channel_profiles(client.channels.process_raw_stats(call.response) or {})
+
+        set_user_artifact(user_id, 'liked_channel_counts', dict(liked_channels), timeout=LIKED_CHANNELS_TIMEOUT)
+        return dict(liked_channels)
+    finally:
+        cache.delete(user_cache_key(user_id, 'liked_channels_collect'))
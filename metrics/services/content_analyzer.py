@@ -1,67 +1,110 @@
 """
 Responsible for analyzing user content affinity, such as:
     - Determining frequently-occurring topics in liked videos.
-    - Analyzing the reasoning YouTube uses to recommend videos on home page.
+    - Determining the category distribution of liked videos.
 """
 
 # Standard Library Imports
 from collections import Counter
-from typing import Any, Dict
+from typing import Dict, Optional, Tuple
 
 # Third-Party Imports
 from django.contrib.auth.models import User
 
 # Local App Imports
 from metrics.utils.api_client import YouTubeClient
+from metrics.utils.cache_helper import (get_user_artifact,
+                                        get_user_artifact_version,
+                                        set_versioned_user_artifact)
 from metrics.utils.topic_helper import parse_topic_urls
-from .visualizer import create_plotly_chart_dict
+from .visualizer import create_plotly_chart_json
 
-def get_content_affinity_context(user: User) -> Dict[str, Any]:
+LIKED_TOPICS_TIMEOUT = 60 * 60 # Seconds liked-video topic frequencies are reused before being recomputed
+LIKED_CATEGORIES_TIMEOUT = 60 * 60 # Seconds liked-video category frequencies are reused before being recomputed
+
+# Chart name -> (artifact name, data name, chart type, chart title)
+AFFINITY_CHARTS = {
+    'topics': ('liked_topic_freqs', "Topic", 'bar', "Topic Frequencies"),
+    'categories': ('liked_category_freqs', "Category", 'donut', "Category Distribution"),
+}
+
+def get_content_affinity_chart(user: User, chart_name: str) -> Tuple[Optional[str], Optional[str]]:
     """
-    Build context for the `content_affinity` view.
+    Build one chart of the `content_affinity` page as serialized Plotly JSON.
+
+    The page shell renders immediately and fetches each chart separately, so the slow playlist
+    analysis behind one chart does not hold up the other.
+
+    Args:
+        user (User): The authenticated Django user object.
+        chart_name (str): 'topics' (bar chart of liked-video topics) or 'categories' (donut chart of
+            liked-video categories).
 
-    This function currently analyzes the user's "Liked Videos" playlist to determine
-    the frequency of different video topics and categories.
+    Returns:
+        Tuple[Optional[str], Optional[str]]: The chart JSON and the version of the data it was built
+        from, or (None, None) if there is no data for the chart.
 
-    The resulting context dictionary contains:
-        - 'topic_freqs': A dictionary mapping topic names to their frequency.
-        - 'category_freqs': A dictionary mapping category names to their frequency.
+    Raises:
+        KeyError: If the chart name is unknown.
+    """
+    artifact_name, data_name, chart_type, chart_title = AFFINITY_CHARTS[chart_name]
+    client = YouTubeClient(credentials=user.usercredential)
+    if chart_name == 'topics':
+        freqs = get_liked_topic_freqs(user, client)
+    else:
+        freqs = get_liked_category_freqs(user, client)
+    if not freqs:
+        return None, None
+
+    chart_json = create_plotly_chart_json(freq_data=freqs, data_name=data_name,
+                                          chart_type=chart_type, chart_title=chart_title)
+    return chart_json, get_user_artifact_version(user.id, artifact_name)
+
+def get_content_affinity_chart_version(user: User, chart_name: str) -> Optional[str]:
+    """Return the version of the data behind a `content_affinity` chart, or None if it is not computed yet."""
+    artifact_name = AFFINITY_CHARTS[chart_name][0]
+    return get_user_artifact_version(user.id, artifact_name)
+
+
+def get_liked_topic_freqs(user: User, client: YouTubeClient) -> Optional[Dict[str, int]]:
     """
-    # Obtain creds from database
-    creds = user.usercredential
-    client = YouTubeClient(credentials=creds)
+    Get the topic frequencies of the user's "Liked Videos" playlist, reusing a recent result if available.
 
-    # Initialize context dictionary
-    context = {}
+    Args:
+        user (User): The authenticated Django user object.
+        client (YouTubeClient): The YouTubeClient instance for making API requests.
 
-    liked_videos_playlist_id = client.channels.get_liked_playlist_id()
-    if liked_videos_playlist_id:
-        # Determine topic frequencies and create bar chart
+    Returns:
+        A dictionary with topic keys and their frequencies, or None if the playlist could not be found.
+    """
+    topic_freqs = get_user_artifact(user.id, 'liked_topic_freqs')
+    if topic_freqs is None:
+        liked_videos_playlist_id = client.channels.get_liked_playlist_id()
+        if not liked_videos_playlist_id:
+            return None
         topic_freqs = get_topic_freqs_in_playlist(client, liked_videos_playlist_id)
-        if topic_freqs:
-            context["topic_freqs"] = topic_freqs
-            context["topic_freq_chart_dict"] = create_plotly_chart_dict(
-                freq_data=topic_freqs,
-                data_name="Topic",
-                chart_type='bar',
-                chart_title="Topic Frequencies"
-            )
-
-        # Determine video category frequencies and create donut chart
-        category_freqs = get_category_freqs_in_playlist(client, liked_videos_playlist_id)
-        if category_freqs:
-            context["category_freqs"] = category_freqs
-            context["category_freq_chart_dict"] = create_plotly_chart_dict(
-                freq_data=category_freqs,
-                data_name="Category",
-                chart_type='donut',
-                chart_title="Category Distribution"
-            )
+        set_versioned_user_artifact(user.id, 'liked_topic_freqs', topic_freqs, timeout=LIKED_TOPICS_TIMEOUT)
+    return topic_freqs
 
-        # 
+def get_liked_category_freqs(user: User, client: YouTubeClient) -> Optional[Dict[str, int]]:
+    """
+    Get the category frequencies of the user's "Liked Videos" playlist, reusing a recent result if available.
 
-    return context
+    Args:
+        user (User): The authenticated Django user object.
+        client (YouTubeClient): The YouTubeClient instance for making API requests.
 
+    Returns:
+        A dictionary with category names and their frequencies, or None if the playlist could not be found.
+    """
+    category_freqs = get_user_artifact(user.id, 'liked_category_freqs')
+    if category_freqs is None:
+        liked_videos_playlist_id = client.channels.get_liked_playlist_id()
+        if not liked_videos_playlist_id:
+            return None
+        category_freqs = get_category_freqs_in_playlist(client, liked_videos_playlist_id)
+        set_versioned_user_artifact(user.id, 'liked_category_freqs', category_freqs, timeout=LIKED_CATEGORIES_TIMEOUT)
+    return category_freqs
 
 def get_topic_freqs_in_playlist(client: YouTubeClient, playlist_id: str) -> Dict[str, int]:
     """
@@ -74,7 +117,7 @@ def get_topic_freqs_in_playlist(client: YouTubeClient, playlist_id: str) -> Dict
     Returns:
         A dictionary with topic keys and a counter value for how many times that topic has appeared in the video playlist.
     """
-    all_playlistitems = client.playlist_items.list_all(playlist_id)
+    all_playlistitems = client.playlist_items.list_all(playlist_id, fields=['contentDetails.videoId'])
     video_ids = []
     for api_response in all_playlistitems.values():
         items = api_response.get('items', [])
@@ -89,13 +132,14 @@ def get_topic_freqs_in_playlist(client: YouTubeClient, playlist_id: str) -> Dict
     topic_frequencies = Counter()
     chunk_size = 50  # Max number of video IDs per API call
 
-    for i in range(0, len(video_ids), chunk_size):
-        video_id_chunk = video_ids[i:i + chunk_size]
-        video_ids_str = ",".join(video_id_chunk)
-        
-        # Fetch video details for the chunk of video IDs
-        video_responses = client.videos.list_video(part="topicDetails", video_ids=video_ids_str, max_results=chunk_size)
-        
+    # Fetch video details for every chunk of video IDs in as few round trips as possible
+    with client.batch() as batch:
+        calls = [batch.videos.list_video(video_ids=",".join(video_ids[i:i + chunk_size]), max_results=chunk_size,
+                                         fields=['topicDetails.topicCategories'])
+                 for i in range(0, len(video_ids), chunk_size)]
+
+    for call in calls:
+        video_responses = call.response
         if video_responses and 'items' in video_responses:
             for video_item in video_responses['items']:
                 topic_details = video_item.get('topicDetails', {})
@@ -115,7 +159,7 @@ def get_category_freqs_in_playlist(client: YouTubeClient, playlist_id: str) -> D
     Returns:
         A dictionary with category names as keys and their frequency count as values. Returns None if an error occurred or the user has no liked videos.
     """
-    all_playlistitems = client.playlist_items.list_all(playlist_id)
+    all_playlistitems = client.playlist_items.list_all(playlist_id, fields=['contentDetails.videoId'])
     video_ids = []
     for api_response in all_playlistitems.values():
         items = api_response.get('items', [])
@@ -130,12 +174,13 @@ def get_category_freqs_in_playlist(client: YouTubeClient, playlist_id: str) -> D
     category_ids = []
     chunk_size = 50  # Max number of video IDs per API call
 
-    for i in range(0, len(video_ids), chunk_size):
-        video_id_chunk = video_ids[i:i + chunk_size]
-        video_ids_str = ",".join(video_id_chunk)
-        
-        video_responses = client.videos.list_video(part="snippet", video_ids=video_ids_str, max_results=chunk_size)
-        
+    with client.batch() as batch:
+        calls = [batch.videos.list_video(video_ids=",".join(video_ids[i:i + chunk_size]), max_results=chunk_size,
+                                         fields=['snippet.categoryId'])
+                 for i in range(0, len(video_ids), chunk_size)]
+
+    for call in calls:
+        video_responses = call.response
         if video_responses and 'items' in video_responses:
             for video_item in video_responses['items']:
                 category_id = video_item.get('snippet', {}).get('categoryId')
@@ -149,7 +194,7 @@ def get_category_freqs_in_playlist(client: YouTubeClient, playlist_id: str) -> D
     unique_category_ids = list(set(category_ids))
     category_id_str = ",".join(unique_category_ids)
     
-    category_responses = client.videos.list_video_category(part="snippet", category_ids=category_id_str)
+    category_responses = client.videos.list_video_category(category_ids=category_id_str, fields=['snippet.title'])
     
     category_id_to_name = {}
     if category_responses and 'items' in category_responses:
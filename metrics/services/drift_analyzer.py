@@ -0,0 +1,247 @@
+"""
+Responsible for analyzing how a user's viewing interests shift over time, such as:
+    - Month-by-month topic and category mix of the watch history.
+    - Divergence between consecutive months, to surface the biggest shifts.
+
+The Takeout upload stores, per local month, how often each video was watched. Each month's sparse
+topic/category vector is built exactly once from the enriched video metadata and compared only with
+the previous calendar month, so the whole analysis is a single pass over the (month, video) pairs.
+The result is cached per upload and enrichment progress, since it only changes when either does.
+"""
+
+# Standard Library Imports
+import math
+from collections import Counter
+from typing import Any, Dict, List, Optional, Tuple
+
+# Third-Party Imports
+from django.contrib.auth.models import User
+
+# Local App Imports
+from metrics.models import VideoMetadata
+from metrics.utils.api_client import YouTubeClient
+from metrics.utils.cache_helper import (get_user_artifact,
+                                        get_user_artifact_version,
+                                        set_user_artifact)
+from .history_enricher import KNOWN_ID_LOOKUP_SIZE, get_enrichment_status
+from .visualizer import create_plotly_chart_dict, create_stacked_area_chart_dict
+
+MAX_SERIES = 10 # Topics/categories shown individually in the stacked charts; the rest are 'Other'
+DRIFT_ARTIFACT = 'topic_drift'
+
+def get_topic_drift_context(user: User) -> Dict[str, Any]:
+    """
+    Build context for the `topic_drift` view.
+
+    The resulting context dictionary contains:
+        - 'enrichment': progress of the video category/topic lookup (see `get_enrichment_status`).
+        - 'topic_drift_chart' / 'category_drift_chart': stacked-area chart dicts of monthly shares.
+        - 'divergence_chart': line chart dict of month-to-month Jensen-Shannon divergence.
+        - 'biggest_shifts': the months with the largest divergence, with the topics that grew and shrank most.
+    """
+    enrichment = get_enrichment_status(user)
+    context: Dict[str, Any] = {'enrichment': enrichment}
+
+    monthly_version = get_user_artifact_version(user.id, 'takeout_monthly_videos')
+    if monthly_version is None:
+        return context
+
+    # The charts only change with a new upload or as more of its videos are enriched
+    drift_version = f"{monthly_version}:{enrichment['completed'] if enrichment else 0}"
+    cached = get_user_artifact(user.id, DRIFT_ARTIFACT)
+    if cached is not None and cached['version'] == drift_version:
+        context.update(cached['charts'])
+        return context
+
+    charts = _build_drift_charts(user)
+    if charts is None:
+        return context
+    set_user_artifact(user.id, DRIFT_ARTIFACT, {'version': drift_version, 'charts': charts})
+    context.update(charts)
+    return context
+
+def _build_drift_charts(user: User) -> Optional[Dict[str, Any]]:
+    """Build the drift chart dicts and biggest shifts, or None if the monthly video counts have expired."""
+    monthly_videos = get_user_artifact(user.id, 'takeout_monthly_videos')
+    if monthly_videos is None:
+        return None
+
+    charts: Dict[str, Any] = {}
+    metadata = _load_metadata({video_id for counts in monthly_videos.values() for video_id in counts})
+    if not metadata:
+        return charts
+
+    category_names = get_category_names(user)
+    drift = compute_drift(monthly_videos, metadata, category_names)
+
+    if drift['periods']:
+        charts['topic_drift_chart'] = create_stacked_area_chart_dict(
+            series=_top_series(drift['topic_vectors']),
+            x_labels=drift['periods'],
+            chart_title="Topic Mix by Month"
+        )
+        charts['category_drift_chart'] = create_stacked_area_chart_dict(
+            series=_top_series(drift['category_vectors']),
+            x_labels=drift['periods'],
+            chart_title="Category Mix by Month"
+        )
+    if drift['topic_divergence']:
+        charts['divergence_chart'] = create_plotly_chart_dict(
+            freq_data=drift['topic_divergence'],
+            data_name="Topic Shift",
+            chart_type='divergence_line',
+            chart_title="Month-to-Month Topic Shift"
+        )
+        charts['biggest_shifts'] = drift['biggest_shifts']
+
+    return charts
+
+def compute_drift(monthly_videos: Dict[str, Dict[str, int]],
+                  metadata: Dict[str, Tuple[str, List[str]]],
+                  category_names: Dict[str, str],
+                  top_shifts: int = 3
+                  ) -> Dict[str, Any]:
+    """
+    Compute per-month topic/category vectors and the divergence between consecutive months.
+
+    Months without any enriched videos are left out, and a month that follows such a gap is not
+    compared with the last month before it.
+
+    Args:
+        monthly_videos (Dict[str, Dict[str, int]]): Months (YYYY-MM) mapped to video ID watch counts.
+        metadata (Dict[str, Tuple[str, List[str]]]): Video IDs mapped to (category ID, topics).
+        category_names (Dict[str, str]): Category IDs mapped to display names.
+        top_shifts (int): The number of largest shifts to report.
+
+    Returns:
+        Dict[str, Any]: A dictionary with 'periods', 'topic_vectors' and 'category_vectors'
+        (one sparse Counter per period), 'topic_divergence' (period -> divergence from the previous
+        calendar month) and 'biggest_shifts'.
+    """
+    periods: List[str] = []
+    topic_vectors: List[Counter] = []
+    category_vectors: List[Counter] = []
+    topic_divergence: Dict[str, float] = {}
+    shifts: List[Dict[str, Any]] = []
+
+    for period in sorted(monthly_videos):
+        topics: Counter = Counter()
+        categories: Counter = Counter()
+        for video_id, count in monthly_videos[period].items():
+            video = metadata.get(video_id)
+            if video is None:
+                continue
+            category_id, video_topics = video
+            if category_id:
+                categories[category_names.get(category_id, category_id)] += count
+            for topic in video_topics:
+                topics[topic] += count
+
+        if not topics and not categories:
+            continue
+
+        if topic_vectors and topics and topic_vectors[-1] and periods[-1] == _previous_month(period):
+            divergence = jensen_shannon_divergence(topic_vectors[-1], topics)
+            topic_divergence[period] = round(divergence, 4)
+            shifts.append({'period': period, 'divergence': round(divergence, 4), **_shift_movers(topic_vectors[-1], topics)})
+
+        periods.append(period)
+        topic_vectors.append(topics)
+        category_vectors.append(categories)
+
+    shifts.sort(key=lambda shift: shift['divergence'], reverse=True)
+    return {
+        'periods': periods,
+        'topic_vectors': topic_vectors,
+        'category_vectors': category_vectors,
+        'topic_divergence': topic_divergence,
+        'biggest_shifts': shifts[:top_shifts],
+    }
+
+def jensen_shannon_divergence(p_counts: Counter, q_counts: Counter) -> float:
+    """
+    Jensen-Shannon divergence (base 2, between 0 and 1) of two sparse count vectors.
+
+    Only keys present in either vector are visited, so the cost is O(nonzero entries).
+    """
+    p_total = sum(p_counts.values())
+    q_total = sum(q_counts.values())
+    if not p_total or not q_total:
+        return 0.0
+
+    divergence = 0.0
+    for key in p_counts.keys() | q_counts.keys():
+        p = p_counts.get(key, 0) / p_total
+        q = q_counts.get(key, 0) / q_total
+        m = (p + q) / 2
+        if p:
+            divergence += p * math.log2(p / m)
+        if q:
+            divergence += q * math.log2(q / m)
+    return divergence / 2
+
+def get_category_names(user: User) -> Dict[str, str]:
+    """
+    Map video category IDs to names.
+
+    The category listing is public, so the client answers it from the shared public cache
+    (see `public_cache_helper`) for all users.
+
+    Args:
+        user (User): The authenticated Django user object (its credentials are used on a cache miss).
+
+    Returns:
+        Dict[str, str]: Category IDs mapped to category titles.
+    """
+    client = YouTubeClient(credentials=user.usercredential)
+    response = client.videos.list_video_category(region_code="US", fields=['snippet.title']) or {}
+    return {
+        item['id']: item.get('snippet', {}).get('title', item['id'])
+        for item in response.get('items', [])
+        if item.get('id')
+    }
+
+def _load_metadata(video_ids: set) -> Dict[str, Tuple[str, List[str]]]:
+    """Fetch (category ID, topics) for every known, available video in chunks."""
+    video_ids = list(video_ids)
+    metadata = {}
+    for i in range(0, len(video_ids), KNOWN_ID_LOOKUP_SIZE):
+        rows = VideoMetadata.objects.filter(
+            video_id__in=video_ids[i:i + KNOWN_ID_LOOKUP_SIZE], is_available=True
+        ).values_list('video_id', 'category_id', 'topics')
+        for video_id, category_id, topics in rows:
+            metadata[video_id] = (category_id, topics)
+    return metadata
+
+def _previous_month(period: str) -> str:
+    """Return the YYYY-MM month before a YYYY-MM month."""
+    year, month = map(int, period.split('-'))
+    return f"{year - 1}-12" if month == 1 else f"{year}-{month - 1:02d}"
+
+def _shift_movers(previous: Counter, current: Counter) -> Dict[str, Optional[str]]:
+    """Find the topics whose share grew and shrank the most between two periods."""
+    previous_total = sum(previous.values())
+    current_total = sum(current.values())
+    deltas = {
+        topic: current.get(topic, 0) / current_total - previous.get(topic, 0) / previous_total
+        for topic in previous.keys() | current.keys()
+    }
+    gained = max(deltas, key=deltas.get)
+    lost = min(deltas, key=deltas.get)
+    return {
+        'gained': gained if deltas[gained] > 0 else None,
+        'lost': lost if deltas[lost] < 0 else None,
+    }
+
+def _top_series(vectors: List[Counter]) -> Dict[str, List[int]]:
+    """Turn per-period vectors into chart series for the overall top keys, folding the rest into 'Other'."""
+    overall: Counter = Counter()
+    for vector in vectors:
+        overall.update(vector)
+    top_keys = [key for key, _ in overall.most_common(MAX_SERIES)]
+
+    series = {key: [vector.get(key, 0) for vector in vectors] for key in top_keys}
+    if len(overall) > len(top_keys):
+        top_set = set(top_keys)
+        series['Other'] = [sum(count for key, count in vector.items() if key not in top_set) for vector in vectors]
+    return series
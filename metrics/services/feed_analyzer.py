@@ -0,0 +1,187 @@
+"""
+Responsible for the "what's new from my subscriptions" feed, such as:
+    - Keeping the latest uploads of every subscribed channel fresh.
+    - Ranking those uploads across all channels by recency.
+
+Each channel's latest uploads are cached (shared by all users, since uploads are public) with a
+freshness TTL. A view only refreshes the channels whose entry has gone stale in the background,
+sending their `playlistItems.list` calls as batch requests (YOUTUBE_API_BATCH_SIZE channels each)
+over a bounded thread pool, and the per-channel lists (already newest-first) are combined with a
+k-way heap merge.
+"""
+
+# Standard Library Imports
+import heapq
+import time
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from typing import Any, Dict, List, Optional, Tuple
+
+# Third-Party Imports
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import cache
+
+# Local App Imports
+from metrics.utils.api_client import YouTubeClient
+from metrics.utils.cache_helper import user_cache_key
+from metrics.utils.date_helper import isostr_to_epoch
+from metrics.utils.task_helper import run_in_background
+from metrics.utils.types import ApiResponse
+from .subscription_analyzer import get_subscription_snapshot
+
+FEED_LENGTH = 50 # Uploads shown in the feed
+UPLOADS_PER_CHANNEL = 5 # Latest uploads cached per channel (one playlistItems.list call)
+CHANNEL_UPLOADS_TIMEOUT = 60 * 60 * 24 * 7 # Stale entries are kept (and shown) until refreshed
+REFRESH_COOLDOWN = 60 # Minimum seconds between two refresh runs for the same user
+UPLOAD_FIELDS = [
+    'snippet.title', 'snippet.channelTitle', 'snippet.thumbnails.medium.url', 'snippet.publishedAt',
+    'snippet.resourceId.videoId', 'contentDetails.videoId', 'contentDetails.videoPublishedAt',
+]
+
+# (published epoch, video ID, title, channel title, thumbnail URL)
+Upload = Tuple[int, str, str, str, str]
+
+def get_upload_feed(user: User, limit: int = FEED_LENGTH) -> Dict[str, Any]:
+    """
+    Rank the latest uploads of all subscribed channels by recency, refreshing stale channels in the background.
+
+    Args:
+        user (User): The authenticated Django user object.
+        limit (int): The maximum number of uploads to return.
+
+    Returns:
+        Dict[str, Any]: A dictionary containing:
+            - 'status': 'building' while the subscription snapshot is not ready, otherwise 'ready'.
+            - 'uploads': the newest uploads, each with 'video_id', 'title', 'channel_title',
+              'thumbnail_url' and 'published_at' (ISO 8601).
+            - 'channel_count': the number of channels with an uploads playlist.
+            - 'pending': the number of channels whose uploads are missing or stale.
+            - 'refreshing': whether a background refresh is running (in any worker).
+    """
+    snapshot = get_subscription_snapshot(user)
+    if snapshot is None:
+        return {'status': 'building', 'uploads': [], 'channel_count': 0, 'pending': 0, 'refreshing': False}
+
+    playlist_ids = [playlist_id for playlist_id in snapshot.uploads_playlist_ids if playlist_id]
+    cached = cache.get_many([_channel_cache_key(playlist_id) for playlist_id in playlist_ids])
+
+    now = time.time()
+    fresh_after = now - settings.UPLOAD_FEED_CHANNEL_TTL
+    channel_uploads: List[List[Upload]] = []
+    stale: List[str] = []
+    for playlist_id in playlist_ids:
+        entry = cached.get(_channel_cache_key(playlist_id))
+        if entry is None or entry['fetched_at'] < fresh_after:
+            stale.append(playlist_id)
+        if entry is not None and entry['uploads']:
+            channel_uploads.append(entry['uploads'])
+
+    # The cooldown keeps other workers (and polls after failed lookups) from refreshing again right away;
+    # its value is True while the refresh runs, so every worker can report it
+    refresh_key = _refresh_cache_key(user.id)
+    if stale and cache.add(refresh_key, True, REFRESH_COOLDOWN):
+        run_in_background(f"upload_feed:{user.id}", refresh_channel_uploads, user.id, stale)
+
+    # Every per-channel list is newest-first, so a k-way merge yields the global order lazily
+    newest = islice(heapq.merge(*channel_uploads, key=lambda upload: -upload[0]), limit)
+    return {
+        'status': 'ready',
+        'uploads': [_upload_to_dict(upload) for upload in newest],
+        'channel_count': len(playlist_ids),
+        'pending': len(stale),
+        'refreshing': bool(cache.get(refresh_key)),
+    }
+
+def refresh_channel_uploads(user_id: int, playlist_ids: List[str]) -> int:
+    """
+    Fetch the latest uploads of the given channels in concurrent batch requests and cache them.
+
+    Args:
+        user_id (int): The ID of the user whose credentials are used for the requests.
+        playlist_ids (List[str]): Uploads playlist IDs of the channels to refresh.
+
+    Returns:
+        int: The number of channels refreshed successfully.
+    """
+    user = User.objects.select_related('usercredential').get(pk=user_id)
+    client = YouTubeClient(credentials=user.usercredential)
+
+    groups = [playlist_ids[i:i + settings.YOUTUBE_API_BATCH_SIZE]
+              for i in range(0, len(playlist_ids), settings.YOUTUBE_API_BATCH_SIZE)]
+    refresh_key = _refresh_cache_key(user_id)
+    refreshed = 0
+    try:
+        with ThreadPoolExecutor(max_workers=settings.UPLOAD_FEED_MAX_WORKERS) as executor:
+            results = executor.map(lambda group: fetch_latest_uploads_batch(client, group), groups)
+            # Store each batch of channels as soon as it arrives so polling views see the feed fill in
+            for group, group_uploads in zip(groups, results):
+                fetched_at = time.time()
+                entries = {_channel_cache_key(playlist_id): {'fetched_at': fetched_at, 'uploads': uploads}
+                           for playlist_id, uploads in zip(group, group_uploads) if uploads is not None}
+                cache.set_many(entries, CHANNEL_UPLOADS_TIMEOUT)
+                refreshed += len(entries)
+                # Keep the marker alive for as long as batches are still arriving
+                cache.set(refresh_key, True, REFRESH_COOLDOWN)
+    finally:
+        # The cooldown restarts when the refresh ends, but the feed no longer reports it as running
+        cache.set(refresh_key, False, REFRESH_COOLDOWN)
+    return refreshed
+
+def fetch_latest_uploads_batch(client: YouTubeClient, playlist_ids: List[str]) -> List[Optional[List[Upload]]]:
+    """
+    Fetch the most recent uploads of several channels with one batch request.
+
+    Args:
+        client (YouTubeClient): The YouTubeClient instance for making API requests.
+        playlist_ids (List[str]): The channels' uploads playlist IDs.
+
+    Returns:
+        List[Optional[List[Upload]]]: Per playlist ID, in order, up to `UPLOADS_PER_CHANNEL`
+        uploads newest first, or None if that channel's request failed.
+    """
+    with client.batch() as batch:
+        calls = [batch.playlist_items.list(playlist_id=playlist_id, max_results=UPLOADS_PER_CHANNEL, fields=UPLOAD_FIELDS)
+                 for playlist_id in playlist_ids]
+    return [_parse_uploads(call.response) for call in calls]
+
+def _parse_uploads(response: Optional[ApiResponse]) -> Optional[List[Upload]]:
+    """Turn a `playlistItems.list` response into uploads, newest first (None if the request failed)."""
+    if response is None:
+        return None
+
+    uploads: List[Upload] = []
+    for item in response.get('items', []):
+        snippet = item.get('snippet', {})
+        content_details = item.get('contentDetails', {})
+        video_id = content_details.get('videoId') or snippet.get('resourceId', {}).get('videoId')
+        published = content_details.get('videoPublishedAt') or snippet.get('publishedAt')
+        epoch = isostr_to_epoch(published) if published else None
+        if not video_id or epoch is None:
+            continue # private or deleted videos have no publish time
+        uploads.append((
+            epoch,
+            video_id,
+            snippet.get('title', ''),
+            snippet.get('channelTitle', ''),
+            snippet.get('thumbnails', {}).get('medium', {}).get('url', ''),
+        ))
+
+    uploads.sort(reverse=True)
+    return uploads
+
+def _refresh_cache_key(user_id: int) -> str:
+    return user_cache_key(user_id, 'upload_feed_refresh')
+
+def _channel_cache_key(playlist_id: str) -> str:
+    return f"metrics:channel_uploads:{playlist_id}"
+
+def _upload_to_dict(upload: Upload) -> Dict[str, Any]:
+    epoch, video_id, title, channel_title, thumbnail_url = upload
+    return {
+        'video_id': video_id,
+        'title': title,
+        'channel_title': channel_title,
+        'thumbnail_url': thumbnail_url,
+        'published_at': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime(epoch)),
+    }
@@ -1,20 +1,52 @@
 # Standard Library Imports
+import codecs
 import json
+import os
 import zipfile
 from collections import Counter
-from datetime import datetime
-from typing import Any, Dict, List
+from itertools import islice
+from datetime import date, datetime, timezone
+from typing import IO, Any, Dict, Iterable, Iterator, List, Optional, Tuple
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 
 # Third-Party Imports
+from django.conf import settings
+from django.core.files.uploadedfile import UploadedFile
 from django.http import HttpRequest
 
 # Local App Imports
-from .visualizer import create_plotly_chart_dict
+from metrics.utils.admission_helper import (AdmissionBusy, AdmissionRejected,
+                                            TakeoutAdmissionController,
+                                            estimate_parse_memory_mb)
+from metrics.utils.cache_helper import (delete_user_artifact,
+                                        get_user_artifact,
+                                        get_user_artifact_version,
+                                        set_user_artifact,
+                                        set_versioned_user_artifact)
+from metrics.utils.cube_helper import TimeCube
+from metrics.utils.date_helper import (EPOCH_ORDINAL, SECONDS_PER_DAY,
+                                       epoch_day_to_date, isostr_to_epoch,
+                                       localize_epochs)
+from metrics.utils.downsample_helper import lttb_indices
+from metrics.utils.search_helper import SearchIndex
+from metrics.utils.sketch_helper import HyperLogLog, SpaceSaving
+from .history_enricher import (get_enrichment_status, resume_enrichment,
+                               start_enrichment)
+from .session_analyzer import get_session_stats, new_session_tracker
+from .visualizer import create_plotly_chart_json
+
+CHARTS_ARTIFACT = 'takeout_charts'
+SUMMARY_KEYS = ('session_stats', 'top_channels', 'top_videos', 'distinct_videos', 'distinct_channels', 'is_approximate')
+DAILY_CHART_POINTS = 600 # Points sent for the daily chart; zooming in fetches full resolution for the visible range
+TAKEOUT_CHUNK_SIZE = 10000 # Watch history entries parsed and localized together
 
 def get_viewing_evolution_context(request: HttpRequest) -> Dict[str, Any]:
     """
     Processes the viewing evolution data from a YouTube Takeout zip file upload.
 
+    An upload that has to wait for a processing slot is kept on the server; the page polls
+    `get_processing_status` and posts 'process-pending' once the upload can start.
+
     Args:
         request (HttpRequest): The Django HTTP request object.
 
@@ -22,13 +54,12 @@ def get_viewing_evolution_context(request: HttpRequest) -> Dict[str, Any]:
         Dict[str, Any]: A context dictionary for the viewing_evolution template.
     """
     context: Dict[str, Any] = {}
-    daily_watch_freq: Dict[str, int] = {}
-    monthly_watch_freq: Dict[str, int] = {}
-    if request.method == 'POST' and 'takeout-zip' in request.FILES:
-        uploaded_zip = request.FILES['takeout-zip']
+    pending_path = _pending_upload_path(request.user.id)
+    if request.method == 'POST' and ('takeout-zip' in request.FILES or 'process-pending' in request.POST):
+        uploaded_zip = request.FILES.get('takeout-zip')
 
         try:
-            with zipfile.ZipFile(uploaded_zip, 'r') as zf:
+            with zipfile.ZipFile(uploaded_zip or pending_path, 'r') as zf:
                 watch_history_file = None
                 for file_name in zf.namelist():
                     if 'watch-history.json' in file_name:
@@ -36,140 +67,672 @@ def get_viewing_evolution_context(request: HttpRequest) -> Dict[str, Any]:
                         break
                 
                 if watch_history_file:
-                    with zf.open(watch_history_file) as json_file:
-                        file_content = json_file.read().decode('utf-8')
-                        analysis_results = process_takeout_data(file_content)
+                    # Reject oversized jobs before decompressing anything
+                    estimated_mb = estimate_parse_memory_mb(zf.getinfo(watch_history_file).file_size)
+                    controller = TakeoutAdmissionController()
+                    time_zone = get_user_time_zone(request)
+
+                    with controller.admit(request.user.id, estimated_mb):
+                        with zf.open(watch_history_file) as json_file:
+                            analysis_results = process_takeout_data(json_file, time_zone)
+
+                    if analysis_results.get('status') != 'success':
+                        # Keep the previous upload's charts and artifacts rather than replacing them with nothing
+                        context['error'] = analysis_results.get('message', 'The Takeout file could not be processed.')
+                    else:
+                        artifacts = {
+                            'takeout_cube': analysis_results.pop('time_cube', None),
+                            'takeout_monthly_videos': analysis_results.pop('monthly_video_counts', None),
+                            'takeout_search': analysis_results.pop('search_index', None),
+                        }
+                        # Artifacts this upload did not produce (sketch mode) must not outlive the previous upload's
+                        for name, value in artifacts.items():
+                            if value is None or value == {}:
+                                delete_user_artifact(request.user.id, name)
+                            elif name == 'takeout_monthly_videos':
+                                # Versioned so the drift page can tell when its cached result is out of date
+                                set_versioned_user_artifact(request.user.id, name, value)
+                            else:
+                                set_user_artifact(request.user.id, name, value)
+                        time_cube = artifacts['takeout_cube']
+
+                        # Look up categories and topics of the watched videos in the background
+                        video_ids = analysis_results.pop('video_ids', [])
+                        if video_ids:
+                            start_enrichment(request.user, video_ids)
+
                         monthly_watch_freq = analysis_results.get('monthly_watch_freq', {})
                         daily_watch_freq = analysis_results.get('daily_watch_freq', {})
+                        if time_cube is not None:
+                            daily_points = get_daily_chart_points(time_cube)
+                            daily_watch_freq = dict(zip(daily_points['x'], daily_points['y']))
+                        session_stats = analysis_results.get('session_stats', {})
+
+                        # Chart inputs and the page's summaries are stored once per upload, so later visits show them
+                        # too; the page fetches each chart from its own endpoint
+                        charts = {
+                            'monthly': (monthly_watch_freq, "Videos Watched", 'timeseries_bar', "Monthly Watch Frequency"),
+                            'daily': (daily_watch_freq, "Videos Watched", 'daily_needle_chart', "Daily Watch Frequency"),
+                            'hourly': (analysis_results.get('hourly_watch_freq', {}), "Hour of Day", 'column',
+                                       f"Videos Watched by Hour ({time_zone})"),
+                            'weekday': (analysis_results.get('weekday_watch_freq', {}), "Day of Week", 'column',
+                                        "Videos Watched by Day of Week"),
+                            'session_length': (session_stats.get('session_length_distribution', {}) if session_stats.get('session_count') else {},
+                                               "Sessions", 'session_length_histogram', "Session Length Distribution"),
+                            'binge_timeline': (session_stats.get('binges_by_month', {}), "Binge Sessions", 'binge_timeline',
+                                               "Binge Sessions per Month"),
+                        }
+                        charts = {name: chart for name, chart in charts.items() if chart[0]}
+                        summary = {key: analysis_results.get(key) for key in SUMMARY_KEYS}
+                        set_versioned_user_artifact(request.user.id, CHARTS_ARTIFACT, {'charts': charts, 'summary': summary})
 
-                        context['analysis_results'] = analysis_results
-                        if monthly_watch_freq:
-                            context['monthly_watch_freq_chart'] = json.dumps(create_plotly_chart_dict(
-                            freq_data=monthly_watch_freq,
-                            data_name="Videos Watched",
-                            chart_type='timeseries_bar',
-                            chart_title="Monthly Watch Frequency"
-                        ))
-                        
-                        if daily_watch_freq:
-                            context['daily_watch_freq_chart'] = json.dumps(create_plotly_chart_dict(
-                                freq_data=daily_watch_freq,
-                                data_name="Videos Watched",
-                                chart_type='daily_needle_chart',
-                                chart_title="Daily Watch Frequency"
-                            ))
                         context['success_message'] = 'File uploaded successfully.'
                 else:
                     context['error'] = 'watch-history.json not found in the uploaded .zip file.'
 
+        except FileNotFoundError:
+            context['error'] = 'Your queued upload has expired. Please upload it again.'
         except zipfile.BadZipFile:
             context['error'] = 'Invalid .zip file.'
-            
+        except AdmissionRejected as e:
+            context['error'] = str(e)
+        except AdmissionBusy as e:
+            context['error'] = str(e)
+            context['retry_after'] = e.retry_after
+            context['queued'] = True
+            if uploaded_zip is not None:
+                _save_pending_upload(uploaded_zip, pending_path)
+
+        if not context.get('queued'):
+            _discard_pending_upload(pending_path)
+    else:
+        # Pick up an enrichment that stopped early (e.g. the API quota has since reset)
+        resume_enrichment(request.user)
+
+    takeout_charts = get_user_artifact(request.user.id, CHARTS_ARTIFACT) or {}
+    context['available_charts'] = list(takeout_charts.get('charts', {}))
+    context['summary'] = takeout_charts.get('summary', {})
+    context['enrichment'] = get_enrichment_status(request.user)
     return context
 
-def get_monthly_watch_freq(watch_history: List[Dict[str, Any]]) -> Dict[str, int]:
+def get_viewing_evolution_chart(user_id: int, chart_name: str) -> Tuple[Optional[str], Optional[str]]:
+    """
+    Returns one chart of the user's latest Takeout upload as serialized Plotly JSON.
+
+    Args:
+        user_id (int): The ID of the user who uploaded the data.
+        chart_name (str): One of 'monthly', 'daily', 'hourly', 'weekday', 'session_length' or 'binge_timeline'.
+
+    Returns:
+        Tuple[Optional[str], Optional[str]]: The chart JSON and the version of the data it was built
+        from, or (None, None) if the chart is not available.
+    """
+    charts = (get_user_artifact(user_id, CHARTS_ARTIFACT) or {}).get('charts', {})
+    if chart_name not in charts:
+        return None, None
+    freq_data, data_name, chart_type, chart_title = charts[chart_name]
+    chart_json = create_plotly_chart_json(freq_data=freq_data, data_name=data_name,
+                                          chart_type=chart_type, chart_title=chart_title)
+    return chart_json, get_user_artifact_version(user_id, CHARTS_ARTIFACT)
+
+def get_processing_status(request: HttpRequest) -> Dict[str, Any]:
+    """
+    Reports where the user's Takeout upload currently sits in the processing queue.
+
+    Args:
+        request (HttpRequest): The Django HTTP request object.
+
+    Returns:
+        Dict[str, Any]: A dictionary with 'state' ('queued', 'running' or 'idle'),
+        'position' (1-indexed queue position while queued), 'queue_length', 'can_start' (whether a
+        queued upload would be admitted now) and 'enrichment' (video category/topic lookup progress, or None).
+    """
+    controller = TakeoutAdmissionController()
+    # Polling keeps a queued upload's place in line
+    status = controller.get_status(request.user.id, keep_alive=True)
+    if status['state'] == 'idle':
+        _discard_pending_upload(_pending_upload_path(request.user.id)) # dropped from the queue after the page went away
+    status['enrichment'] = get_enrichment_status(request.user)
+    return status
+
+def _pending_upload_path(user_id: int) -> str:
+    return os.path.join(settings.TAKEOUT_PENDING_UPLOAD_DIR, f"{user_id}.zip")
+
+def _save_pending_upload(uploaded_zip: UploadedFile, path: str) -> None:
+    """Keep a queued upload on disk until it is admitted, replacing any earlier one of the same user."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'wb') as f:
+        for chunk in uploaded_zip.chunks():
+            f.write(chunk)
+
+def _discard_pending_upload(path: str) -> None:
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+WEEKDAY_NAMES = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
+
+def get_user_time_zone(request: HttpRequest) -> str:
+    """
+    Determines the time zone used to bucket the user's watch history.
+
+    The upload form submits the browser's IANA time zone; it is remembered in the session for later
+    requests. Unknown or missing names fall back to the site's TIME_ZONE setting.
+
+    Args:
+        request (HttpRequest): The Django HTTP request object.
+
+    Returns:
+        str: A valid IANA time zone name.
+    """
+    tz_name = request.POST.get('time-zone') or request.session.get('time_zone')
+    try:
+        ZoneInfo(tz_name)
+    except (ZoneInfoNotFoundError, ValueError, TypeError):
+        tz_name = settings.TIME_ZONE
+
+    request.session['time_zone'] = tz_name
+    return tz_name
+
+
+def stream_takeout_entries(json_file: IO[bytes], read_size: int = 1 << 20) -> Iterator[Dict[str, Any]]:
     """
-    Calculates the number of videos watched per month from a list of watch history entries.
+    Yields the entries of a watch-history.json array one at a time without loading the whole file.
 
     Args:
-        watch_history (List[Dict[str, Any]]): A list of watch history entries from the Takeout data.
+        json_file (IO[bytes]): A binary file object (e.g. from `zipfile.ZipFile.open`).
+        read_size (int): The number of bytes read per chunk.
+
+    Yields:
+        Dict[str, Any]: Each watch history entry, in file order.
+
+    Raises:
+        json.JSONDecodeError: If the file is not a JSON array, or ends before the array is closed.
+    """
+    decoder = json.JSONDecoder()
+    reader = codecs.getincrementaldecoder('utf-8')()
+    buffer = ''
+    pos = 0
+    started = False
+    eof = False
+
+    while True:
+        # Skip whitespace and array punctuation between entries
+        while pos < len(buffer) and buffer[pos] in ' \t\r\n,':
+            pos += 1
+        if not started and pos < len(buffer):
+            if buffer[pos] != '[':
+                raise json.JSONDecodeError("Expected a JSON array", buffer, pos)
+            started = True
+            pos += 1
+            continue
+        if started and pos < len(buffer) and buffer[pos] == ']':
+            return
+
+        try:
+            if pos >= len(buffer):
+                raise ValueError("buffer exhausted")
+            entry, end = decoder.raw_decode(buffer, pos)
+            yield entry
+            pos = end
+        except ValueError as exc:
+            # Entry is split across chunks; read more data. The array must be closed before the file ends.
+            if eof:
+                raise json.JSONDecodeError("Unexpected end of watch history", buffer, pos) from exc
+            chunk = json_file.read(read_size)
+            eof = not chunk
+            buffer = buffer[pos:] + reader.decode(chunk, final=eof)
+            pos = 0
+
+
+def count_local_days_and_hours(local_epochs: Iterable[int], day_counts: Counter, hour_counts: Optional[Counter] = None) -> None:
+    """
+    Adds localized watch timestamps to per-day (days since 1970-01-01) and per-hour counters.
+
+    The counters hold at most one key per day of history and per hour of day, so a history can be
+    counted chunk by chunk.
+    """
+    for local_epoch in local_epochs:
+        day_counts[local_epoch // SECONDS_PER_DAY] += 1
+        if hour_counts is not None:
+            hour_counts[(local_epoch % SECONDS_PER_DAY) // 3600] += 1
+
+
+def get_daily_counts(day_counts: Counter) -> Dict[str, int]:
+    """Turns per-day counts into dates (YYYY-MM-DD) mapped to counts, sorted by date."""
+    return {epoch_day_to_date(epoch_day).isoformat(): day_counts[epoch_day] for epoch_day in sorted(day_counts)}
+
+
+def get_monthly_counts(day_counts: Counter) -> Dict[str, int]:
+    """Turns per-day counts into months (YYYY-MM) mapped to counts, sorted by month."""
+    monthly_counts: Counter = Counter()
+    for epoch_day, count in day_counts.items():
+        monthly_counts[epoch_day_to_date(epoch_day).isoformat()[:7]] += count
+    return dict(sorted(monthly_counts.items()))
+
+
+def get_weekday_counts(day_counts: Counter) -> Dict[str, int]:
+    """Turns per-day counts into weekday names (Monday-Sunday) mapped to counts, for all 7 days."""
+    weekday_counts = [0] * 7
+    for epoch_day, count in day_counts.items():
+        weekday_counts[(epoch_day + 3) % 7] += count # 1970-01-01 was a Thursday
+    return dict(zip(WEEKDAY_NAMES, weekday_counts))
+
+
+def get_hourly_counts(hour_counts: Counter) -> Dict[str, int]:
+    """Turns per-hour counts into hours ('00:00'-'23:00') mapped to counts, for all 24 hours."""
+    return {f"{hour:02d}:00": hour_counts.get(hour, 0) for hour in range(24)}
+
+
+def build_time_cube(columns: 'WatchColumns') -> Optional[TimeCube]:
+    """
+    Builds the prefix-sum time cube used to answer date-range queries without rescanning the history.
+
+    Args:
+        columns (WatchColumns): The parsed columns of the watch history.
 
     Returns:
-        Dict[str, int]: A dictionary mapping dates (YYYY-MM) to the number of videos watched in that month.
+        Optional[TimeCube]: A cube with 'total', 'channel', 'hour' and 'weekday' dimensions,
+        or None if there are no timestamps.
     """
-    monthly_counts = Counter()
-    for entry in watch_history:
-        if 'time' in entry:
-            try:
-                watch_month = datetime.fromisoformat(entry['time'].replace('Z', '+00:00')).strftime('%Y-%m')
-                monthly_counts[watch_month] += 1
-            except (ValueError, TypeError):
-                continue
-    
-    sorted_monthly_counts = dict(sorted(monthly_counts.items()))
-    return sorted_monthly_counts
+    local_epochs = columns.local_epochs
+    local_days = [epoch // SECONDS_PER_DAY for epoch in local_epochs]
+    hour_labels = [f"{hour:02d}:00" for hour in range(24)]
 
+    return TimeCube.build(
+        local_days,
+        {
+            'channel': columns.channels,
+            'hour': [hour_labels[(epoch % SECONDS_PER_DAY) // 3600] for epoch in local_epochs],
+            'weekday': [WEEKDAY_NAMES[(day + 3) % 7] for day in local_days],
+        },
+        member_order={'hour': hour_labels, 'weekday': WEEKDAY_NAMES},
+        max_members=settings.TIME_CUBE_MAX_MEMBERS,
+    )
 
-def get_daily_watch_freq(watch_history: List[Dict[str, Any]]) -> Dict[str, int]:
+
+def get_monthly_video_counts(columns: 'WatchColumns') -> Dict[str, Dict[str, int]]:
     """
-    Calculates the number of videos watched per day from a list of watch history entries.
+    Counts how often each video was watched in every local month, for the topic drift analysis.
+
+    Storing (month, video) pairs instead of raw entries keeps the artifact small while letting
+    monthly topic vectors be rebuilt once the videos have been enriched.
 
     Args:
-        watch_history (List[Dict[str, Any]]): A list of watch history entries from the Takeout data.
+        columns (WatchColumns): The parsed columns of the watch history.
 
     Returns:
-        Dict[str, int]: A dictionary mapping dates (YYYY-MM-DD) to the number of videos watched on that day.
+        Dict[str, Dict[str, int]]: Months (YYYY-MM) mapped to video IDs and their watch counts.
     """
-    daily_counts = Counter()
-    for entry in watch_history:
-        # Some entries might not have a 'time' field (e.g., ads)
-        if 'time' in entry:
-            try:
-                # Extract the date part from the ISO 8601 timestamp
-                watch_date = datetime.fromisoformat(entry['time'].replace('Z', '+00:00')).strftime('%Y-%m-%d')
-                daily_counts[watch_date] += 1
-            except (ValueError, TypeError):
-                # Ignore entries with invalid time formats
-                continue
-    
-    # Sort the results by date
-    sorted_daily_counts = dict(sorted(daily_counts.items()))
-    return sorted_daily_counts
+    month_labels: Dict[int, str] = {} # local day -> YYYY-MM, since far fewer days than entries
+    monthly_counts: Dict[str, Counter] = {}
+    for local_epoch, video_id in zip(columns.local_epochs, columns.video_ids):
+        if not video_id: # removed videos
+            continue
+        epoch_day = local_epoch // SECONDS_PER_DAY
+        month = month_labels.get(epoch_day)
+        if month is None:
+            month = month_labels[epoch_day] = epoch_day_to_date(epoch_day).isoformat()[:7]
+        counts = monthly_counts.get(month)
+        if counts is None:
+            counts = monthly_counts[month] = Counter()
+        counts[video_id] += 1
+
+    return {month: dict(counts) for month, counts in sorted(monthly_counts.items())}
 
 
-def get_top_channels_by_videos_watched(watch_history: List[Dict[str, Any]], top_n: int = 10) -> Dict[str, int]:
+def get_viewing_range_data(request: HttpRequest) -> Tuple[Dict[str, Any], int]:
     """
-    Finds the top N channels by the number of videos watched.
+    Answers a date-range query against the user's stored time cube.
+
+    Query parameters:
+        start, end: Inclusive dates (YYYY-MM-DD). Default to the full history.
+        granularity: 'day', 'week', 'month' (default) or 'year'.
+        dimension: 'total' (default), 'channel', 'hour' or 'weekday'.
 
     Args:
-        watch_history (List[Dict[str, Any]]): A list of watch history entries from the Takeout data.
-        top_n (int): The number of top channels to return.
+        request (HttpRequest): The Django HTTP request object.
 
     Returns:
-        Dict[str, int]: A dictionary mapping channel titles to the number of videos watched.
+        Tuple[Dict[str, Any], int]: The JSON-serializable result (see `TimeCube.query`, plus the
+        covered 'start'/'end' dates) and the HTTP status code.
     """
-    channel_counts = Counter()
-    for entry in watch_history:
-        # Filter out entries that are ads or don't have channel information
-        if 'subtitles' in entry and entry['subtitles']:
-            channel_name = entry['subtitles'][0]['name']
-            channel_counts[channel_name] += 1
+    cube = get_user_artifact(request.user.id, 'takeout_cube')
+    if cube is None:
+        return {'error': 'Upload your Takeout data to explore your viewing history.'}, 404
 
-    return dict(channel_counts.most_common(top_n))
+    try:
+        start = date.fromisoformat(request.GET['start']) if request.GET.get('start') else cube.start_date
+        end = date.fromisoformat(request.GET['end']) if request.GET.get('end') else cube.end_date
+        result = cube.query(
+            start,
+            end,
+            granularity=request.GET.get('granularity', 'month'),
+            dimension=request.GET.get('dimension', 'total'),
+        )
+    except ValueError as e:
+        return {'error': str(e)}, 400
+
+    result['start'] = max(start, cube.start_date).isoformat()
+    result['end'] = min(end, cube.end_date).isoformat()
+    return result, 200
 
 
-def process_takeout_data(file_content: str) -> Dict[str, Any]:
+def get_daily_chart_points(cube: TimeCube, start: Optional[date] = None, end: Optional[date] = None,
+                           max_points: int = DAILY_CHART_POINTS) -> Dict[str, Any]:
     """
-    Processes the content of a YouTube Takeout JSON file.
+    Returns the daily watch counts of a date range, downsampled with LTTB if there are more days than `max_points`.
+
+    Idle days are included as zeros, so the downsampled line keeps the shape of the full series.
 
     Args:
-        file_content (str): The content of the uploaded JSON file as a string.
+        cube (TimeCube): The user's time cube.
+        start (Optional[date]): The first date (inclusive). Defaults to the start of the history.
+        end (Optional[date]): The last date (inclusive). Defaults to the end of the history.
+        max_points (int): The maximum number of points to return.
+
+    Returns:
+        Dict[str, Any]: A dictionary with 'x' (dates as YYYY-MM-DD), 'y' (counts), 'total_points'
+        (days in the range) and 'downsampled' (whether points were dropped).
+    """
+    first_day, counts = cube.daily_series(start, end)
+    indices = lttb_indices(counts, max_points)
+    return {
+        'x': [epoch_day_to_date(first_day + index).isoformat() for index in indices],
+        'y': [counts[index] for index in indices],
+        'total_points': len(counts),
+        'downsampled': len(indices) < len(counts),
+    }
+
+
+def get_daily_chart_data(request: HttpRequest) -> Tuple[Dict[str, Any], int]:
+    """
+    Answers a zoom request for the daily watch chart against the user's stored time cube.
+
+    Query parameters:
+        start, end: Inclusive dates (YYYY-MM-DD) of the visible range. Default to the full history.
+
+    Args:
+        request (HttpRequest): The Django HTTP request object.
+
+    Returns:
+        Tuple[Dict[str, Any], int]: The JSON-serializable result (see `get_daily_chart_points`, plus
+        the covered 'start'/'end' dates) and the HTTP status code.
+    """
+    cube = get_user_artifact(request.user.id, 'takeout_cube')
+    if cube is None:
+        return {'error': 'Upload your Takeout data to explore your viewing history.'}, 404
+
+    try:
+        start = date.fromisoformat(request.GET['start'][:10]) if request.GET.get('start') else cube.start_date
+        end = date.fromisoformat(request.GET['end'][:10]) if request.GET.get('end') else cube.end_date
+    except ValueError as e:
+        return {'error': str(e)}, 400
+
+    result = get_daily_chart_points(cube, start, end)
+    result['start'] = max(start, cube.start_date).isoformat()
+    result['end'] = min(end, cube.end_date).isoformat()
+    return result, 200
+
+
+def build_search_index(columns: 'WatchColumns') -> SearchIndex:
+    """
+    Builds the inverted index used to search watch history titles and channels.
+
+    Args:
+        columns (WatchColumns): The parsed columns of the watch history.
+
+    Returns:
+        SearchIndex: An index over every entry with a valid timestamp and a title.
+    """
+    return SearchIndex.build(
+        (local_epoch, title, channel, video_id)
+        for local_epoch, title, channel, video_id
+        in zip(columns.local_epochs, columns.titles, columns.channels, columns.video_ids)
+        if title
+    )
+
+
+def search_watch_history(request: HttpRequest) -> Tuple[Dict[str, Any], int]:
+    """
+    Answers a search query against the user's stored watch history index.
+
+    Query parameters:
+        q: Search terms. Every term must match; the last term (and any term ending in '*') matches as a prefix.
+        channel: Only return videos from this channel (exact name, case-insensitive).
+        start, end: Inclusive dates (YYYY-MM-DD) in the user's time zone.
+        limit: The maximum number of results (default 50, at most 200).
+
+    Args:
+        request (HttpRequest): The Django HTTP request object.
+
+    Returns:
+        Tuple[Dict[str, Any], int]: The JSON-serializable result (see `SearchIndex.search`, with
+        each result's 'epoch' replaced by a local 'watched_at' timestamp) and the HTTP status code.
+    """
+    index = get_user_artifact(request.user.id, 'takeout_search')
+    if index is None:
+        return {'error': 'Upload your Takeout data to search your watch history.'}, 404
+
+    query = request.GET.get('q', '').strip()
+    channel = request.GET.get('channel', '').strip() or None
+    if not query and not channel:
+        return {'error': 'Enter a search term or a channel.'}, 400
+
+    try:
+        start_epoch = end_epoch = None
+        if request.GET.get('start'):
+            start_epoch = (date.fromisoformat(request.GET['start']).toordinal() - EPOCH_ORDINAL) * SECONDS_PER_DAY
+        if request.GET.get('end'):
+            end_epoch = (date.fromisoformat(request.GET['end']).toordinal() - EPOCH_ORDINAL + 1) * SECONDS_PER_DAY
+        limit = min(max(int(request.GET.get('limit', 50)), 1), 200)
+    except ValueError as e:
+        return {'error': str(e)}, 400
+
+    result = index.search(query, channel=channel, start_epoch=start_epoch, end_epoch=end_epoch, limit=limit)
+    for item in result['results']:
+        # Local epochs are shifted by the zone offset, so format them as if they were UTC
+        item['watched_at'] = datetime.fromtimestamp(item.pop('epoch'), timezone.utc).strftime('%Y-%m-%d %H:%M')
+    return result, 200
+
+def get_video_id(entry: Dict[str, Any]) -> Optional[str]:
+    """
+    Extracts the YouTube video ID from a watch history entry's `titleUrl`.
+
+    Args:
+        entry (Dict[str, Any]): A single watch history entry from the Takeout data.
+
+    Returns:
+        Optional[str]: The video ID, or None for entries without a watch URL (e.g. removed videos).
+    """
+    title_url = entry.get('titleUrl')
+    if not title_url:
+        return None
+    _, found, query = title_url.partition('v=')
+    if not found:
+        return None
+    return query.split('&', 1)[0] or None
+
+
+def get_channel_name(entry: Dict[str, Any]) -> Optional[str]:
+    """Returns the channel name of a watch history entry, or None for ads and removed videos."""
+    subtitles = entry.get('subtitles')
+    if subtitles:
+        return subtitles[0].get('name')
+    return None
+
+
+def get_video_title(entry: Dict[str, Any]) -> Optional[str]:
+    """Returns the video title of a watch history entry without Takeout's "Watched " prefix."""
+    title = entry.get('title')
+    if not title:
+        return None
+    return title[len('Watched '):] if title.startswith('Watched ') else title
+
+
+class WatchColumns:
+    """
+    Per-entry columns of the watch history entries with a valid timestamp, in file order.
+
+    Timestamps are parsed and localized once per upload; the time cube, the monthly video counts,
+    the search index and the session statistics are all built from these columns.
+    """
+    def __init__(self) -> None:
+        self.epochs: List[int] = [] # UTC epoch seconds
+        self.local_epochs: List[int] = [] # the same instants in local wall-clock seconds
+        self.video_ids: List[Optional[str]] = []
+        self.channels: List[Optional[str]] = []
+        self.titles: List[Optional[str]] = []
+
+
+class WatchCounts:
+    """
+    Top channels and videos and distinct counts, accumulated one entry at a time.
+
+    Exact mode keeps a counter per channel and video. Sketch mode keeps fixed-size Space-Saving and
+    HyperLogLog sketches instead (see `sketch_helper`), plus titles for at most twice the sketch
+    capacity of videos, so memory does not grow with the history.
+    """
+    def __init__(self, use_sketch: bool) -> None:
+        self.use_sketch = use_sketch
+        self.titles: Dict[str, str] = {}
+        if use_sketch:
+            self.channel_counts = SpaceSaving(settings.TAKEOUT_SKETCH_CAPACITY)
+            self.video_counts = SpaceSaving(settings.TAKEOUT_SKETCH_CAPACITY)
+            self.distinct_channels = HyperLogLog(settings.TAKEOUT_HLL_PRECISION)
+            self.distinct_videos = HyperLogLog(settings.TAKEOUT_HLL_PRECISION)
+        else:
+            self.channel_counts = Counter()
+            self.video_counts = Counter() # in order of first appearance
+
+    def add(self, video_id: Optional[str], channel_name: Optional[str], title: Optional[str]) -> None:
+        if channel_name:
+            if self.use_sketch:
+                self.channel_counts.add(channel_name)
+                self.distinct_channels.add(channel_name)
+            else:
+                self.channel_counts[channel_name] += 1
+        if not video_id:
+            return
+        if self.use_sketch:
+            self.video_counts.add(video_id)
+            self.distinct_videos.add(video_id)
+            if video_id not in self.titles:
+                self.titles[video_id] = title or video_id
+                if len(self.titles) > 2 * self.video_counts.capacity:
+                    # Keep titles only for videos the sketch still monitors
+                    self.titles = {key: value for key, value in self.titles.items() if key in self.video_counts}
+        else:
+            self.video_counts[video_id] += 1
+            if video_id not in self.titles:
+                self.titles[video_id] = title or video_id
+
+    def results(self, top_n: int = 10) -> Dict[str, Any]:
+        """
+        Returns:
+            Dict[str, Any]: 'top_channels' and 'top_videos' (titles) mapped to counts, and
+            'distinct_videos' and 'distinct_channels' (estimates in sketch mode).
+        """
+        if self.use_sketch:
+            top_channels = [(channel_name, count) for channel_name, count, _ in self.channel_counts.top(top_n)]
+            top_videos = [(video_id, count) for video_id, count, _ in self.video_counts.top(top_n)]
+            distinct_videos, distinct_channels = self.distinct_videos.count(), self.distinct_channels.count()
+        else:
+            top_channels = self.channel_counts.most_common(top_n)
+            top_videos = self.video_counts.most_common(top_n)
+            distinct_videos, distinct_channels = len(self.video_counts), len(self.channel_counts)
+        return {
+            'top_channels': dict(top_channels),
+            'top_videos': {self.titles.get(video_id, video_id): count for video_id, count in top_videos},
+            'distinct_videos': distinct_videos,
+            'distinct_channels': distinct_channels,
+        }
+
+
+def process_takeout_data(json_file: IO[bytes], time_zone: str = 'UTC') -> Dict[str, Any]:
+    """
+    Processes a YouTube Takeout watch-history.json file in one streaming pass.
+
+    Entries are read `TAKEOUT_CHUNK_SIZE` at a time; each chunk's timestamps are parsed and
+    localized once. Exact mode keeps them as `WatchColumns` for the time cube, topic drift counts,
+    search index and video enrichment. With TAKEOUT_SKETCH_MODE, only fixed-size state is kept
+    (day and hour counters, sketches and a session tracker), so memory does not grow with the
+    file; the per-entry artifacts are then skipped (returned as None or empty).
+
+    Args:
+        json_file (IO[bytes]): The watch-history.json file, opened in binary mode.
+        time_zone (str): The IANA time zone used for day, month, hour and weekday buckets.
 
     Returns:
         Dict[str, Any]: A dictionary containing the processed data.
     """
     try:
-        data = json.loads(file_content) # `json.loads()` reads from a string
-        
-        # Get the daily watch frequency
-        daily_watch_freq = get_daily_watch_freq(data)
-
-        # Get the monthly watch frequency
-        monthly_watch_freq = get_monthly_watch_freq(data)
-
-        # Get top channels by videos watched
-        top_channels = get_top_channels_by_videos_watched(data)
-        
-        # Get the monthly watch frequency
-        monthly_watch_freq = get_monthly_watch_freq(data)
-        
+        use_sketch = settings.TAKEOUT_SKETCH_MODE
+        columns = None if use_sketch else WatchColumns()
+        counts = WatchCounts(use_sketch)
+        day_counts: Counter = Counter()
+        hour_counts: Counter = Counter()
+        # Without the columns, sessions are split as the entries arrive (Takeout exports are newest-first)
+        tracker = new_session_tracker() if use_sketch else None
+        entry_count = 0
+
+        entries = stream_takeout_entries(json_file)
+        while True:
+            chunk = list(islice(entries, TAKEOUT_CHUNK_SIZE))
+            if not chunk:
+                break
+            entry_count += len(chunk)
+
+            epochs: List[int] = []
+            for entry in chunk:
+                video_id, channel_name, title = get_video_id(entry), get_channel_name(entry), get_video_title(entry)
+                counts.add(video_id, channel_name, title)
+                # Some entries might not have a 'time' field (e.g., ads)
+                time_str = entry.get('time')
+                epoch = isostr_to_epoch(time_str) if isinstance(time_str, str) else None
+                if epoch is None:
+                    continue
+                epochs.append(epoch)
+                if columns is not None:
+                    columns.video_ids.append(video_id)
+                    columns.channels.append(channel_name)
+                    columns.titles.append(title)
+
+            local_epochs = localize_epochs(epochs, time_zone)
+            count_local_days_and_hours(local_epochs, day_counts, hour_counts)
+            if columns is not None:
+                columns.epochs.extend(epochs)
+                columns.local_epochs.extend(local_epochs)
+            else:
+                tracker.consume(epochs, local_epochs)
+
+        if columns is not None:
+            session_stats = get_session_stats(columns.epochs, time_zone, local_epochs=columns.local_epochs)
+        elif tracker.out_of_order:
+            session_stats = {} # a stream that is not sorted by time cannot be split into sessions
+        else:
+            session_stats = tracker.results()
+
         return {
             'status': 'success',
             'message': 'Takeout data processed successfully.',
-            'data_length': len(data),
-            'daily_watch_freq': daily_watch_freq,
-            'monthly_watch_freq': monthly_watch_freq,
-            'top_channels': top_channels,
+            'data_length': entry_count,
+            'time_zone': time_zone,
+            'daily_watch_freq': get_daily_counts(day_counts),
+            'monthly_watch_freq': get_monthly_counts(day_counts),
+            'hourly_watch_freq': get_hourly_counts(hour_counts),
+            'weekday_watch_freq': get_weekday_counts(day_counts),
+            **counts.results(),
+            'is_approximate': use_sketch,
+            'session_stats': session_stats,
+            'video_ids': list(counts.video_counts) if columns is not None else [],
+            # Precompute prefix sums so later date-range queries never rescan the history
+            'time_cube': build_time_cube(columns) if columns is not None else None,
+            # Keep (month, video) counts so topic drift can be computed once videos are enriched
+            'monthly_video_counts': get_monthly_video_counts(columns) if columns is not None else {},
+            # Index titles and channels so searches never rescan the history
+            'search_index': build_search_index(columns) if columns is not None else None,
         }
     except json.JSONDecodeError:
         return {'status': 'error', 'message': 'Invalid JSON file.'}
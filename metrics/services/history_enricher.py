@@ -0,0 +1,325 @@
+"""
+Responsible for enriching Takeout watch history with public video data, such as:
+    - The category ID of every watched video.
+    - The topic tags of every watched video.
+    - The duration of every watched video.
+
+Lookups run in 50-ID `videos.list` batches over a bounded thread pool. Results are stored in the
+shared VideoMetadata table and progress is checkpointed per user, so a large history resumes
+where it stopped (e.g. after quota exhaustion) and videos already known locally are never re-fetched.
+Each run claims the checkpoint's generation and writes only while it still holds it, so a re-upload
+or a second worker never lets a stale run overwrite newer progress.
+"""
+
+# Standard Library Imports
+import logging
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from datetime import timedelta
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+# Third-Party Imports
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.db import DatabaseError
+from django.db.models import F, Q
+from django.utils import timezone
+from google.auth.exceptions import GoogleAuthError
+
+# Local App Imports
+from metrics.models import VideoMetadata, WatchHistoryEnrichment
+from metrics.utils.api_client import YouTubeClient
+from metrics.utils.date_helper import iso_duration_to_seconds
+from metrics.utils.task_helper import run_in_background
+from metrics.utils.topic_helper import parse_topic_urls
+from metrics.utils.types import ApiResponse
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 50 # Max number of video IDs per API call
+KNOWN_ID_LOOKUP_SIZE = 1000 # IDs checked against the database per query
+LOOKUP_FIELDS = ['snippet.categoryId', 'contentDetails.duration', 'topicDetails.topicCategories'] # contentDetails adds no quota cost
+
+def start_enrichment(user: User, video_ids: List[str]) -> WatchHistoryEnrichment:
+    """
+    Replace the user's enrichment checkpoint with a new set of video IDs and start processing it.
+
+    Bumping the generation takes the job away from any worker still processing the previous upload.
+
+    Args:
+        user (User): The user who uploaded the watch history.
+        video_ids (List[str]): The deduplicated video IDs of the watch history.
+
+    Returns:
+        WatchHistoryEnrichment: The new checkpoint.
+    """
+    job, _ = WatchHistoryEnrichment.objects.get_or_create(user=user)
+    WatchHistoryEnrichment.objects.filter(pk=job.pk).update(
+        video_ids=video_ids,
+        total=len(video_ids),
+        cursor=0,
+        status=WatchHistoryEnrichment.STATUS_PENDING,
+        retry_after=None,
+        generation=F('generation') + 1,
+        updated_at=timezone.now(),
+    )
+    resume_enrichment(user)
+    job.refresh_from_db()
+    return job
+
+def resume_enrichment(user: User) -> bool:
+    """
+    Continue an unfinished enrichment in the background, unless it is complete, already running
+    or waiting out its retry delay.
+
+    Args:
+        user (User): The user whose enrichment should continue.
+
+    Returns:
+        bool: True if a background run was started.
+    """
+    generation = claim_enrichment(user.id)
+    if generation is None:
+        return False
+    return run_in_background(f"enrichment:{user.id}:{generation}", enrich_watch_history, user.id, generation)
+
+def claim_enrichment(user_id: int, ignore_retry_after: bool = False) -> Optional[int]:
+    """
+    Atomically mark an unfinished enrichment as running, so only one worker across all processes runs it.
+
+    Args:
+        user_id (int): The ID of the user whose enrichment should be claimed.
+        ignore_retry_after (bool): Also claim paused jobs whose retry delay has not passed (e.g. from
+                                   cron right after the API quota resets).
+
+    Returns:
+        Optional[int]: The generation to pass to `enrich_watch_history`, or None if there is nothing to
+        claim (complete, running elsewhere, waiting to retry, or claimed by another worker first).
+    """
+    now = timezone.now()
+    # A 'running' job that has not checkpointed recently belongs to a worker that died
+    stale_before = now - timedelta(seconds=settings.ENRICHMENT_STALE_SECONDS)
+    waiting = Q(status__in=[WatchHistoryEnrichment.STATUS_PENDING, WatchHistoryEnrichment.STATUS_PAUSED])
+    if not ignore_retry_after:
+        waiting &= Q(retry_after__isnull=True) | Q(retry_after__lte=now)
+    claimable = waiting | Q(status=WatchHistoryEnrichment.STATUS_RUNNING, updated_at__lt=stale_before)
+
+    generation = (WatchHistoryEnrichment.objects.filter(claimable, user_id=user_id)
+                  .values_list('generation', flat=True).first())
+    if generation is None:
+        return None
+    # The UPDATE re-checks both conditions, so of two concurrent claims only one matches a row
+    claimed = WatchHistoryEnrichment.objects.filter(claimable, user_id=user_id, generation=generation).update(
+        status=WatchHistoryEnrichment.STATUS_RUNNING,
+        retry_after=None,
+        generation=generation + 1,
+        updated_at=now,
+    )
+    return generation + 1 if claimed else None
+
+def enrich_watch_history(user_id: int, generation: int) -> Optional[WatchHistoryEnrichment]:
+    """
+    Look up every not-yet-known video of a claimed checkpoint, saving progress after each batch.
+
+    Batches are submitted to a thread pool of `ENRICHMENT_MAX_WORKERS` workers. The checkpoint cursor
+    only advances past a batch once it and every earlier batch have been stored. If a lookup fails
+    (quota exhaustion, network error) no further batches are submitted and the job is paused until
+    `ENRICHMENT_RETRY_SECONDS` have passed. Every checkpoint is conditional on `generation`; once a
+    new upload or another worker has taken the job over, this run stops without writing.
+
+    Args:
+        user_id (int): The ID of the user whose checkpoint should be processed.
+        generation (int): The generation this run claimed (see `claim_enrichment`).
+
+    Returns:
+        Optional[WatchHistoryEnrichment]: The updated checkpoint, or None if the job was taken over.
+    """
+    job = (WatchHistoryEnrichment.objects.select_related('user__usercredential')
+           .filter(user_id=user_id, generation=generation).first())
+    if job is None:
+        return None
+
+    def checkpoint(**fields: Any) -> bool:
+        """Save fields if this run still owns the job; returns False once it has been taken over."""
+        fields['updated_at'] = timezone.now()
+        owned = WatchHistoryEnrichment.objects.filter(pk=job.pk, generation=generation).update(**fields) == 1
+        if owned:
+            for name, value in fields.items():
+                setattr(job, name, value)
+        return owned
+
+    batches = _plan_batches(job.video_ids, job.cursor)
+    if not batches:
+        return job if checkpoint(cursor=job.total, status=WatchHistoryEnrichment.STATUS_COMPLETE) else None
+
+    client = YouTubeClient(credentials=job.user.usercredential)
+    max_workers = settings.ENRICHMENT_MAX_WORKERS
+    completed = set()
+    next_to_commit = 0
+    next_to_submit = 0
+    failed = False
+    superseded = False
+    in_flight: Dict[Future, int] = {}
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        while True:
+            # Keep a bounded window of batches in flight
+            while not (failed or superseded) and next_to_submit < len(batches) and len(in_flight) < max_workers * 2:
+                batch_ids = batches[next_to_submit][1]
+                future = executor.submit(client.videos.list_video, fields=LOOKUP_FIELDS,
+                                         video_ids=",".join(batch_ids), max_results=BATCH_SIZE)
+                in_flight[future] = next_to_submit
+                next_to_submit += 1
+
+            if not in_flight:
+                break
+
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                ordinal = in_flight.pop(future)
+                try:
+                    response = future.result()
+                except (DatabaseError, GoogleAuthError): # request errors already come back as None
+                    logger.exception("Video lookup failed while enriching history of user %s.", user_id)
+                    response = None
+
+                if response is None:
+                    failed = True
+                    continue
+
+                _store_batch(batches[ordinal][1], response)
+                completed.add(ordinal)
+
+            # Advance the checkpoint over the completed prefix of batches
+            cursor = job.cursor
+            while next_to_commit in completed:
+                cursor = batches[next_to_commit][0]
+                next_to_commit += 1
+            if cursor != job.cursor and not superseded and not checkpoint(cursor=cursor):
+                superseded = True
+
+    if superseded:
+        logger.info("Enrichment of user %s was taken over; stopping generation %s.", user_id, generation)
+        return None
+    if next_to_commit == len(batches):
+        owned = checkpoint(cursor=job.total, status=WatchHistoryEnrichment.STATUS_COMPLETE)
+    else:
+        owned = checkpoint(status=WatchHistoryEnrichment.STATUS_PAUSED,
+                           retry_after=timezone.now() + timedelta(seconds=settings.ENRICHMENT_RETRY_SECONDS))
+    return job if owned else None
+
+def get_enrichment_status(user: User) -> Optional[Dict[str, Any]]:
+    """
+    Summarize the user's enrichment progress for display.
+
+    Args:
+        user (User): The authenticated Django user object.
+
+    Returns:
+        Optional[Dict[str, Any]]: A dictionary with 'status', 'completed', 'total' and 'percent',
+        or None if the user has never uploaded a watch history.
+    """
+    job = WatchHistoryEnrichment.objects.filter(user=user).values('cursor', 'status', 'total').first()
+    if not job:
+        return None
+
+    total = job['total']
+    return {
+        'status': job['status'],
+        'completed': job['cursor'],
+        'total': total,
+        'percent': round(100 * job['cursor'] / total) if total else 100,
+    }
+
+def lookup_video_metadata(client: YouTubeClient, video_ids: Iterable[str]) -> Dict[str, VideoMetadata]:
+    """
+    Fetch metadata (including durations) for a collection of video IDs, looking up unknown videos concurrently.
+
+    Videos already stored with a duration, or already known to be unavailable, are read from the
+    database; the rest are fetched in 50-ID batches over a pool of `ENRICHMENT_MAX_WORKERS` workers
+    and stored for every other user.
+
+    Args:
+        client (YouTubeClient): The YouTubeClient instance for making API requests.
+        video_ids (Iterable[str]): The video IDs to look up.
+
+    Returns:
+        Dict[str, VideoMetadata]: Video IDs mapped to their metadata, unavailable videos included.
+        IDs whose lookup failed are omitted.
+    """
+    video_ids = list(dict.fromkeys(video_ids))
+    metadata: Dict[str, VideoMetadata] = {}
+    for i in range(0, len(video_ids), KNOWN_ID_LOOKUP_SIZE):
+        chunk = video_ids[i:i + KNOWN_ID_LOOKUP_SIZE]
+        for video in VideoMetadata.objects.filter(video_id__in=chunk):
+            if video.duration_seconds is not None or not video.is_available:
+                metadata[video.video_id] = video
+
+    missing = [video_id for video_id in video_ids if video_id not in metadata]
+    batches = [missing[i:i + BATCH_SIZE] for i in range(0, len(missing), BATCH_SIZE)]
+    if not batches:
+        return metadata
+
+    def fetch(batch_ids: List[str]) -> Optional[ApiResponse]:
+        return client.videos.list_video(fields=LOOKUP_FIELDS, video_ids=",".join(batch_ids), max_results=BATCH_SIZE)
+
+    with ThreadPoolExecutor(max_workers=settings.ENRICHMENT_MAX_WORKERS) as executor:
+        for batch_ids, response in zip(batches, executor.map(fetch, batches)):
+            if response is None:
+                continue
+            metadata.update(_store_batch(batch_ids, response, update_existing=True))
+    return metadata
+
+def _plan_batches(video_ids: List[str], cursor: int) -> List[Tuple[int, List[str]]]:
+    """
+    Group the IDs after the cursor that are not yet known locally into lookup batches.
+
+    Returns:
+        List[Tuple[int, List[str]]]: (end index, batch IDs) pairs, where the end index is the
+        position in `video_ids` just after the batch's last ID (the cursor value once it is stored).
+    """
+    batches: List[Tuple[int, List[str]]] = []
+    current: List[str] = []
+    for start in range(cursor, len(video_ids), KNOWN_ID_LOOKUP_SIZE):
+        chunk = video_ids[start:start + KNOWN_ID_LOOKUP_SIZE]
+        known = set(VideoMetadata.objects.filter(video_id__in=chunk).values_list('video_id', flat=True))
+        for offset, video_id in enumerate(chunk):
+            if video_id in known:
+                continue
+            current.append(video_id)
+            if len(current) == BATCH_SIZE:
+                batches.append((start + offset + 1, current))
+                current = []
+    if current:
+        batches.append((len(video_ids), current))
+    return batches
+
+def _store_batch(batch_ids: List[str], response: ApiResponse, update_existing: bool = False) -> Dict[str, VideoMetadata]:
+    """
+    Save the metadata of one lookup batch; IDs the API did not return are marked unavailable.
+
+    Rows that already exist are left alone unless `update_existing` is set (e.g. to fill in
+    durations of videos stored before durations were looked up).
+    """
+    rows = {}
+    for item in response.get('items', []):
+        video_id = item.get('id')
+        if not video_id:
+            continue
+        rows[video_id] = VideoMetadata(
+            video_id=video_id,
+            category_id=item.get('snippet', {}).get('categoryId', ''),
+            topics=parse_topic_urls(item.get('topicDetails', {})),
+            duration_seconds=iso_duration_to_seconds(item.get('contentDetails', {}).get('duration')),
+        )
+    for video_id in batch_ids:
+        if video_id not in rows:
+            rows[video_id] = VideoMetadata(video_id=video_id, is_available=False)
+
+    if update_existing:
+        existing = set(VideoMetadata.objects.filter(pk__in=list(rows)).values_list('video_id', flat=True))
+        VideoMetadata.objects.bulk_update(
+            [row for video_id, row in rows.items() if video_id in existing],
+            ['category_id', 'topics', 'duration_seconds', 'is_available']
+        )
+    VideoMetadata.objects.bulk_create(rows.values(), ignore_conflicts=True)
+    return rows
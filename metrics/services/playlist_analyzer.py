@@ -0,0 +1,210 @@
+"""
+Responsible for analyzing every playlist the user owns, such as:
+    - Total runtime per playlist and across all playlists.
+    - The category mix of the videos saved in playlists.
+    - Videos saved in more than one playlist, and duplicates within a playlist.
+    - Dead entries (deleted, private or otherwise unavailable videos).
+
+All playlists are crawled concurrently over a bounded thread pool, and video durations and
+categories are looked up once per distinct video in 50-ID batches (shared with the watch history
+enrichment through the VideoMetadata table), so a user with hundreds of playlists costs roughly
+as much wall-clock time as the largest single playlist.
+"""
+
+# Standard Library Imports
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Tuple
+
+# Third-Party Imports
+from django.conf import settings
+from django.contrib.auth.models import User
+
+# Local App Imports
+from metrics.utils.api_client import YouTubeClient
+from metrics.utils.api_resources.playlists import Playlists
+from metrics.utils.cache_helper import get_user_artifact, set_user_artifact
+from .drift_analyzer import get_category_names
+from .history_enricher import lookup_video_metadata
+from .visualizer import create_plotly_chart_dict
+
+PLAYLIST_ANALYTICS_ARTIFACT = 'playlist_analytics'
+PLAYLIST_ANALYTICS_TIMEOUT = 60 * 15 # Seconds an analysis is reused before playlists are crawled again
+MAX_LISTED = 50 # Duplicate videos and dead entries listed on the page
+DEAD_TITLES = {'Deleted video', 'Private video'}
+DEAD_PRIVACY_STATUSES = {'private', 'privacyStatusUnspecified'}
+CRAWL_FIELDS = ['snippet.title', 'snippet.resourceId.videoId', 'status.privacyStatus'] # all the analysis reads
+
+def get_playlist_analytics_context(user: User) -> Dict[str, Any]:
+    """
+    Build context for the `playlist_analytics` view.
+
+    The resulting context dictionary contains:
+        - 'analytics': the stored analysis (see `analyze_playlists`).
+        - 'category_chart': a donut chart dict of the category mix, if any video has a known category.
+    """
+    analytics = get_user_artifact(user.id, PLAYLIST_ANALYTICS_ARTIFACT)
+    if analytics is None:
+        client = YouTubeClient(credentials=user.usercredential)
+        analytics = analyze_playlists(client, get_category_names(user))
+        set_user_artifact(user.id, PLAYLIST_ANALYTICS_ARTIFACT, analytics, timeout=PLAYLIST_ANALYTICS_TIMEOUT)
+
+    context: Dict[str, Any] = {'analytics': analytics}
+    if analytics['category_mix']:
+        context['category_chart'] = create_plotly_chart_dict(
+            freq_data=analytics['category_mix'],
+            data_name="Videos",
+            chart_type='donut',
+            chart_title="Category Mix Across Your Playlists"
+        )
+    return context
+
+def analyze_playlists(client: YouTubeClient, category_names: Dict[str, str]) -> Dict[str, Any]:
+    """
+    Crawl all of the user's playlists and compute runtime, category, duplicate and dead-entry statistics.
+
+    Args:
+        client (YouTubeClient): The YouTubeClient instance for making API requests.
+        category_names (Dict[str, str]): Video category IDs mapped to their titles.
+
+    Returns:
+        Dict[str, Any]: A dictionary containing:
+            - 'playlists': one dictionary per playlist ('id', 'title', 'thumbnail_url', 'privacy_status',
+              'item_count', 'runtime_seconds', 'runtime', 'dead_count', 'duplicate_count'), longest first.
+            - 'playlist_count', 'item_count', 'unique_video_count': totals across all playlists.
+            - 'total_runtime' / 'unique_runtime': formatted runtime of every entry / every distinct video.
+            - 'category_mix': category title -> number of distinct videos, most common first.
+            - 'cross_duplicates': videos saved in several playlists ('video_id', 'title', 'playlists').
+            - 'cross_duplicate_count': the number of such videos.
+            - 'dead_entries': unavailable entries ('playlist_id', 'playlist', 'title', 'video_id', 'reason').
+            - 'dead_count': the number of such entries.
+    """
+    playlists: Dict[str, Dict[str, Any]] = {}
+    for response in client.playlists.list_all_mine().values():
+        playlists.update(Playlists.process_raw_playlist(response) or {})
+
+    # Empty playlists need no request; every other playlist is paged through on its own worker
+    to_crawl = [playlist_id for playlist_id, playlist in playlists.items() if playlist['item_count']]
+    with ThreadPoolExecutor(max_workers=settings.PLAYLIST_ANALYTICS_MAX_WORKERS) as executor:
+        crawled = dict(zip(to_crawl, executor.map(lambda playlist_id: crawl_playlist(client, playlist_id), to_crawl)))
+
+    dead_entries: List[Dict[str, str]] = []
+    video_playlists: Dict[str, List[str]] = {}
+    video_titles: Dict[str, str] = {}
+    for playlist_id, (items, _) in crawled.items():
+        for video_id, item in items.items():
+            reason = _dead_reason(item)
+            if reason:
+                dead_entries.append(_dead_entry(playlists[playlist_id], item, reason))
+                continue
+            video_playlists.setdefault(video_id, []).append(playlist_id)
+            video_titles.setdefault(video_id, item['title'])
+
+    metadata = lookup_video_metadata(client, video_playlists)
+
+    # Videos the playlist listing still showed but videos.list no longer returns are dead too
+    for video_id in [video_id for video_id, video in metadata.items() if not video.is_available]:
+        for playlist_id in video_playlists.pop(video_id):
+            item = crawled[playlist_id][0][video_id]
+            dead_entries.append(_dead_entry(playlists[playlist_id], item, 'unavailable'))
+
+    durations = {video_id: metadata[video_id].duration_seconds or 0
+                 for video_id in video_playlists if video_id in metadata}
+    categories = Counter(
+        category_names.get(metadata[video_id].category_id, 'Unknown')
+        for video_id in video_playlists if video_id in metadata
+    )
+
+    playlist_runtimes: Counter = Counter()
+    for video_id, playlist_ids in video_playlists.items():
+        for playlist_id in playlist_ids:
+            playlist_runtimes[playlist_id] += durations.get(video_id, 0)
+    dead_counts = Counter(entry['playlist_id'] for entry in dead_entries)
+
+    playlist_rows = []
+    for playlist_id, playlist in playlists.items():
+        runtime_seconds = playlist_runtimes[playlist_id]
+        playlist_rows.append({
+            'id': playlist_id,
+            'title': playlist['playlist_title'],
+            'thumbnail_url': playlist['thumbnail_url'],
+            'privacy_status': playlist['privacy_status'],
+            'item_count': playlist['item_count'],
+            'runtime_seconds': runtime_seconds,
+            'runtime': format_runtime(runtime_seconds),
+            'dead_count': dead_counts[playlist_id],
+            'duplicate_count': crawled[playlist_id][1] if playlist_id in crawled else 0,
+        })
+    playlist_rows.sort(key=lambda row: row['runtime_seconds'], reverse=True)
+
+    cross_duplicates = sorted(
+        (video_id for video_id, playlist_ids in video_playlists.items() if len(playlist_ids) > 1),
+        key=lambda video_id: len(video_playlists[video_id]),
+        reverse=True
+    )
+
+    return {
+        'playlists': playlist_rows,
+        'playlist_count': len(playlists),
+        'item_count': sum(playlist['item_count'] for playlist in playlists.values()),
+        'unique_video_count': len(video_playlists),
+        'total_runtime': format_runtime(sum(playlist_runtimes.values())),
+        'unique_runtime': format_runtime(sum(durations.values())),
+        'category_mix': dict(categories.most_common()),
+        'cross_duplicates': [
+            {
+                'video_id': video_id,
+                'title': video_titles[video_id],
+                'playlists': [playlists[playlist_id]['playlist_title'] for playlist_id in video_playlists[video_id]],
+            }
+            for video_id in cross_duplicates[:MAX_LISTED]
+        ],
+        'cross_duplicate_count': len(cross_duplicates),
+        'dead_entries': dead_entries[:MAX_LISTED],
+        'dead_count': len(dead_entries),
+    }
+
+def crawl_playlist(client: YouTubeClient, playlist_id: str) -> Tuple[Dict[str, Dict[str, Any]], int]:
+    """
+    Fetch every item of one playlist.
+
+    Args:
+        client (YouTubeClient): The YouTubeClient instance for making API requests.
+        playlist_id (str): The ID of the playlist to crawl.
+
+    Returns:
+        Tuple[Dict[str, Dict[str, Any]], int]: Video IDs mapped to processed playlist items, and the
+        number of entries that repeat a video already in the playlist.
+    """
+    items: Dict[str, Dict[str, Any]] = {}
+    raw_count = 0
+    for response in client.playlist_items.list_all(playlist_id, fields=CRAWL_FIELDS).values():
+        processed_items = client.playlist_items.process_raw_items(response) or {}
+        raw_count += len(response.get('items', []))
+        items.update(processed_items)
+    return items, max(raw_count - len(items), 0)
+
+def format_runtime(seconds: int) -> str:
+    """Format a number of seconds as e.g. '3h 05m', or '4m 09s' below one hour."""
+    hours, remainder = divmod(seconds, 3600)
+    minutes, seconds = divmod(remainder, 60)
+    if hours:
+        return f"{hours}h {minutes:02d}m"
+    return f"{minutes}m {seconds:02d}s"
+
+def _dead_reason(item: Dict[str, Any]) -> str:
+    """Return why a playlist item can no longer be watched ('deleted' or 'private'), or '' if it can."""
+    if item['title'] == 'Deleted video':
+        return 'deleted'
+    if item['title'] in DEAD_TITLES or item['privacy_status'] in DEAD_PRIVACY_STATUSES:
+        return 'private'
+    return ''
+
+def _dead_entry(playlist: Dict[str, Any], item: Dict[str, Any], reason: str) -> Dict[str, str]:
+    return {
+        'playlist_id': playlist['id'],
+        'playlist': playlist['playlist_title'],
+        'title': item['title'],
+        'video_id': item['video_id'],
+        'reason': reason,
+    }
@@ -0,0 +1,211 @@
+"""
+Responsible for splitting watch history into viewing sessions, such as:
+    - Counting sessions and their length distribution.
+    - Detecting binge sessions.
+    - Finding the longest streak of consecutive viewing days.
+
+All statistics are computed in a single pass over time-sorted timestamps with constant memory,
+so they work on the full Takeout column or, chunk by chunk, on a streamed upload alike.
+"""
+
+# Standard Library Imports
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional
+
+# Third-Party Imports
+from django.conf import settings
+
+# Local App Imports
+from metrics.utils.date_helper import SECONDS_PER_DAY, epoch_day_to_date, localize_epochs
+
+# Upper edges (in minutes) of the session length histogram buckets; the last bucket is open-ended
+SESSION_LENGTH_BUCKETS = [5, 15, 30, 60, 120, 240]
+
+class SessionTracker:
+    """
+    Incrementally sessionizes a stream of watch timestamps.
+
+    Timestamps must arrive sorted, either oldest-first or newest-first (Takeout exports are
+    newest-first). A new session starts whenever two consecutive timestamps are more than
+    `gap_seconds` apart. `out_of_order` is set once the direction changes, after which the
+    results are not meaningful.
+    """
+    def __init__(self, gap_seconds: int, binge_min_videos: int) -> None:
+        """
+        Initializes the tracker.
+
+        Args:
+            gap_seconds (int): The largest gap between two videos that still counts as one session.
+            binge_min_videos (int): The number of videos in one session that makes it a binge.
+        """
+        self.gap_seconds = gap_seconds
+        self.binge_min_videos = binge_min_videos
+
+        self.session_count = 0
+        self.video_count = 0
+        self.total_duration = 0
+        self.binge_count = 0
+        self.length_histogram = [0] * (len(SESSION_LENGTH_BUCKETS) + 1)
+        self.binges_by_month: Counter = Counter() # at most one key per month of history
+        self.longest_session: Optional[Dict[str, Any]] = None
+        self._longest_duration = -1
+
+        self.longest_streak = 0
+        self.longest_streak_days: Optional[tuple] = None
+
+        # Current session state
+        self._last_epoch: Optional[int] = None
+        self._session_first_epoch = 0
+        self._session_first_day = 0
+        self._session_videos = 0
+
+        # Current streak state
+        self._last_day: Optional[int] = None
+        self._streak_first_day = 0
+        self._streak = 0
+
+        self.out_of_order = False
+        self._direction = 0 # 1 oldest-first, -1 newest-first, 0 not known yet
+
+    def update(self, epoch: int, local_epoch: Optional[int] = None) -> None:
+        """
+        Consume one watch event.
+
+        Args:
+            epoch (int): The UTC epoch seconds of the event, used for gap detection.
+            local_epoch (Optional[int]): The same instant in local wall-clock seconds, used for day
+                                         boundaries. Defaults to `epoch` (UTC days).
+        """
+        day = (epoch if local_epoch is None else local_epoch) // SECONDS_PER_DAY
+        self.video_count += 1
+
+        if self._last_epoch is not None and epoch != self._last_epoch:
+            direction = 1 if epoch > self._last_epoch else -1
+            if self._direction and direction != self._direction:
+                self.out_of_order = True
+            self._direction = direction
+
+        if self._last_epoch is None or abs(epoch - self._last_epoch) > self.gap_seconds:
+            if self._last_epoch is not None:
+                self._close_session()
+            self._session_first_epoch = epoch
+            self._session_first_day = day
+            self._session_videos = 0
+        self._session_videos += 1
+        self._last_epoch = epoch
+
+        if self._last_day is None or abs(day - self._last_day) > 1:
+            self._streak_first_day = day
+            self._streak = 1
+        elif day != self._last_day:
+            self._streak += 1
+        self._last_day = day
+
+        if self._streak > self.longest_streak:
+            self.longest_streak = self._streak
+            self.longest_streak_days = tuple(sorted((self._streak_first_day, day)))
+
+    def consume(self, epochs: Iterable[int], local_epochs: Optional[Iterable[int]] = None) -> 'SessionTracker':
+        """Feed a sorted iterable of epochs (and optionally their local equivalents) into the tracker."""
+        if local_epochs is None:
+            for epoch in epochs:
+                self.update(epoch)
+        else:
+            for epoch, local_epoch in zip(epochs, local_epochs):
+                self.update(epoch, local_epoch)
+        return self
+
+    def _close_session(self) -> None:
+        """Record the statistics of the session that has just ended."""
+        duration = abs(self._last_epoch - self._session_first_epoch)
+        self.session_count += 1
+        self.total_duration += duration
+
+        minutes = duration / 60
+        bucket = next((i for i, edge in enumerate(SESSION_LENGTH_BUCKETS) if minutes < edge), len(SESSION_LENGTH_BUCKETS))
+        self.length_histogram[bucket] += 1
+
+        if self._session_videos >= self.binge_min_videos:
+            self.binge_count += 1
+            self.binges_by_month[epoch_day_to_date(self._session_first_day).strftime('%Y-%m')] += 1
+
+        if duration > self._longest_duration:
+            self._longest_duration = duration
+            start_epoch = min(self._session_first_epoch, self._last_epoch)
+            self.longest_session = {
+                'start_epoch': start_epoch,
+                'duration_minutes': round(duration / 60),
+                'videos': self._session_videos,
+            }
+
+    def results(self) -> Dict[str, Any]:
+        """
+        Finalize the open session and summarize everything seen so far.
+
+        Returns:
+            Dict[str, Any]: A dictionary containing:
+                - 'session_count', 'binge_count', 'video_count'.
+                - 'avg_session_minutes' and 'avg_videos_per_session'.
+                - 'session_length_distribution': histogram labels to session counts.
+                - 'binges_by_month': months (YYYY-MM) to binge session counts, sorted by month.
+                - 'longest_session': start epoch, duration in minutes and video count, or None.
+                - 'longest_streak_days' and 'longest_streak_start'/'longest_streak_end' (YYYY-MM-DD).
+        """
+        if self._last_epoch is not None and self._session_videos:
+            self._close_session()
+            self._session_videos = 0 # make results() idempotent
+
+        labels = [f"< {edge} min" for edge in SESSION_LENGTH_BUCKETS] + [f"{SESSION_LENGTH_BUCKETS[-1]}+ min"]
+        session_count = self.session_count
+        streak_start, streak_end = self.longest_streak_days or (None, None)
+
+        return {
+            'session_count': session_count,
+            'binge_count': self.binge_count,
+            'video_count': self.video_count,
+            'avg_session_minutes': round(self.total_duration / 60 / session_count, 1) if session_count else 0,
+            'avg_videos_per_session': round(self.video_count / session_count, 1) if session_count else 0,
+            'session_length_distribution': dict(zip(labels, self.length_histogram)),
+            'binges_by_month': dict(sorted(self.binges_by_month.items())),
+            'longest_session': self.longest_session,
+            'longest_streak_days': self.longest_streak,
+            'longest_streak_start': epoch_day_to_date(streak_start).isoformat() if streak_start is not None else None,
+            'longest_streak_end': epoch_day_to_date(streak_end).isoformat() if streak_end is not None else None,
+        }
+
+
+def get_session_stats(epochs: List[int],
+                      time_zone: str = 'UTC',
+                      gap_minutes: Optional[int] = None,
+                      binge_min_videos: Optional[int] = None,
+                      local_epochs: Optional[List[int]] = None
+                      ) -> Dict[str, Any]:
+    """
+    Sessionize an in-memory column of watch timestamps.
+
+    Args:
+        epochs (List[int]): UTC epoch seconds of watched videos, in any order.
+        time_zone (str): The IANA time zone used for streak day boundaries.
+        gap_minutes (Optional[int]): Session gap threshold. Defaults to settings.SESSION_GAP_MINUTES.
+        binge_min_videos (Optional[int]): Binge threshold. Defaults to settings.SESSION_BINGE_MIN_VIDEOS.
+        local_epochs (Optional[List[int]]): `epochs` already localized to `time_zone`, in the same
+                                            order, so they are not localized again.
+
+    Returns:
+        Dict[str, Any]: The session statistics described in `SessionTracker.results`.
+    """
+    tracker = new_session_tracker(gap_minutes, binge_min_videos)
+    if local_epochs is None:
+        sorted_epochs = sorted(epochs)
+        return tracker.consume(sorted_epochs, localize_epochs(sorted_epochs, time_zone)).results()
+    # Takeout columns are newest-first, so this sort is a linear pass in practice
+    order = sorted(range(len(epochs)), key=epochs.__getitem__)
+    return tracker.consume((epochs[i] for i in order), (local_epochs[i] for i in order)).results()
+
+
+def new_session_tracker(gap_minutes: Optional[int] = None, binge_min_videos: Optional[int] = None) -> SessionTracker:
+    """Create a tracker, falling back to the configured thresholds."""
+    return SessionTracker(
+        gap_seconds=(gap_minutes or settings.SESSION_GAP_MINUTES) * 60,
+        binge_min_videos=binge_min_videos or settings.SESSION_BINGE_MIN_VIDEOS,
+    )
@@ -1,24 +1,43 @@
 # Standard Library Imports
-from typing import Any, Dict, Generator
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
 
 # Third-Party Imports
+from django.conf import settings
 from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.utils import timezone
 
 # Local App Imports
+from metrics.models import ChannelProfile
 from metrics.utils.api_client import YouTubeClient
+from metrics.utils.cache_helper import (get_user_artifact, set_user_artifact,
+                                        user_cache_key)
 from metrics.utils.date_helper import isostr_to_datetime
+from metrics.utils.snapshot_helper import SORT_OPTIONS, SubscriptionSnapshot
+from metrics.utils.task_helper import run_in_background
 from metrics.utils.types import ApiResponse
 
-def get_subscription_list_context(user: User, page_num: int) -> Dict[str, Any]:
+API_PAGE_SIZE = 50 # Max number of subscriptions per API call
+PAGE_TOKEN_INDEX = 'subscription_page_tokens'
+SNAPSHOT_ARTIFACT = 'subscription_snapshot'
+SNAPSHOT_CHANNEL_PARTS = "snippet,contentDetails,statistics,topicDetails"
+
+def get_subscription_list_context(user: User, page_num: int, sort: Optional[str] = None, topic: Optional[str] = None) -> Dict[str, Any]:
     """
     Build context for the `subscriptions_list` view.
 
-    This function fetches a paginated list of the user's subscriptions,
-    enriches it with detailed channel statistics, and provides pagination context.
+    Without a sort or topic, this function fetches one page of the user's subscriptions live,
+    enriches it with detailed channel statistics, and provides pagination context. Sorted or
+    filtered pages are served from the user's subscription snapshot, which is built in the
+    background the first time a sort or topic is requested and makes no API calls at view time.
 
     Args:
         user (User): The authenticated Django user object.
         page_num (int): The page number to retrieve.
+        sort (Optional[str]): One of `SORT_OPTIONS` (e.g. 'subscribers', 'newest').
+        topic (Optional[str]): Only show channels tagged with this topic.
 
     Returns:
         A dictionary containing the processed subscription data for the
@@ -28,17 +47,40 @@ def get_subscription_list_context(user: User, page_num: int) -> Dict[str, Any]:
         - 'next_page_number': The number of the next page.
         - 'has_previous_page': A boolean indicating if there is a previous page.
         - 'previous_page_number': The number of the previous page.
+        - 'sort', 'topic', 'sort_options' and 'topic_options': The active and available sort/filter choices.
+        - 'snapshot_status': 'ready', 'building' or 'missing'.
     """
+    sort = sort if sort in SORT_OPTIONS else None
+    # Plain pages are served live, so only a sort or filter is worth a full snapshot build
+    snapshot = get_subscription_snapshot(user, build=bool(sort or topic))
+
+    if snapshot is not None and (sort or topic):
+        pagination_data = snapshot.page(sort=sort or 'title', topic=topic, page_num=page_num)
+        pagination_data.update({
+            'next_page_number': page_num + 1,
+            'previous_page_number': page_num - 1,
+            'has_previous_page': page_num > 1,
+        })
+    else:
+        pagination_data = _get_live_subscription_page(user, page_num)
+
+    pagination_data.update({
+        'sort': sort or '',
+        'topic': topic or '',
+        'sort_options': list(SORT_OPTIONS),
+        'topic_options': snapshot.topic_counts() if snapshot is not None else [],
+        'snapshot_status': 'ready' if snapshot is not None else 'building' if is_snapshot_building(user.id) else 'missing',
+    })
+    return pagination_data
+
+def _get_live_subscription_page(user: User, page_num: int) -> Dict[str, Any]:
+    """Fetch one page of subscriptions and their channel statistics from the API."""
     # Obtain creds from database
     creds = user.usercredential
     client = YouTubeClient(credentials=creds)
 
-    # Get the paginated subscription data
-    subscription_generator = client.subscriptions.stream_user_subscriptions()
-    pagination_data = get_paginated_subscriptions(
-        subscription_generator,
-        page_num=page_num,
-    )
+    # Get the paginated subscription data, resuming from a cached page token
+    pagination_data = get_paginated_subscriptions(client, user.id, page_num=page_num)
 
     # Get additional statistics on current page of subscriptions (25 max)
     subs_on_page = pagination_data.get('subscriptions', {})
@@ -55,23 +97,26 @@ def get_subscription_list_context(user: User, page_num: int) -> Dict[str, Any]:
     return pagination_data
 
 def get_paginated_subscriptions(
-    subscription_generator: Generator[ApiResponse, None, None], 
-    page_num: int = 1, 
+    client: YouTubeClient,
+    user_id: int,
+    page_num: int = 1,
     items_per_page: int = 25
 ) -> ApiResponse:
     """
-    Paginates subscription data from a generator and formats it for display.
+    Fetches one display page of the user's subscriptions and formats it for display.
 
-    This function consumes a generator that yields raw subscription data from the YouTube API.
-    It processes the data, extracts relevant fields, and returns a paginated list of
-    subscriptions, along with context for pagination controls (e.g., next/previous page).
+    The API returns 50 subscriptions per page, reachable only through the previous page's
+    `nextPageToken`. The token of every API page seen so far is cached per user, so a display
+    page normally costs a single `subscriptions.list` call. Unknown tokens are filled in by
+    walking forward from the nearest known page. The cache is discarded whenever the API
+    reports a different total, since added or removed subscriptions shift every later page.
 
     Args:
-        subscription_generator (Generator[ApiResponse, None, None]): A generator that yields
-            raw subscription item dictionaries from the YouTube API.
+        client (YouTubeClient): An authenticated client for the user.
+        user_id (int): The ID of the user, used to key the page-token cache.
         page_num (int, optional): The page number to retrieve (1-indexed). Defaults to 1.
-        items_per_page (int, optional): The number of items to display per page.
-            Defaults to 25.
+        items_per_page (int, optional): The number of items to display per page. Must divide
+            the API page size (50). Defaults to 25.
 
     Returns:
         ApiResponse: A dictionary containing the processed subscriptions for the
@@ -83,36 +128,20 @@ def get_paginated_subscriptions(
             - 'previous_page_number' (int): The number of the previous page.
             - 'has_previous_page' (bool): True if there is a previous page, False otherwise.
     """
+    page_num = max(page_num, 1)
     start_idx = (page_num - 1) * items_per_page
-    end_idx = start_idx + items_per_page
-    
+    api_page, offset = divmod(start_idx, API_PAGE_SIZE)
+
+    response = _fetch_subscription_api_page(client, user_id, api_page)
+    items = response.get('items', []) if response else []
+    page_items = items[offset:offset + items_per_page]
+
     processed_subs = {}
-    has_next_page = False
-    
-    # Iterate through the generator with an index to track page progress
-    for i, sub in enumerate(subscription_generator):
-        # Stop by page/inde
-        if i >= end_idx:
-            has_next_page = True
-            break
-
-        # If curr idx is in the range of the current page, process the item
-        if i >= start_idx:
-            snippet = sub.get('snippet', {})
-            content_details = sub.get('contentDetails', {})
-
-            # Build processed subscription dictionary
-            channel_id = snippet.get('resourceId', {}).get('channelId', '')
-            subscription_data = {
-                'channel_title': snippet.get('title', 'N/A'),
-                'channel_id': snippet.get('resourceId', {}).get('channelId'),
-                'profile_picture_url': snippet.get('thumbnails', {}).get('default', {}).get('url'),
-                'published_at': isostr_to_datetime(snippet.get('publishedAt', None)),
-                'total_item_count': content_details.get('totalItemCount', 0),
-                'new_item_count': content_details.get('newItemCount', 0)
-            }
-
-            processed_subs[channel_id] = subscription_data
+    for sub in page_items:
+        subscription_data = process_subscription_item(sub)
+        processed_subs[subscription_data['channel_id'] or ''] = subscription_data
+
+    has_next_page = offset + items_per_page < len(items) or bool(response and response.get('nextPageToken'))
 
     return {
         'subscriptions': processed_subs,
@@ -121,3 +150,208 @@ def get_paginated_subscriptions(
         'previous_page_number': page_num - 1,
         'has_previous_page': page_num > 1
     }
+
+def process_subscription_item(sub: ApiResponse) -> Dict[str, Any]:
+    """
+    Extracts the displayed fields of a raw subscription item.
+
+    Args:
+        sub (ApiResponse): A single item of a `subscriptions.list` response.
+
+    Returns:
+        Dict[str, Any]: The channel title, ID, profile picture URL, subscription date and item counts.
+    """
+    snippet = sub.get('snippet', {})
+    content_details = sub.get('contentDetails', {})
+    return {
+        'channel_title': snippet.get('title', 'N/A'),
+        'channel_id': snippet.get('resourceId', {}).get('channelId'),
+        'profile_picture_url': snippet.get('thumbnails', {}).get('default', {}).get('url'),
+        'published_at': isostr_to_datetime(snippet.get('publishedAt', None)),
+        'total_item_count': content_details.get('totalItemCount', 0),
+        'new_item_count': content_details.get('newItemCount', 0)
+    }
+
+def _fetch_subscription_api_page(client: YouTubeClient, user_id: int, api_page: int) -> Optional[ApiResponse]:
+    """
+    Fetch one 50-item API page of the user's subscriptions using the cached page-token index.
+
+    Args:
+        client (YouTubeClient): An authenticated client for the user.
+        user_id (int): The ID of the user.
+        api_page (int): The 0-indexed API page.
+
+    Returns:
+        Optional[ApiResponse]: The API response, or None if the page does not exist or a request failed.
+    """
+    index = get_user_artifact(user_id, PAGE_TOKEN_INDEX) or _new_page_token_index()
+
+    response, total_changed = _walk_to_api_page(client, index, api_page)
+    if total_changed:
+        # Subscriptions were added or removed, so cached tokens may point at shifted pages
+        index = _new_page_token_index()
+        response, _ = _walk_to_api_page(client, index, api_page)
+
+    set_user_artifact(user_id, PAGE_TOKEN_INDEX, index)
+    return response
+
+def _walk_to_api_page(client: YouTubeClient, index: Dict[str, Any], api_page: int) -> Tuple[Optional[ApiResponse], bool]:
+    """
+    Request pages from the nearest known token up to `api_page`, recording every new token in `index`.
+
+    Returns:
+        Tuple[Optional[ApiResponse], bool]: The response for `api_page` (None if it does not exist or
+        a request failed) and whether the reported total no longer matches the index.
+    """
+    tokens: Dict[int, Optional[str]] = index['tokens']
+    response = None
+    for current_page in range(max(page for page in tokens if page <= api_page), api_page + 1):
+        if current_page not in tokens:
+            return None, False # the previous page was the last one
+
+        response = client.subscriptions.list(page_token=tokens[current_page], max_results=API_PAGE_SIZE)
+        if not response:
+            return None, False
+
+        total_results = response.get('pageInfo', {}).get('totalResults')
+        if index['total_results'] is not None and total_results != index['total_results']:
+            return None, True
+        index['total_results'] = total_results
+
+        if response.get('nextPageToken'):
+            tokens[current_page + 1] = response['nextPageToken']
+    return response, False
+
+def _new_page_token_index() -> Dict[str, Any]:
+    """Return an empty page-token index; the first API page needs no token."""
+    return {'total_results': None, 'tokens': {0: None}}
+
+def get_subscription_snapshot(user: User, build: bool = True) -> Optional[SubscriptionSnapshot]:
+    """
+    Return the user's subscription snapshot, starting a background (re)build if it is missing or stale.
+
+    A snapshot with channels whose statistics could not be fetched is rebuilt sooner, after
+    SUBSCRIPTION_SNAPSHOT_RETRY_AGE. Only one build runs per user across all workers.
+
+    Args:
+        user (User): The authenticated Django user object.
+        build (bool): Whether to start a build if needed; False only reads the stored snapshot.
+
+    Returns:
+        Optional[SubscriptionSnapshot]: The latest snapshot (possibly stale while a rebuild runs),
+        or None if none has been built yet.
+    """
+    snapshot = get_user_artifact(user.id, SNAPSHOT_ARTIFACT)
+    if not build:
+        return snapshot
+
+    if snapshot is None:
+        stale = True
+    else:
+        max_age = settings.SUBSCRIPTION_SNAPSHOT_RETRY_AGE if getattr(snapshot, 'incomplete_count', 0) else settings.SUBSCRIPTION_SNAPSHOT_MAX_AGE
+        stale = time.time() - snapshot.built_at > max_age
+    # The marker keeps other workers from starting the same build; it is cleared when the build ends
+    if stale and cache.add(_snapshot_build_key(user.id), True, settings.SUBSCRIPTION_SNAPSHOT_BUILD_TIMEOUT):
+        run_in_background(_snapshot_task_key(user.id), build_subscription_snapshot, user.id)
+    return snapshot
+
+def is_snapshot_building(user_id: int) -> bool:
+    """Check whether a snapshot build for the user is running in any worker."""
+    return bool(cache.get(_snapshot_build_key(user_id)))
+
+def build_subscription_snapshot(user_id: int) -> SubscriptionSnapshot:
+    """
+    Fetch every subscription and its channel statistics, and store the result as the user's snapshot.
+
+    Subscription pages are streamed first (each page needs the previous page's token), after which
+    channel statistics are fetched with 50-ID `channels.list` calls, sent as batch requests of
+    YOUTUBE_API_BATCH_SIZE calls over a thread pool. A failed call is retried once on its own; if it
+    fails again, its channels keep only their subscription data and are counted in the snapshot's
+    `incomplete_count`.
+
+    Args:
+        user_id (int): The ID of the user whose subscriptions should be captured.
+
+    Returns:
+        SubscriptionSnapshot: The stored snapshot.
+    """
+    try:
+        user = User.objects.select_related('usercredential').get(pk=user_id)
+        client = YouTubeClient(credentials=user.usercredential)
+
+        rows: Dict[str, Dict[str, Any]] = {}
+        for sub in client.subscriptions.stream_user_subscriptions():
+            row = process_subscription_item(sub)
+            if row['channel_id']:
+                rows[row['channel_id']] = row
+
+        channel_ids = list(rows)
+        id_chunks = [channel_ids[i:i + API_PAGE_SIZE] for i in range(0, len(channel_ids), API_PAGE_SIZE)]
+        groups = [id_chunks[i:i + settings.YOUTUBE_API_BATCH_SIZE]
+                  for i in range(0, len(id_chunks), settings.YOUTUBE_API_BATCH_SIZE)]
+
+        def fetch_group(group: List[List[str]]) -> List[Optional[ApiResponse]]:
+            with client.batch() as batch:
+                calls = [batch.channels.list(part=SNAPSHOT_CHANNEL_PARTS, channel_ids=",".join(chunk)) for chunk in group]
+            return [call.response for call in calls]
+
+        with ThreadPoolExecutor(max_workers=settings.SUBSCRIPTION_SNAPSHOT_MAX_WORKERS) as executor:
+            responses = [response for group_responses in executor.map(fetch_group, groups) for response in group_responses]
+
+        incomplete_count = 0
+        for chunk, response in zip(id_chunks, responses):
+            if not response:
+                response = client.channels.list(part=SNAPSHOT_CHANNEL_PARTS, channel_ids=",".join(chunk))
+            processed_channel_stats = client.channels.process_raw_stats(response) if response else None
+            if processed_channel_stats is None:
+                incomplete_count += len(chunk)
+                continue
+            store_channel_profiles(processed_channel_stats) # subscribed channels become recommendation candidates
+            for channel_id, channel_data in processed_channel_stats.items():
+                if channel_id in rows:
+                    rows[channel_id].update(channel_data)
+
+        snapshot = SubscriptionSnapshot(list(rows.values()), incomplete_count=incomplete_count)
+        set_user_artifact(user_id, SNAPSHOT_ARTIFACT, snapshot)
+        return snapshot
+    finally:
+        cache.delete(_snapshot_build_key(user_id))
+
+def store_channel_profiles(channel_data: Dict[str, Dict[str, Any]]) -> None:
+    """
+    Insert or update channel profiles from processed `channels.list` data.
+
+    Args:
+        channel_data (Dict[str, Dict[str, Any]]): Channel IDs mapped to data as returned by
+            `Channels.process_raw_stats` (uses 'channel_name', 'channel_pfp_url' and 'topics').
+    """
+    now = timezone.now()
+    profiles = {
+        channel_id: ChannelProfile(
+            channel_id=channel_id,
+            title=data.get('channel_name', '')[:255],
+            profile_picture_url=data.get('channel_pfp_url', '')[:255],
+            topics=data.get('topics', []),
+            updated_at=now,
+        )
+        for channel_id, data in channel_data.items()
+        if channel_id
+    }
+    if not profiles:
+        return
+
+    existing = set(ChannelProfile.objects.filter(pk__in=list(profiles)).values_list('channel_id', flat=True))
+    ChannelProfile.objects.bulk_create(
+        [profile for channel_id, profile in profiles.items() if channel_id not in existing],
+        ignore_conflicts=True
+    )
+    ChannelProfile.objects.bulk_update(
+        [profile for channel_id, profile in profiles.items() if channel_id in existing],
+        ['title', 'profile_picture_url', 'topics', 'updated_at']
+    )
+
+def _snapshot_task_key(user_id: int) -> str:
+    return f"subscription_snapshot:{user_id}"
+
+def _snapshot_build_key(user_id: int) -> str:
+    return user_cache_key(user_id, 'subscription_snapshot_build')
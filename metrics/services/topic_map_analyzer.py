@@ -0,0 +1,151 @@
+"""
+Responsible for mapping the topics of all subscribed channels, such as:
+    - Topic distribution across the whole subscription list, weighted per subscription.
+    - Overlap between subscribed-channel topics and liked-video topics.
+
+Channel topics come from the user's subscription snapshot (see `subscription_analyzer`), so the
+channels are fetched once in 50-ID batches and shared with the sorted subscription list. The
+resulting map is stored per user and only recomputed when a newer snapshot is available.
+"""
+
+# Standard Library Imports
+from collections import Counter
+from typing import Any, Dict, List, Optional
+
+# Third-Party Imports
+from django.contrib.auth.models import User
+
+# Local App Imports
+from metrics.utils.api_client import YouTubeClient
+from metrics.utils.cache_helper import get_user_artifact, set_user_artifact
+from metrics.utils.snapshot_helper import SubscriptionSnapshot
+from .content_analyzer import get_liked_topic_freqs
+from .subscription_analyzer import get_subscription_snapshot
+from .visualizer import create_grouped_bar_chart_dict, create_plotly_chart_dict
+
+TOPIC_MAP_ARTIFACT = 'subscription_topic_map'
+MAX_COMPARED_TOPICS = 15 # Topics shown in the subscribed vs. liked comparison chart
+
+def get_subscription_topic_map_context(user: User) -> Dict[str, Any]:
+    """
+    Build context for the `subscription_topic_map` view.
+
+    The resulting context dictionary contains:
+        - 'snapshot_ready': False while the subscription snapshot is still being built.
+        - 'topic_map': the stored analysis (see `compute_topic_map`).
+        - 'topic_map_chart': a treemap chart dict of weighted subscription topics.
+        - 'topic_comparison_chart': a grouped bar chart dict of subscribed vs. liked topic shares.
+    """
+    snapshot = get_subscription_snapshot(user)
+    if snapshot is None:
+        return {'snapshot_ready': False}
+
+    topic_map = get_user_artifact(user.id, TOPIC_MAP_ARTIFACT)
+    if topic_map is None or topic_map['snapshot_built_at'] != snapshot.built_at:
+        client = YouTubeClient(credentials=user.usercredential)
+        liked_topic_freqs = get_liked_topic_freqs(user, client)
+        topic_map = compute_topic_map(snapshot, liked_topic_freqs)
+        set_user_artifact(user.id, TOPIC_MAP_ARTIFACT, topic_map)
+
+    context: Dict[str, Any] = {'snapshot_ready': True, 'topic_map': topic_map}
+    if topic_map['weighted_topics']:
+        context['topic_map_chart'] = create_plotly_chart_dict(
+            freq_data=topic_map['weighted_topics'],
+            data_name="Subscriptions",
+            chart_type='treemap',
+            chart_title="Topics Across Your Subscriptions"
+        )
+    if topic_map['comparison']:
+        labels = [row['topic'] for row in topic_map['comparison']]
+        context['topic_comparison_chart'] = create_grouped_bar_chart_dict(
+            series={
+                'Subscriptions': [row['subscription_share'] for row in topic_map['comparison']],
+                'Liked Videos': [row['liked_share'] for row in topic_map['comparison']],
+            },
+            x_labels=labels,
+            chart_title="Subscribed vs. Liked Topics",
+            y_title="Share (%)"
+        )
+    return context
+
+def compute_topic_map(snapshot: SubscriptionSnapshot, liked_topic_freqs: Optional[Dict[str, int]]) -> Dict[str, Any]:
+    """
+    Aggregate channel topics over a subscription snapshot and compare them with liked-video topics.
+
+    Every subscription carries a total weight of 1, split evenly across its topics, so channels
+    tagged with many topics do not dominate the distribution.
+
+    Args:
+        snapshot (SubscriptionSnapshot): The user's subscription snapshot.
+        liked_topic_freqs (Optional[Dict[str, int]]): Topic frequencies of the user's liked videos.
+
+    Returns:
+        Dict[str, Any]: A dictionary containing:
+            - 'snapshot_built_at': the snapshot this map was computed from.
+            - 'channel_count' / 'channels_without_topics': subscription totals.
+            - 'weighted_topics': topic -> weighted subscription count, most common first.
+            - 'channel_counts': topic -> number of channels tagged with it.
+            - 'overlap': histogram intersection of the two topic distributions (0-1), or None without liked data.
+            - 'comparison': the top topics with their 'subscription_share' and 'liked_share' percentages.
+            - 'subscribed_only' / 'liked_only': top topics that appear on one side only.
+    """
+    weighted: Counter = Counter()
+    channel_counts: Counter = Counter()
+    untagged = 0
+    for topic_ids in snapshot.channel_topics:
+        if not topic_ids:
+            untagged += 1
+            continue
+        weight = 1 / len(topic_ids)
+        for topic_id in topic_ids:
+            topic = snapshot.topics[topic_id]
+            weighted[topic] += weight
+            channel_counts[topic] += 1
+
+    topic_map: Dict[str, Any] = {
+        'snapshot_built_at': snapshot.built_at,
+        'channel_count': len(snapshot),
+        'channels_without_topics': untagged,
+        'weighted_topics': {topic: round(weight, 2) for topic, weight in weighted.most_common()},
+        'channel_counts': dict(channel_counts.most_common()),
+        'overlap': None,
+        'comparison': [],
+        'subscribed_only': [],
+        'liked_only': [],
+    }
+
+    liked = Counter(liked_topic_freqs or {})
+    subscription_total = sum(weighted.values())
+    liked_total = sum(liked.values())
+    if not subscription_total or not liked_total:
+        return topic_map
+
+    subscription_shares = {topic: weight / subscription_total for topic, weight in weighted.items()}
+    liked_shares = {topic: count / liked_total for topic, count in liked.items()}
+    all_topics = subscription_shares.keys() | liked_shares.keys()
+
+    topic_map['overlap'] = round(sum(
+        min(subscription_shares.get(topic, 0), liked_shares.get(topic, 0)) for topic in all_topics
+    ), 3)
+
+    top_topics = sorted(
+        all_topics,
+        key=lambda topic: subscription_shares.get(topic, 0) + liked_shares.get(topic, 0),
+        reverse=True
+    )[:MAX_COMPARED_TOPICS]
+    topic_map['comparison'] = [
+        {
+            'topic': topic,
+            'subscription_share': round(100 * subscription_shares.get(topic, 0), 1),
+            'liked_share': round(100 * liked_shares.get(topic, 0), 1),
+        }
+        for topic in top_topics
+    ]
+    topic_map['subscribed_only'] = _top_exclusive(subscription_shares, liked_shares)
+    topic_map['liked_only'] = _top_exclusive(liked_shares, subscription_shares)
+    return topic_map
+
+def _top_exclusive(shares: Dict[str, float], other_shares: Dict[str, float], limit: int = 5) -> List[str]:
+    """Return the largest topics of one distribution that never appear in the other."""
+    exclusive = [topic for topic in shares if topic not in other_shares]
+    return sorted(exclusive, key=shares.get, reverse=True)[:limit]
@@ -1,8 +1,30 @@
+"""
+Builds Plotly chart specifications as plain dictionaries.
+
+The specs contain only the traces and layout properties each chart sets, without constructing
+`plotly.graph_objects` figures (which validate every property and embed the full default template);
+Plotly.js fills in its own defaults in the browser. Charts embedded in a page are passed to the
+template as dictionaries (for `json_script`); charts fetched from the AJAX chart endpoints go through
+`create_plotly_chart_json`, which memoizes the serialized JSON by its inputs, so serving an unchanged
+chart again skips all chart work.
+"""
+
 # Standard Library Imports
-from typing import Any, Dict
+import json
+from functools import lru_cache
+from typing import Any, Dict, List, Tuple
+
+CHART_JSON_CACHE_SIZE = 128 # Serialized charts kept per process
 
-# Third-Party Imports
-import plotly.graph_objects as go
+# Define a blue color scale
+BLUE_COLORSCALE = [
+    [0, 'rgb(204, 204, 255)'],  # Lightest blue
+    [0.2, 'rgb(153, 153, 255)'],
+    [0.4, 'rgb(102, 102, 255)'],
+    [0.6, 'rgb(51, 51, 255)'],
+    [0.8, 'rgb(100, 100, 200)'],    # Softer pure blue
+    [1, 'rgb(50, 50, 150)']     # Darkest blue (softer)
+]
 
 
 def create_plotly_chart_dict(freq_data: Dict[str, int], data_name: str, chart_type: str, chart_title: str) -> Dict[str, Any]:
@@ -12,7 +34,8 @@ def create_plotly_chart_dict(freq_data: Dict[str, int], data_name: str, chart_ty
     Args:
         freq_data: A dictionary with item names as keys and their frequencies as values.
         data_name: The name of the data being plotted (e.g., "Topic", "Category").
-        chart_type: The type of chart to generate ('bar', 'donut', or 'line').
+        chart_type: The type of chart to generate ('bar', 'donut', 'timeseries_bar', 'daily_needle_chart', 'column',
+                    'session_length_histogram', 'binge_timeline', 'divergence_line', 'treemap', or 'line').
         chart_title: The title of the chart.
 
     Returns:
@@ -23,72 +46,188 @@ def create_plotly_chart_dict(freq_data: Dict[str, int], data_name: str, chart_ty
         sorted_items = sorted(freq_data.items(), key=lambda x: x[1])
     else:
         sorted_items = freq_data.items()
-        
+
     labels = [item[0] for item in sorted_items]
     values = [item[1] for item in sorted_items]
 
     if chart_type == 'bar':
-        fig = go.Figure(data=[go.Bar(x=values, y=labels, orientation='h')])
-        fig.update_layout(
-            title_text=chart_title,
-            xaxis_title="Frequency",
-            yaxis=dict(tickmode='array', tickvals=labels, ticktext=labels),
-            margin=dict(l=150), # Add left margin to prevent labels from being cut off
+        data = [{'type': 'bar', 'x': values, 'y': labels, 'orientation': 'h'}]
+        layout = _layout(
+            chart_title,
+            xaxis=_axis("Frequency"),
+            yaxis={'tickmode': 'array', 'tickvals': labels, 'ticktext': labels},
+            margin={'l': 150}, # Add left margin to prevent labels from being cut off
             height=max(400, len(labels) * 25) # Dynamically adjust height
         )
     elif chart_type == 'donut':
         legend_title = "Categories" if data_name == "Category" else data_name + 's'
-        fig = go.Figure(data=[go.Pie(labels=labels, values=values, hole=.4)])
-        fig.update_layout(
-            title_text=chart_title,
-            legend_title_text=legend_title
-        )
+        data = [{'type': 'pie', 'labels': labels, 'values': values, 'hole': 0.4}]
+        layout = _layout(chart_title, legend={'title': {'text': legend_title}})
     elif chart_type == 'timeseries_bar':
-        # Define a blue color scale
-        blue_colorscale = [
-            [0, 'rgb(204, 204, 255)'],  # Lightest blue
-            [0.2, 'rgb(153, 153, 255)'],
-            [0.4, 'rgb(102, 102, 255)'],
-            [0.6, 'rgb(51, 51, 255)'],
-            [0.8, 'rgb(100, 100, 200)'],    # Softer pure blue
-            [1, 'rgb(50, 50, 150)']     # Darkest blue (softer)
-        ]
-
-        fig = go.Figure(data=[go.Bar(
-            x=labels,
-            y=values,
-            marker=dict(
-                color=values,  # Color based on the 'values' (number of videos watched)
-                colorscale=blue_colorscale,
-                showscale=True
-            )
-        )])
-        fig.update_layout(
-            title_text=chart_title,
-            xaxis_title="Month",
-            yaxis_title="Number of Videos Watched",
-            width=None,
-            height=None,
-            xaxis_rangeslider_visible=True
+        data = [{
+            'type': 'bar',
+            'x': labels,
+            'y': values,
+            'marker': {
+                'color': values, # Color based on the 'values' (number of videos watched)
+                'colorscale': BLUE_COLORSCALE,
+                'showscale': True,
+            },
+        }]
+        layout = _layout(
+            chart_title,
+            xaxis=_axis("Month", rangeslider={'visible': True}),
+            yaxis=_axis("Number of Videos Watched")
         )
     elif chart_type == 'daily_needle_chart':
-        fig = go.Figure(data=[go.Scatter(x=labels, y=values, mode='lines', line=dict(width=1, color='#FF9999'))])
-        fig.update_layout(
-            title_text=chart_title,
-            xaxis_title="Date",
-            yaxis_title="Number of Videos Watched",
-            width=None,
-            height=None,
+        data = [{'type': 'scatter', 'x': labels, 'y': values, 'mode': 'lines', 'line': {'width': 1, 'color': '#FF9999'}}]
+        layout = _layout(
+            chart_title,
+            xaxis=_axis("Date"),
+            yaxis=_axis("Number of Videos Watched"),
             showlegend=False
         )
+    elif chart_type == 'column':
+        # Vertical bars in the given order (e.g. hours of the day, weekdays)
+        data = [{'type': 'bar', 'x': labels, 'y': values, 'marker': {'color': '#d9534f'}}]
+        layout = _layout(
+            chart_title,
+            xaxis=_axis(data_name, type='category'),
+            yaxis=_axis("Number of Videos Watched")
+        )
+    elif chart_type == 'session_length_histogram':
+        data = [{'type': 'bar', 'x': labels, 'y': values, 'marker': {'color': '#5b7bd5'}}]
+        layout = _layout(
+            chart_title,
+            xaxis=_axis("Session Length", type='category'),
+            yaxis=_axis("Number of Sessions"),
+            bargap=0.05
+        )
+    elif chart_type == 'binge_timeline':
+        data = [{'type': 'bar', 'x': labels, 'y': values, 'marker': {'color': '#d9534f'}}]
+        layout = _layout(
+            chart_title,
+            xaxis=_axis("Month", rangeslider={'visible': True}),
+            yaxis=_axis(f"Number of {data_name}")
+        )
+    elif chart_type == 'divergence_line':
+        data = [{
+            'type': 'scatter', 'x': labels, 'y': values, 'mode': 'lines+markers',
+            'name': data_name, 'line': {'color': '#5b7bd5'},
+        }]
+        layout = _layout(
+            chart_title,
+            xaxis=_axis("Month"),
+            yaxis=_axis("Divergence from Previous Month", range=[0, 1])
+        )
+    elif chart_type == 'treemap':
+        data = [{
+            'type': 'treemap',
+            'labels': labels,
+            'parents': [""] * len(labels),
+            'values': values,
+            'textinfo': "label+percent root",
+            'hovertemplate': f"%{{label}}<br>%{{value}} {data_name}<extra></extra>",
+        }]
+        layout = _layout(chart_title, margin={'t': 50, 'l': 10, 'r': 10, 'b': 10})
     elif chart_type == 'line':
-        fig = go.Figure(data=go.Scatter(x=labels, y=values, mode='lines+markers'))
-        fig.update_layout(
-            title_text=chart_title,
-            xaxis_title="Date",
-            yaxis_title="Number of Videos Watched"
+        data = [{'type': 'scatter', 'x': labels, 'y': values, 'mode': 'lines+markers'}]
+        layout = _layout(
+            chart_title,
+            xaxis=_axis("Date"),
+            yaxis=_axis("Number of Videos Watched")
         )
     else:
-        fig = go.Figure() # Return an empty figure if chart_type is invalid
+        data, layout = [], {} # Return an empty figure if chart_type is invalid
+
+    return {'data': data, 'layout': layout}
+
+
+def create_plotly_chart_json(freq_data: Dict[str, int], data_name: str, chart_type: str, chart_title: str) -> str:
+    """
+    Serializes a chart from `create_plotly_chart_dict`, memoized by the chart's inputs.
+
+    The JSON is the body of an AJAX chart response (see `json_response`).
+
+    Args:
+        freq_data: A dictionary with item names as keys and their frequencies as values.
+        data_name: The name of the data being plotted.
+        chart_type: The type of chart to generate (see `create_plotly_chart_dict`).
+        chart_title: The title of the chart.
+
+    Returns:
+        The chart as a compact JSON string.
+    """
+    return _cached_chart_json(tuple(freq_data.items()), data_name, chart_type, chart_title)
+
+
+def create_stacked_area_chart_dict(series: Dict[str, List[int]], x_labels: List[str], chart_title: str) -> Dict[str, Any]:
+    """
+    Creates a JSON-serializable dictionary of a Plotly 100% stacked area chart.
+
+    Args:
+        series: A dictionary with series names as keys and one value per x label as values.
+        x_labels: The x-axis labels (e.g., months), in display order.
+        chart_title: The title of the chart.
+
+    Returns:
+        A dictionary representing the Plotly figure, ready for JSON serialization.
+    """
+    data = [
+        {
+            'type': 'scatter',
+            'x': x_labels,
+            'y': values,
+            'name': name,
+            'mode': 'lines',
+            'line': {'width': 0.5},
+            'stackgroup': 'share',
+            'groupnorm': 'percent', # Each month sums to 100%, so mix shifts are not hidden by volume changes
+        }
+        for name, values in series.items()
+    ]
+    layout = _layout(
+        chart_title,
+        xaxis=_axis("Month"),
+        yaxis=_axis("Share of Videos Watched (%)", range=[0, 100], ticksuffix='%'),
+        hovermode='x unified'
+    )
+    return {'data': data, 'layout': layout}
+
+
+def create_grouped_bar_chart_dict(series: Dict[str, List[float]], x_labels: List[str], chart_title: str, y_title: str) -> Dict[str, Any]:
+    """
+    Creates a JSON-serializable dictionary of a Plotly grouped bar chart comparing several series.
+
+    Args:
+        series: A dictionary with series names as keys and one value per x label as values.
+        x_labels: The x-axis labels (e.g., topics), in display order.
+        chart_title: The title of the chart.
+        y_title: The y-axis title.
+
+    Returns:
+        A dictionary representing the Plotly figure, ready for JSON serialization.
+    """
+    data = [{'type': 'bar', 'name': name, 'x': x_labels, 'y': values} for name, values in series.items()]
+    layout = _layout(
+        chart_title,
+        yaxis=_axis(y_title),
+        barmode='group',
+        xaxis={'type': 'category', 'tickangle': -30}
+    )
+    return {'data': data, 'layout': layout}
+
+
+@lru_cache(maxsize=CHART_JSON_CACHE_SIZE)
+def _cached_chart_json(items: Tuple[Tuple[str, int], ...], data_name: str, chart_type: str, chart_title: str) -> str:
+    """Build and serialize one chart; the cache key is the hash of the (immutable) inputs."""
+    chart = create_plotly_chart_dict(dict(items), data_name, chart_type, chart_title)
+    return json.dumps(chart, separators=(',', ':'))
+
+
+def _layout(chart_title: str, **properties: Any) -> Dict[str, Any]:
+    return {'title': {'text': chart_title}, **properties}
+
 
-    return fig.to_dict()
+def _axis(title: str, **properties: Any) -> Dict[str, Any]:
+    return {'title': {'text': title}, **properties}
@@ -1,3 +1,987 @@
-from django.test import TestCase
+# Standard Library Imports
+import io
+import json
+import os
+import random
+import tempfile
+import time
+import zipfile
+from collections import Counter
+from contextlib import contextmanager
+from datetime import date, datetime, timedelta, timezone
+from types import SimpleNamespace
+from unittest import mock
+from zoneinfo import ZoneInfo
 
-# Create your tests here.
\ No newline at end of file
+# Third-Party Imports
+from django.contrib.auth.models import User
+from django.core.cache import cache, caches
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.utils import timezone as django_timezone
+
+# Local App Imports
+from metrics.services.channel_recommender import get_similar_channels_context, recommend_channels
+from metrics.services.drift_analyzer import compute_drift
+from metrics.services.feed_analyzer import get_upload_feed
+from metrics.models import UserCredential, VideoMetadata, WatchHistoryEnrichment
+from metrics.services.history_analyzer import CHARTS_ARTIFACT, stream_takeout_entries
+from metrics.services.history_enricher import claim_enrichment, enrich_watch_history, start_enrichment
+from metrics.services.playlist_analyzer import analyze_playlists, format_runtime
+from metrics.services.session_analyzer import get_session_stats, new_session_tracker
+from metrics.services.subscription_analyzer import (build_subscription_snapshot, get_paginated_subscriptions,
+                                                    get_subscription_snapshot, is_snapshot_building)
+from metrics.services.topic_map_analyzer import compute_topic_map
+from metrics.utils.admission_helper import (AdmissionBusy, AdmissionRejected, TakeoutAdmissionController,
+                                            estimate_parse_memory_mb)
+from metrics.utils.api_client import BatchCall, YouTubeClient
+from metrics.utils.api_resources.playlistitems import PlaylistItems
+from metrics.utils.api_stub import StubDataset, StubError, build_response
+from metrics.utils.batch_helper import (decode_batch_request, decode_batch_response,
+                                        encode_batch_request, encode_batch_response)
+from metrics.utils.cache_helper import get_user_artifact, set_versioned_user_artifact
+from metrics.utils.cube_helper import TimeCube
+from metrics.utils.date_helper import build_offset_transitions, localize_epochs
+from metrics.utils.downsample_helper import lttb_indices
+from metrics.utils.projection_helper import apply_fields, build_projection, parse_fields
+from metrics.utils.public_cache_helper import fetch_public
+from metrics.utils.search_helper import SearchIndex, decode_postings, encode_postings
+from metrics.utils.sketch_helper import HyperLogLog, SpaceSaving
+from metrics.utils.snapshot_helper import SubscriptionSnapshot
+
+
+def _epoch(year: int, month: int, day: int, hour: int = 0) -> int:
+    return int(datetime(year, month, day, hour, tzinfo=timezone.utc).timestamp())
+
+
+class LttbTests(SimpleTestCase):
+    def test_keeps_every_point_below_threshold(self):
+        self.assertEqual(lttb_indices([3, 1, 2], 10), [0, 1, 2])
+        self.assertEqual(lttb_indices(list(range(100)), 2), list(range(100)))
+
+    def test_keeps_endpoints_and_peaks(self):
+        ys = [0] * 1000
+        ys[437] = 50
+        ys[812] = -50
+        indices = lttb_indices(ys, 20)
+        self.assertEqual(len(indices), 20)
+        self.assertEqual(indices, sorted(indices))
+        self.assertEqual((indices[0], indices[-1]), (0, 999))
+        self.assertIn(437, indices)
+        self.assertIn(812, indices)
+
+
+class SpaceSavingTests(SimpleTestCase):
+    def test_exact_below_capacity(self):
+        sketch = SpaceSaving(capacity=10).update('aabbbc')
+        self.assertEqual(sketch.top(2), [('b', 3, 0), ('a', 2, 0)])
+        self.assertIn('c', sketch)
+        self.assertNotIn('d', sketch)
+
+    def test_heavy_hitters_within_error_bound(self):
+        rng = random.Random(7)
+        items = ['hot'] * 500 + ['warm'] * 200 + [f"cold{rng.randrange(5000)}" for _ in range(3000)]
+        rng.shuffle(items)
+        sketch = SpaceSaving(capacity=50).update(items)
+
+        top = {item: (count, error) for item, count, error in sketch.top(2)}
+        self.assertEqual(set(top), {'hot', 'warm'})
+        for item, true_count in (('hot', 500), ('warm', 200)):
+            count, error = top[item]
+            self.assertGreaterEqual(count, true_count)
+            self.assertLessEqual(count - error, true_count)
+            self.assertLessEqual(count - true_count, sketch.error_bound())
+
+    def test_merge_keeps_totals(self):
+        merged = SpaceSaving(capacity=5).update('aaab').merge(SpaceSaving(capacity=5).update('abb'))
+        self.assertEqual(merged.total, 7)
+        self.assertEqual(merged.top(2), [('a', 4, 0), ('b', 3, 0)])
+
+
+class HyperLogLogTests(SimpleTestCase):
+    def test_estimate_within_error(self):
+        sketch = HyperLogLog(precision=12).update(f"video{i}" for i in range(20000))
+        self.assertLess(abs(sketch.count() - 20000) / 20000, 4 * sketch.relative_error())
+
+    def test_duplicates_and_merge(self):
+        first = HyperLogLog(precision=10).update(str(i) for i in range(100))
+        second = HyperLogLog(precision=10).update(str(i) for i in range(50, 150))
+        self.assertEqual(first.count(), HyperLogLog(precision=10).update(str(i % 100) for i in range(1000)).count())
+        self.assertAlmostEqual(first.merge(second).count(), 150, delta=15)
+
+    def test_rejects_invalid_precision(self):
+        with self.assertRaises(ValueError):
+            HyperLogLog(precision=3)
+
+
+class TimeCubeTests(SimpleTestCase):
+    def setUp(self):
+        # Days since 1970-01-01: 2024-01-30, 2024-01-31 (twice), 2024-02-01, 2024-03-15
+        self.first = date(2024, 1, 30).toordinal() - date(1970, 1, 1).toordinal()
+        days = [self.first, self.first + 1, self.first + 1, self.first + 2, self.first + 45]
+        channels = ['A', 'A', 'B', None, 'B']
+        self.cube = TimeCube.build(days, {'channel': channels})
+
+    def test_build_empty(self):
+        self.assertIsNone(TimeCube.build([], {}))
+
+    def test_prefix_sums(self):
+        prefix = self.cube.prefix_sums['total']['All']
+        self.assertEqual(len(prefix), self.cube.num_days + 1)
+        self.assertEqual(list(prefix[:4]) + [prefix[-1]], [0, 1, 3, 4, 5])
+        self.assertEqual((self.cube.start_date, self.cube.end_date), (date(2024, 1, 30), date(2024, 3, 15)))
+
+    def test_query_by_month(self):
+        result = self.cube.query(date(2024, 1, 1), date(2024, 12, 31), granularity='month', dimension='channel')
+        self.assertEqual(result['labels'], ['2024-01-30', '2024-02-01', '2024-03-01'])
+        self.assertEqual(result['series']['A'], [2, 0, 0])
+        self.assertEqual(result['series']['B'], [1, 0, 1])
+        self.assertEqual(result['total'], 5)
+
+    def test_query_partial_range(self):
+        result = self.cube.query(date(2024, 1, 31), date(2024, 1, 31), granularity='day')
+        self.assertEqual(result['series']['All'], [2])
+        self.assertEqual(result['total'], 2)
+
+    def test_query_rejects_unknown_granularity(self):
+        with self.assertRaises(ValueError):
+            self.cube.query(date(2024, 1, 1), date(2024, 2, 1), granularity='decade')
+
+    def test_daily_series_includes_idle_days(self):
+        first_day, counts = self.cube.daily_series(date(2024, 1, 30), date(2024, 2, 3))
+        self.assertEqual(first_day, self.first)
+        self.assertEqual(counts, [1, 2, 1, 0, 0])
+
+
+class TimeZoneTests(SimpleTestCase):
+    def test_transition_table(self):
+        starts, offsets = build_offset_transitions('America/New_York', _epoch(2024, 1, 1), _epoch(2024, 12, 31))
+        self.assertEqual(offsets, [-5 * 3600, -4 * 3600, -5 * 3600])
+        self.assertEqual(starts[1:], [_epoch(2024, 3, 10, 7), _epoch(2024, 11, 3, 6)])
+
+    def test_localize_matches_zoneinfo(self):
+        tz = ZoneInfo('Europe/Berlin')
+        epochs = [_epoch(2023, 1, 1) + i * 7919 for i in range(5000)]
+        expected = [epoch + int(tz.utcoffset(datetime.fromtimestamp(epoch, tz)).total_seconds()) for epoch in epochs]
+        self.assertEqual(localize_epochs(epochs, 'Europe/Berlin'), expected)
+
+    def test_localize_fixed_offset(self):
+        self.assertEqual(localize_epochs([0, 100], 'UTC'), [0, 100])
+        self.assertEqual(localize_epochs([], 'Asia/Tokyo'), [])
+
+
+class StreamTakeoutEntriesTests(SimpleTestCase):
+    def test_yields_entries_across_chunks(self):
+        entries = [{'title': f"Watched video {i} é漢", 'time': '2024-01-01T00:00:00Z'} for i in range(50)]
+        stream = io.BytesIO(json.dumps(entries, ensure_ascii=False, indent=1).encode('utf-8'))
+        self.assertEqual(list(stream_takeout_entries(stream, read_size=7)), entries)
+
+    def test_empty_array(self):
+        self.assertEqual(list(stream_takeout_entries(io.BytesIO(b' [ ] '))), [])
+
+    def test_rejects_truncated_file(self):
+        stream = io.BytesIO(b'[{"title": "a"}, {"title": "b"}')
+        with self.assertRaises(json.JSONDecodeError):
+            list(stream_takeout_entries(stream, read_size=4))
+
+    def test_rejects_non_array(self):
+        with self.assertRaises(json.JSONDecodeError):
+            list(stream_takeout_entries(io.BytesIO(b'{"title": "a"}')))
+
+
+class SessionStatsTests(SimpleTestCase):
+    def setUp(self):
+        start = _epoch(2024, 3, 1, 20)
+        # Twelve videos 5 minutes apart, then two videos the next day and one three days later
+        self.epochs = [start + i * 300 for i in range(12)] + [start + 86400, start + 86400 + 600, start + 3 * 86400]
+
+    def test_sessions_and_binges(self):
+        stats = get_session_stats(list(reversed(self.epochs)), gap_minutes=30, binge_min_videos=10)
+        self.assertEqual((stats['session_count'], stats['binge_count'], stats['video_count']), (3, 1, 15))
+        self.assertEqual(stats['binges_by_month'], {'2024-03': 1})
+        self.assertEqual(stats['longest_session']['videos'], 12)
+        self.assertEqual(stats['longest_session']['duration_minutes'], 55)
+        self.assertEqual((stats['longest_streak_days'], stats['longest_streak_start']), (2, '2024-03-01'))
+
+    def test_streaks_use_local_days(self):
+        stats = get_session_stats(self.epochs, 'Asia/Tokyo', gap_minutes=30, binge_min_videos=10)
+        self.assertEqual((stats['longest_streak_start'], stats['longest_streak_end']), ('2024-03-02', '2024-03-03'))
+
+    def test_local_epochs_match_time_zone(self):
+        expected = get_session_stats(self.epochs, 'Europe/Berlin')
+        self.assertEqual(get_session_stats(self.epochs, 'Europe/Berlin',
+                                           local_epochs=localize_epochs(self.epochs, 'Europe/Berlin')), expected)
+
+    def test_tracker_matches_batch_and_flags_unsorted_input(self):
+        tracker = new_session_tracker(30, 10)
+        for chunk in (self.epochs[::-1][:5], self.epochs[::-1][5:]):
+            tracker.consume(chunk)
+        self.assertFalse(tracker.out_of_order)
+        self.assertEqual(tracker.results(), get_session_stats(self.epochs, gap_minutes=30, binge_min_videos=10))
+        self.assertTrue(new_session_tracker(30, 10).consume([3, 1, 2]).out_of_order)
+
+
+@override_settings(TAKEOUT_CHUNK_MEMORY_MB=48, TAKEOUT_BYTES_PER_ENTRY=256, TAKEOUT_COLUMN_BYTES_PER_ENTRY=512)
+class ParseMemoryEstimateTests(SimpleTestCase):
+    def test_exact_mode_grows_with_the_columns(self):
+        self.assertEqual(estimate_parse_memory_mb(0, use_sketch=False), 48)
+        self.assertEqual(estimate_parse_memory_mb(100 * 1024 * 1024, use_sketch=False), 48 + 200)
+
+    def test_sketch_mode_is_bounded(self):
+        self.assertEqual(estimate_parse_memory_mb(10 * 1024 ** 3, use_sketch=True), 48)
+
+
+class BatchTests(SimpleTestCase):
+    def test_request_round_trip(self):
+        paths = ['/youtube/v3/videos?part=id&id=a', '/youtube/v3/channels?part=snippet&id=b']
+        body, content_type = encode_batch_request(paths)
+        self.assertTrue(content_type.startswith('multipart/mixed; boundary='))
+        self.assertEqual(decode_batch_request(body, content_type), [('<item0>', paths[0]), ('<item1>', paths[1])])
+
+    def test_response_round_trip(self):
+        body, content_type = encode_batch_response([
+            ('<item1>', 404, 'Not Found', b'{"error": {}}'),
+            ('<item0>', 200, 'OK', b'{"items": []}'),
+        ])
+        self.assertEqual(decode_batch_response(body, content_type),
+                         {0: (200, b'{"items": []}'), 1: (404, b'{"error": {}}')})
+
+    def test_rejects_non_multipart(self):
+        with self.assertRaises(ValueError):
+            decode_batch_response(b'{}', 'application/json')
+
+
+class ProjectionTests(SimpleTestCase):
+    def test_build_projection(self):
+        part, fields = build_projection(['snippet.title', 'snippet.thumbnails.medium.url', 'contentDetails'])
+        self.assertEqual(part, 'snippet,contentDetails')
+        self.assertEqual(fields, 'items(id,snippet(title,thumbnails(medium(url))),contentDetails),'
+                                 'nextPageToken,prevPageToken,pageInfo')
+
+    def test_whole_part_covers_narrower_paths(self):
+        self.assertEqual(build_projection(['snippet', 'snippet.title'])[1].split(',')[:2], ['items(id', 'snippet)'])
+
+    def test_build_projection_requires_a_field(self):
+        with self.assertRaises(ValueError):
+            build_projection([])
+
+    def test_parse_fields_shorthand(self):
+        self.assertEqual(parse_fields('items(id,snippet/title),nextPageToken'),
+                         {'items': {'id': None, 'snippet': {'title': None}}, 'nextPageToken': None})
+        with self.assertRaises(ValueError):
+            parse_fields('items(id')
+
+    def test_apply_fields(self):
+        response = {
+            'kind': 'youtube#videoListResponse',
+            'items': [{'id': 'a', 'snippet': {'title': 'T', 'description': 'D'}, 'statistics': {}}],
+            'nextPageToken': 'n',
+        }
+        _, fields = build_projection(['snippet.title'])
+        self.assertEqual(apply_fields(response, parse_fields(fields)),
+                         {'items': [{'id': 'a', 'snippet': {'title': 'T'}}], 'nextPageToken': 'n'})
+
+
+class SearchIndexTests(SimpleTestCase):
+    def setUp(self):
+        self.index = SearchIndex.build([
+            (300, 'Python Tutorial for Beginners', 'Code Channel', 'v3'),
+            (100, 'Learn Python fast', 'Code Channel', 'v1'),
+            (200, 'Cooking pasta', 'Kitchen', 'v2'),
+            (400, 'Advanced python tricks', None, None),
+        ])
+
+    def test_postings_round_trip(self):
+        ids = [0, 3, 300, 70000, 70001]
+        postings = encode_postings(ids)
+        self.assertEqual(postings.typecode, 'I')
+        self.assertEqual(decode_postings(postings), ids)
+        self.assertEqual(encode_postings([1, 2, 200]).typecode, 'B')
+
+    def test_search_newest_first(self):
+        result = self.index.search('python')
+        self.assertEqual(result['total'], 3)
+        self.assertEqual([row['epoch'] for row in result['results']], [400, 300, 100])
+        self.assertEqual(result['results'][0]['channel'], '')
+
+    def test_terms_and_prefixes(self):
+        self.assertEqual(self.index.search('python tut')['total'], 1)
+        self.assertEqual(self.index.search('pyth* code')['total'], 2)
+        self.assertEqual(self.index.search('kitchen')['results'][0]['video_id'], 'v2')
+        self.assertEqual(self.index.search('missing')['total'], 0)
+
+    def test_filters(self):
+        self.assertEqual(self.index.search('python', channel='code channel')['total'], 2)
+        self.assertEqual(self.index.search('python', channel='Nobody')['total'], 0)
+        self.assertEqual(self.index.search('', start_epoch=200, end_epoch=400)['total'], 2)
+        self.assertEqual(len(self.index.search('python', limit=1)['results']), 1)
+
+    def test_counts_match_naive_scan(self):
+        rng = random.Random(3)
+        words = ['alpha', 'beta', 'gamma', 'delta']
+        entries = [(i, ' '.join(rng.sample(words, 2)), rng.choice(['x', 'y']), None) for i in range(500)]
+        index = SearchIndex.build(entries)
+        expected = Counter(word for _, title, _, _ in entries for word in title.split())
+        for word in words:
+            self.assertEqual(index.search(word + '*')['total'], expected[word])
+
+
+class PublicCacheTests(SimpleTestCase):
+    def setUp(self):
+        caches['public'].clear()
+        cache.clear()
+        self.sent = []
+
+    def send(self, endpoint, params):
+        self.sent.append(params['id'])
+        ids = [video_id for video_id in params['id'].split(',') if video_id != 'gone']
+        return {'items': [{'kind': 'youtube#video', 'id': video_id, 'snippet': {'title': video_id.upper()}}
+                          for video_id in ids]}
+
+    def test_fetches_only_uncached_ids(self):
+        fetch_public('videos', {'part': 'snippet', 'id': 'a,b'}, self.send)
+        response = fetch_public('videos', {'part': 'snippet', 'id': 'b,gone,c,a'}, self.send)
+        self.assertEqual(self.sent, ['a,b', 'gone,c'])
+        self.assertEqual([item['id'] for item in response['items']], ['b', 'c', 'a'])
+        fetch_public('videos', {'part': 'snippet', 'id': 'gone'}, self.send)
+        self.assertEqual(len(self.sent), 2)
+
+    def test_kept_out_of_the_default_cache(self):
+        fetch_public('videos', {'part': 'snippet', 'id': 'a'}, self.send)
+        self.assertIsNotNone(caches['public'].get('metrics:public:videos:a'))
+        self.assertIsNone(cache.get('metrics:public:videos:a'))
+
+    def test_failed_requests_are_not_cached(self):
+        self.assertIsNone(fetch_public('videos', {'part': 'snippet', 'id': 'a'}, lambda endpoint, params: None))
+        fetch_public('videos', {'part': 'snippet', 'id': 'a'}, self.send)
+        self.assertEqual(self.sent, ['a'])
+
+
+class FakeSubscriptionsClient:
+    """Client serving `total` subscriptions in 50-item pages whose tokens are 'p1', 'p2', ..."""
+
+    def __init__(self, total):
+        self.total = total
+        self.calls = []
+        self.subscriptions = SimpleNamespace(list=self.list)
+
+    def list(self, page_token=None, max_results=50):
+        self.calls.append(page_token)
+        page = int(page_token[1:]) if page_token else 0
+        start = page * max_results
+        items = [{'snippet': {'title': f'ch{i}', 'resourceId': {'channelId': f'ch{i}'}}}
+                 for i in range(start, min(start + max_results, self.total))]
+        response = {'items': items, 'pageInfo': {'totalResults': self.total}}
+        if start + max_results < self.total:
+            response['nextPageToken'] = f'p{page + 1}'
+        return response
+
+
+class PageTokenTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = FakeSubscriptionsClient(total=180)
+
+    def test_known_tokens_cost_one_call(self):
+        page = get_paginated_subscriptions(self.client, 1, page_num=6)
+        self.assertEqual(self.client.calls, [None, 'p1', 'p2'])
+        self.assertEqual(next(iter(page['subscriptions'])), 'ch125')
+        self.client.calls.clear()
+        get_paginated_subscriptions(self.client, 1, page_num=5)
+        self.assertEqual(self.client.calls, ['p2'])
+
+    def test_last_page(self):
+        page = get_paginated_subscriptions(self.client, 1, page_num=8)
+        self.assertEqual((len(page['subscriptions']), page['has_next_page']), (5, False))
+        self.assertEqual(get_paginated_subscriptions(self.client, 1, page_num=9)['subscriptions'], {})
+
+    def test_changed_total_resets_tokens(self):
+        get_paginated_subscriptions(self.client, 1, page_num=3)
+        self.client.total = 181
+        self.client.calls.clear()
+        page = get_paginated_subscriptions(self.client, 1, page_num=3)
+        self.assertEqual(self.client.calls, ['p1', None, 'p1'])
+        self.assertEqual(next(iter(page['subscriptions'])), 'ch50')
+
+
+def _subscription_row(channel_id: str, subscribers: int = 0, topics=()) -> dict:
+    return {'channel_id': channel_id, 'channel_title': channel_id.upper(), 'published_at': None,
+            'subscriber_count': subscribers, 'topics': list(topics)}
+
+
+class SubscriptionSnapshotTests(SimpleTestCase):
+    def setUp(self):
+        self.snapshot = SubscriptionSnapshot([
+            _subscription_row('b', 10, ['Music']),
+            _subscription_row('a', 30, ['Music', 'Gaming']),
+            _subscription_row('c', 20),
+        ])
+
+    def test_sorts_and_filters(self):
+        self.assertEqual(list(self.snapshot.page(sort='title')['subscriptions']), ['a', 'b', 'c'])
+        self.assertEqual(list(self.snapshot.page(sort='subscribers')['subscriptions']), ['a', 'c', 'b'])
+        page = self.snapshot.page(sort='subscribers', topic='Music')
+        self.assertEqual((list(page['subscriptions']), page['total']), (['a', 'b'], 2))
+        self.assertEqual(self.snapshot.page(topic='Unknown')['total'], 0)
+        self.assertEqual(self.snapshot.topic_counts(), [('Music', 2), ('Gaming', 1)])
+
+    def test_pages(self):
+        first = self.snapshot.page(items_per_page=2)
+        second = self.snapshot.page(page_num=2, items_per_page=2)
+        self.assertTrue(first['has_next_page'])
+        self.assertEqual((list(second['subscriptions']), second['has_next_page']), (['c'], False))
+
+
+class FakeSnapshotClient:
+    """Client returning one subscription per channel ID and failing the batched lookups in `failing`."""
+
+    def __init__(self, channel_ids, failing=(), retry_fails=False):
+        self.channel_ids = channel_ids
+        self.failing = set(failing)
+        self.retry_fails = retry_fails
+        self.retried = []
+        self.subscriptions = SimpleNamespace(stream_user_subscriptions=self.stream_user_subscriptions)
+        self.channels = SimpleNamespace(list=self.retry, process_raw_stats=self.process_raw_stats)
+
+    def stream_user_subscriptions(self):
+        for channel_id in self.channel_ids:
+            yield {'snippet': {'title': channel_id, 'resourceId': {'channelId': channel_id}}}
+
+    @staticmethod
+    def respond(channel_ids):
+        return {'items': [{'id': channel_id} for channel_id in channel_ids.split(',')]}
+
+    @staticmethod
+    def process_raw_stats(response):
+        return {item['id']: {'subscriber_count': 5} for item in response['items']}
+
+    def retry(self, part, channel_ids):
+        self.retried.append(channel_ids)
+        return None if self.retry_fails else self.respond(channel_ids)
+
+    @contextmanager
+    def batch(self):
+        def batched_list(part, channel_ids):
+            failed = self.failing & set(channel_ids.split(','))
+            return SimpleNamespace(response=None if failed else self.respond(channel_ids))
+        yield SimpleNamespace(channels=SimpleNamespace(list=batched_list))
+
+
+@override_settings(YOUTUBE_API_BATCH_SIZE=2, SUBSCRIPTION_SNAPSHOT_MAX_WORKERS=1)
+class SubscriptionSnapshotBuildTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = SimpleNamespace(id=7)
+
+    def test_reading_does_not_start_a_build(self):
+        with mock.patch('metrics.services.subscription_analyzer.run_in_background') as run:
+            self.assertIsNone(get_subscription_snapshot(self.user, build=False))
+        run.assert_not_called()
+
+    def test_one_build_across_workers(self):
+        with mock.patch('metrics.services.subscription_analyzer.run_in_background') as run:
+            get_subscription_snapshot(self.user)
+            get_subscription_snapshot(self.user)
+        self.assertEqual(run.call_count, 1)
+        self.assertTrue(is_snapshot_building(self.user.id))
+
+    def build(self, client):
+        with mock.patch('metrics.services.subscription_analyzer.User'), \
+             mock.patch('metrics.services.subscription_analyzer.YouTubeClient', return_value=client), \
+             mock.patch('metrics.services.subscription_analyzer.store_channel_profiles'):
+            return build_subscription_snapshot(self.user.id)
+
+    def test_failed_chunk_is_retried(self):
+        channel_ids = [f'ch{i}' for i in range(120)]
+        client = FakeSnapshotClient(channel_ids, failing={'ch60'})
+        snapshot = self.build(client)
+        self.assertEqual(client.retried, [','.join(channel_ids[50:100])])
+        self.assertEqual(snapshot.incomplete_count, 0)
+        self.assertEqual(sum(snapshot.subscriber_counts), 5 * 120)
+        self.assertFalse(is_snapshot_building(self.user.id))
+
+    def test_keeps_partial_results(self):
+        channel_ids = [f'ch{i}' for i in range(120)]
+        snapshot = self.build(FakeSnapshotClient(channel_ids, failing={'ch60'}, retry_fails=True))
+        self.assertEqual(len(snapshot), 120)
+        self.assertEqual(snapshot.incomplete_count, 50)
+        self.assertEqual(sum(snapshot.subscriber_counts), 5 * 70)
+        self.assertEqual(get_subscription_snapshot(self.user, build=False).incomplete_count, 50)
+
+
+def _candidate_index(channels: dict) -> dict:
+    topics = sorted({topic for channel_topics in channels.values() for topic in channel_topics})
+    vectors = [tuple(topics.index(topic) for topic in channel_topics) for channel_topics in channels.values()]
+    return {
+        'topics': topics,
+        'channels': [(channel_id, channel_id, '') for channel_id in channels],
+        'position': {channel_id: i for i, channel_id in enumerate(channels)},
+        'vectors': vectors,
+        'idf': [1.0] * len(topics),
+        'norms': [len(vector) ** 0.5 for vector in vectors],
+    }
+
+
+class ChannelRecommenderTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_ranks_by_cosine_similarity(self):
+        index = _candidate_index({
+            'mine': ['Music', 'Jazz'],
+            'close': ['Music', 'Jazz'],
+            'partial': ['Music', 'Sport'],
+            'unrelated': ['Sport'],
+        })
+        recommendations = recommend_channels(index, {'mine': 1.0}, exclude={'mine'})
+        self.assertEqual([rec['channel_id'] for rec in recommendations], ['close', 'partial'])
+        self.assertEqual(recommendations[0]['score'], 1.0)
+        self.assertEqual(recommendations[1]['shared_topics'], ['Music'])
+        self.assertEqual(recommend_channels(index, {'unknown': 1.0}), [])
+
+    def test_liked_channels_are_collected_once_across_workers(self):
+        user = SimpleNamespace(id=3)
+        snapshot = SubscriptionSnapshot([_subscription_row('mine')])
+        with mock.patch('metrics.services.channel_recommender.get_subscription_snapshot', return_value=snapshot), \
+             mock.patch('metrics.services.channel_recommender.run_in_background') as run:
+            first = get_similar_channels_context(user)
+            second = get_similar_channels_context(user)
+        self.assertEqual(run.call_count, 1)
+        self.assertEqual((first['status'], second['status']), ('building', 'building'))
+
+
+class TopicMapTests(SimpleTestCase):
+    def setUp(self):
+        self.snapshot = SubscriptionSnapshot([
+            _subscription_row('a', topics=['Music', 'Jazz']),
+            _subscription_row('b', topics=['Music']),
+            _subscription_row('c'),
+        ])
+
+    def test_channels_split_their_weight(self):
+        topic_map = compute_topic_map(self.snapshot, None)
+        self.assertEqual(topic_map['weighted_topics'], {'Music': 1.5, 'Jazz': 0.5})
+        self.assertEqual(topic_map['channel_counts'], {'Music': 2, 'Jazz': 1})
+        self.assertEqual((topic_map['channel_count'], topic_map['channels_without_topics']), (3, 1))
+        self.assertIsNone(topic_map['overlap'])
+
+    def test_compares_with_liked_topics(self):
+        topic_map = compute_topic_map(self.snapshot, {'Music': 1, 'Gaming': 3})
+        self.assertEqual(topic_map['overlap'], 0.25)
+        self.assertEqual(topic_map['subscribed_only'], ['Jazz'])
+        self.assertEqual(topic_map['liked_only'], ['Gaming'])
+        self.assertEqual(topic_map['comparison'][0], {'topic': 'Music', 'subscription_share': 75.0, 'liked_share': 25.0})
+
+
+def _upload(epoch: int, video_id: str) -> tuple:
+    return (epoch, video_id, video_id, 'Channel', '')
+
+
+@override_settings(UPLOAD_FEED_CHANNEL_TTL=60)
+class UploadFeedTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = SimpleNamespace(id=5)
+        self.snapshot = SubscriptionSnapshot([
+            dict(_subscription_row(channel_id), uploads_playlist_id=f'UU{channel_id}') for channel_id in 'abc'
+        ])
+
+    def feed(self, **kwargs):
+        with mock.patch('metrics.services.feed_analyzer.get_subscription_snapshot', return_value=self.snapshot), \
+             mock.patch('metrics.services.feed_analyzer.run_in_background') as run:
+            return get_upload_feed(self.user, **kwargs), run
+
+    def test_merges_channels_newest_first(self):
+        now = time.time()
+        cache.set('metrics:channel_uploads:UUa', {'fetched_at': now, 'uploads': [_upload(300, 'a2'), _upload(100, 'a1')]})
+        cache.set('metrics:channel_uploads:UUb', {'fetched_at': now, 'uploads': [_upload(200, 'b1')]})
+        cache.set('metrics:channel_uploads:UUc', {'fetched_at': now, 'uploads': []})
+        feed, run = self.feed(limit=2)
+        self.assertEqual([upload['video_id'] for upload in feed['uploads']], ['a2', 'b1'])
+        self.assertEqual(feed['uploads'][0]['published_at'], '1970-01-01T00:05:00Z')
+        self.assertEqual(feed['pending'], 0)
+        run.assert_not_called()
+
+    def test_refreshes_stale_channels_once(self):
+        cache.set('metrics:channel_uploads:UUa', {'fetched_at': time.time() - 120, 'uploads': [_upload(100, 'a1')]})
+        feed, run = self.feed()
+        self.assertEqual([upload['video_id'] for upload in feed['uploads']], ['a1'])
+        self.assertEqual(feed['pending'], 3)
+        self.assertEqual(run.call_args.args[3], ['UUa', 'UUb', 'UUc'])
+        self.assertTrue(feed['refreshing'])
+        self.assertEqual(self.feed()[1].call_count, 0)
+
+
+class FakePlaylistClient:
+    """Client with fixed playlists of (video ID, title) entries."""
+
+    def __init__(self, playlists):
+        self.playlists_data = playlists
+        self.playlists = SimpleNamespace(list_all_mine=self.list_all_mine)
+        self.playlist_items = SimpleNamespace(list_all=self.list_items, process_raw_items=PlaylistItems.process_raw_items)
+
+    def list_all_mine(self):
+        items = [{'id': playlist_id, 'snippet': {'title': playlist_id}, 'contentDetails': {'itemCount': len(entries)}}
+                 for playlist_id, entries in self.playlists_data.items()]
+        return {None: {'items': items}}
+
+    def list_items(self, playlist_id, fields=None):
+        items = [{'snippet': {'title': title, 'resourceId': {'videoId': video_id}}, 'status': {'privacyStatus': 'public'}}
+                 for video_id, title in self.playlists_data[playlist_id]]
+        return {None: {'items': items}}
+
+
+class PlaylistAnalyticsTests(SimpleTestCase):
+    def test_runtime_duplicates_and_dead_entries(self):
+        client = FakePlaylistClient({
+            'long': [('v1', 'One'), ('v2', 'Two'), ('v2', 'Two'), ('gone', 'Deleted video')],
+            'short': [('v1', 'One'), ('lost', 'Lost')],
+            'empty': [],
+        })
+        metadata = {
+            'v1': SimpleNamespace(is_available=True, duration_seconds=600, category_id='10'),
+            'v2': SimpleNamespace(is_available=True, duration_seconds=3000, category_id='20'),
+            'lost': SimpleNamespace(is_available=False, duration_seconds=None, category_id=''),
+        }
+        with mock.patch('metrics.services.playlist_analyzer.lookup_video_metadata', return_value=metadata):
+            analytics = analyze_playlists(client, {'10': 'Music'})
+
+        self.assertEqual([row['id'] for row in analytics['playlists']], ['long', 'short', 'empty'])
+        self.assertEqual(analytics['playlists'][0]['duplicate_count'], 1)
+        self.assertEqual(analytics['total_runtime'], '1h 10m')
+        self.assertEqual(analytics['unique_runtime'], '1h 00m')
+        self.assertEqual(analytics['category_mix'], {'Music': 1, 'Unknown': 1})
+        self.assertEqual(analytics['cross_duplicates'], [{'video_id': 'v1', 'title': 'One', 'playlists': ['long', 'short']}])
+        self.assertEqual(sorted((entry['video_id'], entry['reason']) for entry in analytics['dead_entries']),
+                         [('gone', 'deleted'), ('lost', 'unavailable')])
+
+    def test_format_runtime(self):
+        self.assertEqual(format_runtime(249), '4m 09s')
+        self.assertEqual(format_runtime(11100), '3h 05m')
+
+
+class ViewingEvolutionChartTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user('viewer')
+        self.client.force_login(self.user)
+        self.store_upload()
+
+    def store_upload(self, hourly=None):
+        charts = {
+            'hourly': (hourly or {'0': 3, '1': 5}, "Hour of Day", 'column', "Videos Watched by Hour"),
+            'session_length': ({'< 15 min': 2}, "Sessions", 'session_length_histogram', "Session Length Distribution"),
+        }
+        summary = {
+            'session_stats': {'session_count': 2, 'binge_count': 0, 'avg_session_minutes': 12.5, 'longest_streak_days': 1},
+            'top_channels': {'Some Channel': 8},
+            'top_videos': {'Some Video': 3},
+            'distinct_videos': 5,
+            'distinct_channels': 1,
+            'is_approximate': False,
+        }
+        set_versioned_user_artifact(self.user.id, CHARTS_ARTIFACT, {'charts': charts, 'summary': summary})
+
+    def test_page_shows_stored_summaries(self):
+        response = self.client.get('/viewing-evolution/')
+        self.assertContains(response, 'Some Channel')
+        self.assertContains(response, 'Some Video')
+        self.assertContains(response, 'id="sessionLengthChart"')
+        self.assertContains(response, 'id="hourlyWatchFreqChart"')
+        self.assertNotContains(response, 'id="bingeTimelineChart"')
+
+    def test_chart_revalidates_with_etag(self):
+        response = self.client.get('/viewing-evolution/charts/hourly/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(json.loads(response.content)['data'][0]['y'], [3, 5])
+        etag = response['ETag']
+
+        self.assertEqual(self.client.get('/viewing-evolution/charts/hourly/', HTTP_IF_NONE_MATCH=etag).status_code, 304)
+        self.store_upload(hourly={'0': 1})
+        response = self.client.get('/viewing-evolution/charts/hourly/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+        self.assertEqual(self.client.get('/viewing-evolution/charts/weekday/').status_code, 404)
+
+
+class AdmissionControllerTests(SimpleTestCase):
+    def setUp(self):
+        state_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(state_dir.cleanup)
+        self.controller = TakeoutAdmissionController(max_concurrent=1, memory_budget_mb=100, queue_timeout=100,
+                                                     retry_after=0, state_file=os.path.join(state_dir.name, 'state.json'))
+
+    def test_queued_jobs_are_admitted_in_order(self):
+        with self.controller.admit(1, 10):
+            for user_id, position in ((2, 1), (3, 2), (2, 1)):
+                with self.assertRaises(AdmissionBusy) as busy, self.controller.admit(user_id, 10):
+                    pass
+                self.assertEqual(busy.exception.position, position)
+            self.assertEqual(self.controller.get_status(1)['state'], 'running')
+            self.assertFalse(self.controller.get_status(2)['can_start'])
+
+        self.assertTrue(self.controller.get_status(2)['can_start'])
+        self.assertFalse(self.controller.get_status(3)['can_start'])
+        with self.controller.admit(2, 10):
+            self.assertEqual(self.controller.get_status(3)['position'], 1)
+        self.assertEqual(self.controller.get_status(2)['state'], 'idle')
+
+    def test_polling_keeps_the_place_in_line(self):
+        with mock.patch('metrics.utils.admission_helper.time.time', return_value=0) as clock, self.controller.admit(1, 10):
+            for user_id in (2, 3):
+                with self.assertRaises(AdmissionBusy), self.controller.admit(user_id, 10):
+                    pass
+            clock.return_value = 90
+            self.controller.get_status(2, keep_alive=True)
+            clock.return_value = 150
+            self.assertEqual(self.controller.get_status(2)['position'], 1)
+            self.assertEqual(self.controller.get_status(3)['state'], 'idle')
+
+    def test_rejects_jobs_over_the_budget(self):
+        with self.assertRaises(AdmissionRejected), self.controller.admit(1, 101):
+            pass
+
+
+def _takeout_zip(entry_count: int = 3) -> bytes:
+    entries = [{'header': 'YouTube', 'title': f'Watched video {i}', 'time': f'2024-01-0{i + 1}T12:00:00Z',
+                'subtitles': [{'name': 'Some Channel'}]} for i in range(entry_count)]
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w') as zf:
+        zf.writestr('Takeout/YouTube/history/watch-history.json', json.dumps(entries))
+    return buffer.getvalue()
+
+
+class TakeoutQueueTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        state_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(state_dir.cleanup)
+        overrides = override_settings(TAKEOUT_MAX_CONCURRENT_PARSES=1,
+                                      TAKEOUT_ADMISSION_STATE_FILE=os.path.join(state_dir.name, 'state.json'),
+                                      TAKEOUT_PENDING_UPLOAD_DIR=os.path.join(state_dir.name, 'pending'))
+        overrides.enable()
+        self.addCleanup(overrides.disable)
+        self.user = User.objects.create_user('uploader')
+        self.client.force_login(self.user)
+        self.pending_path = os.path.join(state_dir.name, 'pending', f'{self.user.id}.zip')
+
+    def test_queued_upload_is_processed_once_admitted(self):
+        upload = SimpleUploadedFile('takeout.zip', _takeout_zip(), content_type='application/zip')
+        with TakeoutAdmissionController().admit(self.user.id + 1, 1):
+            response = self.client.post('/viewing-evolution/', {'takeout-zip': upload, 'time-zone': 'UTC'})
+            self.assertEqual(response.status_code, 503)
+            self.assertContains(response, 'id="pendingUploadForm"', status_code=503)
+            self.assertTrue(os.path.exists(self.pending_path))
+            status = self.client.get('/viewing-evolution/status/').json()
+            self.assertEqual((status['state'], status['position'], status['can_start']), ('queued', 1, False))
+
+        self.assertTrue(self.client.get('/viewing-evolution/status/').json()['can_start'])
+        response = self.client.post('/viewing-evolution/', {'process-pending': '1'})
+        self.assertContains(response, 'File uploaded successfully.')
+        self.assertFalse(os.path.exists(self.pending_path))
+        self.assertEqual(get_user_artifact(self.user.id, CHARTS_ARTIFACT)['summary']['top_channels'], {'Some Channel': 3})
+
+    def test_expired_upload_asks_for_a_new_one(self):
+        response = self.client.post('/viewing-evolution/', {'process-pending': '1'})
+        self.assertContains(response, 'Your queued upload has expired.')
+
+
+class FakeVideosClient:
+    """Client answering `videos.list` lookups, failing every batch that contains an ID in `failing`."""
+
+    def __init__(self, failing=()):
+        self.failing = set(failing)
+        self.requested = []
+        self.videos = SimpleNamespace(list_video=self.list_video)
+
+    def list_video(self, video_ids, fields=None, max_results=50):
+        ids = video_ids.split(',')
+        self.requested.append(ids[0])
+        if self.failing & set(ids):
+            return None
+        return {'items': [{'id': video_id, 'snippet': {'categoryId': '10'}, 'contentDetails': {'duration': 'PT1M'}}
+                          for video_id in ids if video_id != 'v3']}
+
+
+@override_settings(ENRICHMENT_MAX_WORKERS=1)
+class EnrichmentTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user('enricher')
+        UserCredential.objects.create(user=self.user, access_token='token')
+        self.video_ids = [f'v{i}' for i in range(120)]
+        with mock.patch('metrics.services.history_enricher.run_in_background'):
+            self.job = start_enrichment(self.user, self.video_ids)
+
+    def enrich(self, client, generation):
+        with mock.patch('metrics.services.history_enricher.YouTubeClient', return_value=client):
+            return enrich_watch_history(self.user.id, generation)
+
+    def test_running_job_is_claimed_once(self):
+        # start_enrichment already claimed the job for its background run
+        self.assertEqual(self.job.status, WatchHistoryEnrichment.STATUS_RUNNING)
+        self.assertIsNone(claim_enrichment(self.user.id))
+
+        # A running job that stopped checkpointing belongs to a dead worker and can be claimed again
+        stale = django_timezone.now() - timedelta(seconds=3600)
+        WatchHistoryEnrichment.objects.filter(user=self.user).update(updated_at=stale)
+        self.assertEqual(claim_enrichment(self.user.id), self.job.generation + 1)
+        self.assertIsNone(self.enrich(FakeVideosClient(), self.job.generation))
+        self.assertFalse(VideoMetadata.objects.exists())
+
+    def test_failed_lookup_pauses_and_resumes(self):
+        job = self.enrich(FakeVideosClient(failing={'v60'}), self.job.generation)
+        self.assertEqual((job.status, job.cursor), (WatchHistoryEnrichment.STATUS_PAUSED, 50))
+        self.assertIsNone(claim_enrichment(self.user.id)) # waiting out the retry delay
+        self.assertFalse(VideoMetadata.objects.get(pk='v3').is_available)
+
+        client = FakeVideosClient()
+        job = self.enrich(client, claim_enrichment(self.user.id, ignore_retry_after=True))
+        self.assertEqual((job.status, job.cursor), (WatchHistoryEnrichment.STATUS_COMPLETE, 120))
+        self.assertEqual(client.requested[0], 'v50') # the stored first batch is not looked up again
+        self.assertEqual(VideoMetadata.objects.count(), 120)
+
+
+@override_settings(YOUTUBE_API_RECORD_MODE='off', YOUTUBE_API_BATCH_SIZE=10)
+class ExecuteBatchTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        caches['public'].clear()
+        self.client = YouTubeClient(credentials=SimpleNamespace(access_token='token', refresh_token=None))
+        self.batches = []
+        self.client._send_batch = self.send_batch
+        self.client._send = mock.Mock(side_effect=AssertionError("sent outside the batch"))
+
+    def send_batch(self, calls):
+        self.batches.append([(endpoint, params.get('id'), use_oauth) for endpoint, params, use_oauth in calls])
+        results = []
+        for endpoint, params, _ in calls:
+            if params.get('id') == 'broken':
+                results.append((None, 'HTTP 500: Backend Error'))
+            else:
+                ids = params.get('id', '').split(',')
+                results.append(({'items': [{'kind': 'youtube#video', 'id': video_id} for video_id in ids]}, None))
+        return results
+
+    @staticmethod
+    def video_call(video_ids, use_oauth=False):
+        return BatchCall('videos', {'part': 'snippet', 'id': video_ids}, use_oauth)
+
+    def test_sends_each_request_once(self):
+        calls = [self.video_call('a,b'), self.video_call('a,b'), self.video_call('b,c'), self.video_call('a', use_oauth=True)]
+        self.client.execute_batch(calls)
+        # 'b,c' is answered from its own sub-request even though 'b' was cached in between
+        self.assertEqual(self.batches, [[('videos', 'a,b', False), ('videos', 'b,c', False), ('videos', 'a', True)]])
+        self.assertEqual([[item['id'] for item in call.response['items']] for call in calls],
+                         [['a', 'b'], ['a', 'b'], ['b', 'c'], ['a']])
+
+    def test_public_calls_are_answered_from_the_cache(self):
+        self.client.execute_batch([self.video_call('a,b')])
+        call = self.video_call('b,a')
+        self.client.execute_batch([call])
+        self.assertEqual(len(self.batches), 1)
+        self.assertEqual([item['id'] for item in call.response['items']], ['b', 'a'])
+
+    def test_failed_calls_carry_their_error(self):
+        calls = [self.video_call('broken'), self.video_call('broken', use_oauth=True)]
+        self.client.execute_batch(calls)
+        self.assertEqual([(call.response, call.error) for call in calls], [(None, 'HTTP 500: Backend Error')] * 2)
+
+
+class StubResponseTests(SimpleTestCase):
+    def setUp(self):
+        self.dataset = StubDataset(channel_count=20, videos_per_channel=2, subscription_count=12,
+                                   playlist_count=1, liked_count=5)
+
+    def test_page_tokens_walk_every_item_once(self):
+        params = {'part': 'snippet', 'mine': 'true', 'maxResults': '5'}
+        seen, pages = [], 0
+        while True:
+            response = build_response(self.dataset, 'subscriptions', params)
+            seen += [item['id'] for item in response['items']]
+            pages += 1
+            if 'nextPageToken' not in response:
+                break
+            params = dict(params, pageToken=response['nextPageToken'])
+        self.assertEqual(pages, 3)
+        self.assertEqual(seen, [subscription['id'] for subscription in self.dataset.subscriptions])
+        self.assertEqual(response['pageInfo'], {'totalResults': 12, 'resultsPerPage': 2})
+        self.assertIn('prevPageToken', response)
+
+    def test_invalid_parameters_are_400_errors(self):
+        for params, reason in [({'maxResults': 'ten'}, 'invalidParameter'),
+                               ({'maxResults': '51'}, 'invalidParameter'),
+                               ({'pageToken': 'bogus'}, 'invalidPageToken'),
+                               ({'fields': 'items(id'}, 'invalidParameter')]:
+            with self.subTest(params=params), self.assertRaises(StubError) as raised:
+                build_response(self.dataset, 'subscriptions', dict(params, part='snippet', mine='true'))
+            self.assertEqual((raised.exception.status, raised.exception.reason), (400, reason))
+        self.assertIsInstance(raised.exception.__cause__, ValueError)
+
+    def test_unknown_endpoint_is_404(self):
+        with self.assertRaises(StubError) as raised:
+            build_response(self.dataset, 'comments', {'part': 'snippet'})
+        self.assertEqual(raised.exception.to_response()['error']['code'], 404)
+
+
+class StubOAuthTests(TestCase):
+    @override_settings(OAUTH_STUB_ENABLED=True, DEBUG=False)
+    def test_unavailable_without_debug(self):
+        self.assertEqual(self.client.get('/callback/stub/').status_code, 404)
+
+    @override_settings(OAUTH_STUB_ENABLED=False, DEBUG=True)
+    def test_unavailable_when_disabled(self):
+        self.assertEqual(self.client.get('/callback/stub/').status_code, 404)
+
+    @override_settings(OAUTH_STUB_ENABLED=True, DEBUG=True)
+    def test_signs_in_stub_accounts_only(self):
+        response = self.client.get('/callback/stub/', {'email': 'loadtest+1@example.invalid'})
+        self.assertRedirects(response, '/dashboard/', fetch_redirect_response=False)
+        self.assertEqual(UserCredential.objects.get(user__email='loadtest+1@example.invalid').refresh_token, 'stub-refresh-token')
+
+        self.assertEqual(self.client.get('/callback/stub/', {'email': 'someone@gmail.com'}).status_code, 403)
+        User.objects.create_user('loadtest+2@example.invalid', email='loadtest+2@example.invalid', password='secret')
+        self.assertEqual(self.client.get('/callback/stub/', {'email': 'loadtest+2@example.invalid'}).status_code, 403)
+
+
+class TopicDriftTests(SimpleTestCase):
+    def test_compares_only_consecutive_months(self):
+        monthly_videos = {
+            '2024-01': {'a': 3, 'b': 1},
+            '2024-02': {'a': 1, 'b': 3},
+            '2024-03': {'missing': 5}, # no enriched videos, so the month is left out
+            '2024-04': {'b': 2},
+        }
+        metadata = {'a': ('10', ['Music']), 'b': ('20', ['Gaming'])}
+        drift = compute_drift(monthly_videos, metadata, {'10': 'Music', '20': 'Gaming'})
+
+        self.assertEqual(drift['periods'], ['2024-01', '2024-02', '2024-04'])
+        self.assertEqual(drift['category_vectors'][0], Counter({'Music': 3, 'Gaming': 1}))
+        self.assertEqual(list(drift['topic_divergence']), ['2024-02']) # April follows a gap
+        self.assertGreater(drift['topic_divergence']['2024-02'], 0)
+        self.assertEqual(drift['biggest_shifts'], [{'period': '2024-02', 'divergence': drift['topic_divergence']['2024-02'],
+                                                    'gained': 'Gaming', 'lost': 'Music'}])
+
+    def test_identical_months_do_not_diverge(self):
+        drift = compute_drift({'2024-01': {'a': 2}, '2024-02': {'a': 5}}, {'a': ('10', ['Music'])}, {})
+        self.assertEqual(drift['topic_divergence'], {'2024-02': 0.0})
+        self.assertEqual(drift['category_vectors'][1], Counter({'10': 5})) # unnamed categories keep their ID
+
+
+@override_settings(METRICS_TOKEN='scrape-token')
+class PrometheusMetricsTests(TestCase):
+    def test_requires_the_token_or_a_staff_user(self):
+        self.assertEqual(self.client.get('/metrics/').status_code, 403)
+        self.assertEqual(self.client.get('/metrics/', HTTP_AUTHORIZATION='Bearer wrong').status_code, 403)
+        self.client.force_login(User.objects.create_user('viewer', email='viewer@example.com'))
+        self.assertEqual(self.client.get('/metrics/').status_code, 403)
+
+        response = self.client.get('/metrics/', HTTP_AUTHORIZATION='Bearer scrape-token')
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response['Content-Type'].startswith('text/plain; version=0.0.4'))
+
+        self.client.force_login(User.objects.create_user('admin', email='admin@example.com', is_staff=True))
+        self.assertEqual(self.client.get('/metrics/').status_code, 200)
+
+    @override_settings(METRICS_TOKEN='')
+    def test_empty_token_is_never_accepted(self):
+        self.assertEqual(self.client.get('/metrics/', HTTP_AUTHORIZATION='Bearer ').status_code, 403)
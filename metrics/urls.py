@@ -7,13 +7,27 @@ from . import views
 urlpatterns = [
     path('', views.google_login, name='login'),
     path('callback/', views.google_callback, name='callback'),
+    path('callback/stub/', views.stub_oauth_callback, name='stub_oauth_callback'),
     path('dashboard/', views.dashboard, name='dashboard'),
     path('logout/', views.user_logout, name='logout'),
     path('subscriptions/', views.subscriptions_list, name='subscriptions_list'),
+    path('subscriptions/topics/', views.subscription_topic_map, name='subscription_topic_map'),
+    path('subscriptions/similar/', views.similar_channels, name='similar_channels'),
+    path('subscriptions/feed/', views.upload_feed, name='upload_feed'),
+    path('subscriptions/feed/data/', views.upload_feed_ajax, name='upload_feed_ajax'),
+    path('playlists/', views.playlist_analytics, name='playlist_analytics'),
     path('content_affinity/', views.content_affinity, name='content_affinity'),
+    path('content_affinity/charts/<slug:chart_name>/', views.content_affinity_chart_ajax, name='content_affinity_chart_ajax'),
     path('recommended-videos/', views.recommended_videos, name='recommended_videos'),
     path('recommended-videos/ajax/', views.get_recommended_videos_ajax, name='get_recommended_videos_ajax'),
     path('viewing-evolution/', views.viewing_evolution, name='viewing_evolution'),
+    path('viewing-evolution/charts/<slug:chart_name>/', views.viewing_evolution_chart_ajax, name='viewing_evolution_chart_ajax'),
+    path('viewing-evolution/status/', views.viewing_evolution_status_ajax, name='viewing_evolution_status_ajax'),
+    path('viewing-evolution/range/', views.viewing_evolution_range_ajax, name='viewing_evolution_range_ajax'),
+    path('viewing-evolution/daily/', views.viewing_evolution_daily_ajax, name='viewing_evolution_daily_ajax'),
+    path('viewing-evolution/search/', views.viewing_evolution_search_ajax, name='viewing_evolution_search_ajax'),
+    path('viewing-evolution/drift/', views.topic_drift, name='topic_drift'),
+    path('metrics/', views.prometheus_metrics, name='prometheus_metrics'),
     path('privacy-policy/', views.privacy_policy, name='privacy_policy'),
     path('terms-of-service/', views.terms_of_service, name='terms_of_service'),
 ]
@@ -0,0 +1,242 @@
+"""
+Global admission control for Takeout processing.
+
+Every gunicorn worker shares one JSON state file (guarded by an exclusive `fcntl` lock) that
+records which parse jobs are running and which are waiting. A job is admitted in FIFO order once
+both the concurrency limit and the memory budget allow it, so simultaneous large uploads queue
+up instead of exhausting the box's memory. A job that cannot start right away is turned away
+with a retry delay rather than holding its worker, but keeps its place in the queue while the
+user's page polls its status, so the upload is admitted in turn once the page asks for it again.
+"""
+
+# Standard Library Imports
+import fcntl
+import json
+import os
+import time
+import uuid
+from contextlib import contextmanager
+from typing import Any, Dict, Generator, List, Optional, Tuple
+
+# Third-Party Imports
+from django.conf import settings
+
+
+class AdmissionRejected(RuntimeError):
+    """Raised when a job can never fit within the configured memory budget."""
+
+
+class AdmissionBusy(RuntimeError):
+    """Raised when a job is queued behind others and should be retried after `retry_after` seconds."""
+    def __init__(self, message: str, retry_after: int, position: int) -> None:
+        super().__init__(message)
+        self.retry_after = retry_after
+        self.position = position
+
+
+def estimate_parse_memory_mb(uncompressed_bytes: int, use_sketch: Optional[bool] = None) -> float:
+    """
+    Estimate the peak memory needed to process a watch-history.json file.
+
+    `process_takeout_data` streams the file, so the parsed entries of only one chunk are held at
+    a time (TAKEOUT_CHUNK_MEMORY_MB). Exact mode also keeps per-entry columns (timestamps, video
+    IDs, channels and titles) and the artifacts built from them, which grow with the number of
+    entries; sketch mode keeps fixed-size state only, so its estimate does not depend on the file.
+
+    Args:
+        uncompressed_bytes (int): The uncompressed size of the JSON file inside the zip.
+        use_sketch (Optional[bool]): Whether the file is processed in sketch mode. Defaults to
+                                     settings.TAKEOUT_SKETCH_MODE.
+
+    Returns:
+        float: The estimated peak memory in megabytes.
+    """
+    if use_sketch is None:
+        use_sketch = settings.TAKEOUT_SKETCH_MODE
+    estimated_mb = settings.TAKEOUT_CHUNK_MEMORY_MB
+    if not use_sketch:
+        entry_count = uncompressed_bytes / settings.TAKEOUT_BYTES_PER_ENTRY
+        estimated_mb += entry_count * settings.TAKEOUT_COLUMN_BYTES_PER_ENTRY / (1024 * 1024)
+    return estimated_mb
+
+
+class TakeoutAdmissionController:
+    """
+    Admits Takeout parse jobs under a global concurrency limit and memory budget.
+    """
+    def __init__(self,
+                 max_concurrent: Optional[int] = None,
+                 memory_budget_mb: Optional[float] = None,
+                 queue_timeout: Optional[float] = None,
+                 retry_after: Optional[int] = None,
+                 state_file: Optional[str] = None
+                 ) -> None:
+        """
+        Initializes the controller. Any argument left as None falls back to settings.
+
+        Args:
+            max_concurrent (Optional[int]): Maximum number of parse jobs running at once.
+            memory_budget_mb (Optional[float]): Total estimated memory all running jobs may use.
+            queue_timeout (Optional[float]): Seconds a queued job keeps its place without being retried.
+            retry_after (Optional[int]): Seconds a turned-away client is asked to wait before retrying.
+            state_file (Optional[str]): Path of the shared state file.
+        """
+        self.max_concurrent = max_concurrent if max_concurrent is not None else settings.TAKEOUT_MAX_CONCURRENT_PARSES
+        self.memory_budget_mb = memory_budget_mb if memory_budget_mb is not None else settings.TAKEOUT_MEMORY_BUDGET_MB
+        self.queue_timeout = queue_timeout if queue_timeout is not None else settings.TAKEOUT_QUEUE_TIMEOUT
+        self.retry_after = retry_after if retry_after is not None else settings.TAKEOUT_RETRY_AFTER
+        self.state_file = state_file if state_file is not None else settings.TAKEOUT_ADMISSION_STATE_FILE
+
+    @contextmanager
+    def admit(self, user_id: int, estimated_mb: float) -> Generator[str, None, None]:
+        """
+        Context manager that admits the job if a slot is free and releases the slot on exit.
+
+        A user's queued job is reused by their next attempt, so a retry keeps its queue position.
+
+        Args:
+            user_id (int): The ID of the user who uploaded the Takeout (used for status lookups).
+            estimated_mb (float): The estimated peak memory of the job in megabytes.
+
+        Yields:
+            str: The job ID assigned to the admitted job.
+
+        Raises:
+            AdmissionRejected: If the job alone exceeds the memory budget.
+            AdmissionBusy: If other jobs are ahead of this one or it does not fit yet (the job stays queued).
+        """
+        if estimated_mb > self.memory_budget_mb:
+            raise AdmissionRejected(
+                f"This Takeout needs an estimated {estimated_mb:.0f} MB to process, "
+                f"which exceeds the server limit of {self.memory_budget_mb:.0f} MB."
+            )
+
+        job_id, position = self._enqueue_and_try_start(user_id, estimated_mb)
+        if position is not None:
+            raise AdmissionBusy(
+                f"The server is busy processing other uploads. Your upload is number {position} in line "
+                f"and will start automatically when its turn comes; please keep this page open.",
+                retry_after=self.retry_after,
+                position=position,
+            )
+
+        try:
+            yield job_id
+        finally:
+            self._remove(job_id)
+
+    def get_status(self, user_id: int, keep_alive: bool = False) -> Dict[str, Any]:
+        """
+        Report the state of a user's most recent job.
+
+        Args:
+            user_id (int): The ID of the user.
+            keep_alive (bool): Refresh a queued job's heartbeat, so it keeps its place without a retry.
+
+        Returns:
+            Dict[str, Any]: A dictionary with 'state' ('queued', 'running' or 'idle'),
+            'position' (1-indexed queue position, or None), 'queue_length' and 'can_start'
+            (whether the queued job would be admitted if it were sent now).
+        """
+        with self._locked_state() as state:
+            queue_length = len(state['queue'])
+            for job in state['running']:
+                if job['user_id'] == user_id:
+                    return {'state': 'running', 'position': None, 'queue_length': queue_length, 'can_start': False}
+
+            for position, job in enumerate(state['queue'], start=1):
+                if job['user_id'] == user_id:
+                    if keep_alive:
+                        job.update(pid=os.getpid(), heartbeat=time.time())
+                    can_start = position == 1 and self._fits(state['running'], job)
+                    return {'state': 'queued', 'position': position, 'queue_length': queue_length, 'can_start': can_start}
+
+            return {'state': 'idle', 'position': None, 'queue_length': queue_length, 'can_start': False}
+
+    def _enqueue_and_try_start(self, user_id: int, estimated_mb: float) -> Tuple[str, Optional[int]]:
+        """
+        Queue the job (or refresh the user's queued one) and move it to the running set if it is at
+        the head and fits. Returns its job ID and its 1-indexed queue position, or None once running.
+        """
+        with self._locked_state() as state:
+            queue: List[Dict[str, Any]] = state['queue']
+            running: List[Dict[str, Any]] = state['running']
+
+            idx = next((i for i, job in enumerate(queue) if job['user_id'] == user_id), None)
+            if idx is None:
+                queue.append({'job_id': uuid.uuid4().hex, 'user_id': user_id})
+                idx = len(queue) - 1
+            job = queue[idx]
+            job.update(estimated_mb=estimated_mb, pid=os.getpid(), heartbeat=time.time())
+
+            if idx != 0 or not self._fits(running, job):
+                return job['job_id'], idx + 1
+
+            running.append(queue.pop(0))
+            return job['job_id'], None
+
+    def _fits(self, running: List[Dict[str, Any]], job: Dict[str, Any]) -> bool:
+        """Check whether the job can run next to the running jobs under both limits."""
+        if len(running) >= self.max_concurrent:
+            return False
+        used_mb = sum(running_job['estimated_mb'] for running_job in running)
+        return used_mb + job['estimated_mb'] <= self.memory_budget_mb
+
+    def _remove(self, job_id: str) -> None:
+        """Drop the job from both the queue and the running set."""
+        with self._locked_state() as state:
+            state['queue'] = [job for job in state['queue'] if job['job_id'] != job_id]
+            state['running'] = [job for job in state['running'] if job['job_id'] != job_id]
+
+    @contextmanager
+    def _locked_state(self) -> Generator[Dict[str, Any], None, None]:
+        """
+        Open the shared state file under an exclusive lock, yield its contents and write them back.
+        Jobs owned by dead processes, or whose heartbeat has gone stale, are pruned on every access.
+        """
+        with open(self.state_file, 'a+', encoding='utf-8') as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                f.seek(0)
+                raw = f.read()
+                try:
+                    state = json.loads(raw) if raw else {}
+                except json.JSONDecodeError:
+                    state = {}
+                state.setdefault('queue', [])
+                state.setdefault('running', [])
+                self._prune(state)
+
+                yield state
+
+                f.seek(0)
+                f.truncate()
+                json.dump(state, f)
+                f.flush()
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+    def _prune(self, state: Dict[str, Any]) -> None:
+        """Remove jobs whose worker process has died or that have exceeded their time limits."""
+        now = time.time()
+        # A queued job is refreshed when its user retries or their page polls, so give either time to arrive
+        stale_queue_age = max(self.queue_timeout, self.retry_after + 30)
+        state['queue'] = [
+            job for job in state['queue']
+            if _pid_alive(job['pid']) and now - job['heartbeat'] < stale_queue_age
+        ]
+        state['running'] = [
+            job for job in state['running']
+            if _pid_alive(job['pid']) and now - job['heartbeat'] < settings.TAKEOUT_JOB_MAX_SECONDS
+        ]
+
+
+def _pid_alive(pid: int) -> bool:
+    """Check whether a process with the given PID still exists on this machine."""
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
@@ -1,31 +1,76 @@
 # Standard Library Imports
+import json
 import os
-from typing import Any
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from functools import partial
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from urllib.parse import urlencode
 
 # Third-Party Imports
-import requests
+from django.conf import settings
 from dotenv import load_dotenv
-from google.auth.transport.requests import AuthorizedSession
-from google.oauth2.credentials import Credentials
 
 # Local App Imports
 from metrics.models import UserCredential
 from .api_resources import (Activities, Channels, PlaylistItems, Playlists,
                           Subscriptions, Videos)
+from .batch_helper import batch_path, decode_batch_response, encode_batch_request
+from .fixture_helper import load_fixture, request_digest, save_fixture
+from .instrumentation_helper import current_request_stats, record_api_call
+from .public_cache_helper import fetch_public
 from .types import ApiResponse
 
+@dataclass
+class BatchCall:
+    """One call queued in an `ApiBatch`; `response` (or `error`) is set once the batch has been sent."""
+    endpoint_path: str
+    params: Dict[str, Any]
+    use_oauth: bool
+    response: Optional[ApiResponse] = None
+    error: Optional[str] = None
+
+
 class YouTubeClient:
     """
     A client for interacting with the YouTube Data API v3. Manages authentication and raw API requests.
+
+    Requests go to YOUTUBE_API_BASE_URL (e.g. the offline stand-in from `manage.py run_api_stub`).
+    With YOUTUBE_API_RECORD_MODE set to 'record', every successful response is saved as a fixture
+    in YOUTUBE_API_FIXTURES_DIR; with 'replay', responses are read from those fixtures and no
+    request is sent.
+
+    Callers pass `fields` to the resource methods to download only what they read (see
+    `projection_helper`), and responses are requested gzip-compressed.
+
+    Public requests (made with the API key) are answered from a cache shared by all users, see
+    `public_cache_helper`. It is bypassed while recording, so fixtures match the requests made.
+
+    Independent calls can be sent together with `batch()`, one HTTP round trip per
+    YOUTUBE_API_BATCH_SIZE calls.
     """
     BASE_URL = "https://www.googleapis.com/youtube/v3"
+    # Google only compresses responses for clients that accept gzip and name it in their User-Agent
+    COMPRESSION_HEADERS = {'Accept-Encoding': 'gzip', 'User-Agent': 'mytube-metrics (gzip)'}
 
     def __init__(self, credentials: UserCredential | None = None) -> None:
         """
         Initializes the YouTubeClient.
         """
+        # The google-auth and requests stacks are imported on first use rather than at worker boot
+        import requests
+        from google.auth.transport.requests import AuthorizedSession
+        from google.oauth2.credentials import Credentials
+
         load_dotenv()
         self.api_key = os.getenv("API_KEY")
+        self.base_url = settings.YOUTUBE_API_BASE_URL or self.BASE_URL
+        self.record_mode = settings.YOUTUBE_API_RECORD_MODE
+        self.fixtures_dir = settings.YOUTUBE_API_FIXTURES_DIR
+        self.public_cache = self.record_mode == 'off'
+        # Calls made from worker threads are still attributed to the request that created the client
+        self.request_stats = current_request_stats()
         
         if not credentials:
             raise ValueError("UserCredential object is required for YouTubeClient.")
@@ -42,6 +87,8 @@ class YouTubeClient:
         # Use an AuthorizedSession that automatically handles token refreshes
         self.auth_session = AuthorizedSession(self.credentials)
         self.session = requests.Session()
+        for session in (self.auth_session, self.session):
+            session.headers.update(self.COMPRESSION_HEADERS)
             
         # --- Initialize Resource Handlers ---
         self.channels = Channels(self)
@@ -51,6 +98,24 @@ class YouTubeClient:
         self.playlist_items = PlaylistItems(self)
         self.activities = Activities(self)
         
+    @contextmanager
+    def batch(self) -> Iterator['ApiBatch']:
+        """
+        Queue calls and send them as Google batch requests when the block exits.
+
+        Example:
+            with client.batch() as batch:
+                calls = [batch.videos.list_video(video_ids=",".join(chunk), fields=['snippet.categoryId'])
+                         for chunk in chunks]
+            responses = [call.response for call in calls]
+
+        Yields:
+            ApiBatch: Has the client's resource handlers; their single-page methods return a `BatchCall`.
+        """
+        batch = ApiBatch(self)
+        yield batch
+        batch.execute()
+
     def _make_request(self, endpoint_path: str, params: dict[str, str], use_oauth: bool = False) -> ApiResponse | None:
         """
         Make a request to a specific YouTube Data API endpoint.
@@ -63,7 +128,22 @@ class YouTubeClient:
         Returns:
             The JSON response from the API as a dictionary, or None if an error occurs.
         """
-        url = f"{self.BASE_URL}/{endpoint_path}"
+        if self.record_mode == 'replay':
+            response_data = load_fixture(self.fixtures_dir, endpoint_path, params)
+            if response_data is None:
+                print(f"No recorded response for {endpoint_path} with {params}")
+            record_api_call(self.request_stats, endpoint_path, 0.0, 0, 'replay')
+            return response_data
+
+        if self.public_cache and not use_oauth:
+            return fetch_public(endpoint_path, params, self._send)
+        return self._send(endpoint_path, params, use_oauth)
+
+    def _send(self, endpoint_path: str, params: dict[str, str], use_oauth: bool = False) -> ApiResponse | None:
+        """Send one request to the API (see `_make_request`), recording it if in 'record' mode."""
+        import requests # already loaded by __init__, so this is a sys.modules lookup
+
+        url = f"{self.base_url}/{endpoint_path}"
         request_params = params.copy()
 
         session = self.auth_session if use_oauth else self.session
@@ -73,14 +153,216 @@ class YouTubeClient:
                 raise ValueError("Cannot make public request without an API key.")
             request_params["key"] = self.api_key
 
+        start = time.perf_counter()
+        response = None
         try:
             response = session.get(url=url, params=request_params)
+            size = len(response.content)
+            wire_size = response.raw.tell() if hasattr(response.raw, 'tell') else 0 # compressed bytes, once content is read
+            record_api_call(self.request_stats, endpoint_path, time.perf_counter() - start, wire_size or size,
+                            'ok' if response.ok else 'error')
             response.raise_for_status()
-            return response.json()
+            response_data = response.json()
+            if self.record_mode == 'record':
+                save_fixture(self.fixtures_dir, endpoint_path, params, response_data)
+            return response_data
         except requests.exceptions.RequestException as e:
             # If the authorized session failed, the credentials might be invalid.
             # The user may need to re-authenticate.
             print(f"An API request error occurred: {e}")
-            if response:
+            if response is None: # no response at all (e.g. connection error or timeout)
+                record_api_call(self.request_stats, endpoint_path, time.perf_counter() - start, 0, 'error')
+            else:
                 print(f"Response: {response.text}")
-            return None
\ No newline at end of file
+            return None
+
+    def execute_batch(self, calls: List[BatchCall]) -> None:
+        """
+        Resolve queued calls, sending everything the shared cache cannot answer in batch requests.
+
+        Identical requests are sent once. Each call's `response` is set, or its `error` if it failed.
+
+        Args:
+            calls (List[BatchCall]): The calls to resolve, usually collected by `batch`.
+        """
+        if self.record_mode == 'replay':
+            for call in calls:
+                call.response = self._make_request(call.endpoint_path, call.params, call.use_oauth)
+                call.error = None if call.response is not None else "No recorded response"
+            return
+
+        # Public calls are answered from the shared cache where possible: a first pass only collects
+        # the requests the cache cannot answer, a second pass hands it their responses
+        def uses_cache(call: BatchCall) -> bool:
+            return self.public_cache and not call.use_oauth
+
+        pending: Dict[Tuple[str, str, bool], Tuple[str, Dict[str, Any], bool]] = {}
+        unresolved: List[Tuple[BatchCall, List[Tuple[str, Dict[str, Any]]]]] = []
+        for call in calls:
+            needed: List[Tuple[str, Dict[str, Any]]] = []
+            if uses_cache(call):
+                response = fetch_public(call.endpoint_path, call.params, partial(_collect_request, needed))
+                if not needed:
+                    call.response = response
+                    continue
+                for endpoint, params in needed:
+                    pending[(endpoint, request_digest(endpoint, params), False)] = (endpoint, params, False)
+            else:
+                key = (call.endpoint_path, request_digest(call.endpoint_path, call.params), call.use_oauth)
+                pending[key] = (call.endpoint_path, call.params, call.use_oauth)
+            unresolved.append((call, needed))
+
+        sent: Dict[Tuple[str, str, bool], Tuple[Optional[ApiResponse], Optional[str]]] = {}
+        keys = list(pending)
+        for i in range(0, len(keys), settings.YOUTUBE_API_BATCH_SIZE):
+            chunk = keys[i:i + settings.YOUTUBE_API_BATCH_SIZE]
+            sent.update(zip(chunk, self._send_batch([pending[key] for key in chunk])))
+
+        for call, needed in unresolved:
+            if not uses_cache(call):
+                call.response, call.error = sent[(call.endpoint_path, request_digest(call.endpoint_path, call.params), call.use_oauth)]
+                continue
+            errors: List[str] = []
+            call.response = fetch_public(call.endpoint_path, call.params, partial(self._take_sent, sent, needed, errors))
+            call.error = None if call.response is not None else (errors[0] if errors else "Request failed")
+
+    def _take_sent(self,
+                   sent: Dict[Tuple[str, str, bool], Tuple[Optional[ApiResponse], Optional[str]]],
+                   needed: List[Tuple[str, Dict[str, Any]]],
+                   errors: List[str],
+                   endpoint: str,
+                   params: Dict[str, Any]
+                   ) -> Optional[ApiResponse]:
+        """
+        Answer a public request of a call from the batch results, recording its error in `errors`.
+
+        `needed` holds the requests the call asked for when the batch was collected. If an earlier
+        call of the batch has since cached some of the same IDs, only the rest is asked for now,
+        and the answer is cut out of the call's own response.
+        """
+        result = sent.get((endpoint, request_digest(endpoint, params), False))
+        if result is None:
+            result = _narrow_sent(sent, needed, endpoint, params)
+        if result is None: # another worker filled the cache in between, so less is needed now
+            return self._send(endpoint, params)
+        if result[1]:
+            errors.append(result[1])
+        return result[0]
+
+    def _send_batch(self, calls: List[Tuple[str, Dict[str, Any], bool]]) -> List[Tuple[Optional[ApiResponse], Optional[str]]]:
+        """
+        Send (endpoint path, params, use_oauth) calls as one batch request.
+
+        Returns:
+            List[Tuple[Optional[ApiResponse], Optional[str]]]: (response, error) per call, in order.
+        """
+        import requests # already loaded by __init__, so this is a sys.modules lookup
+
+        if len(calls) == 1: # a batch of one only adds multipart overhead
+            endpoint_path, params, use_oauth = calls[0]
+            response_data = self._send(endpoint_path, params, use_oauth)
+            return [(response_data, None if response_data is not None else "Request failed")]
+
+        batch_url, path_prefix = batch_path(self.base_url)
+        paths = []
+        for endpoint_path, params, use_oauth in calls:
+            query = dict(params)
+            if not use_oauth:
+                if not self.api_key:
+                    raise ValueError("Cannot make public request without an API key.")
+                query["key"] = self.api_key
+            paths.append(f"{path_prefix}/{endpoint_path}?{urlencode(query)}")
+        body, content_type = encode_batch_request(paths)
+        # The outer request's OAuth token applies to every sub-request; public ones also carry the API key
+        session = self.auth_session if any(use_oauth for _, _, use_oauth in calls) else self.session
+
+        start = time.perf_counter()
+        try:
+            response = session.post(url=batch_url, data=body, headers={'Content-Type': content_type})
+            response.raise_for_status()
+            parts = decode_batch_response(response.content, response.headers.get('Content-Type', ''))
+        except (requests.exceptions.RequestException, ValueError) as e:
+            print(f"An API batch request error occurred: {e}")
+            seconds = time.perf_counter() - start
+            for endpoint_path, _, _ in calls:
+                record_api_call(self.request_stats, endpoint_path, seconds, 0, 'error')
+            return [(None, str(e))] * len(calls)
+        seconds = time.perf_counter() - start # every sub-request waited for the whole batch
+
+        results: List[Tuple[Optional[ApiResponse], Optional[str]]] = []
+        for index, (endpoint_path, params, _) in enumerate(calls):
+            status, part_body = parts.get(index, (0, b''))
+            record_api_call(self.request_stats, endpoint_path, seconds, len(part_body),
+                            'ok' if 200 <= status < 300 else 'error')
+            try:
+                response_data = json.loads(part_body) if part_body else None
+            except ValueError:
+                response_data = None
+            if not 200 <= status < 300:
+                message = (response_data or {}).get('error', {}).get('message', '') if isinstance(response_data, dict) else ''
+                error = f"HTTP {status}: {message}" if status else "Missing from the batch response"
+                print(f"An API request error occurred in a batch: {error} ({endpoint_path})")
+                results.append((None, error))
+            elif response_data is None:
+                results.append((None, "Invalid JSON in the batch response"))
+            else:
+                if self.record_mode == 'record':
+                    save_fixture(self.fixtures_dir, endpoint_path, params, response_data)
+                results.append((response_data, None))
+        return results
+
+
+class ApiBatch:
+    """
+    Collects calls for `YouTubeClient.batch`.
+
+    It offers the client's resource handlers, but their single-page methods (e.g. `videos.list_video`,
+    `channels.list`, `playlist_items.list`) return a `BatchCall` instead of sending a request.
+    Helpers that page through results (`list_all`, `stream_*`) need each response before the next
+    call and cannot be queued.
+    """
+
+    def __init__(self, client: YouTubeClient) -> None:
+        self._client = client
+        self.calls: List[BatchCall] = []
+        self.channels = Channels(self)
+        self.playlists = Playlists(self)
+        self.subscriptions = Subscriptions(self)
+        self.videos = Videos(self)
+        self.playlist_items = PlaylistItems(self)
+        self.activities = Activities(self)
+
+    def _make_request(self, endpoint_path: str, params: dict[str, str], use_oauth: bool = False) -> BatchCall:
+        call = BatchCall(endpoint_path, dict(params), use_oauth)
+        self.calls.append(call)
+        return call
+
+    def execute(self) -> List[BatchCall]:
+        """Send every queued call and return them with their results."""
+        calls, self.calls = self.calls, []
+        if calls:
+            self._client.execute_batch(calls)
+        return calls
+
+
+def _collect_request(needed: List[Tuple[str, Dict[str, Any]]], endpoint: str, params: Dict[str, Any]) -> None:
+    """Stand-in sender for `fetch_public` that only records which requests the cache cannot answer."""
+    needed.append((endpoint, params))
+
+def _narrow_sent(sent: Dict[Tuple[str, str, bool], Tuple[Optional[ApiResponse], Optional[str]]],
+                 needed: List[Tuple[str, Dict[str, Any]]],
+                 endpoint: str,
+                 params: Dict[str, Any]
+                 ) -> Optional[Tuple[Optional[ApiResponse], Optional[str]]]:
+    """Find a sent request for a superset of the requested IDs and keep only the requested items."""
+    wanted = set(str(params.get('id', '')).split(','))
+    other_params = {name: value for name, value in params.items() if name != 'id'}
+    for sent_endpoint, sent_params in needed:
+        if (sent_endpoint != endpoint or not wanted <= set(str(sent_params.get('id', '')).split(','))
+                or {name: value for name, value in sent_params.items() if name != 'id'} != other_params):
+            continue
+        response, error = sent[(sent_endpoint, request_digest(sent_endpoint, sent_params), False)]
+        if response is None:
+            return None, error
+        return {**response, 'items': [item for item in response.get('items', []) if item.get('id') in wanted]}, None
+    return None
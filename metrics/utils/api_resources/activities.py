@@ -1,8 +1,9 @@
 # Standard Library Imports
-from typing import Any, Dict, Generator, Optional
+from typing import Any, Dict, Generator, List, Optional
 
 # Local App Imports
 from metrics.utils.date_helper import is_valid_datetime_range
+from metrics.utils.projection_helper import apply_projection
 from metrics.utils.types import ApiResponse
 
 class Activities:
@@ -13,7 +14,8 @@ class Activities:
              max_results: int = 50,
              occurred_after: Optional[str] = None,
              occurred_before: Optional[str] = None,
-             page_token: Optional[str] = None
+             page_token: Optional[str] = None,
+             fields: Optional[List[str]] = None
             ) -> Optional[ApiResponse]:
         """
         List a single page of raw data obtained from YouTube Data API regarding activities.
@@ -27,6 +29,7 @@ class Activities:
             occurred_after (Optional[str]): A datetime string (ISO 8601) to filter activities published after this time.
             occurred_before (Optional[str]): A datetime string (ISO 8601) to filter activities published before this time.
             page_token (Optional[str]): The `nextPageToken` or `prevPageToken` from a previous API response to retrieve a specific page of results.
+            fields (Optional[List[str]]): Item fields to return as dotted paths (e.g. 'snippet.title') instead of whole parts.
 
         Returns:
             Optional[ApiResponse]: The JSON response from the API as a dictionary, or None if an error occurs.
@@ -46,6 +49,7 @@ class Activities:
             params['publishedBefore'] = occurred_before
         if page_token:
             params["pageToken"] = page_token
+        apply_projection(params, fields)
 
         return self._client._make_request(
             endpoint_path="activities",
@@ -55,7 +59,8 @@ class Activities:
 
     def stream_user_activities(self, part: str = "id,snippet,contentDetails",
                                occurred_after: Optional[str] = None,
-                               occurred_before: Optional[str] = None
+                               occurred_before: Optional[str] = None,
+                               fields: Optional[List[str]] = None
                                ) -> Generator[ApiResponse, None, None]:
         """
         Streams the authenticated user's activities as a generator.
@@ -65,6 +70,7 @@ class Activities:
                         Valid values are `id`, `snippet`, and `contentDetails`. Defaults to "id,snippet,contentDetails".
             occurred_after (Optional[str]): A datetime string (ISO 8601) to filter activities published after this time.
             occurred_before (Optional[str]): A datetime string (ISO 8601) to filter activities published before this time.
+            fields (Optional[List[str]]): Item fields to return (see `list`).
 
         Yields:
             ApiResponse: A dictionary/JSON form of the activity resource for each activity.
@@ -79,7 +85,8 @@ class Activities:
                 max_results=50,
                 occurred_after=occurred_after,
                 occurred_before=occurred_before,
-                page_token=next_page_token
+                page_token=next_page_token,
+                fields=fields
             )
 
             if not response or 'items' not in response:
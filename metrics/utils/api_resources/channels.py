@@ -1,9 +1,10 @@
 # Standard Library Imports
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
 from urllib.parse import unquote
 
 # Local App Imports
 from metrics.utils.date_helper import isostr_to_datetime
+from metrics.utils.projection_helper import apply_projection
 from metrics.utils.topic_helper import parse_topic_urls
 from metrics.utils.types import ApiResponse
 
@@ -16,7 +17,8 @@ class Channels:
              mine: bool = False,             
              channel_ids: Optional[str] = "",
              max_results: int = 50,
-             page_token: Optional[str] = None
+             page_token: Optional[str] = None,
+             fields: Optional[List[str]] = None
             ) -> Optional[ApiResponse]:
         """
         List raw data obtained from YouTube Data API regarding channels (up to 50 channels).
@@ -28,6 +30,7 @@ class Channels:
             channel_ids (Optional[str]): Comma-separated list of channel ids to retrieve data for.
             max_results (int): The number of items to return in response (1-50).
             page_token (Optional[str]): The specific page.
+            fields (Optional[List[str]]): Item fields to return as dotted paths (e.g. 'snippet.title') instead of whole parts.
         """
         # Build params dictionary
         params: Dict[str: Any] = {
@@ -46,6 +49,7 @@ class Channels:
 
         if page_token:
             params["pageToken"] = page_token
+        apply_projection(params, fields)
 
         # Make API request to list page of channels
         return self._client._make_request(
@@ -106,8 +110,8 @@ class Channels:
         Returns:
             str: The playlist ID for the user's liked videos, or an empty string if not found.
         """
-        # Request both snippet and contentDetails to ensure all data is available
-        raw_channel_data = self.list(part="snippet,contentDetails", mine=True)
+        # Only the likes playlist ID is needed, so nothing else is downloaded
+        raw_channel_data = self.list(mine=True, fields=["contentDetails.relatedPlaylists.likes"])
         if not raw_channel_data or 'items' not in raw_channel_data or not raw_channel_data['items']:
             return ""
 
@@ -3,6 +3,7 @@ from typing import Any, Dict, List, Optional
 
 # Local App Imports
 from metrics.utils.date_helper import isostr_to_datetime
+from metrics.utils.projection_helper import apply_projection
 from metrics.utils.types import ApiResponse
 
 class PlaylistItems:
@@ -18,7 +19,8 @@ class PlaylistItems:
     def list(self, part: str = "id,snippet,contentDetails,status",
              playlist_id: str = "",
              max_results: int = 50,
-             page_token: Optional[str] = None
+             page_token: Optional[str] = None,
+             fields: Optional[List[str]] = None
             ) -> Optional[ApiResponse]:
         """
         List raw data obtained from YouTube Data API regarding playlist items (up to 50 items).
@@ -29,6 +31,7 @@ class PlaylistItems:
             playlist_id (str): The ID of the playlist for which to retrieve items.
             max_results (int): The number of items to return in response (1-50).
             page_token (Optional[str]): The specific page token for pagination.
+            fields (Optional[List[str]]): Item fields to return as dotted paths (e.g. 'snippet.title') instead of whole parts.
 
         Returns:
             Optional[ApiResponse]: The JSON response from the API as a dictionary, or None if an error occurs.
@@ -45,6 +48,7 @@ class PlaylistItems:
 
         if page_token:
             params["pageToken"] = page_token
+        apply_projection(params, fields)
 
         # Make API request to playlistItems endpoint
         return self._client._make_request(
@@ -53,7 +57,7 @@ class PlaylistItems:
             use_oauth=True # playlistItems always require OAuth
         )
     
-    def list_all(self, playlist_id: str) -> Dict[int, ApiResponse]:
+    def list_all(self, playlist_id: str, fields: Optional[List[str]] = None) -> Dict[int, ApiResponse]:
         """
         Fetches all item resources from a specific playlist, handling pagination automatically.
 
@@ -63,6 +67,7 @@ class PlaylistItems:
 
         Args:
             playlist_id (str): The ID of the playlist for which to retrieve all items.
+            fields (Optional[List[str]]): Item fields to return (see `list`).
 
         Returns:
             Dict[int, ApiResponse]: A dictionary with keys of page numberings (50 entries per page) and values containing all the raw playlistItem resources listed from the API.
@@ -72,7 +77,7 @@ class PlaylistItems:
         page_token = None
         page_num = 0
         while True:
-            api_response = self.list(playlist_id=playlist_id, page_token=page_token)
+            api_response = self.list(playlist_id=playlist_id, page_token=page_token, fields=fields)
             if api_response:
                 all_playlistitems[page_num] = api_response
                 page_token = api_response.get('nextPageToken')
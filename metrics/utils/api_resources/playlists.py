@@ -1,8 +1,9 @@
 # Standard Library Imports
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
 
 # Local App Imports
 from metrics.utils.date_helper import isostr_to_datetime
+from metrics.utils.projection_helper import apply_projection
 from metrics.utils.types import ApiResponse
 
 class Playlists:
@@ -20,7 +21,8 @@ class Playlists:
                       playlist_ids: Optional[str] = None,
                       channel_id: Optional[str] = None,
                       max_results: int = 50,
-                      page_token: Optional[str] = None
+                      page_token: Optional[str] = None,
+                      fields: Optional[List[str]] = None
                     ) -> Optional[ApiResponse]:
         """
         List raw data obtained from YouTube Data API regarding playlists (up to 50 playlists).
@@ -33,6 +35,7 @@ class Playlists:
             channel_id (Optional[str]): The ID of the channel for which to retrieve playlists.
             max_results (int): The number of items to return in response (1-50).
             page_token (Optional[str]): The specific page token for pagination.
+            fields (Optional[List[str]]): Item fields to return as dotted paths (e.g. 'snippet.title') instead of whole parts.
 
         Returns:
             Optional[ApiResponse]: The JSON response from the API as a dictionary, or None if an error occurs.
@@ -57,6 +60,7 @@ class Playlists:
         
         if page_token:
             params["pageToken"] = page_token
+        apply_projection(params, fields)
 
         # Make API request to playlists endpoint
         return self._client._make_request(
@@ -65,6 +69,34 @@ class Playlists:
             use_oauth=use_oauth
         )
     
+    def list_all_mine(self, fields: Optional[List[str]] = None) -> Dict[int, ApiResponse]:
+        """
+        Fetches all playlists owned by the authenticated user, handling pagination automatically.
+
+        Args:
+            fields (Optional[List[str]]): Item fields to return (see `list`).
+
+        Returns:
+            Dict[int, ApiResponse]: A dictionary with keys of page numberings (50 entries per page) and values containing all the raw playlist resources listed from the API.
+            Returns an empty dict if the user has no playlists or an error occurs.
+        """
+        all_playlists = {}
+        page_token = None
+        page_num = 0
+        while True:
+            api_response = self.list(mine=True, page_token=page_token, fields=fields)
+            if api_response:
+                all_playlists[page_num] = api_response
+                page_token = api_response.get('nextPageToken')
+                page_num += 1
+            else:
+                break
+
+            if not page_token:
+                break
+
+        return all_playlists
+
     @staticmethod
     def process_raw_playlist(raw_playlist_data: ApiResponse) -> Optional[Dict[str, Any]]:
         """
@@ -1,7 +1,8 @@
 # Standard Library Imports
-from typing import Any, Dict, Generator, Optional
+from typing import Any, Dict, Generator, List, Optional
 
 # Local App Imports
+from metrics.utils.projection_helper import apply_projection
 from metrics.utils.types import ApiResponse
 
 class Subscriptions:
@@ -19,7 +20,8 @@ class Subscriptions:
              channel_id: Optional[str] = None,
              max_results: int = 50,
              order: str = "alphabetical",
-             page_token: Optional[str] = None
+             page_token: Optional[str] = None,
+             fields: Optional[List[str]] = None
             ) -> Optional[ApiResponse]:
         """
         List a single page of raw data obtained from YouTube Data API regarding subscriptions.
@@ -32,6 +34,7 @@ class Subscriptions:
             max_results (int): The maximum number of items to return per page (1-50).
             order (str): The order in which to retrieve the subscriptions. Accepts 'alphabetical', 'relevance', or 'unread'.
             page_token (Optional[str]): The `nextPageToken` or `prevPageToken` from a previous API response to retrieve a specific page of results.
+            fields (Optional[List[str]]): Item fields to return as dotted paths (e.g. 'snippet.title') instead of whole parts.
 
         Returns:
             Optional[ApiResponse]: The JSON response from the API as a dictionary, or None if an error occurs.
@@ -54,6 +57,7 @@ class Subscriptions:
 
         if page_token:
             params["pageToken"] = page_token
+        apply_projection(params, fields)
 
         # Make API request to list page of subscriptions
         return self._client._make_request(
@@ -63,7 +67,8 @@ class Subscriptions:
         )
 
     def stream_user_subscriptions(self, part: str = "id,snippet,contentDetails", 
-                                      order: str = "alphabetical"
+                                      order: str = "alphabetical",
+                                      fields: Optional[List[str]] = None
                                       ) -> Generator[ApiResponse, None, None]:
         """
         Generator to list all of the authenticated user's subscription data.
@@ -72,6 +77,7 @@ class Subscriptions:
             part (str): Comma-separated list of one or more subscription resource properties.
                         (e.g., 'snippet,contentDetails').
             order (str): The order in which to retrieve the subscriptions. Accepts 'alphabetical', 'relevance', or 'unread'.
+            fields (Optional[List[str]]): Item fields to return (see `list`).
 
         Yields:
             ApiResponse: A dictionary representing a single subscription item. None if there is an error during listing.
@@ -83,7 +89,8 @@ class Subscriptions:
                 mine=True,
                 max_results=50,
                 order=order,
-                page_token=next_page_token
+                page_token=next_page_token,
+                fields=fields
             )
 
             if not response or 'items' not in response:
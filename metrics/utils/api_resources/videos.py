@@ -2,6 +2,7 @@
 from typing import Any, Dict, List, Optional
 
 # Local App Imports
+from metrics.utils.projection_helper import apply_projection
 from metrics.utils.types import ApiResponse
 
 class Videos:
@@ -17,7 +18,8 @@ class Videos:
              chart: Optional[str] = None,
              video_category_id: Optional[str] = None,
              max_results: int = 50,
-             page_token: Optional[str] = None
+             page_token: Optional[str] = None,
+             fields: Optional[List[str]] = None
             ) -> Optional[ApiResponse]:
         """
         Retrieves a list of videos based on specified criteria. Corresponds to the `videos.list` endpoint.
@@ -31,6 +33,7 @@ class Videos:
             video_category_id (Optional[str]): The video category ID for which you want to retrieve popular videos.
             max_results (int): The maximum number of items to return (1-50).
             page_token (Optional[str]): The token for a specific page of results.
+            fields (Optional[List[str]]): Item fields to return as dotted paths (e.g. 'snippet.title') instead of whole parts.
 
         Returns:
             Optional[ApiResponse]: The raw JSON response from the API, or None if an error occurs.
@@ -56,6 +59,7 @@ class Videos:
 
         if page_token:
             params["pageToken"] = page_token
+        apply_projection(params, fields)
 
         # Make API request to list page of channels
         return self._client._make_request(
@@ -64,12 +68,13 @@ class Videos:
             use_oauth=use_oauth
         )
     
-    def list_all_video_id(self, video_ids: List[str]) -> Dict[int, ApiResponse]:
+    def list_all_video_id(self, video_ids: List[str], fields: Optional[List[str]] = None) -> Dict[int, ApiResponse]:
         """
         Fetches all video resources for a given list of video IDs, handling pagination automatically.
 
         Args:
             video_ids (List[str]): A list of video IDs to retrieve.
+            fields (Optional[List[str]]): Item fields to return (see `list_video`).
 
         Returns:
             Dict[int, ApiResponse]: A dictionary where keys are page numbers and values are the raw
@@ -80,7 +85,7 @@ class Videos:
         page_token = None
         page_num = 0
         while True:
-            api_response = self.list_video(video_ids=video_ids_str, page_token=page_token)
+            api_response = self.list_video(video_ids=video_ids_str, page_token=page_token, fields=fields)
             if api_response:
                 all_videos[page_num] = api_response
                 page_token = api_response.get('nextPageToken')
@@ -93,12 +98,13 @@ class Videos:
                     
         return all_videos
     
-    def list_all_user_rated(self, user_rating: str) -> Dict[int, ApiResponse]:
+    def list_all_user_rated(self, user_rating: str, fields: Optional[List[str]] = None) -> Dict[int, ApiResponse]:
         """
         Fetches all videos rated by the authenticated user, handling pagination automatically.
 
         Args:
             user_rating (str): The rating type to filter by. Acceptable values are "like" or "dislike".
+            fields (Optional[List[str]]): Item fields to return (see `list_video`).
 
         Returns:
             Dict[int, ApiResponse]: A dictionary where keys are page numbers and values are the raw
@@ -108,7 +114,7 @@ class Videos:
         page_token = None
         page_num = 0
         while True:
-            api_response = self.list_video(user_rating=user_rating, page_token=page_token)
+            api_response = self.list_video(user_rating=user_rating, page_token=page_token, fields=fields)
             if api_response:
                 all_videos[page_num] = api_response
                 page_token = api_response.get('nextPageToken')
@@ -125,7 +131,8 @@ class Videos:
                             category_ids: Optional[str] = None,
                             region_code: Optional[str] = None,
                             max_results: int = 50,
-                            page_token: Optional[str] = None
+                            page_token: Optional[str] = None,
+                            fields: Optional[List[str]] = None
                             ) -> Optional[ApiResponse]:
         """
         Retrieves a list of video categories based on specified criteria. Corresponds to the `videoCategories.list` endpoint.
@@ -136,6 +143,7 @@ class Videos:
             region_code (Optional[str]): Instructs the API to return the list of video categories available in the specified country.
             max_results (int): The maximum number of items to return (1-50).
             page_token (Optional[str]): The token for a specific page of results.
+            fields (Optional[List[str]]): Item fields to return as dotted paths (e.g. 'snippet.title') instead of whole parts.
 
         Returns:
             Optional[ApiResponse]: The raw JSON response from the API, or None if an error occurs.
@@ -153,6 +161,7 @@ class Videos:
 
         if page_token:
             params["pageToken"] = page_token
+        apply_projection(params, fields)
 
         return self._client._make_request(
             endpoint_path="videoCategories",
@@ -0,0 +1,524 @@
+"""
+An offline stand-in for the YouTube Data API v3, for benchmarking and exercising the views without quota.
+
+The server implements the endpoints the `api_resources` call (channels, playlists, playlistItems,
+videos, videoCategories, subscriptions and activities) over a deterministic synthetic dataset:
+the same seed always yields the same channels, videos, playlists and page tokens. It honours
+`part`, `fields`, `id`, `mine`, `maxResults` and `pageToken`, answers batch requests (POSTs to
+/batch/youtube/v3, see `batch_helper`), compresses responses the way the API does (for clients that
+accept gzip and say so in their User-Agent), and can add latency and inject
+errors in the API's own error format. Responses recorded by `YouTubeClient` (see `fixture_helper`) take
+precedence over the synthetic data, so real captures can be replayed through the same latency and
+failure settings.
+
+Run it with `manage.py run_api_stub` and point YOUTUBE_API_BASE_URL at it.
+"""
+
+# Standard Library Imports
+import base64
+import gzip
+import hashlib
+import json
+import random
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlsplit
+
+# Local App Imports
+from .batch_helper import decode_batch_request, encode_batch_response
+from .fixture_helper import load_fixture
+from .projection_helper import apply_fields, parse_fields
+
+API_PREFIX = '/youtube/v3/'
+BATCH_PATH = '/batch' + API_PREFIX.rstrip('/')
+DEFAULT_MAX_RESULTS = 5 # The API's own default when maxResults is omitted
+MAX_MAX_RESULTS = 50
+EPOCH = datetime(2015, 1, 1, tzinfo=timezone.utc)
+
+VIDEO_CATEGORIES = {
+    '1': 'Film & Animation', '2': 'Autos & Vehicles', '10': 'Music', '15': 'Pets & Animals',
+    '17': 'Sports', '19': 'Travel & Events', '20': 'Gaming', '22': 'People & Blogs', '23': 'Comedy',
+    '24': 'Entertainment', '25': 'News & Politics', '26': 'Howto & Style', '27': 'Education',
+    '28': 'Science & Technology', '29': 'Nonprofits & Activism',
+}
+TOPICS = [
+    'Music', 'Pop_music', 'Hip_hop_music', 'Video_game_culture', 'Action_game', 'Technology',
+    'Knowledge', 'Lifestyle_(sociology)', 'Food', 'Tourism', 'Physical_fitness', 'Politics',
+    'Society', 'Sport', 'Association_football', 'Film', 'Entertainment', 'Humour', 'Pet', 'Vehicle',
+]
+
+
+def stub_channel_id(index: int) -> str:
+    """The ID of the `index`-th synthetic channel."""
+    return f"UCstub{index:016d}"
+
+def stub_video_id(channel_index: int, video_index: int) -> str:
+    """The ID of a synthetic channel's `video_index`-th upload (11 characters, like real video IDs)."""
+    return f"v{channel_index:05d}{video_index:05d}"
+
+
+@dataclass
+class StubConfig:
+    """Behaviour of the stand-in server beyond the dataset itself."""
+    latency_ms: float = 0.0 # Added to every response (once per batch request)
+    jitter_ms: float = 0.0 # Uniform random extra latency on top of `latency_ms`
+    error_rate: float = 0.0 # Fraction of requests (and batch sub-requests) answered with a 500 backendError
+    quota_requests: Optional[int] = None # Requests (counting batch sub-requests) served before every response becomes 403 quotaExceeded
+    fixtures_dir: str = '' # Recorded responses served before the synthetic dataset
+
+
+class StubDataset:
+    """
+    A deterministic synthetic YouTube account and the public channels around it.
+
+    Args:
+        seed (int): Seed of the generator; equal seeds produce identical datasets.
+        channel_count (int): Number of public channels.
+        videos_per_channel (int): Uploads per channel.
+        subscription_count (int): Channels the account subscribes to.
+        playlist_count (int): Playlists the account owns (besides its liked videos).
+        liked_count (int): Videos the account has liked.
+    """
+    MINE_CHANNEL_ID = 'UCstubmine000000000000'
+    LIKED_PLAYLIST_ID = 'LLstubmine000000000000'
+
+    def __init__(self, seed: int = 0, channel_count: int = 300, videos_per_channel: int = 40,
+                 subscription_count: int = 150, playlist_count: int = 20, liked_count: int = 400) -> None:
+        rng = random.Random(seed)
+
+        self.channels: Dict[str, Dict[str, Any]] = {}
+        self.videos: Dict[str, Dict[str, Any]] = {}
+        self.playlists: Dict[str, Dict[str, Any]] = {} # playlist ID -> resource
+        self.playlist_items: Dict[str, List[Dict[str, Any]]] = {} # playlist ID -> items in order
+        self.unavailable: set = set() # video IDs that videos.list no longer returns
+
+        for c in range(channel_count):
+            channel_id = stub_channel_id(c)
+            topics = rng.sample(TOPICS, rng.randint(1, 4))
+            category_id = rng.choice(list(VIDEO_CATEGORIES))
+            channel = self._channel(channel_id, f"Stub Channel {c}", rng, topics)
+            self.channels[channel_id] = channel
+
+            uploads_id = channel['contentDetails']['relatedPlaylists']['uploads']
+            uploads = []
+            for v in range(videos_per_channel):
+                video = self._video(stub_video_id(c, v), channel, category_id, topics, rng)
+                self.videos[video['id']] = video
+                uploads.append(video)
+                if rng.random() < 0.02:
+                    self.unavailable.add(video['id'])
+            uploads.sort(key=lambda video: video['snippet']['publishedAt'], reverse=True)
+            self._add_playlist(uploads_id, channel, f"Uploads from {channel['snippet']['title']}", uploads, rng)
+
+        self.mine = self._channel(self.MINE_CHANNEL_ID, "Stub Viewer", rng, [])
+        self.mine['contentDetails']['relatedPlaylists']['likes'] = self.LIKED_PLAYLIST_ID
+        self._add_playlist('UU' + self.MINE_CHANNEL_ID[2:], self.mine, "Uploads from Stub Viewer", [], rng)
+
+        channel_ids = list(self.channels)
+        self.subscriptions = [
+            self._subscription(self.channels[channel_id], rng)
+            for channel_id in sorted(rng.sample(channel_ids, min(subscription_count, len(channel_ids))),
+                                     key=lambda channel_id: self.channels[channel_id]['snippet']['title'])
+        ]
+
+        video_ids = list(self.videos)
+        liked = [self.videos[video_id] for video_id in rng.sample(video_ids, min(liked_count, len(video_ids)))]
+        self.liked_video_ids = [video['id'] for video in liked]
+        self._add_playlist(self.LIKED_PLAYLIST_ID, self.mine, "Liked videos", liked, rng)
+
+        self.my_playlist_ids = []
+        for p in range(playlist_count):
+            playlist_id = f"PLstub{p:016d}"
+            picks = [self.videos[video_id] for video_id in rng.sample(video_ids, rng.randint(0, min(120, len(video_ids))))]
+            picks += rng.sample(picks, len(picks) // 20) # a few duplicates within the playlist
+            self._add_playlist(playlist_id, self.mine, f"Stub Playlist {p}", picks, rng, dead_rate=0.03)
+            self.my_playlist_ids.append(playlist_id)
+
+        self.activities = [
+            {
+                'kind': 'youtube#activity',
+                'id': f"ACstub{i:010d}",
+                'snippet': {
+                    'publishedAt': self._timestamp(rng),
+                    'channelId': self.MINE_CHANNEL_ID,
+                    'title': video['snippet']['title'],
+                    'type': 'like',
+                },
+                'contentDetails': {'like': {'resourceId': {'kind': 'youtube#video', 'videoId': video['id']}}},
+            }
+            for i, video in enumerate(liked[:200])
+        ]
+        self.activities.sort(key=lambda activity: activity['snippet']['publishedAt'], reverse=True)
+
+    # --- Resource construction ---
+    @staticmethod
+    def _timestamp(rng: random.Random) -> str:
+        moment = EPOCH + timedelta(seconds=rng.randint(0, 10 * 365 * 86400))
+        return moment.strftime('%Y-%m-%dT%H:%M:%SZ')
+
+    @staticmethod
+    def _thumbnails(key: str) -> Dict[str, Any]:
+        return {size: {'url': f"https://stub.invalid/{key}/{size}.jpg"} for size in ('default', 'medium', 'high')}
+
+    def _channel(self, channel_id: str, title: str, rng: random.Random, topics: List[str]) -> Dict[str, Any]:
+        return {
+            'kind': 'youtube#channel',
+            'id': channel_id,
+            'snippet': {
+                'title': title,
+                'description': f"Synthetic channel {title}.",
+                'publishedAt': self._timestamp(rng),
+                'thumbnails': self._thumbnails(channel_id),
+            },
+            'contentDetails': {'relatedPlaylists': {'likes': '', 'uploads': 'UU' + channel_id[2:]}},
+            'statistics': {
+                'viewCount': str(rng.randint(1000, 10 ** 9)),
+                'subscriberCount': str(rng.randint(10, 10 ** 7)),
+                'hiddenSubscriberCount': rng.random() < 0.05,
+                'videoCount': str(rng.randint(1, 2000)),
+            },
+            'topicDetails': {'topicCategories': [f"https://en.wikipedia.org/wiki/{topic}" for topic in topics]},
+        }
+
+    def _video(self, video_id: str, channel: Dict[str, Any], category_id: str, topics: List[str],
+               rng: random.Random) -> Dict[str, Any]:
+        minutes, seconds = divmod(rng.randint(30, 3 * 3600), 60)
+        hours, minutes = divmod(minutes, 60)
+        duration = 'PT' + (f"{hours}H" if hours else '') + (f"{minutes}M" if minutes else '') + f"{seconds}S"
+        return {
+            'kind': 'youtube#video',
+            'id': video_id,
+            'snippet': {
+                'publishedAt': self._timestamp(rng),
+                'channelId': channel['id'],
+                'channelTitle': channel['snippet']['title'],
+                'title': f"Stub Video {video_id}",
+                'description': '',
+                'thumbnails': self._thumbnails(video_id),
+                'categoryId': category_id,
+            },
+            'contentDetails': {'duration': duration},
+            'status': {'privacyStatus': 'public'},
+            'statistics': {'viewCount': str(rng.randint(0, 10 ** 8)), 'likeCount': str(rng.randint(0, 10 ** 6))},
+            'topicDetails': {'topicCategories': [f"https://en.wikipedia.org/wiki/{topic}" for topic in topics]},
+        }
+
+    def _subscription(self, channel: Dict[str, Any], rng: random.Random) -> Dict[str, Any]:
+        return {
+            'kind': 'youtube#subscription',
+            'id': 'SUB' + channel['id'][2:],
+            'snippet': {
+                'publishedAt': self._timestamp(rng),
+                'title': channel['snippet']['title'],
+                'description': channel['snippet']['description'],
+                'resourceId': {'kind': 'youtube#channel', 'channelId': channel['id']},
+                'channelId': self.MINE_CHANNEL_ID,
+                'thumbnails': channel['snippet']['thumbnails'],
+            },
+            'contentDetails': {'totalItemCount': int(channel['statistics']['videoCount']), 'newItemCount': 0},
+        }
+
+    def _add_playlist(self, playlist_id: str, owner: Dict[str, Any], title: str, videos: List[Dict[str, Any]],
+                      rng: random.Random, dead_rate: float = 0.0) -> None:
+        items = []
+        for position, video in enumerate(videos):
+            dead = rng.random() < dead_rate
+            items.append({
+                'kind': 'youtube#playlistItem',
+                'id': f"PI{playlist_id[2:]}{position:05d}",
+                'snippet': {
+                    'publishedAt': self._timestamp(rng),
+                    'channelId': owner['id'],
+                    'channelTitle': owner['snippet']['title'],
+                    'title': 'Deleted video' if dead else video['snippet']['title'],
+                    'description': '',
+                    'thumbnails': {} if dead else video['snippet']['thumbnails'],
+                    'playlistId': playlist_id,
+                    'position': position,
+                    'resourceId': {'kind': 'youtube#video', 'videoId': video['id']},
+                    'videoOwnerChannelId': video['snippet']['channelId'],
+                    'videoOwnerChannelTitle': video['snippet']['channelTitle'],
+                },
+                'contentDetails': {'videoId': video['id'], 'videoPublishedAt': video['snippet']['publishedAt']},
+                'status': {'privacyStatus': 'privacyStatusUnspecified' if dead else 'public'},
+            })
+        self.playlist_items[playlist_id] = items
+        self.playlists[playlist_id] = {
+            'kind': 'youtube#playlist',
+            'id': playlist_id,
+            'snippet': {
+                'publishedAt': self._timestamp(rng),
+                'channelId': owner['id'],
+                'channelTitle': owner['snippet']['title'],
+                'title': title,
+                'description': '',
+                'thumbnails': self._thumbnails(playlist_id),
+            },
+            'status': {'privacyStatus': rng.choice(['public', 'unlisted', 'private'])},
+            'contentDetails': {'itemCount': len(items)},
+        }
+
+    # --- Endpoints ---
+    def channels_list(self, params: Dict[str, str]) -> List[Dict[str, Any]]:
+        if params.get('mine') == 'true':
+            return [self.mine]
+        return self._by_ids(self.channels, params, 'id')
+
+    def playlists_list(self, params: Dict[str, str]) -> List[Dict[str, Any]]:
+        if params.get('mine') == 'true':
+            return [self.playlists[playlist_id] for playlist_id in self.my_playlist_ids]
+        if params.get('channelId'):
+            return [playlist for playlist in self.playlists.values()
+                    if playlist['snippet']['channelId'] == params['channelId']]
+        return self._by_ids(self.playlists, params, 'id')
+
+    def playlist_items_list(self, params: Dict[str, str]) -> List[Dict[str, Any]]:
+        if params.get('playlistId') not in self.playlist_items:
+            raise StubError(404, 'playlistNotFound', "The playlist identified with the request's playlistId parameter cannot be found.")
+        return self.playlist_items[params['playlistId']]
+
+    def videos_list(self, params: Dict[str, str]) -> List[Dict[str, Any]]:
+        if params.get('myRating') == 'like':
+            return [self.videos[video_id] for video_id in self.liked_video_ids if video_id not in self.unavailable]
+        if params.get('chart') == 'mostPopular':
+            category_id = params.get('videoCategoryId')
+            popular = [video for video in self.videos.values()
+                       if video['id'] not in self.unavailable
+                       and (not category_id or video['snippet']['categoryId'] == category_id)]
+            return sorted(popular, key=lambda video: int(video['statistics']['viewCount']), reverse=True)[:200]
+        available = {video_id: video for video_id, video in self.videos.items() if video_id not in self.unavailable}
+        return self._by_ids(available, params, 'id')
+
+    def video_categories_list(self, params: Dict[str, str]) -> List[Dict[str, Any]]:
+        categories = {
+            category_id: {'kind': 'youtube#videoCategory', 'id': category_id,
+                          'snippet': {'title': title, 'assignable': True, 'channelId': 'UCBR8-60-B28hp2BmDPdntcQ'}}
+            for category_id, title in VIDEO_CATEGORIES.items()
+        }
+        if params.get('id'):
+            return self._by_ids(categories, params, 'id')
+        return list(categories.values())
+
+    def subscriptions_list(self, params: Dict[str, str]) -> List[Dict[str, Any]]:
+        if params.get('mine') != 'true':
+            return [] # other users' subscriptions are private
+        return self.subscriptions
+
+    def activities_list(self, params: Dict[str, str]) -> List[Dict[str, Any]]:
+        if params.get('mine') != 'true':
+            return []
+        after, before = params.get('publishedAfter'), params.get('publishedBefore')
+        return [activity for activity in self.activities
+                if (not after or activity['snippet']['publishedAt'] >= after)
+                and (not before or activity['snippet']['publishedAt'] < before)]
+
+    @staticmethod
+    def _by_ids(resources: Dict[str, Dict[str, Any]], params: Dict[str, str], name: str) -> List[Dict[str, Any]]:
+        ids = [resource_id for resource_id in params.get(name, '').split(',') if resource_id]
+        if len(ids) > MAX_MAX_RESULTS:
+            raise StubError(400, 'invalidParameter', f"Too many values for parameter '{name}'.")
+        return [resources[resource_id] for resource_id in ids if resource_id in resources]
+
+
+class StubError(Exception):
+    """An API error, answered in the YouTube Data API's JSON error format."""
+    def __init__(self, status: int, reason: str, message: str) -> None:
+        super().__init__(message)
+        self.status = status
+        self.reason = reason
+        self.message = message
+
+    def to_response(self) -> Dict[str, Any]:
+        return {'error': {'code': self.status, 'message': self.message,
+                          'errors': [{'message': self.message, 'domain': 'youtube.api', 'reason': self.reason}]}}
+
+
+ENDPOINTS = {
+    'channels': ('youtube#channelListResponse', StubDataset.channels_list, True),
+    'playlists': ('youtube#playlistListResponse', StubDataset.playlists_list, True),
+    'playlistItems': ('youtube#playlistItemListResponse', StubDataset.playlist_items_list, True),
+    'videos': ('youtube#videoListResponse', StubDataset.videos_list, True),
+    'videoCategories': ('youtube#videoCategoryListResponse', StubDataset.video_categories_list, False),
+    'subscriptions': ('youtube#subscriptionListResponse', StubDataset.subscriptions_list, True),
+    'activities': ('youtube#activityListResponse', StubDataset.activities_list, True),
+}
+
+def build_response(dataset: StubDataset, endpoint: str, params: Dict[str, str]) -> Dict[str, Any]:
+    """
+    Answer one list request from the synthetic dataset.
+
+    Args:
+        dataset (StubDataset): The dataset to serve.
+        endpoint (str): The endpoint path below /youtube/v3/ (e.g. 'playlistItems').
+        params (Dict[str, str]): The query parameters.
+
+    Returns:
+        Dict[str, Any]: The list response.
+
+    Raises:
+        StubError: If the endpoint is unknown or the parameters are invalid.
+    """
+    if endpoint not in ENDPOINTS:
+        raise StubError(404, 'notFound', f"Unknown endpoint '{endpoint}'.")
+    kind, list_resources, paginated = ENDPOINTS[endpoint]
+    if not params.get('part'):
+        raise StubError(400, 'required', "Required parameter: part")
+
+    resources = list_resources(dataset, params)
+    response: Dict[str, Any] = {'kind': kind, 'etag': ''}
+    if paginated:
+        page, next_token, prev_token = paginate(resources, params)
+        if next_token:
+            response['nextPageToken'] = next_token
+        if prev_token:
+            response['prevPageToken'] = prev_token
+        response['pageInfo'] = {'totalResults': len(resources), 'resultsPerPage': len(page)}
+    else:
+        page = resources
+    response['items'] = [select_parts(resource, params['part']) for resource in page]
+    response['etag'] = hashlib.md5(json.dumps(response['items'], sort_keys=True).encode()).hexdigest()
+    if params.get('fields'):
+        try:
+            return apply_fields(response, parse_fields(params['fields']))
+        except ValueError as exc:
+            raise StubError(400, 'invalidParameter', "Invalid field selection.") from exc
+    return response
+
+def paginate(resources: List[Any], params: Dict[str, str]) -> Tuple[List[Any], Optional[str], Optional[str]]:
+    """Slice one page out of `resources` according to `maxResults` and `pageToken`."""
+    try:
+        max_results = int(params.get('maxResults', DEFAULT_MAX_RESULTS))
+    except ValueError as exc:
+        raise StubError(400, 'invalidParameter', "Invalid value for parameter 'maxResults'.") from exc
+    if not 0 <= max_results <= MAX_MAX_RESULTS:
+        raise StubError(400, 'invalidParameter', "Invalid value for parameter 'maxResults'.")
+
+    offset = decode_token(params['pageToken']) if params.get('pageToken') else 0
+    if offset is None or offset > len(resources):
+        raise StubError(400, 'invalidPageToken', "The request specifies an invalid page token.")
+
+    end = offset + max_results
+    next_token = encode_token(end) if end < len(resources) and max_results else None
+    prev_token = encode_token(max(offset - max_results, 0)) if offset else None
+    return resources[offset:end], next_token, prev_token
+
+def encode_token(offset: int) -> str:
+    return base64.urlsafe_b64encode(f"stub:{offset}".encode()).decode().rstrip('=')
+
+def decode_token(token: str) -> Optional[int]:
+    try:
+        prefix, offset = base64.urlsafe_b64decode(token + '=' * (-len(token) % 4)).decode().split(':')
+        return int(offset) if prefix == 'stub' and int(offset) >= 0 else None
+    except ValueError:
+        return None
+
+def select_parts(resource: Dict[str, Any], part: str) -> Dict[str, Any]:
+    """Keep only the requested parts of a resource (plus its kind and ID), as the API does."""
+    parts = set(part.split(','))
+    return {key: value for key, value in resource.items() if key in ('kind', 'id') or key in parts}
+
+
+class ApiStubServer(ThreadingHTTPServer):
+    """
+    Serves the stand-in API over HTTP.
+
+    Args:
+        address (Tuple[str, int]): The host and port to bind (port 0 picks a free port).
+        dataset (StubDataset): The dataset to serve.
+        config (StubConfig): Latency, error injection and fixture settings.
+    """
+    daemon_threads = True
+
+    def __init__(self, address: Tuple[str, int], dataset: StubDataset, config: StubConfig) -> None:
+        super().__init__(address, ApiStubHandler)
+        self.dataset = dataset
+        self.config = config
+        self.request_count = 0
+        self._lock = threading.Lock()
+        self._rng = random.Random(0)
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}{API_PREFIX.rstrip('/')}"
+
+    def next_request(self) -> Tuple[int, float]:
+        """Count a request and draw its random numbers; returns (request number, uniform draw)."""
+        with self._lock:
+            self.request_count += 1
+            return self.request_count, self._rng.random()
+
+
+class ApiStubHandler(BaseHTTPRequestHandler):
+    server: ApiStubServer
+
+    def do_GET(self) -> None:
+        request_number, draw = self.server.next_request()
+        self._delay(draw)
+        status, body = self._answer(self.path, request_number, draw)
+        self._send(status, json.dumps(body).encode('utf-8'), 'application/json; charset=UTF-8')
+
+    def do_POST(self) -> None:
+        length = int(self.headers.get('Content-Length') or 0)
+        request_body = self.rfile.read(length)
+        if urlsplit(self.path).path.rstrip('/') != BATCH_PATH:
+            error = StubError(404, 'notFound', f"Unknown path '{self.path}'.")
+            self._send(error.status, json.dumps(error.to_response()).encode('utf-8'), 'application/json; charset=UTF-8')
+            return
+        try:
+            sub_requests = decode_batch_request(request_body, self.headers.get('Content-Type', ''))
+        except ValueError as e:
+            error = StubError(400, 'badRequest', str(e))
+            self._send(error.status, json.dumps(error.to_response()).encode('utf-8'), 'application/json; charset=UTF-8')
+            return
+
+        # Every sub-request counts against the quota and may fail, but the batch waits only once
+        numbered = [self.server.next_request() for _ in sub_requests]
+        self._delay(numbered[0][1] if numbered else 0.0)
+        results = []
+        for (content_id, path), (request_number, draw) in zip(sub_requests, numbered):
+            status, body = self._answer(path, request_number, draw)
+            results.append((content_id, status, HTTPStatus(status).phrase, json.dumps(body).encode('utf-8')))
+        payload, content_type = encode_batch_response(results)
+        self._send(200, payload, content_type)
+
+    def _delay(self, draw: float) -> None:
+        delay = self.server.config.latency_ms + draw * self.server.config.jitter_ms
+        if delay:
+            time.sleep(delay / 1000)
+
+    def _answer(self, path: str, request_number: int, draw: float) -> Tuple[int, Dict[str, Any]]:
+        """Answer one API request (a GET or a batch sub-request); returns (status, JSON body)."""
+        url = urlsplit(path)
+        params = dict(parse_qsl(url.query))
+        endpoint = url.path[len(API_PREFIX):] if url.path.startswith(API_PREFIX) else ''
+        config = self.server.config
+        try:
+            if config.quota_requests is not None and request_number > config.quota_requests:
+                raise StubError(403, 'quotaExceeded', "The request cannot be completed because you have exceeded your quota.")
+            if draw < config.error_rate:
+                raise StubError(500, 'backendError', "Backend Error")
+            recorded = load_fixture(config.fixtures_dir, endpoint, params) if config.fixtures_dir else None
+            return 200, recorded if recorded is not None else build_response(self.server.dataset, endpoint, params)
+        except StubError as e:
+            return e.status, e.to_response()
+
+    def _send(self, status: int, payload: bytes, content_type: str) -> None:
+        compress = 'gzip' in self.headers.get('Accept-Encoding', '') and 'gzip' in self.headers.get('User-Agent', '')
+        if compress:
+            payload = gzip.compress(payload, compresslevel=6)
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        if compress:
+            self.send_header('Content-Encoding', 'gzip')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass # one line per request would drown out benchmark output
@@ -1,12 +1,14 @@
 # Standard Library Imports
 import os
+from typing import TYPE_CHECKING
 
 # Third-Party Imports
 from dotenv import load_dotenv
-from google.oauth2.credentials import Credentials
-from google_auth_oauthlib.flow import Flow
 from django.conf import settings
 
+if TYPE_CHECKING:
+    from google.oauth2.credentials import Credentials
+
 class OAuth:
     def __init__(self) -> None:
         os.environ['OAUTHLIB_INSECURE_TRANSPORT'] = '1'
@@ -52,6 +54,8 @@ class OAuth:
         Returns:
             A tuple containing the authorization URL and the state parameter.
         """
+        from google_auth_oauthlib.flow import Flow # only needed during login, so kept off the import path of every worker
+
         client_config = self.build_client_config()
         flow = Flow.from_client_config(
             client_config=client_config,
@@ -67,10 +71,12 @@ class OAuth:
 
         return authorization_url, state
 
-    def fetch_credentials(self, state: str, authorization_response: str) -> Credentials:
+    def fetch_credentials(self, state: str, authorization_response: str) -> 'Credentials':
         """
         Takes the redirect URL returned by Google (authorization_response) and returns credentials by extracting the authorization code within the URL and making a secure request to the token endpoint.
         """
+        from google_auth_oauthlib.flow import Flow
+
         client_config = self.build_client_config()
         flow = Flow.from_client_config(
             client_config=client_config,
@@ -0,0 +1,140 @@
+"""
+Encodes and decodes Google API batch requests (multipart/mixed bodies of embedded HTTP messages).
+
+A batch request is one POST to the API's batch endpoint whose body holds many sub-requests,
+each an `application/http` part with a Content-ID. The response holds one `application/http`
+part per sub-request, carrying that sub-request's own status line, headers and body; its
+Content-ID is the request's prefixed with 'response-'. `YouTubeClient.batch` builds requests
+with these functions and the offline API stand-in answers them.
+"""
+
+# Standard Library Imports
+import re
+import uuid
+from typing import Dict, List, Tuple
+
+CRLF = b'\r\n'
+_BOUNDARY = re.compile(r'boundary="?([^";]+)"?', re.IGNORECASE)
+
+def batch_path(base_url: str) -> Tuple[str, str]:
+    """
+    Derive the batch endpoint and the sub-request path prefix from an API base URL.
+
+    'https://www.googleapis.com/youtube/v3' yields ('https://www.googleapis.com/batch/youtube/v3', '/youtube/v3').
+    """
+    match = re.match(r'^(https?://[^/]+)(/.*)?$', base_url.rstrip('/'))
+    if not match:
+        raise ValueError(f"Invalid API base URL '{base_url}'.")
+    origin, path = match.group(1), match.group(2) or ''
+    return f"{origin}/batch{path}", path
+
+def encode_batch_request(paths: List[str]) -> Tuple[bytes, str]:
+    """
+    Build the body of a batch of GET sub-requests.
+
+    Args:
+        paths (List[str]): The path and query string of each sub-request, e.g. '/youtube/v3/videos?part=id&id=x'.
+
+    Returns:
+        Tuple[bytes, str]: The body and its Content-Type (with the boundary).
+    """
+    return _encode_parts([
+        ({'Content-Type': 'application/http', 'Content-ID': f"<item{index}>"}, f"GET {path} HTTP/1.1\r\n\r\n".encode('utf-8'))
+        for index, path in enumerate(paths)
+    ])
+
+def decode_batch_response(body: bytes, content_type: str) -> Dict[int, Tuple[int, bytes]]:
+    """
+    Split a batch response into the results of its sub-requests.
+
+    Args:
+        body (bytes): The batch response body.
+        content_type (str): Its Content-Type header, which names the boundary.
+
+    Returns:
+        Dict[int, Tuple[int, bytes]]: Sub-request indexes (their order in `encode_batch_request`) mapped
+        to (HTTP status, body). Sub-requests without a response part are absent.
+
+    Raises:
+        ValueError: If the body is not a multipart batch response.
+    """
+    results = {}
+    for headers, payload in _decode_parts(body, content_type):
+        match = re.fullmatch(r'<response-item(\d+)>', headers.get('content-id', ''))
+        if not match:
+            continue
+        head, _, message_body = payload.partition(CRLF + CRLF)
+        status_line = head.split(CRLF, 1)[0].decode('utf-8')
+        results[int(match.group(1))] = (int(status_line.split()[1]), message_body)
+    return results
+
+def decode_batch_request(body: bytes, content_type: str) -> List[Tuple[str, str]]:
+    """
+    Split a batch request into its sub-requests, for serving batches.
+
+    Returns:
+        List[Tuple[str, str]]: (Content-ID, path with query string) of every GET sub-request.
+
+    Raises:
+        ValueError: If the body is not a multipart batch request or a sub-request is not a GET.
+    """
+    requests = []
+    for headers, payload in _decode_parts(body, content_type):
+        request_line = payload.split(CRLF, 1)[0].decode('utf-8')
+        method, path = (request_line.split() + ['', ''])[:2]
+        if method != 'GET' or not path:
+            raise ValueError(f"Unsupported batch sub-request '{request_line}'.")
+        requests.append((headers.get('content-id', ''), path))
+    return requests
+
+def encode_batch_response(results: List[Tuple[str, int, str, bytes]]) -> Tuple[bytes, str]:
+    """
+    Build a batch response body.
+
+    Args:
+        results (List[Tuple[str, int, str, bytes]]): (request Content-ID, status, reason, JSON body) per sub-request.
+
+    Returns:
+        Tuple[bytes, str]: The body and its Content-Type (with the boundary).
+    """
+    parts = []
+    for content_id, status, reason, body in results:
+        response_id = f"<response-{content_id.strip('<>')}>" if content_id else ''
+        message = (f"HTTP/1.1 {status} {reason}\r\nContent-Type: application/json; charset=UTF-8\r\n"
+                   f"Content-Length: {len(body)}\r\n\r\n").encode('utf-8') + body
+        parts.append(({'Content-Type': 'application/http', 'Content-ID': response_id}, message))
+    return _encode_parts(parts)
+
+def _encode_parts(parts: List[Tuple[Dict[str, str], bytes]]) -> Tuple[bytes, str]:
+    boundary = f"batch_{uuid.uuid4().hex}"
+    chunks = []
+    for headers, payload in parts:
+        chunks.append(f"--{boundary}\r\n".encode('utf-8'))
+        chunks.append("".join(f"{name}: {value}\r\n" for name, value in headers.items() if value).encode('utf-8'))
+        chunks.append(CRLF + payload + CRLF)
+    chunks.append(f"--{boundary}--\r\n".encode('utf-8'))
+    return b''.join(chunks), f"multipart/mixed; boundary={boundary}"
+
+def _decode_parts(body: bytes, content_type: str) -> List[Tuple[Dict[str, str], bytes]]:
+    """Split a multipart body into (lower-cased part headers, payload) pairs."""
+    content_type = content_type or ''
+    match = _BOUNDARY.search(content_type)
+    if not content_type.lower().startswith('multipart/') or not match:
+        raise ValueError(f"Not a multipart body (Content-Type '{content_type}').")
+    delimiter = b'--' + match.group(1).encode('utf-8')
+
+    parts = []
+    for chunk in body.split(delimiter)[1:]:
+        if chunk.startswith(b'--'):
+            break # the closing delimiter
+        header_block, _, payload = chunk.strip(CRLF).partition(CRLF + CRLF)
+        parts.append((_parse_headers(header_block), payload))
+    return parts
+
+def _parse_headers(block: bytes) -> Dict[str, str]:
+    headers: Dict[str, str] = {}
+    for line in block.decode('utf-8').split('\r\n'):
+        name, separator, value = line.partition(':')
+        if separator:
+            headers[name.strip().lower()] = value.strip()
+    return headers
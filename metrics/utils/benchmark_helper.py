@@ -0,0 +1,90 @@
+"""
+Measures benchmark scenarios and compares them against stored baselines.
+
+Wall time is the best of several untraced runs; peak memory comes from one extra run under
+`tracemalloc` (which slows code down, so it never contributes to the timing). Baselines are plain
+JSON keyed by scenario name, meant to be committed or kept as CI artifacts.
+"""
+
+# Standard Library Imports
+import gc
+import json
+import os
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, NamedTuple, Optional
+
+class BenchmarkResult(NamedTuple):
+    scenario: str
+    wall_ms: float
+    peak_kb: float
+    api_calls: Optional[int] # None for scenarios that make no API requests
+
+def measure(func: Callable[[], Any], repeat: int = 3) -> Dict[str, float]:
+    """
+    Time a function and record its peak Python memory allocation.
+
+    Args:
+        func (Callable[[], Any]): The code under test; it must be safe to call repeatedly.
+        repeat (int): The number of timed runs; the fastest one is reported.
+
+    Returns:
+        Dict[str, float]: 'wall_ms' (fastest run) and 'peak_kb' (peak traced allocation of one run).
+    """
+    timings = []
+    for _ in range(max(repeat, 1)):
+        gc.collect()
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {'wall_ms': min(timings) * 1000, 'peak_kb': peak / 1024}
+
+def load_baseline(path: str) -> Dict[str, Dict[str, Any]]:
+    """Return the stored baseline results keyed by scenario, or an empty dict if there is no baseline."""
+    try:
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)['scenarios']
+    except FileNotFoundError:
+        return {}
+
+def save_baseline(path: str, results: List[BenchmarkResult]) -> None:
+    """Store results as the new baseline, keeping entries for scenarios that were not run."""
+    scenarios = load_baseline(path)
+    scenarios.update({result.scenario: result._asdict() for result in results})
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({'scenarios': dict(sorted(scenarios.items()))}, f, indent=2)
+        f.write('\n')
+
+def find_regressions(results: List[BenchmarkResult], baseline: Dict[str, Dict[str, Any]],
+                     tolerance: float = 0.25) -> List[str]:
+    """
+    Compare results with a baseline.
+
+    Wall time and peak memory regress when they exceed the baseline by more than `tolerance`
+    (a fraction); API calls are deterministic, so any increase is a regression.
+
+    Returns:
+        List[str]: One description per regression, empty if there are none.
+    """
+    regressions = []
+    for result in results:
+        base = baseline.get(result.scenario)
+        if not base:
+            continue
+        for metric, unit in (('wall_ms', 'ms'), ('peak_kb', 'KiB')):
+            current, previous = getattr(result, metric), base[metric]
+            if previous and current > previous * (1 + tolerance):
+                regressions.append(f"{result.scenario}: {metric} {current:.1f} {unit} vs baseline {previous:.1f} {unit} "
+                                   f"(+{(current / previous - 1) * 100:.0f}%)")
+        if result.api_calls is not None and base.get('api_calls') is not None and result.api_calls > base['api_calls']:
+            regressions.append(f"{result.scenario}: api_calls {result.api_calls} vs baseline {base['api_calls']}")
+    return regressions
@@ -0,0 +1,68 @@
+# Standard Library Imports
+import hashlib
+import json
+from typing import Any, Optional
+
+# Third-Party Imports
+from django.conf import settings
+from django.core.cache import cache
+
+def user_cache_key(user_id: int, name: str) -> str:
+    """
+    Build the cache key of a per-user artifact.
+
+    Args:
+        user_id (int): The ID of the user who owns the artifact.
+        name (str): The artifact name (e.g. 'takeout_cube').
+
+    Returns:
+        str: A namespaced cache key.
+    """
+    return f"metrics:user:{user_id}:{name}"
+
+def get_user_artifact(user_id: int, name: str) -> Optional[Any]:
+    """Fetch a per-user artifact from the cache, or None if it is missing or expired."""
+    return cache.get(user_cache_key(user_id, name))
+
+def set_user_artifact(user_id: int, name: str, value: Any, timeout: Optional[int] = None) -> None:
+    """
+    Store a per-user artifact in the cache.
+
+    Args:
+        user_id (int): The ID of the user who owns the artifact.
+        name (str): The artifact name.
+        value (Any): Any picklable value.
+        timeout (Optional[int]): Seconds until expiry. Defaults to settings.USER_ARTIFACT_TIMEOUT.
+    """
+    cache.set(user_cache_key(user_id, name), value, timeout or settings.USER_ARTIFACT_TIMEOUT)
+
+def set_versioned_user_artifact(user_id: int, name: str, value: Any, timeout: Optional[int] = None) -> str:
+    """
+    Store a JSON-serializable per-user artifact together with a content hash of it.
+
+    The version is stored under its own small key, so it can be read (e.g. to answer a conditional
+    request) without loading the artifact. Storing identical data again yields the same version.
+
+    Args:
+        user_id (int): The ID of the user who owns the artifact.
+        name (str): The artifact name.
+        value (Any): Any JSON-serializable value.
+        timeout (Optional[int]): Seconds until expiry. Defaults to settings.USER_ARTIFACT_TIMEOUT.
+
+    Returns:
+        str: The version (a hex digest of the value).
+    """
+    serialized = json.dumps(value, sort_keys=True, separators=(',', ':'), default=str)
+    version = hashlib.blake2b(serialized.encode('utf-8'), digest_size=16).hexdigest()
+    key = user_cache_key(user_id, name)
+    cache.set_many({key: value, f"{key}:version": version}, timeout or settings.USER_ARTIFACT_TIMEOUT)
+    return version
+
+def get_user_artifact_version(user_id: int, name: str) -> Optional[str]:
+    """Fetch the version of an artifact stored with `set_versioned_user_artifact`, or None if there is none."""
+    return cache.get(f"{user_cache_key(user_id, name)}:version")
+
+def delete_user_artifact(user_id: int, name: str) -> None:
+    """Remove a per-user artifact (and its version, if any) from the cache."""
+    key = user_cache_key(user_id, name)
+    cache.delete_many([key, f"{key}:version"])
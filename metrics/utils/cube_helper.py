@@ -0,0 +1,191 @@
+"""
+Prefix-sum time cube over (local day x dimension member) for range queries on watch history.
+
+For every member of every dimension the cube stores P[d] = number of videos watched before day d,
+so the count over any day range [a, b) is P[b] - P[a]. A query over arbitrary dates therefore costs
+O(1) per member and bucket, independent of how many entries the history has.
+"""
+
+# Standard Library Imports
+from array import array
+from collections import Counter
+from datetime import date, timedelta
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+# Local App Imports
+from metrics.utils.date_helper import EPOCH_ORDINAL, epoch_day_to_date
+
+GRANULARITIES = ('day', 'week', 'month', 'year')
+OTHER_MEMBER = 'Other'
+
+class TimeCube:
+    """
+    Immutable prefix-sum cube built once per Takeout upload.
+    """
+    def __init__(self, first_day: int, num_days: int, members: Dict[str, List[str]], prefix_sums: Dict[str, Dict[str, array]]) -> None:
+        """
+        Initializes the cube. Use `TimeCube.build` to construct one from watch history columns.
+
+        Args:
+            first_day (int): The first covered day (days since 1970-01-01, local time).
+            num_days (int): The number of covered days.
+            members (Dict[str, List[str]]): Dimension names mapped to their member names, in display order.
+            prefix_sums (Dict[str, Dict[str, array]]): Dimension -> member -> prefix-sum array of length num_days + 1.
+        """
+        self.first_day = first_day
+        self.num_days = num_days
+        self.members = members
+        self.prefix_sums = prefix_sums
+
+    @classmethod
+    def build(cls, local_days: Sequence[int],
+              dimension_columns: Dict[str, Sequence[Optional[str]]],
+              member_order: Optional[Dict[str, List[str]]] = None,
+              max_members: int = 50
+              ) -> Optional['TimeCube']:
+        """
+        Build a cube from per-entry columns.
+
+        A 'total' dimension is always included. Dimensions with more than `max_members` distinct
+        values keep their most frequent members and fold the rest into 'Other'.
+
+        Args:
+            local_days (Sequence[int]): The local day of every entry.
+            dimension_columns (Dict[str, Sequence[Optional[str]]]): Dimension names mapped to a column
+                of member names aligned with `local_days` (None for entries without a value).
+            member_order (Optional[Dict[str, List[str]]]): Fixed display order for cyclic dimensions
+                (e.g. hours or weekdays). Other dimensions are ordered by frequency.
+            max_members (int): The maximum number of named members per dimension.
+
+        Returns:
+            Optional[TimeCube]: The cube, or None if there are no entries.
+        """
+        if not local_days:
+            return None
+
+        first_day = min(local_days)
+        num_days = max(local_days) - first_day + 1
+
+        columns: Dict[str, Sequence[Optional[str]]] = {'total': ['All'] * len(local_days)}
+        columns.update(dimension_columns)
+
+        members: Dict[str, List[str]] = {}
+        prefix_sums: Dict[str, Dict[str, array]] = {}
+        for dimension, column in columns.items():
+            member_totals = Counter(value for value in column if value is not None)
+            kept = [member for member, _ in member_totals.most_common(max_members)]
+            kept_set = set(kept)
+            if len(member_totals) > len(kept):
+                kept.append(OTHER_MEMBER)
+
+            daily = {member: [0] * num_days for member in kept}
+            for day, value in zip(local_days, column):
+                if value is None:
+                    continue
+                member = value if value in kept_set else OTHER_MEMBER
+                daily[member][day - first_day] += 1
+
+            prefix_sums[dimension] = {}
+            for member, counts in daily.items():
+                running = 0
+                prefix = array('I', [0]) # unsigned 32-bit counts keep the cube compact
+                for count in counts:
+                    running += count
+                    prefix.append(running)
+                prefix_sums[dimension][member] = prefix
+
+            if member_order and dimension in member_order:
+                # Members missing from the requested order go last, in their current order
+                order = dict.fromkeys(kept, len(member_order[dimension]))
+                order.update((member, i) for i, member in enumerate(member_order[dimension]))
+                kept.sort(key=order.get)
+            members[dimension] = kept
+
+        return cls(first_day, num_days, members, prefix_sums)
+
+    @property
+    def start_date(self) -> date:
+        return epoch_day_to_date(self.first_day)
+
+    @property
+    def end_date(self) -> date:
+        return epoch_day_to_date(self.first_day + self.num_days - 1)
+
+    def query(self, start: date, end: date, granularity: str = 'month', dimension: str = 'total') -> Dict[str, Any]:
+        """
+        Aggregate the counts of every member of a dimension into calendar buckets.
+
+        Args:
+            start (date): The first date of the range (inclusive).
+            end (date): The last date of the range (inclusive).
+            granularity (str): 'day', 'week' (ISO weeks starting Monday), 'month' or 'year'.
+            dimension (str): A dimension name present in `self.members`.
+
+        Returns:
+            Dict[str, Any]: A dictionary with 'labels' (bucket start dates as YYYY-MM-DD),
+            'series' (member name -> list of counts per bucket) and 'total' (count over the whole range).
+
+        Raises:
+            ValueError: If the granularity or dimension is unknown.
+        """
+        if granularity not in GRANULARITIES:
+            raise ValueError(f"granularity must be one of {', '.join(GRANULARITIES)}.")
+        if dimension not in self.prefix_sums:
+            raise ValueError(f"dimension must be one of {', '.join(self.prefix_sums)}.")
+
+        lo, hi = self._day_range(start, end)
+        boundaries = self._bucket_boundaries(lo, hi, granularity)
+
+        labels = [epoch_day_to_date(self.first_day + index).isoformat() for index in boundaries[:-1]]
+        series = {}
+        for member in self.members[dimension]:
+            prefix = self.prefix_sums[dimension][member]
+            series[member] = [prefix[b] - prefix[a] for a, b in zip(boundaries, boundaries[1:])]
+
+        total_prefix = self.prefix_sums['total']['All']
+        return {
+            'labels': labels,
+            'series': series,
+            'total': total_prefix[hi] - total_prefix[lo] if hi > lo else 0,
+        }
+
+    def daily_series(self, start: Optional[date] = None, end: Optional[date] = None) -> Tuple[int, List[int]]:
+        """
+        Return the total number of videos watched on every day of a date range, including idle days.
+
+        Returns:
+            Tuple[int, List[int]]: The first day of the series (days since 1970-01-01, local time)
+            and one count per consecutive day (empty if the range does not overlap the cube).
+        """
+        lo, hi = self._day_range(start or self.start_date, end or self.end_date)
+        prefix = self.prefix_sums['total']['All']
+        return self.first_day + lo, [prefix[index + 1] - prefix[index] for index in range(lo, hi)]
+
+    def _day_range(self, start: date, end: date) -> tuple:
+        """Convert an inclusive date range into clamped [lo, hi) prefix-array indices."""
+        lo = start.toordinal() - EPOCH_ORDINAL - self.first_day
+        hi = end.toordinal() - EPOCH_ORDINAL - self.first_day + 1
+        return max(lo, 0), min(max(hi, 0), self.num_days)
+
+    def _bucket_boundaries(self, lo: int, hi: int, granularity: str) -> List[int]:
+        """Return the prefix-array indices where calendar buckets start within [lo, hi), plus hi."""
+        if hi <= lo:
+            return [lo]
+        if granularity == 'day':
+            return list(range(lo, hi + 1))
+
+        boundaries = [lo]
+        current = epoch_day_to_date(self.first_day + lo)
+        while True:
+            if granularity == 'week':
+                current = current + timedelta(days=7 - current.weekday())
+            elif granularity == 'month':
+                current = date(current.year + (current.month == 12), current.month % 12 + 1, 1)
+            else:
+                current = date(current.year + 1, 1, 1)
+            index = current.toordinal() - EPOCH_ORDINAL - self.first_day
+            if index >= hi:
+                break
+            boundaries.append(index)
+        boundaries.append(hi)
+        return boundaries
@@ -1,6 +1,16 @@
 # Standard Library Imports
-from datetime import datetime
-from typing import Optional
+from bisect import bisect_right
+from datetime import date, datetime, timezone
+from functools import lru_cache
+from typing import List, Optional, Tuple
+from zoneinfo import ZoneInfo
+
+SECONDS_PER_DAY = 86400
+EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+# Seconds per ISO 8601 duration designator, before and after the 'T' separator
+_DURATION_DATE_UNITS = {'W': 7 * SECONDS_PER_DAY, 'D': SECONDS_PER_DAY}
+_DURATION_TIME_UNITS = {'H': 3600, 'M': 60, 'S': 1}
 
 def isostr_to_datetime(published_at_str: str | None) -> datetime | None:
     """
@@ -48,4 +58,156 @@ def is_valid_datetime_range(start_time_str: Optional[str], end_time_str: Optiona
     if start_time is None or end_time is None:
         return False # Invalid datetime string provided
 
-    return start_time < end_time
\ No newline at end of file
+    return start_time < end_time
+
+def isostr_to_epoch(iso_str: str) -> Optional[int]:
+    """
+    Convert an ISO 8601 timestamp string to whole seconds since the Unix epoch (UTC).
+
+    Takeout timestamps share a small number of distinct dates, so the date part is resolved through
+    a cached lookup and only the time of day is parsed per call.
+
+    Args:
+        iso_str (str): ISO 8601 format, e.g. '2024-03-10T22:15:03.123Z'.
+
+    Returns:
+        The epoch seconds as an int. None if the string cannot be parsed.
+    """
+    if len(iso_str) >= 20 and iso_str[-1] == 'Z' and iso_str[10] == 'T':
+        day_start = _day_start_epoch(iso_str[:10])
+        if day_start is not None:
+            try:
+                return day_start + int(iso_str[11:13]) * 3600 + int(iso_str[14:16]) * 60 + int(iso_str[17:19])
+            except ValueError:
+                return None
+
+    parsed = isostr_to_datetime(iso_str)
+    if parsed is None:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return int(parsed.timestamp())
+
+def iso_duration_to_seconds(duration: Optional[str]) -> Optional[int]:
+    """
+    Convert an ISO 8601 duration (as used by `contentDetails.duration`) to whole seconds.
+
+    The string is scanned once, character by character, without regular expressions or
+    intermediate objects. Only the designators YouTube emits are accepted (weeks, days, hours,
+    minutes, seconds); calendar units such as years or months have no fixed length and are rejected.
+
+    Args:
+        duration (Optional[str]): ISO 8601 format, e.g. 'PT1H2M10S' or 'P1DT3M'.
+
+    Returns:
+        The duration in seconds as an int ('P0D' for live streams is 0). None if the string cannot be parsed.
+    """
+    if not duration or duration[0] != 'P':
+        return None
+
+    units = _DURATION_DATE_UNITS
+    total = 0
+    value = 0
+    has_digits = False
+    for char in duration[1:]:
+        if '0' <= char <= '9':
+            value = value * 10 + ord(char) - 48
+            has_digits = True
+        elif char == 'T' and units is _DURATION_DATE_UNITS and not has_digits:
+            units = _DURATION_TIME_UNITS
+        else:
+            multiplier = units.get(char)
+            if multiplier is None or not has_digits:
+                return None
+            total += value * multiplier
+            value = 0
+            has_digits = False
+
+    return None if has_digits else total
+
+@lru_cache(maxsize=8192)
+def _day_start_epoch(date_str: str) -> Optional[int]:
+    """Return the epoch seconds of midnight UTC for a 'YYYY-MM-DD' string, or None if invalid."""
+    try:
+        return (date.fromisoformat(date_str).toordinal() - EPOCH_ORDINAL) * SECONDS_PER_DAY
+    except ValueError:
+        return None
+
+def build_offset_transitions(time_zone: str, start_epoch: int, end_epoch: int) -> Tuple[List[int], List[int]]:
+    """
+    Build a table of UTC-offset transitions for a time zone over an epoch range.
+
+    The offset is sampled once per day and every change is narrowed down to the exact second
+    by binary search, so a decade of history costs a few thousand `utcoffset` calls in total.
+
+    Args:
+        time_zone (str): An IANA time zone name, e.g. 'America/New_York'.
+        start_epoch (int): The first epoch second that must be covered.
+        end_epoch (int): The last epoch second that must be covered.
+
+    Returns:
+        A tuple (transition_starts, offsets): offsets[i] (in seconds) applies from
+        transition_starts[i] up to transition_starts[i + 1]. The first start is always `start_epoch`.
+
+    Raises:
+        ZoneInfoNotFoundError: If the time zone name is unknown.
+    """
+    tz = ZoneInfo(time_zone)
+
+    def offset_at(epoch: int) -> int:
+        return int(tz.utcoffset(datetime.fromtimestamp(epoch, tz)).total_seconds())
+
+    starts = [start_epoch]
+    offsets = [offset_at(start_epoch)]
+
+    prev_epoch = start_epoch
+    current_offset = offsets[0]
+    while prev_epoch < end_epoch:
+        next_epoch = min(prev_epoch + SECONDS_PER_DAY, end_epoch)
+        next_offset = offset_at(next_epoch)
+        if next_offset != current_offset:
+            # Offset changed somewhere in (prev_epoch, next_epoch]; find the first second of the new offset
+            lo, hi = prev_epoch, next_epoch
+            while hi - lo > 1:
+                mid = (lo + hi) // 2
+                if offset_at(mid) == current_offset:
+                    lo = mid
+                else:
+                    hi = mid
+            starts.append(hi)
+            offsets.append(next_offset)
+            current_offset = next_offset
+        prev_epoch = next_epoch
+
+    return starts, offsets
+
+def localize_epochs(epochs: List[int], time_zone: str) -> List[int]:
+    """
+    Shift a whole column of UTC epoch seconds into local "wall clock" epoch seconds.
+
+    The transition table is computed once for the column's range. Zones without transitions in
+    that range take a constant-offset fast path; otherwise each value is located by bisection.
+
+    Args:
+        epochs (List[int]): Epoch seconds in UTC, in any order.
+        time_zone (str): An IANA time zone name.
+
+    Returns:
+        List[int]: Epoch seconds shifted by the local UTC offset, so that integer division by
+        86400 yields the local day.
+    """
+    if not epochs:
+        return []
+
+    starts, offsets = build_offset_transitions(time_zone, min(epochs), max(epochs))
+    if len(offsets) == 1:
+        offset = offsets[0]
+        if offset == 0:
+            return list(epochs)
+        return [epoch + offset for epoch in epochs]
+
+    return [epoch + offsets[bisect_right(starts, epoch) - 1] for epoch in epochs]
+
+def epoch_day_to_date(epoch_day: int) -> date:
+    """Convert a day number (days since 1970-01-01) into a date object."""
+    return date.fromordinal(EPOCH_ORDINAL + epoch_day)
@@ -0,0 +1,56 @@
+"""
+Largest-Triangle-Three-Buckets (LTTB) downsampling for line charts (Steinarsson, 2013).
+
+The first and last points are always kept. The points in between are split into equal buckets,
+and from each bucket the point forming the largest triangle with the previously kept point and the
+average of the next bucket is kept. Peaks and troughs survive, so a few hundred points are visually
+close to thousands, in a single O(n) pass.
+"""
+
+# Standard Library Imports
+from typing import List, Optional, Sequence
+
+
+def lttb_indices(ys: Sequence[float], threshold: int, xs: Optional[Sequence[float]] = None) -> List[int]:
+    """
+    Select the indices of the points to keep when downsampling a series with LTTB.
+
+    Args:
+        ys (Sequence[float]): The y values, ordered by x.
+        threshold (int): The number of points to keep (at least 3 to downsample at all).
+        xs (Optional[Sequence[float]]): The x values, ascending. Defaults to evenly spaced indices.
+
+    Returns:
+        List[int]: Ascending indices into `ys`; every index if no downsampling is needed.
+    """
+    n = len(ys)
+    if threshold >= n or threshold < 3:
+        return list(range(n))
+    if xs is None:
+        xs = range(n)
+
+    bucket_size = (n - 2) / (threshold - 2)
+    selected = [0]
+    a = 0
+    for bucket in range(threshold - 2):
+        # Average of the next bucket (the last point for the final bucket)
+        next_start = int((bucket + 1) * bucket_size) + 1
+        next_end = min(int((bucket + 2) * bucket_size) + 1, n)
+        span = next_end - next_start
+        avg_x = sum(xs[next_start:next_end]) / span
+        avg_y = sum(ys[next_start:next_end]) / span
+
+        ax, ay = xs[a], ys[a]
+        best_area = -1.0
+        best = next_start - 1
+        for j in range(int(bucket * bucket_size) + 1, next_start):
+            # Twice the triangle area; the constant factor does not change the argmax
+            area = abs((ax - avg_x) * (ys[j] - ay) - (ax - xs[j]) * (avg_y - ay))
+            if area > best_area:
+                best_area = area
+                best = j
+        selected.append(best)
+        a = best
+
+    selected.append(n - 1)
+    return selected
@@ -0,0 +1,68 @@
+"""
+Stores YouTube Data API responses as JSON fixture files, keyed by endpoint and query parameters.
+
+`YouTubeClient` writes fixtures in 'record' mode and reads them back in 'replay' mode, and the
+offline API stand-in (`api_stub`) serves them ahead of its synthetic data. The API key is never
+part of the key or the file, so recordings can be shared.
+"""
+
+# Standard Library Imports
+import hashlib
+import json
+import os
+import tempfile
+from typing import Any, Dict, Optional
+
+# Local App Imports
+from .types import ApiResponse
+
+SECRET_PARAMS = {'key', 'access_token'}
+
+def fixture_path(fixtures_dir: str, endpoint: str, params: Dict[str, Any]) -> str:
+    """
+    Build the file path of the fixture for one request.
+
+    Args:
+        fixtures_dir (str): The directory holding the fixtures.
+        endpoint (str): The endpoint path (e.g. 'playlistItems').
+        params (Dict[str, Any]): The query parameters; order does not matter.
+
+    Returns:
+        str: The fixture path, '<endpoint>-<hash of the parameters>.json'.
+    """
+    return os.path.join(fixtures_dir, f"{endpoint}-{request_digest(endpoint, params)}.json")
+
+def request_digest(endpoint: str, params: Dict[str, Any]) -> str:
+    """A short hash identifying a request by its endpoint and parameters (secrets excluded, order ignored)."""
+    normalized = json.dumps(_normalize(params), sort_keys=True)
+    return hashlib.sha1(f"{endpoint}?{normalized}".encode('utf-8')).hexdigest()[:16]
+
+def load_fixture(fixtures_dir: str, endpoint: str, params: Dict[str, Any]) -> Optional[ApiResponse]:
+    """Return the recorded response for a request, or None if none was recorded."""
+    try:
+        with open(fixture_path(fixtures_dir, endpoint, params), encoding='utf-8') as f:
+            return json.load(f)['response']
+    except FileNotFoundError:
+        return None
+
+def save_fixture(fixtures_dir: str, endpoint: str, params: Dict[str, Any], response: ApiResponse) -> str:
+    """
+    Record the response to a request, replacing any earlier recording.
+
+    The request parameters are stored alongside the response so fixtures can be reviewed and edited by hand.
+
+    Returns:
+        str: The fixture path.
+    """
+    path = fixture_path(fixtures_dir, endpoint, params)
+    os.makedirs(fixtures_dir, exist_ok=True)
+    fixture = {'endpoint': endpoint, 'params': _normalize(params), 'response': response}
+    # Write to a temporary file first so concurrent lookups never read a partial fixture
+    fd, tmp_path = tempfile.mkstemp(dir=fixtures_dir, suffix='.tmp')
+    with os.fdopen(fd, 'w', encoding='utf-8') as f:
+        json.dump(fixture, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, path)
+    return path
+
+def _normalize(params: Dict[str, Any]) -> Dict[str, str]:
+    return {name: str(value) for name, value in params.items() if name not in SECRET_PARAMS}
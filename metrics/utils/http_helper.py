@@ -0,0 +1,68 @@
+"""
+Helpers for cacheable JSON responses: strong ETags per representation and memoized gzip bodies.
+
+A gzip-encoded body is a different representation from the identity-encoded one, so it gets its
+own strong ETag (suffixed '-gzip') rather than the weakened ETag Django's gzip middleware would send.
+"""
+
+# Standard Library Imports
+import gzip
+import re
+from functools import lru_cache
+from typing import Optional
+
+# Third-Party Imports
+from django.http import HttpRequest, HttpResponse
+from django.utils.cache import patch_vary_headers, quote_etag
+
+GZIP_MIN_BYTES = 1024 # Smaller payloads are sent uncompressed
+GZIP_CACHE_SIZE = 64 # Compressed bodies kept per process
+
+_ACCEPTS_GZIP = re.compile(r'\bgzip\b')
+
+def accepts_gzip(request: HttpRequest) -> bool:
+    """Return whether the client accepts gzip-encoded responses."""
+    return bool(_ACCEPTS_GZIP.search(request.META.get('HTTP_ACCEPT_ENCODING', '')))
+
+def representation_etag(request: HttpRequest, version: Optional[str]) -> Optional[str]:
+    """
+    Build the strong ETag of the representation a request will receive.
+
+    Args:
+        request (HttpRequest): The Django HTTP request object.
+        version (Optional[str]): The version of the underlying data, or None if it is unknown.
+
+    Returns:
+        Optional[str]: The quoted ETag, or None if the version is unknown.
+    """
+    if not version:
+        return None
+    return quote_etag(f"{version}-gzip" if accepts_gzip(request) else version)
+
+def json_response(request: HttpRequest, body: str, version: str) -> HttpResponse:
+    """
+    Send serialized JSON with a strong ETag, gzip-compressed if it is large and the client accepts it.
+
+    Args:
+        request (HttpRequest): The Django HTTP request object.
+        body (str): The serialized JSON.
+        version (str): The version of the underlying data (see `representation_etag`).
+
+    Returns:
+        HttpResponse: The response.
+    """
+    compress = accepts_gzip(request)
+    if compress and len(body) >= GZIP_MIN_BYTES:
+        response = HttpResponse(_gzip(body), content_type='application/json')
+        response['Content-Encoding'] = 'gzip'
+    else:
+        response = HttpResponse(body, content_type='application/json')
+    # The ETag follows what the client accepts, not the payload size, so it matches `representation_etag`
+    response['ETag'] = representation_etag(request, version)
+    patch_vary_headers(response, ('Accept-Encoding',))
+    return response
+
+@lru_cache(maxsize=GZIP_CACHE_SIZE)
+def _gzip(body: str) -> bytes:
+    # mtime=0 keeps the output byte-identical for identical input
+    return gzip.compress(body.encode('utf-8'), compresslevel=6, mtime=0)
@@ -0,0 +1,237 @@
+"""
+Collects per-request timings and counters and aggregates them in-process for Prometheus.
+
+`InstrumentationMiddleware` opens a `RequestStats` for every request. The YouTube client,
+the cache backends below and a database execute wrapper all record into it, and when the
+response is ready the totals are folded into the process-wide `REGISTRY`, which
+`REGISTRY.render()` writes in Prometheus text format. Each process (e.g. each gunicorn worker)
+keeps its own registry, so Prometheus should scrape every worker or sum them.
+
+YouTube clients remember the stats of the request that created them, so calls made from a
+request's thread pool are still counted against that request.
+"""
+
+# Standard Library Imports
+import bisect
+import contextvars
+import threading
+import time
+from collections import Counter
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# Third-Party Imports
+from django.core.cache.backends.db import DatabaseCache
+from django.core.cache.backends.filebased import FileBasedCache
+from django.core.cache.backends.redis import RedisCache
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0) # seconds
+
+Labels = Tuple[Tuple[str, str], ...]
+
+class MetricsRegistry:
+    """Thread-safe counters and histograms with labels, rendered in the Prometheus text format."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._descriptions: Dict[str, Tuple[str, str]] = {} # name -> (type, help)
+        self._counters: Dict[str, Dict[Labels, float]] = {}
+        self._histograms: Dict[str, Dict[Labels, List[float]]] = {} # bucket counts (+Inf last), then sum and count
+
+    def counter(self, name: str, help_text: str) -> None:
+        self._descriptions[name] = ('counter', help_text)
+        self._counters[name] = {}
+
+    def histogram(self, name: str, help_text: str) -> None:
+        self._descriptions[name] = ('histogram', help_text)
+        self._histograms[name] = {}
+
+    def inc(self, name: str, amount: float = 1, **labels: str) -> None:
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            series = self._counters[name]
+            series[key] = series.get(key, 0) + amount
+
+    def observe(self, name: str, value: float, **labels: str) -> None:
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            series = self._histograms[name]
+            if key not in series:
+                series[key] = [0.0] * (len(DURATION_BUCKETS) + 3) # buckets, +Inf, sum, count
+            values = series[key]
+            values[bisect.bisect_left(DURATION_BUCKETS, value)] += 1 # values above every bucket land in +Inf
+            values[-2] += value
+            values[-1] += 1
+
+    def render(self) -> str:
+        """Write every metric in the Prometheus text exposition format (version 0.0.4)."""
+        lines = []
+        with self._lock:
+            for name, (metric_type, help_text) in self._descriptions.items():
+                lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} {metric_type}")
+                if metric_type == 'counter':
+                    for labels, value in sorted(self._counters[name].items()):
+                        lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+                    continue
+                for labels, values in sorted(self._histograms[name].items()):
+                    cumulative = 0.0
+                    for bound, count in zip(DURATION_BUCKETS + (float('inf'),), values):
+                        cumulative += count
+                        le = '+Inf' if bound == float('inf') else repr(bound)
+                        lines.append(f"{name}_bucket{_format_labels(labels + (('le', le),))} {_format_value(cumulative)}")
+                    lines.append(f"{name}_sum{_format_labels(labels)} {values[-2]!r}")
+                    lines.append(f"{name}_count{_format_labels(labels)} {_format_value(values[-1])}")
+        return "\n".join(lines) + "\n"
+
+REGISTRY = MetricsRegistry()
+REGISTRY.counter('mytube_http_requests_total', "HTTP requests handled, by view, method and status code.")
+REGISTRY.histogram('mytube_http_request_duration_seconds', "Total time to produce a response, by view.")
+REGISTRY.counter('mytube_view_api_calls_total', "YouTube Data API calls made while handling requests, by view.")
+REGISTRY.counter('mytube_view_db_queries_total', "Database queries run while handling requests, by view.")
+REGISTRY.counter('mytube_view_db_seconds_total', "Time spent in database queries while handling requests, by view.")
+REGISTRY.counter('mytube_cache_lookups_total', "Cache lookups, by view ('background' outside requests) and result.")
+REGISTRY.counter('mytube_api_calls_total', "YouTube Data API calls, by endpoint and outcome.")
+REGISTRY.counter('mytube_api_response_bytes_total', "Bytes received from the YouTube Data API, by endpoint.")
+REGISTRY.histogram('mytube_api_call_duration_seconds', "Latency of YouTube Data API calls, by endpoint.")
+
+
+class RequestStats:
+    """Everything recorded while handling one request. Safe to update from several threads."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.api_calls: Counter = Counter() # endpoint -> calls
+        self.api_seconds = 0.0 # summed over threads, so it can exceed the request's wall time
+        self.api_bytes = 0
+        self.db_queries = 0
+        self.db_seconds = 0.0
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    def add_api_call(self, endpoint: str, seconds: float, size: int) -> None:
+        with self._lock:
+            self.api_calls[endpoint] += 1
+            self.api_seconds += seconds
+            self.api_bytes += size
+
+    def add_cache_lookups(self, hits: int, misses: int) -> None:
+        with self._lock:
+            self.cache_hits += hits
+            self.cache_misses += misses
+
+    def db_wrapper(self, execute: Callable, sql: str, params: Any, many: bool, context: Dict[str, Any]) -> Any:
+        """A `connection.execute_wrapper` that times every query of the request's thread."""
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            with self._lock:
+                self.db_queries += 1
+                self.db_seconds += time.perf_counter() - start
+
+    def breakdown(self) -> str:
+        """A one-line summary for slow request logs."""
+        endpoints = ", ".join(f"{endpoint}x{calls}" for endpoint, calls in self.api_calls.most_common())
+        lookups = self.cache_hits + self.cache_misses
+        return (f"api {sum(self.api_calls.values())} calls / {self.api_seconds * 1000:.0f} ms / "
+                f"{self.api_bytes / 1024:.0f} KiB [{endpoints}]; db {self.db_queries} queries / "
+                f"{self.db_seconds * 1000:.0f} ms; cache {self.cache_hits}/{lookups} hits")
+
+_current_stats: contextvars.ContextVar[Optional[RequestStats]] = contextvars.ContextVar('request_stats', default=None)
+
+def start_request() -> Tuple[RequestStats, contextvars.Token]:
+    """Open the stats of a new request on the current thread; pass the token to `end_request`."""
+    stats = RequestStats()
+    return stats, _current_stats.set(stats)
+
+def end_request(stats: RequestStats, token: contextvars.Token, view: str, method: str, status: int, seconds: float) -> None:
+    """Close a request's stats and fold them into the registry."""
+    _current_stats.reset(token)
+    REGISTRY.inc('mytube_http_requests_total', view=view, method=method, status=str(status))
+    REGISTRY.observe('mytube_http_request_duration_seconds', seconds, view=view)
+    REGISTRY.inc('mytube_view_api_calls_total', sum(stats.api_calls.values()), view=view)
+    REGISTRY.inc('mytube_view_db_queries_total', stats.db_queries, view=view)
+    REGISTRY.inc('mytube_view_db_seconds_total', stats.db_seconds, view=view)
+    REGISTRY.inc('mytube_cache_lookups_total', stats.cache_hits, view=view, result='hit')
+    REGISTRY.inc('mytube_cache_lookups_total', stats.cache_misses, view=view, result='miss')
+
+def current_request_stats() -> Optional[RequestStats]:
+    """The stats of the request being handled on this thread, or None outside requests."""
+    return _current_stats.get()
+
+def record_api_call(stats: Optional[RequestStats], endpoint: str, seconds: float, size: int, outcome: str) -> None:
+    """
+    Record one YouTube Data API call.
+
+    Args:
+        stats (Optional[RequestStats]): The stats of the request the call belongs to, if any.
+        endpoint (str): The endpoint path (e.g. 'channels').
+        seconds (float): The call's latency.
+        size (int): The size of the response body in bytes, as transferred (i.e. compressed).
+        outcome (str): 'ok', 'error' or 'replay'.
+    """
+    REGISTRY.inc('mytube_api_calls_total', endpoint=endpoint, outcome=outcome)
+    REGISTRY.inc('mytube_api_response_bytes_total', size, endpoint=endpoint)
+    REGISTRY.observe('mytube_api_call_duration_seconds', seconds, endpoint=endpoint)
+    if stats is not None:
+        stats.add_api_call(endpoint, seconds, size)
+
+
+def record_cache_lookups(hits: int, misses: int) -> None:
+    """Count cache hits and misses against the current request, or as 'background' outside requests."""
+    stats = current_request_stats()
+    if stats is not None:
+        stats.add_cache_lookups(hits, misses)
+    else:
+        REGISTRY.inc('mytube_cache_lookups_total', hits, view='background', result='hit')
+        REGISTRY.inc('mytube_cache_lookups_total', misses, view='background', result='miss')
+
+
+_MISSING = object()
+
+class InstrumentedFileBasedCache(FileBasedCache):
+    """The file-based cache, counting hits and misses of every lookup (`get_many` goes through `get`)."""
+
+    def get(self, key: Any, default: Any = None, version: Optional[int] = None) -> Any:
+        value = super().get(key, _MISSING, version=version)
+        hit = value is not _MISSING
+        record_cache_lookups(int(hit), int(not hit))
+        return value if hit else default
+
+
+class InstrumentedDatabaseCache(DatabaseCache):
+    """The database cache, counting hits and misses of every lookup (`get` goes through `get_many`)."""
+
+    def get_many(self, keys: Any, version: Optional[int] = None) -> Dict[Any, Any]:
+        keys = list(keys)
+        found = super().get_many(keys, version=version)
+        record_cache_lookups(len(found), len(keys) - len(found))
+        return found
+
+
+class InstrumentedRedisCache(RedisCache):
+    """The Redis cache, counting hits and misses of every lookup."""
+
+    def get(self, key: Any, default: Any = None, version: Optional[int] = None) -> Any:
+        value = super().get(key, _MISSING, version=version)
+        hit = value is not _MISSING
+        record_cache_lookups(int(hit), int(not hit))
+        return value if hit else default
+
+    def get_many(self, keys: Any, version: Optional[int] = None) -> Dict[Any, Any]:
+        keys = list(keys)
+        found = super().get_many(keys, version=version)
+        record_cache_lookups(len(found), len(keys) - len(found))
+        return found
+
+
+def _format_labels(labels: Labels) -> str:
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in labels) + '}'
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+def _format_value(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(value)
@@ -0,0 +1,187 @@
+"""
+Drives the site over HTTP with simulated users and summarizes latency per view.
+
+Each `VirtualUser` signs in through the stubbed OAuth callback and then repeats weighted
+journeys (dashboard, subscription paging, content affinity, recommendation scrolling, Takeout
+uploads) with exponentially distributed think time. Every HTTP request is recorded under the
+name of the view it hits, and `LoadTestStats.report` computes throughput, latency percentiles
+and error rates per view.
+"""
+
+# Standard Library Imports
+import math
+import random
+import threading
+import time
+from collections import defaultdict
+from typing import Any, Callable, Dict, List, Optional
+from urllib.parse import urlsplit
+
+# Third-Party Imports
+import requests
+
+# Journeys and their default relative weights
+DEFAULT_MIX = {
+    'dashboard': 3,
+    'subscriptions': 4,
+    'content_affinity': 2,
+    'recommendations': 2,
+    'takeout_upload': 1,
+}
+SUBSCRIPTION_PAGES_PER_VISIT = 3
+RECOMMENDATION_SCROLLS = 3
+
+def percentile(sorted_values: List[float], q: float) -> float:
+    """Nearest-rank percentile (0 < q <= 100) of an ascending list; 0 for an empty list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(math.ceil(q / 100 * len(sorted_values)), 1)
+    return sorted_values[rank - 1]
+
+
+class LoadTestStats:
+    """Latencies and errors per view, safe to record from every virtual user's thread."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.errors: Dict[str, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
+        self.started_at = time.perf_counter()
+        self.finished_at: Optional[float] = None
+
+    def record(self, view: str, seconds: float, error: Optional[str] = None) -> None:
+        with self._lock:
+            self.latencies[view].append(seconds)
+            if error:
+                self.errors[view][error] += 1
+
+    def report(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Summarize the run.
+
+        Returns:
+            Dict[str, Dict[str, Any]]: Per view (and 'TOTAL'): 'requests', 'errors', 'error_rate',
+            'throughput' (requests per second), 'p50_ms', 'p95_ms', 'p99_ms', 'max_ms' and 'error_kinds'.
+        """
+        elapsed = (self.finished_at or time.perf_counter()) - self.started_at
+        with self._lock:
+            per_view = {view: sorted(latencies) for view, latencies in self.latencies.items()}
+            errors = {view: dict(kinds) for view, kinds in self.errors.items()}
+
+        rows = {}
+        all_latencies: List[float] = []
+        all_errors: Dict[str, int] = defaultdict(int)
+        for view in sorted(per_view):
+            all_latencies.extend(per_view[view])
+            for kind, count in errors.get(view, {}).items():
+                all_errors[kind] += count
+            rows[view] = _summarize(per_view[view], errors.get(view, {}), elapsed)
+        rows['TOTAL'] = _summarize(sorted(all_latencies), dict(all_errors), elapsed)
+        return rows
+
+
+class VirtualUser:
+    """
+    One simulated user with its own session (cookies) and random stream.
+
+    Args:
+        base_url (str): The site's root URL, e.g. 'http://127.0.0.1:8000'.
+        user_number (int): Distinguishes the user's account (loadtest+<n>@example.invalid).
+        stats (LoadTestStats): Where requests are recorded.
+        mix (Dict[str, int]): Journey names mapped to relative weights.
+        think_seconds (float): Mean pause between journeys.
+        takeout_zip (Optional[bytes]): The archive uploaded by the 'takeout_upload' journey.
+        slots (threading.Semaphore): Bounds the number of requests in flight across all users.
+        seed (int): Seed of the user's random stream.
+    """
+
+    def __init__(self, base_url: str, user_number: int, stats: LoadTestStats, mix: Dict[str, int],
+                 think_seconds: float, takeout_zip: Optional[bytes], slots: threading.Semaphore, seed: int = 0) -> None:
+        self.base_url = base_url.rstrip('/')
+        self.email = f"loadtest+{user_number}@example.invalid"
+        self.stats = stats
+        self.journeys = list(mix)
+        self.weights = [mix[name] for name in self.journeys]
+        self.think_seconds = think_seconds
+        self.takeout_zip = takeout_zip
+        self.slots = slots
+        self.rng = random.Random(seed * 1_000_003 + user_number)
+        self.session = requests.Session()
+
+    def run(self, stop_at: float) -> None:
+        """Sign in, then run journeys until `stop_at` (a `time.perf_counter` value)."""
+        if not self._request('stub_oauth_callback', 'GET', '/callback/stub/', params={'email': self.email},
+                             expect=302):
+            return
+        journeys: Dict[str, Callable[[], None]] = {
+            'dashboard': self.dashboard,
+            'subscriptions': self.subscriptions,
+            'content_affinity': self.content_affinity,
+            'recommendations': self.recommendations,
+            'takeout_upload': self.takeout_upload,
+        }
+        while time.perf_counter() < stop_at:
+            journeys[self.rng.choices(self.journeys, self.weights)[0]]()
+            if self.think_seconds:
+                time.sleep(min(self.rng.expovariate(1 / self.think_seconds), max(stop_at - time.perf_counter(), 0)))
+
+    # --- Journeys ---
+    def dashboard(self) -> None:
+        self._request('dashboard', 'GET', '/dashboard/')
+
+    def subscriptions(self) -> None:
+        for page in range(1, SUBSCRIPTION_PAGES_PER_VISIT + 1):
+            if not self._request('subscriptions_list', 'GET', '/subscriptions/', params={'page': page}):
+                return
+
+    def content_affinity(self) -> None:
+        if self._request('content_affinity', 'GET', '/content_affinity/'):
+            for chart in ('topics', 'categories'):
+                self._request('content_affinity_chart_ajax', 'GET', f'/content_affinity/charts/{chart}/', expect=(200, 404))
+
+    def recommendations(self) -> None:
+        if self._request('recommended_videos', 'GET', '/recommended-videos/'):
+            for _ in range(RECOMMENDATION_SCROLLS):
+                self._request('get_recommended_videos_ajax', 'GET', '/recommended-videos/ajax/')
+
+    def takeout_upload(self) -> None:
+        if not self.takeout_zip or not self._request('viewing_evolution', 'GET', '/viewing-evolution/'):
+            return
+        csrf_token = self.session.cookies.get('csrftoken', '')
+        self._request(
+            'viewing_evolution_upload', 'POST', '/viewing-evolution/',
+            data={'csrfmiddlewaretoken': csrf_token, 'time-zone': 'UTC'},
+            files={'takeout-zip': ('takeout.zip', self.takeout_zip, 'application/zip')},
+            headers={'Referer': f"{self.base_url}/viewing-evolution/"},
+        )
+        self._request('viewing_evolution_chart_ajax', 'GET', '/viewing-evolution/charts/monthly/', expect=(200, 404))
+
+    def _request(self, view: str, method: str, path: str, expect: Any = 200, **kwargs: Any) -> bool:
+        """Send one request, record it under `view`, and return whether it got an expected status."""
+        expected = expect if isinstance(expect, tuple) else (expect,)
+        with self.slots:
+            start = time.perf_counter()
+            try:
+                response = self.session.request(method, self.base_url + path, allow_redirects=False, timeout=120, **kwargs)
+                error = None if response.status_code in expected else f"HTTP {response.status_code}"
+                if error and response.status_code == 302 and urlsplit(response.headers.get('Location', '')).path == '/':
+                    error = 'signed out' # redirected to the login page (LOGIN_URL)
+            except requests.exceptions.RequestException as e: # connection errors and timeouts count against the view, too
+                error = type(e).__name__
+            self.stats.record(view, time.perf_counter() - start, error)
+        return error is None
+
+
+def _summarize(latencies: List[float], errors: Dict[str, int], elapsed: float) -> Dict[str, Any]:
+    error_count = sum(errors.values())
+    return {
+        'requests': len(latencies),
+        'errors': error_count,
+        'error_rate': error_count / len(latencies) if latencies else 0.0,
+        'throughput': len(latencies) / elapsed if elapsed > 0 else 0.0,
+        'p50_ms': percentile(latencies, 50) * 1000,
+        'p95_ms': percentile(latencies, 95) * 1000,
+        'p99_ms': percentile(latencies, 99) * 1000,
+        'max_ms': (latencies[-1] if latencies else 0.0) * 1000,
+        'error_kinds': errors,
+    }
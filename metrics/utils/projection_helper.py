@@ -0,0 +1,126 @@
+"""
+Builds YouTube Data API partial-response requests from the fields a caller needs.
+
+The API bills quota by `part` and sends every property of each requested part unless the
+`fields` parameter narrows the response. Callers of the `api_resources` declare the item fields
+they read as dotted paths, e.g. `['snippet.categoryId', 'topicDetails.topicCategories']`, and
+`build_projection` turns them into the minimal `part` list and a `fields` expression:
+
+    part=snippet,topicDetails
+    fields=items(id,snippet(categoryId),topicDetails(topicCategories)),nextPageToken,prevPageToken,pageInfo
+
+Item IDs and the paging properties are always kept. `parse_fields` and `apply_fields` read and
+evaluate such expressions (including the `a/b` shorthand for `a(b)`), for the shared public cache
+and the offline API stand-in.
+"""
+
+# Standard Library Imports
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+# Properties of list responses kept by every projection, so paging keeps working
+ENVELOPE_FIELDS = ('nextPageToken', 'prevPageToken', 'pageInfo')
+
+# A parsed `fields` expression: property names mapped to their own selection, or None for the whole value
+FieldTree = Dict[str, Optional['FieldTree']]
+
+def build_projection(fields: Iterable[str]) -> Tuple[str, str]:
+    """
+    Build the `part` and `fields` parameters that return only the given item fields.
+
+    Args:
+        fields (Iterable[str]): Dotted paths below each item, e.g. 'snippet.title' or 'contentDetails'
+                                (a whole part). The item ID is always included.
+
+    Returns:
+        Tuple[str, str]: The comma-separated parts and the `fields` expression.
+
+    Raises:
+        ValueError: If no fields are given.
+    """
+    tree: FieldTree = {'id': None}
+    for path in fields:
+        node = tree
+        names = [name for name in path.split('.') if name]
+        for depth, name in enumerate(names):
+            if depth == len(names) - 1:
+                node[name] = None # the whole value, which also covers any narrower path
+                break
+            if node.get(name, {}) is None:
+                break # already selected as a whole
+            node = node.setdefault(name, {})
+
+    parts = [name for name in tree if name != 'id']
+    if not parts:
+        raise ValueError("At least one field besides the item ID must be requested.")
+    return ",".join(parts), ",".join([f"items({render_fields(tree)})", *ENVELOPE_FIELDS])
+
+def apply_projection(params: Dict[str, Any], fields: Optional[Iterable[str]]) -> None:
+    """Replace the `part` of a request's parameters with the projection of `fields`, if any are given."""
+    if fields:
+        params['part'], params['fields'] = build_projection(fields)
+
+def render_fields(tree: FieldTree) -> str:
+    """Write a parsed selection back as a `fields` expression (the inverse of `parse_fields`)."""
+    return ",".join(name if selection is None else f"{name}({render_fields(selection)})"
+                    for name, selection in tree.items())
+
+def parse_fields(expression: str) -> FieldTree:
+    """
+    Parse a `fields` expression such as 'items(id,snippet(title)),nextPageToken'.
+
+    Raises:
+        ValueError: If the parentheses do not match.
+    """
+    tree, end = _parse(expression, 0)
+    if end != len(expression):
+        raise ValueError(f"Unbalanced parentheses in fields expression '{expression}'.")
+    return tree
+
+def apply_fields(value: Any, tree: Optional[FieldTree]) -> Any:
+    """Keep only the selected properties of a JSON value; lists are filtered element by element."""
+    if tree is None:
+        return value
+    if isinstance(value, list):
+        return [apply_fields(element, tree) for element in value]
+    if not isinstance(value, dict):
+        return value
+    return {name: apply_fields(value[name], selection) for name, selection in tree.items() if name in value}
+
+def _parse(expression: str, position: int) -> Tuple[FieldTree, int]:
+    """Parse a comma-separated selection starting at `position`, up to a closing parenthesis or the end."""
+    tree: FieldTree = {}
+    name = ''
+    while position < len(expression):
+        char = expression[position]
+        if char == '(':
+            selection, position = _parse(expression, position + 1)
+            if position >= len(expression) or expression[position] != ')':
+                raise ValueError(f"Unbalanced parentheses in fields expression '{expression}'.")
+            _add(tree, name, selection)
+            name = ''
+        elif char == ')':
+            break
+        elif char == ',':
+            _add(tree, name, None)
+            name = ''
+        else:
+            name += char
+        position += 1
+    _add(tree, name, None)
+    return tree, position
+
+def _add(tree: FieldTree, path: str, selection: Optional[FieldTree]) -> None:
+    """Add 'a/b/c' (with an optional selection of c) to the tree; the '/' form is shorthand for a(b(c))."""
+    names = [name for name in path.strip().split('/') if name]
+    if not names:
+        return
+    for name in names[:-1]:
+        if tree.get(name, {}) is None:
+            return
+        tree = tree.setdefault(name, {})
+    existing = tree.get(names[-1], {})
+    if existing is None or selection is None:
+        tree[names[-1]] = None
+    else:
+        existing.update(selection)
+        tree[names[-1]] = existing
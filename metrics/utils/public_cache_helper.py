@@ -0,0 +1,155 @@
+"""
+Shares public YouTube Data API responses between all users through the 'public' cache.
+
+Requests made with the API key (no OAuth) return the same data for every user, so
+`YouTubeClient` sends them through `fetch_public`:
+
+- Lookups by ID (`videos`, `channels` and `playlists` with an `id` parameter) are cached per
+  resource, with each part stored separately. Only the IDs (or parts) nobody has fetched
+  recently are requested, so a video liked by thousands of users is looked up once, and the
+  response is reassembled from the cache in the requested order. IDs the API does not return
+  (deleted or private resources) are remembered as missing. A part narrowed by `fields` is
+  stored under its selection (e.g. 'snippet(categoryId)'); a cached whole part answers any
+  selection of it.
+- Every other public request (e.g. `mostPopular` charts, video categories) is cached whole,
+  keyed by its parameters.
+
+Failed requests are never cached. Requests that need OAuth (liked videos, subscriptions, the
+user's own channel and playlists) never come here and stay per user. The 'public' cache is kept
+apart from the default one, so culling shared entries never evicts per-user artifacts.
+"""
+
+# Standard Library Imports
+from typing import Any, Callable, Dict, Optional
+
+# Third-Party Imports
+from django.conf import settings
+from django.core.cache import caches
+
+# Local App Imports
+from .fixture_helper import request_digest
+from .projection_helper import parse_fields, render_fields
+from .types import ApiResponse
+
+# Endpoints cached per resource, with the `kind` of their resources and list responses
+RESOURCE_KINDS = {
+    'videos': ('youtube#video', 'youtube#videoListResponse'),
+    'channels': ('youtube#channel', 'youtube#channelListResponse'),
+    'playlists': ('youtube#playlist', 'youtube#playlistListResponse'),
+}
+MISSING = 'missing' # Cached in place of resources the API did not return
+
+Send = Callable[[str, Dict[str, Any]], Optional[ApiResponse]]
+
+def public_resource_key(endpoint: str, resource_id: str) -> str:
+    """Build the cache key of one public resource (e.g. a video), shared by all users."""
+    return f"metrics:public:{endpoint}:{resource_id}"
+
+def fetch_public(endpoint: str, params: Dict[str, Any], send: Send) -> Optional[ApiResponse]:
+    """
+    Answer a public API request from the shared cache, sending only what is not cached.
+
+    Args:
+        endpoint (str): The endpoint path (e.g. 'videos').
+        params (Dict[str, Any]): The query parameters, without the API key.
+        send (Send): Sends a request (endpoint, params) to the API; returns the response or None on error.
+
+    Returns:
+        Optional[ApiResponse]: The response, or None if a request that was needed failed.
+    """
+    if endpoint in RESOURCE_KINDS and params.get('id') and 'pageToken' not in params:
+        selections = _item_selections(params.get('fields'))
+        if selections is not None:
+            return _fetch_resources(endpoint, params, selections, send)
+
+    timeout = settings.PUBLIC_LISTING_CACHE_TIMEOUT
+    if timeout <= 0:
+        return send(endpoint, params)
+    cache = caches['public']
+    key = f"metrics:public:{endpoint}?{request_digest(endpoint, params)}"
+    response = cache.get(key)
+    if response is None:
+        response = send(endpoint, params)
+        if response is not None:
+            cache.set(key, response, timeout)
+    return response
+
+def _item_selections(fields: Optional[str]) -> Optional[Dict[str, Optional[str]]]:
+    """
+    Map each item property kept by a `fields` expression to its selection (None for all of it).
+
+    Returns an empty dict without `fields`, and None if the items or their IDs are not kept,
+    since such responses cannot be split by resource.
+    """
+    if not fields:
+        return {}
+    tree = parse_fields(fields)
+    if 'items' not in tree:
+        return None
+    if tree['items'] is None:
+        return {}
+    if 'id' not in tree['items']:
+        return None
+    return {name: None if selection is None else render_fields(selection) for name, selection in tree['items'].items()}
+
+def _fetch_resources(endpoint: str, params: Dict[str, Any], selections: Dict[str, Optional[str]],
+                     send: Send) -> Optional[ApiResponse]:
+    timeout = settings.PUBLIC_RESOURCE_CACHE_TIMEOUT
+    if timeout <= 0:
+        return send(endpoint, params)
+
+    resource_ids = [resource_id for resource_id in dict.fromkeys(str(params['id']).split(',')) if resource_id]
+    # Each requested part (IDs are always returned) and the name it is cached under
+    parts = {
+        part: part if selections.get(part) is None else f"{part}({selections[part]})"
+        for part in str(params.get('part', '')).split(',')
+        if part and part != 'id' and (not selections or part in selections)
+    }
+    cache = caches['public']
+    keys = {resource_id: public_resource_key(endpoint, resource_id) for resource_id in resource_ids}
+    cached = cache.get_many(list(keys.values()))
+    entries = {resource_id: cached[key] for resource_id, key in keys.items() if key in cached}
+
+    uncached = [resource_id for resource_id in resource_ids if not _covers(entries.get(resource_id), parts)]
+    if uncached:
+        response = send(endpoint, {**params, 'id': ",".join(uncached)})
+        if response is None:
+            return None
+        fetched = {item.get('id'): item for item in response.get('items', [])}
+        found, missing = {}, {}
+        for resource_id in uncached:
+            item = fetched.get(resource_id)
+            if item is None:
+                entries[resource_id] = MISSING
+                missing[keys[resource_id]] = MISSING
+                continue
+            entry = entries.get(resource_id)
+            # Keep the parts other callers already cached; a part the resource lacks is stored as None
+            stored_parts = dict(entry['parts']) if isinstance(entry, dict) else {}
+            stored_parts.update((name, item.get(part)) for part, name in parts.items())
+            entries[resource_id] = {'kind': item.get('kind', RESOURCE_KINDS[endpoint][0]), 'parts': stored_parts}
+            found[keys[resource_id]] = entries[resource_id]
+        cache.set_many(found, timeout)
+        cache.set_many(missing, settings.PUBLIC_MISSING_CACHE_TIMEOUT)
+
+    items = [_item(resource_id, entries[resource_id], parts) for resource_id in resource_ids
+             if entries.get(resource_id) not in (None, MISSING)]
+    return {
+        'kind': RESOURCE_KINDS[endpoint][1],
+        'items': items,
+        'pageInfo': {'totalResults': len(items), 'resultsPerPage': len(items)},
+    }
+
+def _covers(entry: Any, parts: Dict[str, str]) -> bool:
+    """Whether a cached entry answers a request for `parts`; a resource known to be missing always does."""
+    if entry is None:
+        return False
+    return entry == MISSING or all(name in entry['parts'] or part in entry['parts'] for part, name in parts.items())
+
+def _item(resource_id: str, entry: Dict[str, Any], parts: Dict[str, str]) -> ApiResponse:
+    item: ApiResponse = {'kind': entry['kind'], 'id': resource_id}
+    for part, name in parts.items():
+        value = entry['parts'][name] if name in entry['parts'] else entry['parts'][part]
+        if value is not None:
+            item[part] = value
+    return item
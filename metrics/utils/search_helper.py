@@ -0,0 +1,192 @@
+"""
+Inverted index over watch history titles and channel names for fast per-user search.
+
+Entries are numbered in chronological order, so a date filter is just a contiguous range of entry
+numbers. Every term maps to a posting list of entry numbers, stored as a delta-encoded array using
+the smallest integer type that fits the gaps (most gaps fit in one or two bytes). Decoding is a
+single `itertools.accumulate` pass. The vocabulary is kept sorted so prefix queries are a bisect
+plus a scan over the matching terms.
+"""
+
+# Standard Library Imports
+import re
+from array import array
+from bisect import bisect_left, bisect_right
+from itertools import accumulate
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+TOKEN_PATTERN = re.compile(r"\w+")
+MAX_PREFIX_TERMS = 500 # Prefix queries matching more vocabulary terms than this are truncated
+
+def tokenize(text: str) -> List[str]:
+    """Split text into lowercase word tokens."""
+    return TOKEN_PATTERN.findall(text.casefold())
+
+def encode_postings(entry_ids: Sequence[int]) -> array:
+    """
+    Delta-encode a sorted list of entry numbers into the most compact array type that fits.
+    """
+    deltas = [entry_ids[0]] + [b - a for a, b in zip(entry_ids, entry_ids[1:])] if entry_ids else []
+    largest = max(deltas, default=0)
+    typecode = 'B' if largest < 1 << 8 else 'H' if largest < 1 << 16 else 'I'
+    return array(typecode, deltas)
+
+def decode_postings(postings: array) -> List[int]:
+    """Restore the sorted entry numbers of a delta-encoded posting list."""
+    return list(accumulate(postings))
+
+
+class SearchIndex:
+    """
+    Immutable inverted index built once per Takeout upload.
+    """
+    def __init__(self, epochs: array, titles: List[str], video_ids: List[Optional[str]],
+                 channel_ids: array, channels: List[str], postings: Dict[str, array]) -> None:
+        """
+        Initializes the index. Use `SearchIndex.build` to construct one from watch history columns.
+
+        Args:
+            epochs (array): Local epoch seconds of every entry, in ascending order.
+            titles (List[str]): The title of every entry.
+            video_ids (List[Optional[str]]): The video ID of every entry (None if unknown).
+            channel_ids (array): Index into `channels` of every entry's channel.
+            channels (List[str]): Distinct channel names ('' for entries without a channel).
+            postings (Dict[str, array]): Terms mapped to delta-encoded entry numbers.
+        """
+        self.epochs = epochs
+        self.titles = titles
+        self.video_ids = video_ids
+        self.channel_ids = channel_ids
+        self.channels = channels
+        self.postings = postings
+        self.vocabulary = sorted(postings)
+        self._channel_lookup = {channel.casefold(): i for i, channel in enumerate(channels)}
+
+    @classmethod
+    def build(cls, entries: Iterable[Tuple[int, str, Optional[str], Optional[str]]]) -> 'SearchIndex':
+        """
+        Build an index from (local epoch, title, channel, video ID) tuples in any order.
+
+        Both the title and channel name of an entry are indexed.
+        """
+        rows = sorted(entries, key=lambda row: row[0])
+
+        channels: List[str] = []
+        channel_lookup: Dict[str, int] = {}
+        channel_ids = array('I')
+        term_entries: Dict[str, List[int]] = {}
+        channel_terms: Dict[int, set] = {}
+        for entry_id, (_, title, channel, _) in enumerate(rows):
+            channel = channel or ''
+            channel_id = channel_lookup.get(channel)
+            if channel_id is None:
+                channel_id = channel_lookup[channel] = len(channels)
+                channels.append(channel)
+                channel_terms[channel_id] = set(tokenize(channel))
+            channel_ids.append(channel_id)
+
+            for term in set(tokenize(title)) | channel_terms[channel_id]:
+                posting = term_entries.get(term)
+                if posting is None:
+                    posting = term_entries[term] = []
+                posting.append(entry_id)
+
+        return cls(
+            epochs=array('q', (row[0] for row in rows)),
+            titles=[row[1] for row in rows],
+            video_ids=[row[3] for row in rows],
+            channel_ids=channel_ids,
+            channels=channels,
+            postings={term: encode_postings(ids) for term, ids in term_entries.items()},
+        )
+
+    def __len__(self) -> int:
+        return len(self.titles)
+
+    def search(self, query: str, channel: Optional[str] = None,
+               start_epoch: Optional[int] = None, end_epoch: Optional[int] = None,
+               limit: int = 50) -> Dict[str, Any]:
+        """
+        Find the entries matching every query term, newest first.
+
+        A term ending in '*' matches every term with that prefix; otherwise the last term is also
+        matched as a prefix, so results update while the user is still typing.
+
+        Args:
+            query (str): Free-text query. May be empty when filtering by channel or date only.
+            channel (Optional[str]): Only return entries from this channel (case-insensitive).
+            start_epoch (Optional[int]): Only return entries watched at or after this local epoch.
+            end_epoch (Optional[int]): Only return entries watched before this local epoch.
+            limit (int): The maximum number of results.
+
+        Returns:
+            Dict[str, Any]: A dictionary with 'total' (number of matches) and 'results', a list
+            of dictionaries with 'epoch', 'title', 'channel' and 'video_id'.
+        """
+        lo = bisect_left(self.epochs, start_epoch) if start_epoch is not None else 0
+        hi = bisect_left(self.epochs, end_epoch) if end_epoch is not None else len(self.epochs)
+
+        channel_id = None
+        if channel:
+            channel_id = self._channel_lookup.get(channel.casefold())
+            if channel_id is None:
+                return {'total': 0, 'results': []}
+
+        terms = query.split()
+        if terms:
+            matches = self._match_terms(terms)
+            matches = matches[bisect_left(matches, lo):bisect_left(matches, hi)]
+        else:
+            matches = range(lo, hi)
+
+        if channel_id is not None:
+            channel_ids = self.channel_ids
+            matches = [entry_id for entry_id in matches if channel_ids[entry_id] == channel_id]
+
+        newest = matches[-limit:] if limit > 0 else []
+        results = [
+            {
+                'epoch': self.epochs[entry_id],
+                'title': self.titles[entry_id],
+                'channel': self.channels[self.channel_ids[entry_id]],
+                'video_id': self.video_ids[entry_id],
+            }
+            for entry_id in reversed(newest)
+        ]
+        return {'total': len(matches), 'results': results}
+
+    def _match_terms(self, raw_terms: List[str]) -> List[int]:
+        """Intersect the posting lists of every query term, starting with the rarest."""
+        candidates: List[List[int]] = []
+        for i, raw_term in enumerate(raw_terms):
+            is_prefix = raw_term.endswith('*') or i == len(raw_terms) - 1
+            for token in tokenize(raw_term):
+                candidates.append(self._lookup(token, is_prefix))
+
+        if not candidates:
+            return []
+        candidates.sort(key=len)
+        matches = candidates[0]
+        for other in candidates[1:]:
+            if not matches:
+                break
+            other_set = set(other)
+            matches = [entry_id for entry_id in matches if entry_id in other_set]
+        return matches
+
+    def _lookup(self, token: str, is_prefix: bool) -> List[int]:
+        """Return the sorted entry numbers containing a term, or any term starting with it."""
+        if not is_prefix:
+            postings = self.postings.get(token)
+            return decode_postings(postings) if postings is not None else []
+
+        first = bisect_left(self.vocabulary, token)
+        last = bisect_right(self.vocabulary, token + '\uffff', lo=first)
+        terms = self.vocabulary[first:min(last, first + MAX_PREFIX_TERMS)]
+        if len(terms) == 1:
+            return decode_postings(self.postings[terms[0]])
+
+        entry_ids = set()
+        for term in terms:
+            entry_ids.update(accumulate(self.postings[term]))
+        return sorted(entry_ids)
@@ -0,0 +1,191 @@
+"""
+Fixed-memory streaming sketches for very large watch histories.
+
+    - SpaceSaving: top-k heavy hitters (Metwally et al.). With capacity k over a stream of N
+      items, every reported count overestimates the true count by at most N / k, and every item
+      whose true count exceeds N / k is guaranteed to be reported.
+    - HyperLogLog: distinct counts (Flajolet et al.). With 2^p registers the relative standard
+      error is about 1.04 / sqrt(2^p), i.e. ~0.8% for the default p = 14 (16 KB of registers).
+
+Both sketches are mergeable, so partitions of a history can be summarized in parallel and
+combined afterwards.
+"""
+
+# Standard Library Imports
+import hashlib
+import heapq
+import math
+from typing import Dict, Hashable, Iterable, List, Tuple
+
+
+class SpaceSaving:
+    """
+    Space-Saving heavy-hitter sketch holding at most `capacity` counters.
+    """
+    def __init__(self, capacity: int = 1000) -> None:
+        """
+        Initializes the sketch.
+
+        Args:
+            capacity (int): The number of monitored items. The count error is at most N / capacity.
+        """
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1.")
+        self.capacity = capacity
+        self.total = 0
+        self._counts: Dict[Hashable, int] = {}
+        self._errors: Dict[Hashable, int] = {}
+        self._heap: List[Tuple[int, Hashable]] = [] # lazy min-heap of (count, item); stale entries are skipped
+
+    def add(self, item: Hashable, count: int = 1) -> None:
+        """
+        Record `count` occurrences of `item`.
+        """
+        self.total += count
+        if item in self._counts:
+            self._counts[item] += count
+        elif len(self._counts) < self.capacity:
+            self._counts[item] = count
+            self._errors[item] = 0
+        else:
+            # Evict the current minimum; the newcomer inherits its count as the error bound
+            min_count, min_item = self._pop_min()
+            del self._counts[min_item]
+            del self._errors[min_item]
+            self._counts[item] = min_count + count
+            self._errors[item] = min_count
+
+        heapq.heappush(self._heap, (self._counts[item], item))
+        if len(self._heap) > 4 * self.capacity:
+            self._heap = [(c, i) for i, c in self._counts.items()]
+            heapq.heapify(self._heap)
+
+    def __contains__(self, item: Hashable) -> bool:
+        """Whether `item` is currently monitored (and so has a counter)."""
+        return item in self._counts
+
+    def update(self, items: Iterable[Hashable]) -> 'SpaceSaving':
+        """Record one occurrence of each item in an iterable."""
+        for item in items:
+            self.add(item)
+        return self
+
+    def top(self, n: int) -> List[Tuple[Hashable, int, int]]:
+        """
+        Return the n items with the highest estimated counts.
+
+        Returns:
+            List[Tuple[Hashable, int, int]]: (item, estimated count, maximum overestimate) tuples,
+            highest count first.
+        """
+        ranked = heapq.nlargest(n, self._counts.items(), key=lambda kv: kv[1])
+        return [(item, count, self._errors[item]) for item, count in ranked]
+
+    def error_bound(self) -> float:
+        """Return the worst-case overestimate of any reported count (N / capacity)."""
+        return self.total / self.capacity
+
+    def merge(self, other: 'SpaceSaving') -> 'SpaceSaving':
+        """
+        Combine two sketches into a new one with this sketch's capacity.
+
+        Items missing from a full sketch may have been evicted with up to that sketch's minimum
+        count, so the minimum is added to both their count and their error bound.
+        """
+        merged = SpaceSaving(self.capacity)
+        self_min = self._min_count() if len(self._counts) >= self.capacity else 0
+        other_min = other._min_count() if len(other._counts) >= other.capacity else 0
+
+        combined: Dict[Hashable, Tuple[int, int]] = {}
+        for item in self._counts.keys() | other._counts.keys():
+            count = self._counts.get(item, self_min) + other._counts.get(item, other_min)
+            error = self._errors.get(item, self_min) + other._errors.get(item, other_min)
+            combined[item] = (count, error)
+
+        for item, (count, error) in heapq.nlargest(self.capacity, combined.items(), key=lambda kv: kv[1][0]):
+            merged._counts[item] = count
+            merged._errors[item] = error
+        merged._heap = [(c, i) for i, c in merged._counts.items()]
+        heapq.heapify(merged._heap)
+        merged.total = self.total + other.total
+        return merged
+
+    def _min_count(self) -> int:
+        """Return the smallest monitored count without removing it."""
+        while self._heap:
+            count, item = self._heap[0]
+            if self._counts.get(item) == count:
+                return count
+            heapq.heappop(self._heap)
+        return 0
+
+    def _pop_min(self) -> Tuple[int, Hashable]:
+        """Remove and return the (count, item) pair with the smallest current count."""
+        while True:
+            count, item = heapq.heappop(self._heap)
+            if self._counts.get(item) == count:
+                return count, item
+
+
+class HyperLogLog:
+    """
+    HyperLogLog distinct-count sketch with 2^precision one-byte registers.
+    """
+    def __init__(self, precision: int = 14) -> None:
+        """
+        Initializes the sketch.
+
+        Args:
+            precision (int): Number of index bits (4-18). Memory is 2^precision bytes and the
+                             relative standard error is about 1.04 / sqrt(2^precision).
+        """
+        if not 4 <= precision <= 18:
+            raise ValueError("precision must be between 4 and 18.")
+        self.precision = precision
+        self.num_registers = 1 << precision
+        self.registers = bytearray(self.num_registers)
+
+    def add(self, item: str) -> None:
+        """
+        Record one occurrence of `item`.
+        """
+        hashed = int.from_bytes(hashlib.blake2b(item.encode('utf-8'), digest_size=8).digest(), 'big')
+        index = hashed >> (64 - self.precision)
+        remaining = hashed & ((1 << (64 - self.precision)) - 1)
+        rank = (64 - self.precision) - remaining.bit_length() + 1 # position of the leftmost 1-bit
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def update(self, items: Iterable[str]) -> 'HyperLogLog':
+        """Record each item in an iterable."""
+        for item in items:
+            self.add(item)
+        return self
+
+    def count(self) -> int:
+        """
+        Estimate the number of distinct items added.
+        """
+        m = self.num_registers
+        alpha = 0.7213 / (1 + 1.079 / m) if m >= 128 else {16: 0.673, 32: 0.697, 64: 0.709}[m]
+        estimate = alpha * m * m / sum(2.0 ** -register for register in self.registers)
+
+        zero_registers = self.registers.count(0)
+        if estimate <= 2.5 * m and zero_registers:
+            # Small-range correction: linear counting is more accurate for sparse sketches
+            estimate = m * math.log(m / zero_registers)
+        return round(estimate)
+
+    def relative_error(self) -> float:
+        """Return the relative standard error of `count()` for this precision."""
+        return 1.04 / math.sqrt(self.num_registers)
+
+    def merge(self, other: 'HyperLogLog') -> 'HyperLogLog':
+        """
+        Combine two sketches of equal precision into a new one (register-wise maximum).
+        """
+        if other.precision != self.precision:
+            raise ValueError("Cannot merge HyperLogLog sketches with different precisions.")
+        merged = HyperLogLog(self.precision)
+        merged.registers = bytearray(map(max, self.registers, other.registers))
+        return merged
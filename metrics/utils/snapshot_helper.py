@@ -0,0 +1,138 @@
+"""
+Compact, column-oriented snapshot of every channel a user subscribes to.
+
+Each field is stored as one column (numeric fields as typed arrays, topics as indices into a shared
+topic list), and a sort permutation is precomputed for every sort key. Serving a sorted, filtered
+page is then a walk over one permutation, checked against a topic's member set, with no API calls.
+"""
+
+# Standard Library Imports
+import time
+from array import array
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+# Sort key -> (column attribute, descending)
+SORT_OPTIONS: Dict[str, Tuple[str, bool]] = {
+    'title': ('title_keys', False),
+    'subscribers': ('subscriber_counts', True),
+    'videos': ('video_counts', True),
+    'views': ('view_counts', True),
+    'newest': ('subscribed_at', True),
+    'oldest': ('subscribed_at', False),
+}
+
+class SubscriptionSnapshot:
+    """
+    Immutable snapshot built in the background from all subscription pages and channel statistics.
+    """
+    def __init__(self, rows: List[Dict[str, Any]], incomplete_count: int = 0) -> None:
+        """
+        Initializes the snapshot.
+
+        Args:
+            rows (List[Dict[str, Any]]): One dictionary per subscription with the keys 'channel_id',
+                'channel_title', 'profile_picture_url', 'published_at' (datetime or None),
+                'new_item_count', 'channel_description', 'subscriber_count', 'video_count',
+                'view_count', 'uploads_playlist_id' and 'topics'.
+            incomplete_count (int): The number of rows whose channel statistics could not be fetched.
+        """
+        self.built_at = time.time()
+        self.incomplete_count = incomplete_count
+        self.channel_ids = [row['channel_id'] for row in rows]
+        self.titles = [row['channel_title'] for row in rows]
+        self.picture_urls = [row.get('profile_picture_url') or '' for row in rows]
+        self.descriptions = [row.get('channel_description') or '' for row in rows]
+        self.uploads_playlist_ids = [row.get('uploads_playlist_id') or '' for row in rows]
+        self.subscribed_at = array('q', (
+            int(row['published_at'].timestamp()) if row.get('published_at') else 0 for row in rows
+        ))
+        self.new_item_counts = array('I', (int(row.get('new_item_count') or 0) for row in rows))
+        self.subscriber_counts = array('q', (int(row.get('subscriber_count') or 0) for row in rows))
+        self.video_counts = array('q', (int(row.get('video_count') or 0) for row in rows))
+        self.view_counts = array('q', (int(row.get('view_count') or 0) for row in rows))
+        self.title_keys = [title.casefold() for title in self.titles]
+
+        # Topics are interned once; each channel keeps a tuple of topic indices
+        self.topics: List[str] = []
+        topic_lookup: Dict[str, int] = {}
+        self.channel_topics: List[Tuple[int, ...]] = []
+        members: Dict[int, List[int]] = {}
+        for i, row in enumerate(rows):
+            topic_ids = []
+            for topic in row.get('topics') or []:
+                topic_id = topic_lookup.get(topic)
+                if topic_id is None:
+                    topic_id = topic_lookup[topic] = len(self.topics)
+                    self.topics.append(topic)
+                    members[topic_id] = []
+                topic_ids.append(topic_id)
+                members[topic_id].append(i)
+            self.channel_topics.append(tuple(topic_ids))
+        self.topic_members = {topic_id: frozenset(ids) for topic_id, ids in members.items()}
+        self._topic_lookup = topic_lookup
+
+        self.sort_orders: Dict[str, array] = {}
+        for sort, (column_name, descending) in SORT_OPTIONS.items():
+            column = getattr(self, column_name)
+            # Stable sort, so ties keep the API's alphabetical order
+            order = sorted(range(len(rows)), key=column.__getitem__, reverse=descending)
+            self.sort_orders[sort] = array('I', order)
+
+        del self.title_keys # only needed to build the sort orders
+
+    def __len__(self) -> int:
+        return len(self.channel_ids)
+
+    def topic_counts(self) -> List[Tuple[str, int]]:
+        """Return every topic with its number of channels, most common first."""
+        counts = [(self.topics[topic_id], len(ids)) for topic_id, ids in self.topic_members.items()]
+        return sorted(counts, key=lambda item: (-item[1], item[0]))
+
+    def page(self, sort: str = 'title', topic: Optional[str] = None,
+             page_num: int = 1, items_per_page: int = 25) -> Dict[str, Any]:
+        """
+        Return one page of subscriptions in the requested order, optionally limited to one topic.
+
+        Args:
+            sort (str): One of `SORT_OPTIONS` (unknown values fall back to 'title').
+            topic (Optional[str]): Only include channels tagged with this topic.
+            page_num (int): The page number to retrieve (1-indexed).
+            items_per_page (int): The number of subscriptions per page.
+
+        Returns:
+            Dict[str, Any]: A dictionary with 'subscriptions' (channel ID -> display data, in order),
+            'total' (number of matching channels) and 'has_next_page'.
+        """
+        order = self.sort_orders.get(sort, self.sort_orders['title'])
+        if topic:
+            topic_id = self._topic_lookup.get(topic)
+            allowed = self.topic_members.get(topic_id, frozenset()) if topic_id is not None else frozenset()
+            matching = [i for i in order if i in allowed]
+        else:
+            matching = order
+
+        start_idx = (max(page_num, 1) - 1) * items_per_page
+        end_idx = start_idx + items_per_page
+        subscriptions = {self.channel_ids[i]: self._row(i) for i in matching[start_idx:end_idx]}
+        return {
+            'subscriptions': subscriptions,
+            'total': len(matching),
+            'has_next_page': end_idx < len(matching),
+        }
+
+    def _row(self, i: int) -> Dict[str, Any]:
+        """Rebuild the display dictionary of one channel."""
+        subscribed_at = self.subscribed_at[i]
+        return {
+            'channel_title': self.titles[i],
+            'channel_id': self.channel_ids[i],
+            'profile_picture_url': self.picture_urls[i],
+            'published_at': datetime.fromtimestamp(subscribed_at, timezone.utc) if subscribed_at else None,
+            'new_item_count': self.new_item_counts[i],
+            'channel_description': self.descriptions[i],
+            'subscriber_count': self.subscriber_counts[i],
+            'video_count': self.video_counts[i],
+            'view_count': self.view_counts[i],
+            'topics': [self.topics[topic_id] for topic_id in self.channel_topics[i]],
+        }
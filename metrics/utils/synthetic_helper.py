@@ -0,0 +1,126 @@
+"""
+Generates synthetic YouTube Takeout watch histories for benchmarks and load tests.
+
+Entries have the shape of a real watch-history.json (newest first, with removed videos and ads
+mixed in), and video and channel IDs match the offline API stand-in (`api_stub`), so an uploaded
+synthetic history can also be enriched against it. Video popularity follows a Zipf-like
+distribution, so top-N lists and sketches see a realistic skew.
+"""
+
+# Standard Library Imports
+import io
+import json
+import random
+import zipfile
+from bisect import bisect
+from datetime import date
+from itertools import accumulate
+from typing import IO, Any, Dict, Iterator
+
+# Local App Imports
+from .api_stub import stub_channel_id, stub_video_id
+
+TAKEOUT_START_EPOCH = 1420070400 # 2015-01-01T00:00:00Z
+REMOVED_RATE = 0.02 # Share of entries for videos that have since been removed
+AD_RATE = 0.01 # Share of entries that are ads watched from Google Ads
+EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+def generate_watch_history(entry_count: int, seed: int = 0, channel_count: int = 300,
+                           videos_per_channel: int = 40, span_days: int = 3650) -> Iterator[Dict[str, Any]]:
+    """
+    Yield synthetic watch history entries, newest first.
+
+    Args:
+        entry_count (int): The number of entries.
+        seed (int): Seed of the generator; equal arguments produce identical histories.
+        channel_count (int): The number of distinct channels watched.
+        videos_per_channel (int): The number of distinct videos per channel.
+        span_days (int): The number of days the history covers.
+
+    Yields:
+        Dict[str, Any]: Each watch history entry.
+    """
+    rng = random.Random(seed)
+    video_count = channel_count * videos_per_channel
+    # Zipf-like popularity: the k-th most popular video is watched about 1/k as often as the first
+    cum_weights = list(accumulate(1 / rank for rank in range(1, video_count + 1)))
+    total_weight = cum_weights[-1]
+    ranked = list(range(video_count))
+    rng.shuffle(ranked)
+
+    span_seconds = span_days * 86400
+    mean_gap = span_seconds / max(entry_count, 1) * 0.95 # leave headroom so the walk rarely hits the start
+    epoch = float(TAKEOUT_START_EPOCH + span_seconds)
+    for _ in range(entry_count):
+        # Exponential gaps walking back in time, so sessions and binges emerge naturally
+        epoch = max(epoch - rng.expovariate(1 / mean_gap), TAKEOUT_START_EPOCH)
+        timestamp = _isoformat(int(epoch), int(epoch % 1 * 1000))
+        roll = rng.random()
+
+        if roll < AD_RATE:
+            yield {
+                'header': 'YouTube',
+                'title': 'Watched Stub Ad',
+                'titleUrl': f"https://www.youtube.com/watch?v=ad{rng.randrange(10 ** 9):09d}",
+                'time': timestamp,
+                'products': ['YouTube'],
+                'details': [{'name': 'From Google Ads'}],
+                'activityControls': ['YouTube watch history'],
+            }
+            continue
+
+        video = ranked[bisect(cum_weights, rng.random() * total_weight) % video_count]
+        channel_index, video_index = divmod(video, videos_per_channel)
+        video_id = stub_video_id(channel_index, video_index)
+        if roll < AD_RATE + REMOVED_RATE:
+            yield {
+                'header': 'YouTube',
+                'title': 'Watched a video that has been removed',
+                'time': timestamp,
+                'products': ['YouTube'],
+                'activityControls': ['YouTube watch history'],
+            }
+            continue
+
+        yield {
+            'header': 'YouTube',
+            'title': f"Watched Stub Video {video_id}",
+            'titleUrl': f"https://www.youtube.com/watch?v={video_id}",
+            'subtitles': [{
+                'name': f"Stub Channel {channel_index}",
+                'url': f"https://www.youtube.com/channel/{stub_channel_id(channel_index)}",
+            }],
+            'time': timestamp,
+            'products': ['YouTube'],
+            'activityControls': ['YouTube watch history'],
+        }
+
+def write_watch_history(fp: IO[str], entry_count: int, seed: int = 0, **options: Any) -> None:
+    """
+    Write a synthetic watch-history.json to a text file one entry at a time (constant memory).
+
+    Args:
+        fp (IO[str]): The text file to write to.
+        entry_count (int): The number of entries.
+        seed (int): Seed of the generator.
+        **options: Further arguments for `generate_watch_history`.
+    """
+    fp.write('[')
+    for i, entry in enumerate(generate_watch_history(entry_count, seed, **options)):
+        fp.write(',\n' if i else '\n')
+        fp.write(json.dumps(entry, ensure_ascii=False))
+    fp.write('\n]')
+
+def write_takeout_zip(path: str, entry_count: int, seed: int = 0, **options: Any) -> None:
+    """Write a synthetic Takeout archive, laid out like Google's, that the viewing evolution upload accepts."""
+    with zipfile.ZipFile(path, 'w', compression=zipfile.ZIP_DEFLATED) as zf:
+        with zf.open('Takeout/YouTube and YouTube Music/history/watch-history.json', 'w', force_zip64=True) as raw:
+            with io.TextIOWrapper(raw, encoding='utf-8') as fp:
+                write_watch_history(fp, entry_count, seed, **options)
+
+def _isoformat(epoch: int, millis: int) -> str:
+    days, seconds = divmod(epoch, 86400)
+    day = date.fromordinal(EPOCH_ORDINAL + days) # cheaper than a datetime per entry
+    hours, seconds = divmod(seconds, 3600)
+    minutes, seconds = divmod(seconds, 60)
+    return f"{day.isoformat()}T{hours:02d}:{minutes:02d}:{seconds:02d}.{millis:03d}Z"
@@ -0,0 +1,58 @@
+# Standard Library Imports
+import logging
+import threading
+from typing import Any, Callable, Dict
+
+# Third-Party Imports
+from django.db import DatabaseError, connections
+from google.auth.exceptions import GoogleAuthError
+from requests.exceptions import RequestException
+
+logger = logging.getLogger(__name__)
+
+_running_tasks: Dict[str, threading.Thread] = {}
+_running_tasks_lock = threading.Lock()
+
+def run_in_background(task_key: str, func: Callable[..., Any], *args: Any, **kwargs: Any) -> bool:
+    """
+    Run a function in a daemon thread, at most once at a time per task key within this process.
+
+    The thread's database connection is closed when the function finishes, since Django opens a
+    separate connection for every thread. Database, authentication and network errors are logged;
+    anything else is a bug and is left to `threading.excepthook`.
+
+    The thread dies with its worker process (e.g. when gunicorn recycles it), so tasks must be safe
+    to start again: they checkpoint their progress or are simply rebuilt on the user's next visit.
+
+    Args:
+        task_key (str): Identifies the task (e.g. 'enrichment:42'). A second call with the same key
+                        while the first is still running is ignored.
+        func (Callable[..., Any]): The function to run.
+        *args (Any): Positional arguments for `func`.
+        **kwargs (Any): Keyword arguments for `func`.
+
+    Returns:
+        bool: True if a new thread was started, False if the task was already running.
+    """
+    def runner() -> None:
+        try:
+            func(*args, **kwargs)
+        except (DatabaseError, GoogleAuthError, RequestException):
+            logger.exception("Background task %s failed.", task_key)
+        finally:
+            connections.close_all()
+            with _running_tasks_lock:
+                _running_tasks.pop(task_key, None)
+
+    with _running_tasks_lock:
+        if task_key in _running_tasks:
+            return False
+        thread = threading.Thread(target=runner, name=f"task-{task_key}", daemon=True)
+        _running_tasks[task_key] = thread
+    thread.start()
+    return True
+
+def is_running(task_key: str) -> bool:
+    """Check whether a background task with the given key is running in this process."""
+    with _running_tasks_lock:
+        return task_key in _running_tasks
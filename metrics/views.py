@@ -1,19 +1,42 @@
+# Standard Library Imports
+import re
+
 # Third-Party Imports
 import requests
+from django.conf import settings
 from django.contrib.auth import login, logout
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth.models import User
-from django.http import JsonResponse
+from django.http import Http404, HttpResponse, HttpResponseForbidden, JsonResponse
 from django.shortcuts import redirect, render
+from django.utils.crypto import constant_time_compare
+from django.views.decorators.cache import cache_control, never_cache
+from django.views.decorators.http import condition
 from google.auth.exceptions import RefreshError
 
 # Local App Imports
 from .models import UserCredential
 from .services.activity_analyzer import get_recommended_videos_context
-from .services.content_analyzer import get_content_affinity_context
-from .services.history_analyzer import get_viewing_evolution_context
+from .services.channel_recommender import get_similar_channels_context
+from .services.content_analyzer import (AFFINITY_CHARTS,
+                                        get_content_affinity_chart,
+                                        get_content_affinity_chart_version)
+from .services.drift_analyzer import get_topic_drift_context
+from .services.feed_analyzer import get_upload_feed
+from .services.history_analyzer import (CHARTS_ARTIFACT,
+                                        get_daily_chart_data,
+                                        get_processing_status,
+                                        get_viewing_evolution_context,
+                                        get_viewing_evolution_chart,
+                                        get_viewing_range_data,
+                                        search_watch_history)
+from .services.playlist_analyzer import get_playlist_analytics_context
 from .services.subscription_analyzer import get_subscription_list_context
+from .services.topic_map_analyzer import get_subscription_topic_map_context
 from .utils.auth_helper import OAuth
+from .utils.cache_helper import get_user_artifact_version
+from .utils.http_helper import json_response, representation_etag
+from .utils.instrumentation_helper import REGISTRY
 
 # --- Initial Login Page ---
 def google_login(request):
@@ -50,10 +73,41 @@ def google_callback(request):
     # Use the credentials to get user info
     user_info_response = requests.get(
         'https://www.googleapis.com/oauth2/v3/userinfo',
-        headers={'Authorization': f'Bearer {credentials.token}'}
+        headers={'Authorization': f'Bearer {credentials.token}'},
+        timeout=10, # seconds; don't let a stalled Google response hold the worker
     )
     user_info = user_info_response.json()
 
+    _sign_in(request, user_info, credentials.token, credentials.refresh_token)
+
+    next_url = request.session.pop('next', 'dashboard')
+    return redirect(next_url)
+
+# --- Stubbed OAuth Flow for Load Tests (callback/stub/) ---
+STUB_EMAIL = re.compile(r'loadtest\+\d+@example\.invalid') # a reserved domain no Google account can have
+STUB_ACCESS_TOKEN = 'stub-token'
+STUB_REFRESH_TOKEN = 'stub-refresh-token'
+
+def stub_oauth_callback(request): # only with OAUTH_STUB_ENABLED and DEBUG, against the offline API stand-in
+    if not (settings.OAUTH_STUB_ENABLED and settings.DEBUG):
+        raise Http404
+    email = request.GET.get('email', 'loadtest+0@example.invalid')
+    if not STUB_EMAIL.fullmatch(email):
+        return HttpResponseForbidden("Stub sign-in is limited to loadtest+<n>@example.invalid accounts.")
+    # Only accounts the stub created itself may be signed into (and have their tokens replaced)
+    user = User.objects.filter(email=email).select_related('usercredential').first()
+    if user is not None and (user.is_staff or user.is_superuser or user.has_usable_password()
+                             or getattr(getattr(user, 'usercredential', None), 'refresh_token', None) != STUB_REFRESH_TOKEN):
+        return HttpResponseForbidden("This account was not created by the stub sign-in.")
+    if user is None:
+        user = User(email=email, username=email, first_name='Load', last_name='Test')
+        user.set_unusable_password()
+        user.save()
+        UserCredential.objects.create(user=user, access_token=STUB_ACCESS_TOKEN, refresh_token=STUB_REFRESH_TOKEN)
+    _sign_in(request, {'email': email, 'given_name': 'Load', 'family_name': 'Test'}, STUB_ACCESS_TOKEN, STUB_REFRESH_TOKEN)
+    return redirect('dashboard')
+
+def _sign_in(request, user_info, access_token, refresh_token):
     # Create or get the user in auth_user table
     user, _ = User.objects.get_or_create(
         email=user_info['email'],
@@ -69,15 +123,12 @@ def google_callback(request):
 
     # Save the credentials in metrics_usercredential table
     user_credential, created = UserCredential.objects.get_or_create(user=user)
-    user_credential.access_token = credentials.token
-    if credentials.refresh_token:
-        user_credential.refresh_token = credentials.refresh_token
+    user_credential.access_token = access_token
+    if refresh_token:
+        user_credential.refresh_token = refresh_token
     user_credential.profile_picture_url = user_info.get('picture', '')
     user_credential.save() # commit changes to database
 
-    next_url = request.session.pop('next', 'dashboard')
-    return redirect(next_url)
-
 # --- Dashboard Home Page (dashboard/) ---
 @login_required # sends user to LOGIN_URL in settings.py if not already logged in
 def dashboard(request):
@@ -88,22 +139,88 @@ def dashboard(request):
 def subscriptions_list(request):
     try:
         page_num = int(request.GET.get('page', 1))
-        context = get_subscription_list_context(request.user, page_num)
+        context = get_subscription_list_context(
+            request.user,
+            page_num,
+            sort=request.GET.get('sort') or None,
+            topic=request.GET.get('topic') or None,
+        )
         return render(request, 'metrics/subscriptions_list.html', context)
     except RefreshError:
         # If refresh token is expired or revoked, re-authenticate the user
         logout(request)
         return redirect('login')
 
+# --- Subscription Topic Map (subscriptions/topics/) ---
+@login_required
+def subscription_topic_map(request):
+    try:
+        context = get_subscription_topic_map_context(request.user)
+        return render(request, 'metrics/subscription_topic_map.html', context)
+    except RefreshError:
+        logout(request)
+        return redirect('login')
+
+# --- Similar Channels (subscriptions/similar/) ---
+@login_required
+def similar_channels(request):
+    try:
+        context = get_similar_channels_context(request.user)
+        return render(request, 'metrics/similar_channels.html', context)
+    except RefreshError:
+        logout(request)
+        return redirect('login')
+
+# --- Upload Feed (subscriptions/feed/) ---
+@login_required
+def upload_feed(request):
+    return render(request, 'metrics/upload_feed.html')
+
+# --- AJAX Endpoint for the Upload Feed ---
+@login_required
+def upload_feed_ajax(request): # polled by upload_feed.js while channels are refreshed
+    try:
+        return JsonResponse(get_upload_feed(request.user))
+    except RefreshError:
+        logout(request)
+        return JsonResponse({'error': 'Session expired. Please log in again.'}, status=401)
+
+# --- Playlist Analytics (playlists/) ---
+@login_required
+def playlist_analytics(request):
+    try:
+        context = get_playlist_analytics_context(request.user)
+        return render(request, 'metrics/playlist_analytics.html', context)
+    except RefreshError:
+        logout(request)
+        return redirect('login')
+
 # --- Content Affinity Analysis (content_affinity/) ---
 @login_required
 def content_affinity(request):
+    return render(request, 'metrics/content_affinity.html') # charts are fetched by content_affinity.js
+
+# --- Chart Data for Content Affinity (content_affinity/charts/<chart_name>/) ---
+def _content_affinity_chart_etag(request, chart_name):
+    if not request.user.is_authenticated or chart_name not in AFFINITY_CHARTS:
+        return None
+    version = get_content_affinity_chart_version(request.user, chart_name)
+    return representation_etag(request, f"{chart_name}-{version}" if version else None)
+
+@login_required
+@cache_control(private=True, no_cache=True) # browsers revalidate with If-None-Match on every visit
+@condition(etag_func=_content_affinity_chart_etag)
+def content_affinity_chart_ajax(request, chart_name):
+    if chart_name not in AFFINITY_CHARTS:
+        return JsonResponse({'error': 'Unknown chart.'}, status=404)
     try:
-        context = get_content_affinity_context(request.user)
-        return render(request, 'metrics/content_affinity.html', context)
+        chart_json, version = get_content_affinity_chart(request.user, chart_name)
     except RefreshError:
         logout(request)
-        return redirect('login')
+        return JsonResponse({'error': 'Session expired. Please log in again.'}, status=401)
+    if chart_json is None:
+        return JsonResponse({'error': 'No data available for this chart.'}, status=404)
+    return json_response(request, chart_json, f"{chart_name}-{version}")
 
 # --- Logout Page (logout/) ---
 def user_logout(request):
@@ -136,11 +253,74 @@ def get_recommended_videos_ajax(request): # called by activities.js
 def viewing_evolution(request):
     try:
         context = get_viewing_evolution_context(request)
+        if 'retry_after' in context:
+            # Queued behind other uploads: turn the request away instead of holding the worker
+            response = render(request, 'metrics/viewing_evolution.html', context, status=503)
+            response['Retry-After'] = str(context['retry_after'])
+            return response
         return render(request, 'metrics/viewing_evolution.html', context)
     except RefreshError:
         logout(request)
         return redirect('login')
 
+# --- Chart Data for Viewing Evolution (viewing-evolution/charts/<chart_name>/) ---
+def _viewing_evolution_chart_etag(request, chart_name):
+    if not request.user.is_authenticated:
+        return None
+    version = get_user_artifact_version(request.user.id, CHARTS_ARTIFACT)
+    return representation_etag(request, f"{chart_name}-{version}" if version else None)
+
+@login_required
+@cache_control(private=True, no_cache=True)
+@condition(etag_func=_viewing_evolution_chart_etag)
+def viewing_evolution_chart_ajax(request, chart_name):
+    chart_json, version = get_viewing_evolution_chart(request.user.id, chart_name)
+    if chart_json is None:
+        return JsonResponse({'error': 'No data available for this chart.'}, status=404)
+    return json_response(request, chart_json, f"{chart_name}-{version}")
+
+# --- AJAX Endpoint for Takeout Processing Status ---
+@login_required
+def viewing_evolution_status_ajax(request): # polled by viewing_evolution.js during uploads
+    return JsonResponse(get_processing_status(request))
+
+# --- AJAX Endpoint for Viewing History Range Queries ---
+@login_required
+def viewing_evolution_range_ajax(request): # called by viewing_evolution.js
+    data, status = get_viewing_range_data(request)
+    return JsonResponse(data, status=status)
+
+# --- AJAX Endpoint for Zooming the Daily Watch Chart ---
+@login_required
+def viewing_evolution_daily_ajax(request): # called by viewing_evolution.js on zoom
+    data, status = get_daily_chart_data(request)
+    return JsonResponse(data, status=status)
+
+# --- AJAX Endpoint for Watch History Search ---
+@login_required
+def viewing_evolution_search_ajax(request): # called by viewing_evolution.js
+    data, status = search_watch_history(request)
+    return JsonResponse(data, status=status)
+
+# --- Topic and Category Drift (viewing-evolution/drift/) ---
+@login_required
+def topic_drift(request):
+    try:
+        context = get_topic_drift_context(request.user)
+        return render(request, 'metrics/topic_drift.html', context)
+    except RefreshError:
+        logout(request)
+        return redirect('login')
+
+# --- Prometheus Metrics (metrics/) ---
+@never_cache
+def prometheus_metrics(request): # scraped with "Authorization: Bearer <METRICS_TOKEN>"
+    token = settings.METRICS_TOKEN
+    authorization = request.headers.get('Authorization', '')
+    if not (request.user.is_staff or (token and constant_time_compare(authorization, f"Bearer {token}"))):
+        return HttpResponse(status=403)
+    return HttpResponse(REGISTRY.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
+
 # --- Privacy Policy Page (privacy-policy/) ---
 def privacy_policy(request):
     return render(request, 'metrics/privacy_policy.html')
@@ -11,6 +11,7 @@ https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
 import os
+import tempfile
 from pathlib import Path
 from dotenv import load_dotenv
 
@@ -79,6 +80,7 @@ INSTALLED_APPS = [
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',
+    'metrics.middleware.InstrumentationMiddleware', # after WhiteNoise, so static files are not counted
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -133,6 +135,54 @@ else:
     }
 
 
+# --- Cache Configuration ---
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+# The cache is shared by every gunicorn worker and holds per-user analysis artifacts (Takeout cubes,
+# search indexes, snapshots). Artifacts are derived data, not a durable store: any backend may evict
+# them early, and the pages then ask the user to upload their Takeout data again.
+
+# Public YouTube data shared between users (see `public_cache_helper`) is kept in a separate 'public'
+# cache of the same kind, so its churn never evicts per-user artifacts.
+
+# Cache backend: 'database' (default; tables in the site database shared by every machine, created by
+# `migrate`), 'redis' (set CACHE_LOCATION and PUBLIC_CACHE_LOCATION to redis:// URLs; needs the redis
+# package) or 'file' (directories per machine, for local development; they are listed on writes once full).
+CACHE_BACKEND = os.environ.get('CACHE_BACKEND', 'database')
+
+# Cache backends that also count hits and misses for /metrics, with the default and public locations.
+CACHE_BACKENDS = {
+    'database': ('metrics.utils.instrumentation_helper.InstrumentedDatabaseCache',
+                 'metrics_cache', 'metrics_public_cache'),
+    'redis': ('metrics.utils.instrumentation_helper.InstrumentedRedisCache',
+              'redis://127.0.0.1:6379/0', 'redis://127.0.0.1:6379/1'),
+    'file': ('metrics.utils.instrumentation_helper.InstrumentedFileBasedCache',
+             os.path.join(tempfile.gettempdir(), 'mytube_metrics_cache'),
+             os.path.join(tempfile.gettempdir(), 'mytube_metrics_public_cache')),
+}
+
+# Entries kept before the oldest are culled. Redis evicts by its own maxmemory policy instead.
+CACHE_MAX_ENTRIES = int(os.environ.get('CACHE_MAX_ENTRIES', 1000000))
+PUBLIC_CACHE_MAX_ENTRIES = int(os.environ.get('PUBLIC_CACHE_MAX_ENTRIES', 1000000))
+
+CACHES = {
+    'default': {
+        'BACKEND': CACHE_BACKENDS[CACHE_BACKEND][0],
+        'LOCATION': os.environ.get('CACHE_LOCATION', CACHE_BACKENDS[CACHE_BACKEND][1]),
+        'TIMEOUT': 60 * 60 * 24,
+        'OPTIONS': {} if CACHE_BACKEND == 'redis' else {'MAX_ENTRIES': CACHE_MAX_ENTRIES},
+    },
+    'public': {
+        'BACKEND': CACHE_BACKENDS[CACHE_BACKEND][0],
+        'LOCATION': os.environ.get('PUBLIC_CACHE_LOCATION', CACHE_BACKENDS[CACHE_BACKEND][2]),
+        'TIMEOUT': 60 * 60 * 6,
+        'OPTIONS': {} if CACHE_BACKEND == 'redis' else {'MAX_ENTRIES': PUBLIC_CACHE_MAX_ENTRIES},
+    },
+}
+
+# Seconds that per-user artifacts (Takeout cubes, indexes, snapshots) are kept.
+USER_ARTIFACT_TIMEOUT = int(os.environ.get('USER_ARTIFACT_TIMEOUT', 60 * 60 * 24 * 7))
+
+
 # --- Password Validation ---
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
@@ -161,3 +211,146 @@ STATIC_ROOT = BASE_DIR / 'staticfiles'
 STATICFILES_DIRS = [
     BASE_DIR / "static",
 ]
+
+
+# --- Takeout Processing ---
+
+# Maximum number of Takeout files parsed at once across all workers on this machine.
+TAKEOUT_MAX_CONCURRENT_PARSES = int(os.environ.get('TAKEOUT_MAX_CONCURRENT_PARSES', 2))
+
+# Total estimated memory (MB) that concurrently running Takeout parses may use.
+TAKEOUT_MEMORY_BUDGET_MB = float(os.environ.get('TAKEOUT_MEMORY_BUDGET_MB', 1024))
+
+# Memory (MB) of one chunk of parsed entries and the read buffer; all that sketch mode needs.
+TAKEOUT_CHUNK_MEMORY_MB = float(os.environ.get('TAKEOUT_CHUNK_MEMORY_MB', 48))
+
+# Smallest typical size (bytes) of one entry in watch-history.json, used to estimate the entry count up front.
+TAKEOUT_BYTES_PER_ENTRY = float(os.environ.get('TAKEOUT_BYTES_PER_ENTRY', 300))
+
+# Memory (bytes) per entry of the exact-mode columns and the artifacts built from them.
+TAKEOUT_COLUMN_BYTES_PER_ENTRY = float(os.environ.get('TAKEOUT_COLUMN_BYTES_PER_ENTRY', 512))
+
+# Seconds a queued upload keeps its place in line once its page stops polling for it.
+TAKEOUT_QUEUE_TIMEOUT = float(os.environ.get('TAKEOUT_QUEUE_TIMEOUT', 120))
+
+# Seconds a queued upload is told to wait (Retry-After) by clients that do not poll its status.
+TAKEOUT_RETRY_AFTER = int(os.environ.get('TAKEOUT_RETRY_AFTER', 15))
+
+# Seconds after which a running parse is assumed dead and its slot is reclaimed.
+TAKEOUT_JOB_MAX_SECONDS = float(os.environ.get('TAKEOUT_JOB_MAX_SECONDS', 600))
+
+# Shared state file used by all workers to coordinate admission.
+TAKEOUT_ADMISSION_STATE_FILE = os.environ.get(
+    'TAKEOUT_ADMISSION_STATE_FILE', os.path.join(tempfile.gettempdir(), 'mytube_metrics_takeout_admission.json')
+)
+
+# Directory holding queued uploads (one file per user) until they are admitted and processed.
+TAKEOUT_PENDING_UPLOAD_DIR = os.environ.get(
+    'TAKEOUT_PENDING_UPLOAD_DIR', os.path.join(tempfile.gettempdir(), 'mytube_metrics_pending_takeouts')
+)
+
+# Largest gap (minutes) between two watched videos that still belongs to the same viewing session.
+SESSION_GAP_MINUTES = int(os.environ.get('SESSION_GAP_MINUTES', 30))
+
+# Number of videos in a single session that counts as a binge.
+SESSION_BINGE_MIN_VIDEOS = int(os.environ.get('SESSION_BINGE_MIN_VIDEOS', 10))
+
+# Process uploads with fixed memory: top channels/videos and distinct counts come from sketches, and the
+# time cube, search index, topic drift counts and video enrichment (which need every entry) are skipped.
+TAKEOUT_SKETCH_MODE = os.environ.get('TAKEOUT_SKETCH_MODE', 'false').lower() == 'true'
+
+# Counters kept by each Space-Saving sketch; reported counts overestimate by at most N / capacity.
+TAKEOUT_SKETCH_CAPACITY = int(os.environ.get('TAKEOUT_SKETCH_CAPACITY', 1000))
+
+# HyperLogLog precision; relative standard error is about 1.04 / sqrt(2 ** precision).
+TAKEOUT_HLL_PRECISION = int(os.environ.get('TAKEOUT_HLL_PRECISION', 14))
+
+# Concurrent videos.list lookups used to enrich an uploaded watch history with categories and topics.
+ENRICHMENT_MAX_WORKERS = int(os.environ.get('ENRICHMENT_MAX_WORKERS', 4))
+
+# Seconds without a checkpoint after which a 'running' enrichment is assumed dead and may be resumed.
+ENRICHMENT_STALE_SECONDS = int(os.environ.get('ENRICHMENT_STALE_SECONDS', 600))
+
+# Seconds a paused enrichment (e.g. after quota exhaustion) waits before page views may resume it.
+ENRICHMENT_RETRY_SECONDS = int(os.environ.get('ENRICHMENT_RETRY_SECONDS', 60 * 30))
+
+# Channels tracked individually in the viewing time cube; the rest are grouped as 'Other'.
+TIME_CUBE_MAX_MEMBERS = int(os.environ.get('TIME_CUBE_MAX_MEMBERS', 50))
+
+
+# --- Subscription Snapshots ---
+
+# Concurrent channels.list lookups used while building a user's full subscription snapshot.
+SUBSCRIPTION_SNAPSHOT_MAX_WORKERS = int(os.environ.get('SUBSCRIPTION_SNAPSHOT_MAX_WORKERS', 4))
+
+# Seconds after which a subscription snapshot is rebuilt in the background (the old one is served meanwhile).
+SUBSCRIPTION_SNAPSHOT_MAX_AGE = int(os.environ.get('SUBSCRIPTION_SNAPSHOT_MAX_AGE', 60 * 60 * 24))
+
+# Seconds after which a snapshot missing some channel statistics (failed lookups) is rebuilt.
+SUBSCRIPTION_SNAPSHOT_RETRY_AGE = int(os.environ.get('SUBSCRIPTION_SNAPSHOT_RETRY_AGE', 60 * 5))
+
+# Seconds a snapshot build may run before another worker may start one (in case its worker died).
+SUBSCRIPTION_SNAPSHOT_BUILD_TIMEOUT = int(os.environ.get('SUBSCRIPTION_SNAPSHOT_BUILD_TIMEOUT', 60 * 10))
+
+# Concurrent playlistItems.list lookups used to refresh the upload feed.
+UPLOAD_FEED_MAX_WORKERS = int(os.environ.get('UPLOAD_FEED_MAX_WORKERS', 8))
+
+# Seconds a channel's cached latest uploads are considered fresh before the feed refreshes them.
+UPLOAD_FEED_CHANNEL_TTL = int(os.environ.get('UPLOAD_FEED_CHANNEL_TTL', 60 * 30))
+
+# Concurrent playlists crawled (playlistItems.list pages) by the playlist analytics view.
+PLAYLIST_ANALYTICS_MAX_WORKERS = int(os.environ.get('PLAYLIST_ANALYTICS_MAX_WORKERS', 8))
+
+# --- YouTube Data API ---
+
+# Base URL of the YouTube Data API; point it at `manage.py run_api_stub` to work offline.
+YOUTUBE_API_BASE_URL = os.environ.get('YOUTUBE_API_BASE_URL', 'https://www.googleapis.com/youtube/v3')
+
+# 'record' saves every API response as a fixture file, 'replay' answers requests from those files, 'off' does neither.
+YOUTUBE_API_RECORD_MODE = os.environ.get('YOUTUBE_API_RECORD_MODE', 'off').lower()
+
+# Directory of recorded API response fixtures.
+YOUTUBE_API_FIXTURES_DIR = os.environ.get('YOUTUBE_API_FIXTURES_DIR', str(BASE_DIR / 'api_fixtures'))
+
+# Most calls sent in one batch request by `YouTubeClient.batch` (Google accepts up to 1000; 1 sends them one by one).
+YOUTUBE_API_BATCH_SIZE = max(int(os.environ.get('YOUTUBE_API_BATCH_SIZE', 50)), 1)
+
+# Seconds public videos, channels and playlists looked up by ID are shared between users (0 disables sharing).
+PUBLIC_RESOURCE_CACHE_TIMEOUT = int(os.environ.get('PUBLIC_RESOURCE_CACHE_TIMEOUT', 60 * 60 * 6))
+
+# Seconds an ID the API did not return (a deleted or private resource) is remembered as missing.
+PUBLIC_MISSING_CACHE_TIMEOUT = int(os.environ.get('PUBLIC_MISSING_CACHE_TIMEOUT', 60 * 60))
+
+# Seconds other public responses (mostPopular charts, video categories) are shared between users (0 disables sharing).
+PUBLIC_LISTING_CACHE_TIMEOUT = int(os.environ.get('PUBLIC_LISTING_CACHE_TIMEOUT', 60 * 30))
+
+# --- Instrumentation ---
+
+# Record per-request API calls, database queries, cache lookups and timings for the /metrics/ endpoint.
+INSTRUMENTATION_ENABLED = os.environ.get('INSTRUMENTATION_ENABLED', 'true').lower() == 'true'
+
+# Bearer token a Prometheus scraper must send to read /metrics/ (staff users may always read it).
+METRICS_TOKEN = os.environ.get('METRICS_TOKEN', '')
+
+# Requests slower than this (milliseconds) are logged with their API, database and cache breakdown.
+SLOW_REQUEST_MS = float(os.environ.get('SLOW_REQUEST_MS', 1000))
+
+# --- Benchmarks ---
+
+# Stored results of `manage.py benchmark --save-baseline`, compared against on every later run.
+BENCHMARK_BASELINE_FILE = os.environ.get('BENCHMARK_BASELINE_FILE', str(BASE_DIR / 'benchmarks' / 'baseline.json'))
+
+# Fractional slowdown or memory growth over the baseline that `manage.py benchmark` reports as a regression.
+BENCHMARK_TOLERANCE = float(os.environ.get('BENCHMARK_TOLERANCE', 0.25))
+
+# --- Load Testing ---
+
+# Let `callback/stub/` sign loadtest+<n>@example.invalid users in without Google, for load tests against the
+# offline API stand-in. Only honoured with DEBUG; never on in production.
+OAUTH_STUB_ENABLED = (os.environ.get('OAUTH_STUB_ENABLED', 'false').lower() == 'true'
+                      and os.environ.get('MODE') != 'production')
+
+# --- Startup Profiling ---
+
+# Import-time budget (milliseconds) for booting a worker; `manage.py profile_startup` fails above it.
+STARTUP_IMPORT_BUDGET_MS = int(os.environ.get('STARTUP_IMPORT_BUDGET_MS', 1500))
@@ -1,26 +1,34 @@
 document.addEventListener('DOMContentLoaded', function() {
-    function renderPlotlyChart(chartId, dataId) {
+    // Chart specs are served by ETag-aware endpoints; a missing chart shows its fallback message instead
+    function renderPlotlyChart(chartId, name, fallbackId) {
         const chartDiv = document.getElementById(chartId);
-        const chartDataElement = document.getElementById(dataId);
-
-        if (!chartDiv || !chartDataElement) {
-            return Promise.resolve(); // Return a resolved promise if chart can't be rendered
+        if (!chartDiv) {
+            return Promise.resolve(false); // Resolve with false if the chart can't be rendered
         }
 
-        const figure = JSON.parse(chartDataElement.textContent);
-        if (figure && figure.data && figure.data.length > 0) {
-            return Plotly.newPlot(chartId, figure.data, figure.layout, { responsive: true });
-        }
-        return Promise.resolve();
+        return fetch(`/content_affinity/charts/${name}/`, { method: 'GET' })
+            .then(response => response.ok ? response.json() : null)
+            .then(figure => {
+                if (figure && figure.data && figure.data.length > 0) {
+                    return Plotly.newPlot(chartId, figure.data, figure.layout, { responsive: true }).then(() => true);
+                }
+                chartDiv.style.display = 'none';
+                document.getElementById(fallbackId).classList.remove('d-none');
+                return false;
+            })
+            .catch(error => {
+                console.error(`Error fetching ${name} chart data:`, error);
+                return false;
+            });
     }
 
     // Render the topic chart and then check its height
-    renderPlotlyChart('topicFreqChart', 'topic-chart-data').then(function() {
+    renderPlotlyChart('topicFreqChart', 'topics', 'topicChartFallback').then(function(rendered) {
         const expandBtn = document.getElementById('expandTopicChartBtn');
         const topicChartContainer = document.getElementById('topicChartContainer');
         const chartDiv = document.getElementById('topicFreqChart');
 
-        if (expandBtn && topicChartContainer && chartDiv) {
+        if (rendered && expandBtn && topicChartContainer && chartDiv) {
             const isOverflowing = chartDiv.clientHeight > topicChartContainer.clientHeight;
 
             if (isOverflowing) {
@@ -43,5 +51,5 @@ document.addEventListener('DOMContentLoaded', function() {
     });
 
     // Render the category chart (it doesn't need special handling)
-    renderPlotlyChart('categoryFreqChart', 'category-chart-data');
+    renderPlotlyChart('categoryFreqChart', 'categories', 'categoryChartFallback');
 });
@@ -0,0 +1,13 @@
+document.addEventListener('DOMContentLoaded', function() {
+    const chartDiv = document.getElementById('playlistCategoryChart');
+    const chartDataElement = document.getElementById('playlist-category-chart-data');
+
+    if (!chartDiv || !chartDataElement) {
+        return;
+    }
+
+    const figure = JSON.parse(chartDataElement.textContent);
+    if (figure && figure.data && figure.data.length > 0) {
+        Plotly.newPlot('playlistCategoryChart', figure.data, figure.layout, { responsive: true });
+    }
+});
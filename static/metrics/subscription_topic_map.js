@@ -0,0 +1,18 @@
+document.addEventListener('DOMContentLoaded', function() {
+    function renderPlotlyChart(chartId, dataId) {
+        const chartDiv = document.getElementById(chartId);
+        const chartDataElement = document.getElementById(dataId);
+
+        if (!chartDiv || !chartDataElement) {
+            return;
+        }
+
+        const figure = JSON.parse(chartDataElement.textContent);
+        if (figure && figure.data && figure.data.length > 0) {
+            Plotly.newPlot(chartId, figure.data, figure.layout, { responsive: true });
+        }
+    }
+
+    renderPlotlyChart('topicMapChart', 'topic-map-chart-data');
+    renderPlotlyChart('topicComparisonChart', 'topic-comparison-chart-data');
+});
@@ -0,0 +1,19 @@
+document.addEventListener('DOMContentLoaded', function() {
+    function renderPlotlyChart(chartId, dataId) {
+        const chartDiv = document.getElementById(chartId);
+        const chartDataElement = document.getElementById(dataId);
+
+        if (!chartDiv || !chartDataElement) {
+            return;
+        }
+
+        const figure = JSON.parse(chartDataElement.textContent);
+        if (figure && figure.data && figure.data.length > 0) {
+            Plotly.newPlot(chartId, figure.data, figure.layout, { responsive: true });
+        }
+    }
+
+    renderPlotlyChart('topicDriftChart', 'topic-drift-chart-data');
+    renderPlotlyChart('categoryDriftChart', 'category-drift-chart-data');
+    renderPlotlyChart('divergenceChart', 'divergence-chart-data');
+});
@@ -0,0 +1,66 @@
+document.addEventListener('DOMContentLoaded', function() {
+    const feedContainer = document.getElementById('upload-feed-container');
+    const feedStatus = document.getElementById('feed-status');
+    const loadingSpinner = document.getElementById('loading-spinner');
+    const POLL_INTERVAL_MS = 3000;
+
+    function renderUploads(uploads) {
+        feedContainer.replaceChildren();
+        uploads.forEach(upload => {
+            const column = document.createElement('div');
+            column.className = 'col-sm-12 col-md-6 col-lg-4 mb-4';
+            column.innerHTML = `
+                <div class="card h-100">
+                    <a target="_blank"><img class="card-img-top"></a>
+                    <div class="card-body d-flex flex-column">
+                        <h6 class="card-title"></h6>
+                        <p class="card-text mt-auto"><small class="text-muted"></small></p>
+                    </div>
+                </div>`;
+            const url = `https://www.youtube.com/watch?v=${encodeURIComponent(upload.video_id)}`;
+            column.querySelector('a').href = url;
+            column.querySelector('img').src = upload.thumbnail_url;
+            column.querySelector('img').alt = upload.title;
+            column.querySelector('.card-title').textContent = upload.title;
+            column.querySelector('small').textContent =
+                `${upload.channel_title} · ${new Date(upload.published_at).toLocaleString()}`;
+            feedContainer.appendChild(column);
+        });
+    }
+
+    function fetchFeed() {
+        fetch('/subscriptions/feed/data/', { method: 'GET' })
+            .then(response => {
+                if (response.status === 401) {
+                    window.location.href = '/'; // Redirect to login if unauthorized
+                }
+                if (!response.ok) {
+                    throw new Error(`HTTP error! status: ${response.status}`);
+                }
+                return response.json();
+            })
+            .then(data => {
+                renderUploads(data.uploads);
+                if (data.status === 'building') {
+                    feedStatus.textContent = 'Collecting your subscriptions...';
+                } else if (data.pending > 0) {
+                    feedStatus.textContent = `Checking ${data.pending} of ${data.channel_count} channels for new uploads...`;
+                } else {
+                    feedStatus.textContent = `Up to date across ${data.channel_count} channels.`;
+                }
+
+                // Keep polling while channels are still being refreshed in the background
+                if (data.status === 'building' || data.refreshing) {
+                    setTimeout(fetchFeed, POLL_INTERVAL_MS);
+                } else {
+                    loadingSpinner.style.display = 'none';
+                }
+            })
+            .catch(error => {
+                console.error('Error fetching upload feed:', error);
+                loadingSpinner.style.display = 'none';
+            });
+    }
+
+    fetchFeed();
+});
@@ -1,25 +1,203 @@
 document.addEventListener('DOMContentLoaded', function () {
-    const chartDataElement = document.getElementById('chart-data');
-    if (chartDataElement) {
-        try {
-            const chartData = JSON.parse(chartDataElement.textContent);
-            if (chartData && chartData.data && chartData.layout) {
-                Plotly.newPlot('viewingEvolutionChart', chartData.data, chartData.layout);
-            }
-        } catch (e) {
-            console.error("Error parsing chart data:", e);
+    // Chart specs are served by ETag-aware endpoints, so revisits revalidate instead of re-downloading
+    function renderChart(name, chartId, config) {
+        if (!document.getElementById(chartId)) return Promise.resolve(null);
+        return fetch(`/viewing-evolution/charts/${name}/`, { method: 'GET' })
+            .then(response => response.ok ? response.json() : null)
+            .then(chartData => {
+                if (chartData && chartData.data && chartData.layout) {
+                    return Plotly.newPlot(chartId, chartData.data, chartData.layout, config);
+                }
+                return null;
+            })
+            .catch(error => {
+                console.error(`Error fetching ${name} chart data:`, error);
+                return null;
+            });
+    }
+
+    renderChart('monthly', 'viewingEvolutionChart');
+    renderChart('daily', 'dailyWatchFreqChart')
+        .then(chart => chart && chart.on('plotly_relayout', onDailyChartZoom));
+
+    // The page only carries a downsampled daily series; on zoom, fetch the visible range at full resolution
+    let dailyZoomTimer = null;
+    function onDailyChartZoom(event) {
+        let params = null;
+        if (event['xaxis.range[0]'] && event['xaxis.range[1]']) {
+            params = { start: event['xaxis.range[0]'].slice(0, 10), end: event['xaxis.range[1]'].slice(0, 10) };
+        } else if (event['xaxis.range'] && event['xaxis.range'].length === 2) {
+            params = { start: String(event['xaxis.range'][0]).slice(0, 10), end: String(event['xaxis.range'][1]).slice(0, 10) };
+        } else if (event['xaxis.autorange']) {
+            params = {};
+        } else {
+            return;
         }
+
+        clearTimeout(dailyZoomTimer);
+        dailyZoomTimer = setTimeout(function () {
+            fetch(`/viewing-evolution/daily/?${new URLSearchParams(params).toString()}`, { method: 'GET' })
+                .then(response => response.ok ? response.json() : null)
+                .then(points => {
+                    if (points) {
+                        Plotly.restyle('dailyWatchFreqChart', { x: [points.x], y: [points.y] }, [0]);
+                    }
+                })
+                .catch(error => console.error('Error fetching daily chart data:', error));
+        }, 250);
+    }
+
+    [
+        ['hourly', 'hourlyWatchFreqChart'],
+        ['weekday', 'weekdayWatchFreqChart'],
+        ['session_length', 'sessionLengthChart'],
+        ['binge_timeline', 'bingeTimelineChart'],
+    ].forEach(function ([name, chartId]) {
+        renderChart(name, chartId, { responsive: true });
+    });
+
+    // Bucket the watch history in the browser's local time zone
+    const timeZoneInput = document.getElementById('time-zone');
+    if (timeZoneInput) {
+        timeZoneInput.value = Intl.DateTimeFormat().resolvedOptions().timeZone || '';
+    }
+
+    // Report progress while the upload is being processed
+    const uploadForm = document.getElementById('takeoutUploadForm');
+    const uploadMessage = document.getElementById('uploadMessage');
+    if (uploadForm && uploadMessage) {
+        uploadForm.addEventListener('submit', function () {
+            uploadMessage.innerHTML = '<div class="alert alert-info" role="alert">Uploading...</div>';
+
+            const pollStatus = function () {
+                fetch('/viewing-evolution/status/', { method: 'GET' })
+                    .then(response => response.ok ? response.json() : null)
+                    .then(status => {
+                        if (status && status.state === 'running') {
+                            uploadMessage.innerHTML = '<div class="alert alert-info" role="alert">Analyzing your watch history...</div>';
+                        }
+                    })
+                    .catch(error => console.error('Error fetching processing status:', error));
+            };
+            setInterval(pollStatus, 2000); // The page navigates away once the upload response arrives
+        });
+    }
+
+    // A queued upload waits on the server; poll its place in line and ask for it to be processed once it can start
+    const pendingForm = document.getElementById('pendingUploadForm');
+    if (pendingForm && uploadMessage) {
+        const waitForSlot = function () {
+            fetch('/viewing-evolution/status/', { method: 'GET' })
+                .then(response => response.ok ? response.json() : null)
+                .then(status => {
+                    if (status && status.can_start) {
+                        uploadMessage.innerHTML = '<div class="alert alert-info" role="alert">Analyzing your watch history...</div>';
+                        pendingForm.submit();
+                        return;
+                    }
+                    if (status && status.state === 'idle') {
+                        uploadMessage.innerHTML = '<div class="alert alert-warning" role="alert">Your queued upload has expired. Please upload it again.</div>';
+                        return;
+                    }
+                    if (status && status.state === 'queued') {
+                        uploadMessage.innerHTML = `<div class="alert alert-info" role="alert">The server is busy. Your upload is queued at position ${status.position} of ${status.queue_length}.</div>`;
+                    }
+                    setTimeout(waitForSlot, 2000);
+                })
+                .catch(error => {
+                    console.error('Error fetching processing status:', error);
+                    setTimeout(waitForSlot, 2000);
+                });
+        };
+        waitForSlot();
     }
 
-    const dailyChartDataElement = document.getElementById('daily-chart-data');
-    if (dailyChartDataElement) {
-        try {
-            const dailyChartData = JSON.parse(dailyChartDataElement.textContent);
-            if (dailyChartData && dailyChartData.data && dailyChartData.layout) {
-                Plotly.newPlot('dailyWatchFreqChart', dailyChartData.data, dailyChartData.layout);
-            }
-        } catch (e) {
-            console.error("Error parsing daily chart data:", e);
+    // Query the precomputed time cube for any date range, granularity and split
+    const rangeForm = document.getElementById('rangeQueryForm');
+    const rangeSummary = document.getElementById('rangeQuerySummary');
+    function fetchRangeData() {
+        const params = new URLSearchParams(new FormData(rangeForm));
+        fetch(`/viewing-evolution/range/?${params.toString()}`, { method: 'GET' })
+            .then(response => response.json().then(data => ({ ok: response.ok, data: data })))
+            .then(({ ok, data }) => {
+                if (!ok) {
+                    rangeSummary.textContent = data.error;
+                    return;
+                }
+                if (!document.getElementById('range-start').value) {
+                    document.getElementById('range-start').value = data.start;
+                    document.getElementById('range-end').value = data.end;
+                }
+                rangeSummary.textContent = `${data.total} videos watched between ${data.start} and ${data.end}.`;
+                const traces = Object.entries(data.series).map(([name, values]) => ({
+                    type: 'bar', name: name, x: data.labels, y: values,
+                }));
+                Plotly.react('rangeQueryChart', traces, {
+                    barmode: 'stack',
+                    xaxis: { title: 'Date' },
+                    yaxis: { title: 'Number of Videos Watched' },
+                    showlegend: traces.length > 1,
+                }, { responsive: true });
+            })
+            .catch(error => console.error('Error fetching range data:', error));
+    }
+    const searchForm = document.getElementById('historySearchForm');
+    const searchSummary = document.getElementById('historySearchSummary');
+    const searchResults = document.getElementById('historySearchResults');
+    let searchTimer = null;
+    function searchHistory() {
+        const params = new URLSearchParams(new FormData(searchForm));
+        if (!params.get('q').trim() && !params.get('channel').trim()) {
+            searchSummary.textContent = '';
+            searchResults.replaceChildren();
+            return;
         }
+        fetch(`/viewing-evolution/search/?${params.toString()}`, { method: 'GET' })
+            .then(response => response.json().then(data => ({ ok: response.ok, data: data })))
+            .then(({ ok, data }) => {
+                searchResults.replaceChildren();
+                if (!ok) {
+                    searchSummary.textContent = data.error;
+                    return;
+                }
+                searchSummary.textContent = data.total > data.results.length
+                    ? `${data.total} matches, showing the ${data.results.length} most recent.`
+                    : `${data.total} matches.`;
+                data.results.forEach(result => {
+                    const item = document.createElement('li');
+                    item.className = 'list-group-item d-flex justify-content-between align-items-center';
+                    const title = document.createElement(result.video_id ? 'a' : 'span');
+                    title.textContent = result.title;
+                    if (result.video_id) {
+                        title.href = `https://www.youtube.com/watch?v=${encodeURIComponent(result.video_id)}`;
+                        title.target = '_blank';
+                    }
+                    const details = document.createElement('small');
+                    details.className = 'text-muted ms-3 text-nowrap';
+                    details.textContent = `${result.channel || 'Unknown channel'} · ${result.watched_at}`;
+                    item.append(title, details);
+                    searchResults.appendChild(item);
+                });
+            })
+            .catch(error => console.error('Error searching watch history:', error));
+    }
+    if (searchForm) {
+        searchForm.addEventListener('submit', function (e) {
+            e.preventDefault();
+            searchHistory();
+        });
+        // Search as the user types; the index answers prefix queries for the last word
+        document.getElementById('search-query').addEventListener('input', function () {
+            clearTimeout(searchTimer);
+            searchTimer = setTimeout(searchHistory, 250);
+        });
+    }
+
+    if (rangeForm) {
+        rangeForm.addEventListener('submit', function (e) {
+            e.preventDefault();
+            fetchRangeData();
+        });
+        fetchRangeData();
     }
-});
\ No newline at end of file
+});